@@ -1,94 +1,123 @@
+"""
+动作包：基类与全部具体动作。
+
+导入本包不会加载具体动作模块：包属性在首次访问时才导入对应子模块（见 __getattr__），
+ActionRegistry 在首次查询时调用 load_all_actions() 导入并注册所有动作（含 mutual actions）。
+"""
 from __future__ import annotations
 
-# 基类与工具
-from .action import (
-    Action,
-    DefineAction,
-    LLMAction,
-    ChunkActionMixin,
-    ActualActionMixin,
-    InstantAction,
-    TimedAction,
-    long_action,
-)
-from .registry import register_action
+import importlib
 
-# 具体动作（按文件拆分）
-from .move import Move
-from .move_to_region import MoveToRegion
-from .move_to_avatar import MoveToAvatar
-from .move_away_from_avatar import MoveAwayFromAvatar
-from .move_away_from_region import MoveAwayFromRegion
-from .escape import Escape
-from .respire import Respire
-from .breakthrough import Breakthrough
-from .play import Reading, TeaTasting, Traveling, ZitherPlaying
-from .hunt import Hunt
-from .harvest import Harvest
-from .sell import Sell
-from .attack import Attack
-from .plunder_people import PlunderPeople
-from .help_people import HelpPeople
-from .devour_people import DevourPeople
-from .self_heal import SelfHeal
-from .catch import Catch
-from .nurture_weapon import NurtureWeapon
-from .assassinate import Assassinate
-from .move_to_direction import MoveToDirection
-from .cast import Cast
-from .refine import Refine
-from .buy import Buy
-from .mine import Mine
-from .retreat import Retreat
-from .meditate import Meditate
-from .educate import Educate
-from .temper import Temper
-from .plant import Plant
+from .registry import register_action
 
-# 注册到 ActionRegistry（标注是否为实际可执行动作）
-register_action(actual=False)(Action)
-register_action(actual=False)(DefineAction)
-register_action(actual=False)(LLMAction)
-register_action(actual=False)(ChunkActionMixin)
-register_action(actual=False)(ActualActionMixin)
-register_action(actual=False)(InstantAction)
-register_action(actual=False)(TimedAction)
+# 导出名 -> 子模块
+_EXPORTS = {
+    "Action": "action",
+    "DefineAction": "action",
+    "LLMAction": "action",
+    "ChunkActionMixin": "action",
+    "ActualActionMixin": "action",
+    "InstantAction": "action",
+    "TimedAction": "action",
+    "long_action": "action",
+    "Move": "move",
+    "MoveToRegion": "move_to_region",
+    "MoveToAvatar": "move_to_avatar",
+    "MoveAwayFromAvatar": "move_away_from_avatar",
+    "MoveAwayFromRegion": "move_away_from_region",
+    "Escape": "escape",
+    "Respire": "respire",
+    "Breakthrough": "breakthrough",
+    "Reading": "play",
+    "TeaTasting": "play",
+    "Traveling": "play",
+    "ZitherPlaying": "play",
+    "Hunt": "hunt",
+    "Harvest": "harvest",
+    "Sell": "sell",
+    "Attack": "attack",
+    "PlunderPeople": "plunder_people",
+    "HelpPeople": "help_people",
+    "DevourPeople": "devour_people",
+    "SelfHeal": "self_heal",
+    "Catch": "catch",
+    "NurtureWeapon": "nurture_weapon",
+    "Assassinate": "assassinate",
+    "MoveToDirection": "move_to_direction",
+    "Cast": "cast",
+    "Refine": "refine",
+    "Buy": "buy",
+    "Mine": "mine",
+    "Retreat": "retreat",
+    "Meditate": "meditate",
+    "Educate": "educate",
+    "Temper": "temper",
+    "Plant": "plant",
+}
 
-register_action(actual=False)(Move)
-register_action(actual=True)(MoveToRegion)
-register_action(actual=True)(MoveToAvatar)
-register_action(actual=True)(MoveAwayFromAvatar)
-register_action(actual=True)(MoveAwayFromRegion)
-register_action(actual=False)(Escape)
-register_action(actual=True)(Respire)
-register_action(actual=True)(Breakthrough)
-register_action(actual=True)(Reading)
-register_action(actual=True)(TeaTasting)
-register_action(actual=True)(Traveling)
-register_action(actual=True)(ZitherPlaying)
-register_action(actual=True)(Hunt)
-register_action(actual=True)(Harvest)
-register_action(actual=True)(Sell)
-register_action(actual=False)(Attack)
-register_action(actual=True)(PlunderPeople)
-register_action(actual=True)(HelpPeople)
-register_action(actual=True)(DevourPeople)
-register_action(actual=True)(SelfHeal)
-register_action(actual=True)(Catch)
-register_action(actual=True)(NurtureWeapon)
-register_action(actual=True)(Assassinate)
-register_action(actual=True)(MoveToDirection)
-register_action(actual=True)(Cast)
-register_action(actual=True)(Refine)
-register_action(actual=True)(Buy)
-register_action(actual=True)(Mine)
-register_action(actual=True)(Retreat)
-register_action(actual=True)(Meditate)
-register_action(actual=True)(Educate)
-register_action(actual=True)(Temper)
-register_action(actual=True)(Plant)
+# 注册到 ActionRegistry（标注是否为实际可执行动作；注册顺序即动作信息中的排列顺序）
+_REGISTRATIONS = (
+    ("Action", False),
+    ("DefineAction", False),
+    ("LLMAction", False),
+    ("ChunkActionMixin", False),
+    ("ActualActionMixin", False),
+    ("InstantAction", False),
+    ("TimedAction", False),
+    ("Move", False),
+    ("MoveToRegion", True),
+    ("MoveToAvatar", True),
+    ("MoveAwayFromAvatar", True),
+    ("MoveAwayFromRegion", True),
+    ("Escape", False),
+    ("Respire", True),
+    ("Breakthrough", True),
+    ("Reading", True),
+    ("TeaTasting", True),
+    ("Traveling", True),
+    ("ZitherPlaying", True),
+    ("Hunt", True),
+    ("Harvest", True),
+    ("Sell", True),
+    ("Attack", False),
+    ("PlunderPeople", True),
+    ("HelpPeople", True),
+    ("DevourPeople", True),
+    ("SelfHeal", True),
+    ("Catch", True),
+    ("NurtureWeapon", True),
+    ("Assassinate", True),
+    ("MoveToDirection", True),
+    ("Cast", True),
+    ("Refine", True),
+    ("Buy", True),
+    ("Mine", True),
+    ("Retreat", True),
+    ("Meditate", True),
+    ("Educate", True),
+    ("Temper", True),
+    ("Plant", True),
+)
 # Talk 已移动到 mutual_action 模块，在那里注册
 
+
+def load_all_actions() -> None:
+    """导入所有动作模块并注册（重复调用无副作用）。"""
+    for name, actual in _REGISTRATIONS:
+        register_action(actual=actual)(__getattr__(name))
+    from src.classes.mutual_action import register_mutual_actions
+    register_mutual_actions()
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     # 基类
     "Action",
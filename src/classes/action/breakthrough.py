@@ -63,10 +63,14 @@ class Breakthrough(TimedAction):
         if random.random() < success_rate:
             old_realm = self.avatar.cultivation_progress.realm
             self.avatar.cultivation_progress.break_through()
+            self.avatar.mark_save_dirty()
             new_realm = self.avatar.cultivation_progress.realm
 
             # 突破成功时更新HP的最大值
             if new_realm != old_realm:
+                # 境界变化影响宗门成员统计、总战力与势力半径
+                if self.avatar.sect is not None:
+                    self.avatar.sect.on_member_realm_changed(self.avatar)
                 self._update_hp_on_breakthrough(new_realm)
                 # 成功：确保最大寿元至少达到新境界的基线
                 self.avatar.age.ensure_max_lifespan_at_least_realm_base(new_realm)
@@ -37,6 +37,7 @@ class DevourPeople(TimedAction):
             gain = random.randint(10, 100)
             current_souls = auxiliary.special_data.get("devoured_souls", 0)
             auxiliary.special_data["devoured_souls"] = min(10000, int(current_souls) + gain)
+            self.avatar.mark_save_dirty()
             
             # 若在城市中，大幅降低繁荣度
             region = self.avatar.tile.region
@@ -62,6 +62,7 @@ class Educate(TimedAction):
             exp = int(exp * (1 + efficiency))
             
         self.avatar.cultivation_progress.add_exp(exp)
+        self.avatar.mark_save_dirty()
         
         # 副作用：小概率增加城市繁荣度 (20%)
         base_prob = 0.2
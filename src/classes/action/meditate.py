@@ -62,6 +62,7 @@ class Meditate(TimedAction):
             exp = int(exp * (1 + multiplier))
             
         self.avatar.cultivation_progress.add_exp(exp)
+        self.avatar.mark_save_dirty()
         
         # 记录本次结果供事件使用
         self._last_is_epiphany = is_epiphany
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from src.classes.action import DefineAction, ChunkActionMixin
 from src.classes.action.move_helper import clamp_manhattan_with_diagonal_priority
+from src.classes.travel import get_avatar_move_step
 
 
 class Move(DefineAction, ChunkActionMixin):
@@ -22,11 +23,8 @@ class Move(DefineAction, ChunkActionMixin):
         移动到某个tile
         """
         world = self.world
-        # 基于境界的移动步长：曼哈顿限制，优先斜向
-        step = getattr(self.avatar, "move_step_length", 1)
-        # 附加移动步长加成
-        extra_raw = self.avatar.effects.get("extra_move_step", 0)
-        step += int(extra_raw or 0)
+        # 基于境界的移动步长 + 附加移动步长加成：曼哈顿限制，优先斜向
+        step = get_avatar_move_step(self.avatar)
         clamped_dx, clamped_dy = clamp_manhattan_with_diagonal_priority(delta_x, delta_y, step)
 
         new_x = self.avatar.pos_x + clamped_dx
@@ -58,10 +58,18 @@ class MoveToRegion(DefineAction, ActualActionMixin):
         target_loc = self._get_target_loc(target_region)
         
         cur_loc = (self.avatar.pos_x, self.avatar.pos_y)
+        step = getattr(self.avatar, "move_step_length", 1)
+
+        # 区域外：沿地形流场前进（同一目的地的角色共用流场）；进入区域后再直线走向具体目标点
+        pathfinder = getattr(self.world.map, "pathfinder", None)
+        if pathfinder is not None and not pathfinder.is_inside(*cur_loc, target_region):
+            next_loc = pathfinder.advance(*cur_loc, target_region, step)
+            if next_loc is not None:
+                Move(self.avatar, self.world).execute(next_loc[0] - cur_loc[0], next_loc[1] - cur_loc[1])
+                return
+
         raw_dx = target_loc[0] - cur_loc[0]
         raw_dy = target_loc[1] - cur_loc[1]
-        
-        step = getattr(self.avatar, "move_step_length", 1)
         dx, dy = clamp_manhattan_with_diagonal_priority(raw_dx, raw_dy, step)
         Move(self.avatar, self.world).execute(dx, dy)
 
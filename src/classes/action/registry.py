@@ -10,9 +10,41 @@ class ActionRegistry:
     - register(action_cls, actual): 注册一个动作类
     - get(name): 按名称获取动作类
     - all()/all_actual(): 获取全部/实际可执行的动作类集合
+
+    查询前会确保所有动作模块已导入注册（首次查询时才加载，见 src/classes/action/__init__.py）。
     """
     _name_to_cls: Dict[str, type] = {}
     _actual_name_to_cls: Dict[str, type] = {}
+    _loaded: bool = False
+    # 加载过程中（动作模块导入时）的重入查询直接使用已注册的部分
+    _loading: bool = False
+
+    @classmethod
+    def _ensure_loaded(cls) -> None:
+        if cls._loaded or cls._loading:
+            return
+        cls._loading = True
+        # 先于全量加载注册的动作（如被单独导入的 mutual action）按规范顺序重排
+        early, early_actual = dict(cls._name_to_cls), dict(cls._actual_name_to_cls)
+        cls._name_to_cls.clear()
+        cls._actual_name_to_cls.clear()
+        try:
+            from src.classes.action import load_all_actions
+            load_all_actions()
+        except BaseException:
+            # 导入失败：恢复加载前的注册表，下次查询时重试（注册是幂等的）
+            cls._name_to_cls.clear()
+            cls._actual_name_to_cls.clear()
+            cls._name_to_cls.update(early)
+            cls._actual_name_to_cls.update(early_actual)
+            raise
+        finally:
+            cls._loading = False
+        for name, action_cls in early.items():
+            cls._name_to_cls.setdefault(name, action_cls)
+        for name, action_cls in early_actual.items():
+            cls._actual_name_to_cls.setdefault(name, action_cls)
+        cls._loaded = True
 
     @classmethod
     def register(cls, action_cls: type, *, actual: bool) -> None:
@@ -23,10 +55,12 @@ class ActionRegistry:
 
     @classmethod
     def get(cls, name: str) -> type:
+        cls._ensure_loaded()
         return cls._name_to_cls[name]
 
     @classmethod
     def all(cls) -> Iterable[type]:
+        cls._ensure_loaded()
         # 去重保持稳定顺序
         seen = set()
         ordered: list[type] = []
@@ -38,6 +72,7 @@ class ActionRegistry:
 
     @classmethod
     def all_actual(cls) -> Iterable[type]:
+        cls._ensure_loaded()
         # 去重保持稳定顺序
         seen = set()
         ordered: list[type] = []
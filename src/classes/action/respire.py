@@ -57,6 +57,7 @@ class Respire(TimedAction):
             exp = int(exp * (1 + multiplier))
             
         self.avatar.cultivation_progress.add_exp(exp)
+        self.avatar.mark_save_dirty()
 
     def _get_matched_essence_density(self) -> int:
         """
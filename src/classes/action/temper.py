@@ -46,6 +46,7 @@ class Temper(TimedAction):
         exp = max(1, exp)
             
         self.avatar.cultivation_progress.add_exp(exp)
+        self.avatar.mark_save_dirty()
 
     def can_start(self) -> tuple[bool, str]:
         if not self.avatar.cultivation_progress.can_cultivate():
@@ -7,15 +7,14 @@ if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
 
 from src.classes.action.registry import ActionRegistry
-# 确保在收集注册表前加载所有动作模块（含 mutual actions）
-import src.classes.action  # noqa: F401
-import src.classes.mutual_action  # noqa: F401
 
 
-ALL_ACTION_CLASSES = list(ActionRegistry.all())
-ALL_ACTUAL_ACTION_CLASSES = list(ActionRegistry.all_actual())
-ALL_ACTION_NAMES = [cls.__name__ for cls in ALL_ACTION_CLASSES]
-ALL_ACTUAL_ACTION_NAMES = [cls.__name__ for cls in ALL_ACTUAL_ACTION_CLASSES]
+def _all_action_classes() -> list:
+    return list(ActionRegistry.all())
+
+
+def _all_actual_action_classes() -> list:
+    return list(ActionRegistry.all_actual())
 
 def _build_action_info(action):
     info = {
@@ -36,7 +35,7 @@ def get_action_infos(avatar: "Avatar" | None = None) -> Dict[str, Any]:
     如果提供了 avatar，则会过滤掉该角色绝对不可能执行的动作。
     """
     infos = {}
-    for action_cls in ALL_ACTUAL_ACTION_CLASSES:
+    for action_cls in _all_actual_action_classes():
         if avatar is not None:
             # 实例化动作以检查是否可能执行
             action_inst = action_cls(avatar, avatar.world)
@@ -51,7 +50,22 @@ def get_action_infos_str(avatar: "Avatar" | None = None) -> str:
     """
     return json.dumps(get_action_infos(avatar), ensure_ascii=False, indent=2)
 
-# 为了兼容性保留 ACTION_INFOS_STR，但请注意这可能是旧的（导入时的快照），不会随语言切换更新
+# 以下模块属性为兼容保留，首次访问时才计算并缓存（导入本模块不会加载全部动作）。
+# 注意 ACTION_INFOS / ACTION_INFOS_STR 是首次访问时的快照，不会随语言切换更新，
 # 建议使用 get_action_infos_str() 获取最新语言的描述
-ACTION_INFOS = get_action_infos()
-ACTION_INFOS_STR = json.dumps(ACTION_INFOS, ensure_ascii=False, indent=2)
+_LAZY_ATTRS = {
+    "ALL_ACTION_CLASSES": _all_action_classes,
+    "ALL_ACTUAL_ACTION_CLASSES": _all_actual_action_classes,
+    "ALL_ACTION_NAMES": lambda: [cls.__name__ for cls in _all_action_classes()],
+    "ALL_ACTUAL_ACTION_NAMES": lambda: [cls.__name__ for cls in _all_actual_action_classes()],
+    "ACTION_INFOS": get_action_infos,
+    "ACTION_INFOS_STR": lambda: get_action_infos_str(),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        value = _LAZY_ATTRS[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
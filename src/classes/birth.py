@@ -2,6 +2,7 @@ import random
 from src.classes.core.world import World
 from src.classes.core.avatar import Avatar, Gender
 from src.classes.relation.relation import Relation
+from src.classes.relation.relation_graph import first_related
 from src.classes.mortal import Mortal
 from src.classes.event import Event
 from src.utils.config import CONFIG
@@ -29,11 +30,7 @@ def process_births(world: World) -> list[Event]:
 
     for avatar in living_avatars:
         # 1. 寻找道侣
-        partner: Avatar | None = None
-        for target, rel in avatar.relations.items():
-            if rel == Relation.IS_LOVER_OF:
-                partner = target
-                break
+        partner: Avatar | None = first_related(avatar, Relation.IS_LOVER_OF)
         
         if not partner:
             continue
@@ -103,6 +100,8 @@ def _create_child_for_couple(world: World, parent1: Avatar, parent2: Avatar) ->
     # 4. 绑定关系
     parent1.children.append(child)
     parent2.children.append(child)
+    parent1.mark_save_dirty()
+    parent2.mark_save_dirty()
     
     # 5. 注册到世界凡人管理器
     world.mortal_manager.register_mortal(child)
@@ -64,9 +64,11 @@ class ActionMixin:
             self.planned_actions[0:0] = plans
         else:
             self.planned_actions.extend(plans)
+        self.mark_save_dirty()
 
     def clear_plans(self: "Avatar") -> None:
         self.planned_actions.clear()
+        self.mark_save_dirty()
 
     def has_plans(self: "Avatar") -> bool:
         return len(self.planned_actions) > 0
@@ -77,6 +79,8 @@ class ActionMixin:
         """
         if self.current_action is not None:
             return None
+        if self.planned_actions:
+            self.mark_save_dirty()
         while self.planned_actions:
             plan = self.planned_actions.pop(0)
             try:
@@ -53,6 +53,21 @@ from src.classes.core.avatar.action_mixin import ActionMixin
 
 persona_num = CONFIG.avatar.persona_num
 
+# 不进入存档的运行时属性：赋值不标记存档脏（见 Avatar.__setattr__）
+_SAVE_UNTRACKED_ATTRS = frozenset({
+    "tile",
+    "computed_relations",
+    "owned_regions",
+    "relation_interaction_states",
+    "_pending_events",
+    "_new_action_set_this_step",
+    "_relation_index",
+    "_relation_referrers",
+    "_save_dirty",
+})
+# 赋回相等的不可变值不算改动
+_SAVE_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
 
 @dataclass
 class Avatar(
@@ -90,8 +105,13 @@ class Avatar(
     materials: dict[Material, int] = field(default_factory=dict)
     hp: HP = field(default_factory=lambda: HP(0, 0))
     relations: dict["Avatar", Relation] = field(default_factory=dict)
-    # 缓存的二阶关系 (由 Simulator 定期计算)
+    # 缓存的二阶关系（随 set_relation / clear_relation 增量维护，见 relations.refresh_second_degree_around）
     computed_relations: dict["Avatar", Relation] = field(default_factory=dict)
+    # 关系图索引（类型邻接与反向边），由 relation_graph 维护
+    _relation_index: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _relation_referrers: dict[int, "Avatar"] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # 自上次检查点以来存档数据是否可能有变化；增量存档只序列化脏角色（见 src/sim/save/journal.py）
+    _save_dirty: bool = field(default=True, init=False, repr=False, compare=False)
     alignment: Alignment | None = None
     sect: Sect | None = None
     sect_rank: "SectRank | None" = None
@@ -141,6 +161,20 @@ class Avatar(
     # 拥有的洞府列表（不参与序列化，通过 load_game 重建）
     owned_regions: List["CultivateRegion"] = field(default_factory=list, init=False)
 
+    def __setattr__(self, name: str, value) -> None:
+        # 给存档字段赋值即视为有改动；容器与状态对象的原地修改由各修改方法调用 mark_save_dirty
+        if name not in _SAVE_UNTRACKED_ATTRS and not self._save_dirty:
+            old = self.__dict__.get(name, _SAVE_UNTRACKED_ATTRS)
+            # 只有不可变标量才按值比较；MagicStone 之类的 int 子类会被原地修改，不能据此判定未变
+            scalar = type(value) in _SAVE_SCALAR_TYPES or isinstance(value, Enum)
+            if not (scalar and type(old) is type(value) and old == value):
+                object.__setattr__(self, "_save_dirty", True)
+        object.__setattr__(self, name, value)
+
+    def mark_save_dirty(self) -> None:
+        """标记存档数据有改动（原地修改 hp、修为、背包、关系等之后调用）。"""
+        object.__setattr__(self, "_save_dirty", True)
+
     def occupy_region(self, region: "CultivateRegion") -> None:
         """
         占据一个洞府，处理双向绑定和旧主清理。
@@ -338,6 +372,7 @@ class Avatar(
         )
 
         self.metrics_history.append(metrics)
+        self.mark_save_dirty()
 
         # 自动清理旧记录
         if len(self.metrics_history) > self.max_metrics_history:
@@ -365,7 +400,10 @@ class Avatar(
 
     def update_age(self, current_month_stamp: MonthStamp):
         """更新年龄"""
+        old_age = self.age.age
         self.age.update_age(current_month_stamp, self.birth_month_stamp)
+        if self.age.age != old_age:
+            self.mark_save_dirty()
 
     def update_cultivation(self, new_level: int):
         """更新修仙进度，并在境界提升时更新寿命和宗门职位"""
@@ -373,8 +411,11 @@ class Avatar(
         self.cultivation_progress.level = new_level
         self.cultivation_progress.realm = self.cultivation_progress.get_realm(new_level)
         self.cultivation_progress.stage = self.cultivation_progress.get_stage(new_level)
+        self.mark_save_dirty()
         
         if self.cultivation_progress.realm != old_realm:
+            if self.sect is not None:
+                self.sect.on_member_realm_changed(self)
             self.age.update_realm(self.cultivation_progress.realm)
             self.recalc_effects()
             from src.classes.sect_ranks import check_and_promote_sect_rank
@@ -384,6 +425,7 @@ class Avatar(
 
     def _init_known_regions(self):
         """初始化已知区域：当前位置 + 宗门驻地"""
+        self.mark_save_dirty()
         if self.tile and self.tile.region:
             self.known_regions.add(self.tile.region.id)
         
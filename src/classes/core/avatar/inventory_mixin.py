@@ -31,6 +31,7 @@ class InventoryMixin:
             self.materials[material] += quantity
         else:
             self.materials[material] = quantity
+        self.mark_save_dirty()
     
     def remove_material(self: "Avatar", material: "Material", quantity: int = 1) -> bool:
         """
@@ -57,6 +58,7 @@ class InventoryMixin:
         # 如果数量为0，从字典中移除该物品
         if self.materials[material] == 0:
             del self.materials[material]
+        self.mark_save_dirty()
             
         return True
     
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from pathlib import Path
 import json
+import math
 from enum import Enum
 
 from src.classes.alignment import Alignment
@@ -10,12 +11,13 @@ from src.classes.sect_effect import SectEffectsMixin
 from src.classes.core.orthodoxy import get_orthodoxy
 from src.utils.config import CONFIG
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
     from src.classes.technique import Technique
     from src.classes.sect_ranks import SectRank
     from src.classes.weapon_type import WeaponType
+    from src.systems.cultivation import Realm
 
 """
 宗门、宗门总部基础数据。
@@ -24,6 +26,30 @@ if TYPE_CHECKING:
 """
 
 
+@dataclass(frozen=True, slots=True)
+class SectMemberStats:
+    """宗门成员统计（只读），见 Sect.get_member_stats。"""
+    living_members: tuple["Avatar", ...]
+    realm_counts: dict["Realm", int]
+    peak_realm: Optional["Realm"]
+    patriarch: Optional["Avatar"]
+
+
+@dataclass(frozen=True, slots=True)
+class SectStrengthSummary:
+    """
+    宗门成员战力汇总，见 Sect.get_strength_summary。
+    - total: 成员战力之和（宗门榜使用）
+    - combined: log(sum(exp(成员战力)))，宗门总战力（势力半径使用）
+    """
+    total: float
+    combined: float
+
+
+def _is_patriarch(avatar: "Avatar") -> bool:
+    return getattr(getattr(avatar, "sect_rank", None), "value", "") == "patriarch"
+
+
 class SectRuleId(str, Enum):
     RIGHTEOUS_ORTHODOXY = "righteous_orthodoxy"
     EVIL_SECT_LOYALTY = "evil_sect_loyalty"
@@ -84,6 +110,15 @@ class Sect(SectEffectsMixin):
     members: dict[str, "Avatar"] = field(default_factory=dict, init=False)
     # 功法对象列表：Technique
     techniques: list["Technique"] = field(default_factory=list, init=False)
+    # 成员版本：本宗成员变动（含死亡）、成员境界或职位变化时递增，见 bump_member_version
+    member_version: int = field(default=0, init=False, repr=False, compare=False)
+    # 成员聚合（随成员增删与境界/职位钩子增量维护）：存活成员 id -> 计入的境界、各境界人数、掌门
+    _member_realms: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _realm_counts: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _patriarch: Optional["Avatar"] = field(default=None, init=False, repr=False, compare=False)
+    # 成员统计缓存：(成员版本, SectMemberStats)；战力汇总缓存：(成员版本, 月份, 战力函数, SectStrengthSummary)
+    _member_stats: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _strength_summary: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.members = {}
@@ -95,11 +130,108 @@ class Sect(SectEffectsMixin):
         """添加成员到宗门"""
         if avatar.id not in self.members:
             self.members[avatar.id] = avatar
+            if not getattr(avatar, "is_dead", False):
+                self._count_realm(avatar, avatar.cultivation_progress.realm)
+                if self._patriarch is None and _is_patriarch(avatar):
+                    self._patriarch = avatar
+            self.bump_member_version()
     
     def remove_member(self, avatar: "Avatar") -> None:
         """从宗门移除成员"""
         if avatar.id in self.members:
             del self.members[avatar.id]
+            self._uncount_realm(avatar)
+            if self._patriarch is avatar:
+                self._find_patriarch()
+            self.bump_member_version()
+
+    def on_member_realm_changed(self, avatar: "Avatar") -> None:
+        """成员境界变化后调用：更新境界分布。"""
+        old = self._member_realms.get(avatar.id)
+        if old is not None:
+            self._adjust_realm_count(old, -1)
+            # 原地更新，保持成员加入顺序
+            self._member_realms[avatar.id] = avatar.cultivation_progress.realm
+            self._adjust_realm_count(avatar.cultivation_progress.realm, 1)
+        self.bump_member_version()
+
+    def on_member_rank_changed(self, avatar: "Avatar") -> None:
+        """成员职位变化后调用：更新掌门。"""
+        if self._patriarch is avatar and not _is_patriarch(avatar):
+            self._find_patriarch()
+        elif self._patriarch is None and avatar.id in self._member_realms and _is_patriarch(avatar):
+            self._patriarch = avatar
+        self.bump_member_version()
+
+    def bump_member_version(self) -> None:
+        """
+        成员、成员境界或职位变化后调用（由 add_member / remove_member 与上面两个钩子调用）。
+        本宗的成员统计、战力汇总以及 SectManager.get_snapshot 的势力快照据此判断缓存是否仍然有效。
+        """
+        self.member_version += 1
+
+    def _adjust_realm_count(self, realm: "Realm", delta: int) -> None:
+        count = self._realm_counts.get(realm, 0) + delta
+        if count > 0:
+            self._realm_counts[realm] = count
+        else:
+            self._realm_counts.pop(realm, None)
+
+    def _count_realm(self, avatar: "Avatar", realm: "Realm") -> None:
+        self._member_realms[avatar.id] = realm
+        self._adjust_realm_count(realm, 1)
+
+    def _uncount_realm(self, avatar: "Avatar") -> None:
+        realm = self._member_realms.pop(avatar.id, None)
+        if realm is not None:
+            self._adjust_realm_count(realm, -1)
+
+    def _find_patriarch(self) -> None:
+        # 掌门离任、离宗或身故时才需要重新查找，按成员加入顺序取第一位
+        self._patriarch = next(
+            (self.members[aid] for aid in self._member_realms if _is_patriarch(self.members[aid])),
+            None,
+        )
+
+    def get_member_stats(self) -> SectMemberStats:
+        """
+        存活成员、境界分布、最高境界与掌门。
+        境界分布与掌门由成员增删和境界/职位钩子增量维护，这里只按成员版本缓存只读快照。
+        """
+        version = self.member_version
+        cached = self._member_stats
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        stats = SectMemberStats(
+            living_members=tuple(self.members[aid] for aid in self._member_realms),
+            realm_counts=dict(self._realm_counts),
+            peak_realm=max(self._realm_counts) if self._realm_counts else None,
+            patriarch=self._patriarch,
+        )
+        self._member_stats = (version, stats)
+        return stats
+
+    def get_strength_summary(self, strength_fn: Callable[["Avatar"], float], month: int) -> SectStrengthSummary:
+        """
+        存活成员战力汇总。战力还受装备、功法等效果影响，因此除成员版本外按月份缓存：
+        同一个月内势力结算与宗门榜共享一次计算。
+        """
+        version = self.member_version
+        cached = self._strength_summary
+        if cached is not None and cached[:3] == (version, month, strength_fn):
+            return cached[3]
+
+        strengths = [float(strength_fn(m)) for m in self.get_member_stats().living_members]
+        combined = 0.0
+        if strengths:
+            max_str = max(strengths)
+            # 防止 exp 溢出，限制上限
+            sum_exp = sum(math.exp(max(-500.0, min(s - max_str, 500.0))) for s in strengths)
+            combined = max_str + math.log(sum_exp)
+        summary = SectStrengthSummary(total=sum(strengths), combined=combined)
+        self._strength_summary = (version, month, strength_fn, summary)
+        return summary
 
     def get_info(self) -> str:
         from src.i18n import t
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Any, Iterable
@@ -16,6 +17,7 @@ from src.classes.language import language_manager, LanguageType
 from src.i18n import t
 from src.classes.ranking import RankingManager
 from src.classes.war import SectWar, STATUS_PEACE, STATUS_WAR
+from src.utils.rng import SimRandom
 
 if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
@@ -50,8 +52,18 @@ class World():
     playthrough_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     sect_relation_modifiers: list[dict[str, Any]] = field(default_factory=list)
     sect_wars: list[dict[str, Any]] = field(default_factory=list)
+    # 世界随机源，仅在确定性模式（指定种子）下存在，见 src/utils/rng.py
+    rng: Optional[SimRandom] = None
+    # 增量自动存档日志（不参与序列化），见 src/sim/save/journal.py
+    save_journal: Any = field(default=None, init=False, repr=False)
     # 宗门上下文（惰性初始化），用于统一本局启用宗门作用域
     _sect_context: Any = field(default=None, init=False, repr=False)
+    # static_info 缓存：(世界观配置行, 语言, 历史文本, 结果)
+    _static_info_cache: Optional[tuple] = field(default=None, init=False, repr=False)
+    # 宗门势力版本：本局宗门启用状态变化时递增，见 bump_territory_version
+    territory_version: int = field(default=0, init=False, repr=False)
+    # 宗门势力快照缓存：(缓存键, SectTerritorySnapshot)，见 SectManager.get_snapshot
+    _territory_snapshot: Optional[tuple] = field(default=None, init=False, repr=False)
 
     def get_info(self, detailed: bool = False, avatar: Optional["Avatar"] = None) -> dict:
         """
@@ -74,12 +86,33 @@ class World():
 
         return world_info
 
+    def set_seed(self, seed: Optional[int]) -> None:
+        """开启（或以 None 关闭）确定性随机模式。游玩 ID 也由种子派生。"""
+        if seed is None:
+            self.rng = None
+            return
+        self.rng = SimRandom(seed)
+        self.playthrough_id = str(uuid.UUID(int=self.rng.derive("playthrough_id").getrandbits(128), version=4))
+
+    def random_scope(self):
+        """推演期间使用的随机作用域；未开启确定性模式时为空上下文。"""
+        if self.rng is None:
+            return nullcontext()
+        return self.rng.bind_global()
+
     def get_avatars_in_same_region(self, avatar: "Avatar"):
         return self.avatar_manager.get_avatars_in_same_region(avatar)
 
     def get_observable_avatars(self, avatar: "Avatar"):
         return self.avatar_manager.get_observable_avatars(avatar)
 
+    def bump_territory_version(self) -> None:
+        """
+        本局宗门启用状态变化后调用，使 SectManager.get_snapshot 的势力快照失效。
+        成员与总部的变动分别记在 Sect.member_version 与 Map.sect_regions_version 上。
+        """
+        self.territory_version += 1
+
     @property
     def sect_context(self) -> "SectContext":
         """
@@ -433,7 +466,16 @@ class World():
 
     @property
     def static_info(self) -> dict:
+        """
+        世界观与历史。结果按 (world_info 配置, 语言, 历史文本) 缓存，每次返回副本。
+        """
         info_list = game_configs.get("world_info", [])
+        lang = language_manager.current
+        text = self.history.text
+        cache = self._static_info_cache
+        if cache is not None and cache[0] is info_list and cache[1] is lang and cache[2] == text:
+            return dict(cache[3])
+
         desc = {}
         for row in info_list:
             t_val = row.get("title")
@@ -441,10 +483,11 @@ class World():
             if t_val and d_val:
                 desc[t_val] = d_val
         
-        if self.history.text:
+        if text:
             key = t("History")
-            desc[key] = self.history.text
-        return desc
+            desc[key] = text
+        self._static_info_cache = (info_list, lang, text, desc)
+        return dict(desc)
 
     @classmethod
     def create_with_db(
@@ -501,6 +544,7 @@ class SectContext:
             for sect in existed_sects
             if getattr(sect, "is_active", True)
         }
+        self._world.bump_territory_version()
 
     def mark_sect_inactive(self, sect_id: int) -> None:
         """在上下文中标记某宗门为失效。"""
@@ -508,7 +552,9 @@ class SectContext:
             sid = int(sect_id)
         except (TypeError, ValueError):
             return
-        self.active_sect_ids.discard(sid)
+        if sid in self.active_sect_ids:
+            self.active_sect_ids.discard(sid)
+            self._world.bump_territory_version()
 
     def get_active_sects(self) -> list["Sect"]:
         """
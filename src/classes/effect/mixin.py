@@ -5,13 +5,23 @@ Avatar 效果计算 Mixin
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 
 if TYPE_CHECKING:
     from src.classes.core.avatar.core import Avatar
 
 from .process import _merge_effects, _evaluate_conditional_effect
 from src.classes.hp import HP_MAX_BY_REALM
+from src.run.profiler import profile_span
+
+
+def _declares_effect(raw_effects: Any, key: str) -> bool:
+    """原始效果（dict 或条件数组）中是否出现 key。"""
+    if isinstance(raw_effects, dict):
+        return key in raw_effects
+    if isinstance(raw_effects, list):
+        return any(isinstance(item, dict) and key in item for item in raw_effects)
+    return False
 
 
 class EffectsMixin:
@@ -75,93 +85,99 @@ class EffectsMixin:
         
         # get_effect_breakdown 已经完成了条件评估(when)和动态值计算(expressions)
         # 我们只需要合并结果即可
-        for _, effect_dict in self.get_effect_breakdown():
-            merged = _merge_effects(merged, effect_dict)
+        with profile_span("effects.recompute", "effects", cpu=True):
+            for _, effect_dict in self.get_effect_breakdown():
+                merged = _merge_effects(merged, effect_dict)
 
         return merged
 
-    def get_effect_breakdown(self: "Avatar") -> list[tuple[str, dict[str, Any]]]:
+    def _iter_effect_sources(self: "Avatar") -> Iterator[tuple[Callable[[], str], Any]]:
         """
-        获取效果明细，返回 [(来源名称, 生效的效果字典), ...]
-        用于 get_desc 展示。
+        按优先级产出 (来源名称的生成函数, 原始效果)。
+        原始效果为 dict 或条件数组，尚未评估；名称按需生成，避免只取单个效果时的翻译开销。
         """
         from src.i18n import t
-        breakdown = []
-        
-        def _collect(name: str, source_obj=None, explicit_effects=None):
-            """
-            收集效果。
-            source_obj: 包含 .effects 的对象
-            explicit_effects: 直接传入的 effects (dict or list)
-            """
-            raw_effects = explicit_effects
-            if raw_effects is None and source_obj is not None:
-                raw_effects = getattr(source_obj, "effects", {})
-                
-            if not raw_effects:
-                return
-
-            # 1. 评估条件 (when)
-            evaluated = _evaluate_conditional_effect(raw_effects, self)
-            # 2. 评估动态值 (expressions)
-            evaluated = self._evaluate_values(evaluated)
-            
-            if evaluated:
-                breakdown.append((name, evaluated))
 
-        # 按照优先级或逻辑顺序收集（使用翻译）
         if self.sect:
-            label = t("Sect [{name}]", name=self.sect.name)
-            _collect(label, source_obj=self.sect)
+            sect = self.sect
+            yield (lambda: t("Sect [{name}]", name=sect.name)), getattr(sect, "effects", {})
         else:
             # 散修应用默认道统效果
             from src.classes.core.orthodoxy import get_orthodoxy
             sanxiu_orthodoxy = get_orthodoxy("sanxiu")
             if sanxiu_orthodoxy:
-                label = t("Orthodoxy [{name}]", name=t(sanxiu_orthodoxy.name))
-                _collect(label, source_obj=sanxiu_orthodoxy)
-            
+                yield (lambda: t("Orthodoxy [{name}]", name=t(sanxiu_orthodoxy.name))), getattr(sanxiu_orthodoxy, "effects", {})
+
         if self.technique:
-            label = t("Technique [{name}]", name=self.technique.name)
-            _collect(label, source_obj=self.technique)
-            
+            technique = self.technique
+            yield (lambda: t("Technique [{name}]", name=technique.name)), getattr(technique, "effects", {})
+
         if self.root:
-            _collect(t("Spirit Root"), source_obj=self.root)
-            
+            yield (lambda: t("Spirit Root")), getattr(self.root, "effects", {})
+
         for p in self.personas:
-            label = t("Trait [{name}]", name=p.name)
-            _collect(label, source_obj=p)
-            
+            yield (lambda p=p: t("Trait [{name}]", name=p.name)), getattr(p, "effects", {})
+
         if self.weapon:
-            label = t("Weapon [{name}]", name=self.weapon.name)
-            _collect(label, source_obj=self.weapon)
-            
+            weapon = self.weapon
+            yield (lambda: t("Weapon [{name}]", name=weapon.name)), getattr(weapon, "effects", {})
+
         if self.auxiliary:
-            label = t("Auxiliary [{name}]", name=self.auxiliary.name)
-            _collect(label, source_obj=self.auxiliary)
-            
+            auxiliary = self.auxiliary
+            yield (lambda: t("Auxiliary [{name}]", name=auxiliary.name)), getattr(auxiliary, "effects", {})
+
         if self.spirit_animal:
-            label = t("Spirit Animal [{name}]", name=self.spirit_animal.name)
-            _collect(label, source_obj=self.spirit_animal)
-            
+            spirit_animal = self.spirit_animal
+            yield (lambda: t("Spirit Animal [{name}]", name=spirit_animal.name)), getattr(spirit_animal, "effects", {})
+
         if self.world.current_phenomenon:
-            _collect(t("Heaven and Earth Phenomenon"), source_obj=self.world.current_phenomenon)
+            yield (lambda: t("Heaven and Earth Phenomenon")), getattr(self.world.current_phenomenon, "effects", {})
 
         for consumed in self.elixirs:
             # 使用 get_active_effects 获取当前生效的效果
             active = consumed.get_active_effects(int(self.world.month_stamp))
-            label = t("Elixir [{name}]", name=consumed.elixir.name)
-            _collect(label, explicit_effects=active)
+            yield (lambda consumed=consumed: t("Elixir [{name}]", name=consumed.elixir.name)), active
 
         # 处理临时效果（如闭关获得的短期加成）
         for temp_eff in self.get_active_temporary_effects():
             # 来源显示，支持翻译
             source_key = temp_eff.get("source", "Unknown")
-            label = t(source_key)
-            _collect(label, explicit_effects=temp_eff.get("effects", {}))
+            yield (lambda source_key=source_key: t(source_key)), temp_eff.get("effects", {})
+
+    def _evaluate_effect_source(self: "Avatar", raw_effects: Any) -> dict[str, Any]:
+        # 1. 评估条件 (when)
+        evaluated = _evaluate_conditional_effect(raw_effects, self)
+        # 2. 评估动态值 (expressions)
+        return self._evaluate_values(evaluated)
 
+    def get_effect_breakdown(self: "Avatar") -> list[tuple[str, dict[str, Any]]]:
+        """
+        获取效果明细，返回 [(来源名称, 生效的效果字典), ...]
+        用于 get_desc 展示。
+        """
+        breakdown = []
+        for label, raw_effects in self._iter_effect_sources():
+            if not raw_effects:
+                continue
+            evaluated = self._evaluate_effect_source(raw_effects)
+            if evaluated:
+                breakdown.append((label(), evaluated))
         return breakdown
 
+    def get_effect(self: "Avatar", key: str, default: Any = None) -> Any:
+        """
+        单个效果的合并值，与 self.effects.get(key, default) 一致。
+        只评估声明了该 key 的来源，适合每月高频读取单个效果（如感知半径）。
+        """
+        merged: dict[str, object] = {}
+        for _, raw_effects in self._iter_effect_sources():
+            if not _declares_effect(raw_effects, key):
+                continue
+            evaluated = self._evaluate_effect_source(raw_effects)
+            if key in evaluated:
+                merged = _merge_effects(merged, {key: evaluated[key]})
+        return merged.get(key, default)
+
     def recalc_effects(self: "Avatar") -> None:
         """
         重新计算所有长期效果
@@ -171,6 +187,8 @@ class EffectsMixin:
         - HP 最大值
         - 寿命最大值
         """
+        # HP / 寿命上限是原地修改，标记存档脏
+        self.mark_save_dirty()
         # 计算基础最大值（基于境界）
         base_max_hp = HP_MAX_BY_REALM.get(self.cultivation_progress.realm, 100)
         
@@ -207,6 +225,7 @@ class EffectsMixin:
             
             recover_amount = int(base_recover * recovery_rate_multiplier)
             self.hp.recover(recover_amount)
+            self.mark_save_dirty()
 
     @property
     def move_step_length(self: "Avatar") -> int:
@@ -1,18 +1,66 @@
+from array import array
 from typing import TYPE_CHECKING, Optional
 
 from src.classes.environment.tile import Tile, TileType
+from src.classes.environment.tile_grid import TileGrid
+from src.classes.environment.pathfinding import PathFinder
 from src.classes.environment.sect_region import SectRegion
+from src.classes.travel import travel_months_from
 
 if TYPE_CHECKING:
     from src.classes.environment.region import Region
 
 
+# region_travel_months 缓存的位置/步长组合上限
+_TRAVEL_CACHE_SIZE = 4096
+
+
+class RegionTable(dict):
+    """
+    区域字典：每次新增、替换或删除区域时递增 version，
+    供按区域缓存的索引（中心表、到达月数、洞府主人等）判断失效。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+
 class Map():
     """
-    通过dict记录position 到 tile。
+    通过 TileGrid 记录 position 到 tile：对外仍是 (x, y) -> Tile 的映射，内部为稠密图层。
     """
     def __init__(self, width: int, height: int):
-        self.tiles = {}
+        self.tiles = TileGrid(width, height)
         self.width = width
         self.height = height
         # 维护“最终归属”的每个 region 的坐标集合（由分配流程写入）
@@ -21,17 +69,72 @@ class Map():
         
         # 区域字典，由外部加载器 (load_map.py) 填充
         # 只维护 regions[id] 作为唯一的 source of truth，按名称查找通过遍历实现
-        self.regions = {}
+        self.regions = RegionTable()
         self.sect_regions = {}
+        # 宗门总部版本：update_sect_regions 时递增，SectManager.get_snapshot 据此判断总部是否变动
+        self.sect_regions_version = 0
         
         # 分类字典（暂未使用，保留以备兼容）
         self.normal_regions = {}
         self.cultivate_regions = {}
         self.city_regions = {}
 
+        # get_info 用的按类别分组的区域表（惰性构建），见 _get_region_groups
+        self._region_groups: Optional[tuple] = None
+        # 感知缓存：(x, y, radius) -> (区域 id 集合, 其中的修炼区域)，区域图层变化时清空
+        self._observed_regions: dict[tuple[int, int, int], tuple] = {}
+        self._observed_version = -1
+        # 区域中心索引、到达月数表与每格最近区域表，见 _get_region_index
+        self._region_index: Optional[dict] = None
+        # 洞府主人索引：(regions 版本, {avatar_id: 占据的洞府数})，由 CultivateRegion.host_avatar 的写入维护
+        self._host_index: Optional[tuple] = None
+        # 地形感知寻路：按目的地区域缓存的流场
+        self.pathfinder = PathFinder(self)
+
+    @property
+    def regions(self) -> RegionTable:
+        return self._regions
+
+    @regions.setter
+    def regions(self, value: dict) -> None:
+        # 整体替换时同样包装成 RegionTable，并保证版本号前进
+        old = getattr(self, "_regions", None)
+        table = value if isinstance(value, RegionTable) else RegionTable(value)
+        if old is not None:
+            table.version = max(table.version, old.version + 1)
+        self._regions = table
+
+    @property
+    def region_version(self) -> tuple[int, int]:
+        """区域版本：regions 增删/替换或区域图层（区域坐标）写入时变化。"""
+        return (self._regions.version, self.tiles.region_version)
+
     def update_sect_regions(self) -> None:
         """根据当前 self.regions 动态刷新宗门总部区域字典。"""
         self.sect_regions = {rid: r for rid, r in self.regions.items() if isinstance(r, SectRegion)}
+        self._region_groups = None
+        # 宗门总部可能变动，势力快照需重算
+        self.sect_regions_version += 1
+
+    def _get_region_groups(self) -> tuple:
+        """
+        按 get_info 的四个类别分组的区域表 [(region_id, region), ...]，
+        保持 regions 的插入顺序。随 region_version 失效。
+        """
+        version = self.region_version
+        groups = self._region_groups
+        if groups is not None and groups[0] == version:
+            return groups[1]
+
+        from src.classes.environment.region import NormalRegion, CultivateRegion, CityRegion
+        classes = (CultivateRegion, NormalRegion, CityRegion, SectRegion)
+        buckets = tuple([] for _ in classes)
+        for rid, r in self.regions.items():
+            for bucket, cls in zip(buckets, classes):
+                if isinstance(r, cls):
+                    bucket.append((rid, r))
+        self._region_groups = (version, buckets)
+        return buckets
 
     def is_in_bounds(self, x: int, y: int) -> bool:
         """
@@ -40,10 +143,10 @@ class Map():
         return 0 <= x < self.width and 0 <= y < self.height
 
     def create_tile(self, x: int, y: int, tile_type: TileType):
-        self.tiles[(x, y)] = Tile(tile_type, x, y, region=None)
+        self.tiles.create(x, y, tile_type)
 
     def get_tile(self, x: int, y: int) -> Tile:
-        return self.tiles[(x, y)]
+        return self.tiles.tile_at(x, y)
 
     def get_center_locs(self, locs: list[tuple[int, int]]) -> tuple[int, int]:
         """
@@ -74,7 +177,155 @@ class Map():
         """
         获取一个region。
         """
-        return self.tiles[(x, y)].region
+        return self.tiles.region_at(x, y)
+
+    def _get_region_index(self) -> dict:
+        """
+        区域索引（随 region_version 变化重建）：
+        - ids / centers：区域 id 列表及各区域中心
+        - travel：{(x, y, 步长): {区域 id: 到达月数}}（惰性计算，见 region_travel_months）
+        - nearest：{区域类型: 每格最近区域 id 表}（惰性计算，见 nearest_region_id）
+        """
+        version = self.region_version
+        index = self._region_index
+        if index is not None and index["version"] == version:
+            return index
+        ids = list(self.regions)
+        index = {
+            "version": version,
+            "ids": ids,
+            "centers": [self.regions[rid].center_loc for rid in ids],
+            "travel": {},
+            "nearest": {},
+        }
+        self._region_index = index
+        return index
+
+    def region_travel_months(self, x: int, y: int, step_len: int) -> dict[int, int]:
+        """
+        从 (x, y) 以 step_len 步长走到各区域中心的预计月数 {区域 id: 月数}，与 travel_months 同一公式。
+        角色多数月份原地不动，按 (x, y, step_len) 缓存，条目过多时整体清空。
+        """
+        index = self._get_region_index()
+        travel = index["travel"]
+        key = (x, y, step_len)
+        months = travel.get(key)
+        if months is None:
+            if len(travel) >= _TRAVEL_CACHE_SIZE:
+                travel.clear()
+            months = travel[key] = {
+                rid: travel_months_from((x, y), center, step_len)
+                for rid, center in zip(index["ids"], index["centers"])
+            }
+        return months
+
+    def nearest_region_id(self, x: int, y: int, region_cls: type = None) -> int:
+        """
+        距 (x, y) 中心最近（切比雪夫距离）的区域 id，可按区域类型过滤；没有候选时返回 -1。
+        距离相同时取 regions 中靠前者。每种类型的每格结果在首次查询时整表计算。
+        """
+        index = self._get_region_index()
+        table = index["nearest"].get(region_cls)
+        if table is None:
+            candidates = [
+                (rid, center) for rid, center in zip(index["ids"], index["centers"])
+                if (region_cls is None or isinstance(self.regions[rid], region_cls)) and self.is_in_bounds(*center)
+            ]
+            table = index["nearest"][region_cls] = self._build_nearest_table(candidates)
+        return table[y * self.width + x]
+
+    def _build_nearest_table(self, candidates: list) -> array:
+        """
+        以各候选中心为源做多源 BFS（八邻接，层数即切比雪夫距离），得到每格最近区域 id 表。
+        同层到达的格子取候选序号最小者：格子的最近中心必经某个上一层邻格的最近中心，因此与逐个比较的结果一致。
+        """
+        width, height = self.width, self.height
+        table = array("i", [-1]) * (width * height)
+        if not candidates:
+            return table
+        dist = array("i", [-1]) * (width * height)
+        owner = array("i", [-1]) * (width * height)
+        frontier = []
+        for i, (_, (cx, cy)) in enumerate(candidates):
+            k = cy * width + cx
+            if dist[k] == -1:
+                dist[k], owner[k] = 0, i
+                frontier.append(k)
+        layer = 0
+        while frontier:
+            layer += 1
+            next_frontier = []
+            for k in frontier:
+                y, x = divmod(k, width)
+                source = owner[k]
+                for ny in range(max(0, y - 1), min(height, y + 2)):
+                    row = ny * width
+                    for nx in range(max(0, x - 1), min(width, x + 2)):
+                        n = row + nx
+                        if dist[n] == -1:
+                            dist[n], owner[n] = layer, source
+                            next_frontier.append(n)
+                        elif dist[n] == layer and source < owner[n]:
+                            owner[n] = source
+            frontier = next_frontier
+        ids = [rid for rid, _ in candidates]
+        for k, i in enumerate(owner):
+            table[k] = ids[i]
+        return table
+
+    def get_observed_regions(self, x: int, y: int, radius: int) -> tuple[frozenset[int], tuple]:
+        """
+        位于 (x, y)、感知半径为 radius（曼哈顿距离）时可见的区域。
+        返回 (区域 id 的 frozenset, 其中的 CultivateRegion 元组)。地图区域归属是静态的，结果按参数缓存。
+        """
+        if self._observed_version != self.tiles.region_version:
+            self._observed_regions.clear()
+            self._observed_version = self.tiles.region_version
+
+        key = (x, y, radius)
+        observed = self._observed_regions.get(key)
+        if observed is None:
+            from src.classes.environment.region import CultivateRegion
+            regions = self.tiles.regions_in_diamond(x, y, radius)
+            observed = (
+                frozenset(r.id for r in regions),
+                tuple(r for r in regions if isinstance(r, CultivateRegion)),
+            )
+            self._observed_regions[key] = observed
+        return observed
+
+    def _get_host_counts(self) -> dict[str, int]:
+        version = self.regions.version
+        index = self._host_index
+        if index is not None and index[0] == version:
+            return index[1]
+
+        from src.classes.environment.region import CultivateRegion
+        counts: dict[str, int] = {}
+        for r in self.regions.values():
+            if isinstance(r, CultivateRegion):
+                r._host_listener = self
+                if r.host_avatar is not None:
+                    counts[r.host_avatar.id] = counts.get(r.host_avatar.id, 0) + 1
+        self._host_index = (version, counts)
+        return counts
+
+    def _on_host_changed(self, old, new) -> None:
+        if self._host_index is None:
+            return
+        counts = self._host_index[1]
+        if old is not None:
+            remaining = counts.get(old.id, 0) - 1
+            if remaining > 0:
+                counts[old.id] = remaining
+            else:
+                counts.pop(old.id, None)
+        if new is not None:
+            counts[new.id] = counts.get(new.id, 0) + 1
+
+    def is_region_host(self, avatar_id: str) -> bool:
+        """该角色是否占据了本图中的任一修炼区域（洞府）。"""
+        return avatar_id in self._get_host_counts()
 
     def get_info(self, detailed: bool = False, avatar: object = None) -> dict:
         """
@@ -83,33 +334,31 @@ class Map():
                1. 过滤仅返回 avatar.known_regions 中的区域
                2. 计算并在描述中追加从 avatar 当前位置到各区域的距离
         """
-        if TYPE_CHECKING:
-             from src.classes.core.avatar import Avatar
+        from src.classes.environment.region import distance_desc, distance_desc_table
+        from src.i18n import t
 
-        from src.classes.environment.region import NormalRegion, CultivateRegion, CityRegion
-        
         known_region_ids = avatar.known_regions if avatar else None
-        current_loc = (avatar.pos_x, avatar.pos_y) if avatar else None
-        
-        def filter_regions(cls):
-            return {
-                rid: r for rid, r in self.regions.items() 
-                if isinstance(r, cls) and (known_region_ids is None or rid in known_region_ids)
-            }
-
-        from src.i18n import t
+        travel = self.region_travel_months(avatar.pos_x, avatar.pos_y, avatar.move_step_length) if avatar else None
+        fragment_index = 1 if detailed else 0
+        distance_texts = distance_desc_table()
 
-        def build_regions_info(regions_dict) -> list[str]:
+        # 与 Region.get_info / get_detailed_info 拼接结果一致：缓存片段 + 距离 + 归属
+        def build_regions_info(group) -> list[str]:
             infos = []
-            step_len = avatar.move_step_length if avatar else 1
-            for r in regions_dict.values():
-                base_info = r.get_detailed_info(current_loc, step_len) if detailed else r.get_info(current_loc, step_len)
-                infos.append(base_info)
+            for rid, r in group:
+                if known_region_ids is not None and rid not in known_region_ids:
+                    continue
+                text = r._get_info_fragments()[fragment_index]
+                if travel is not None:
+                    months = travel[rid]
+                    text += distance_texts.get(months) or distance_desc(months)
+                infos.append(text + r._get_owner_desc())
             return infos
 
+        cultivate, normal, city, sect = self._get_region_groups()
         return {
-            t("Cultivate Region (can respire to increase cultivation)"): build_regions_info(filter_regions(CultivateRegion)),
-            t("Normal Region (can hunt, gather, mine)"): build_regions_info(filter_regions(NormalRegion)),
-            t("City Region (can trade)"): build_regions_info(filter_regions(CityRegion)),
-            t("Sect Headquarters (sect disciples heal faster here)"): build_regions_info(filter_regions(SectRegion)),
+            t("Cultivate Region (can respire to increase cultivation)"): build_regions_info(cultivate),
+            t("Normal Region (can hunt, gather, mine)"): build_regions_info(normal),
+            t("City Region (can trade)"): build_regions_info(city),
+            t("Sect Headquarters (sect disciples heal faster here)"): build_regions_info(sect),
         }
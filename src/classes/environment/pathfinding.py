@@ -0,0 +1,197 @@
+"""
+地形感知寻路
+
+- 每种 TileType 有一个移动消耗（进入该格时扣除的步数），见 TILE_MOVE_COSTS；
+- 对每个目标区域计算一张流场（flow field）：从区域所有格子出发做多源 Dijkstra，
+  记录每格到区域的最小消耗与下一跳。同一目的地的所有角色共用一张流场；
+- 流场按最近使用保留 FLOW_FIELD_CACHE_SIZE 张。单格地形改动时只丢弃确实受影响的流场，
+  类型图层整体替换（重新加载地图）时全部丢弃；区域坐标变动（如宗门总部迁移）时重建该区域的流场。
+
+移动规则：每月的步数预算为境界步长 move_step_length；沿流场前进，进入下一格的消耗超出剩余预算时停下，
+但每月至少前进一格，保证在高消耗地形上也能推进。
+"""
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass
+from array import array
+from typing import TYPE_CHECKING, Optional
+
+from src.classes.environment.tile import TileType
+from src.classes.environment.tile_grid import TILE_TYPES
+
+if TYPE_CHECKING:
+    from src.classes.environment.map import Map
+    from src.classes.environment.region import Region
+
+
+DEFAULT_MOVE_COST = 1
+TILE_MOVE_COSTS: dict[TileType, int] = {
+    TileType.PLAIN: 1,
+    TileType.GRASSLAND: 1,
+    TileType.FARM: 1,
+    TileType.CITY: 1,
+    TileType.SECT: 1,
+    TileType.CAVE: 1,
+    TileType.RUIN: 1,
+    TileType.ISLAND: 1,
+    TileType.GOBI: 1,
+    TileType.FOREST: 2,
+    TileType.BAMBOO: 2,
+    TileType.RAINFOREST: 2,
+    TileType.MOUNTAIN: 2,
+    TileType.DESERT: 2,
+    TileType.TUNDRA: 2,
+    TileType.SWAMP: 2,
+    TileType.MARSH: 2,
+    TileType.WATER: 2,
+    TileType.SNOW_MOUNTAIN: 3,
+    TileType.GLACIER: 3,
+    TileType.VOLCANO: 3,
+    TileType.SEA: 3,
+}
+# 按类型编码索引（编码 0 表示无地块）
+_COST_BY_CODE: tuple[int, ...] = (DEFAULT_MOVE_COST,) + tuple(
+    TILE_MOVE_COSTS.get(tile_type, DEFAULT_MOVE_COST) for tile_type in TILE_TYPES
+)
+
+FLOW_FIELD_CACHE_SIZE = 32
+_UNREACHABLE = 2 ** 31 - 1
+
+
+@dataclass(slots=True)
+class FlowField:
+    """通往某个区域的流场。dist 为到区域的最小消耗，next_hop 为下一格下标（区域内或不可达为 -1）。"""
+    region: "Region"
+    # 构建时的区域坐标快照，用于发现原地修改的 cors
+    cors: tuple
+    dist: array
+    next_hop: array
+
+
+def _cors_of(region: "Region") -> tuple:
+    return tuple(getattr(region, "cors", None) or ())
+
+
+class PathFinder:
+    def __init__(self, game_map: "Map"):
+        self.map = game_map
+        self._fields: OrderedDict[int, FlowField] = OrderedDict()
+        self._type_version = game_map.tiles.type_version
+        game_map.tiles.type_listener = self._on_tile_type_changed
+
+    def tile_cost(self, idx: int) -> int:
+        return _COST_BY_CODE[self.map.tiles.type_codes[idx]]
+
+    def flow_field(self, region: "Region") -> Optional[FlowField]:
+        """目标区域的流场；区域没有界内坐标时返回 None。"""
+        tiles = self.map.tiles
+        if self._type_version != tiles.type_version:
+            self._fields.clear()
+            self._type_version = tiles.type_version
+
+        field = self._fields.get(region.id)
+        if field is not None and field.region is region and field.cors == _cors_of(region):
+            self._fields.move_to_end(region.id)
+            return field
+
+        field = self._build(region)
+        if field is None:
+            return None
+        self._fields[region.id] = field
+        if len(self._fields) > FLOW_FIELD_CACHE_SIZE:
+            self._fields.popitem(last=False)
+        return field
+
+    def _neighbors(self, idx: int) -> list[int]:
+        width, height = self.map.width, self.map.height
+        x, y = idx % width, idx // width
+        result = []
+        if x > 0:
+            result.append(idx - 1)
+        if x < width - 1:
+            result.append(idx + 1)
+        if y > 0:
+            result.append(idx - width)
+        if y < height - 1:
+            result.append(idx + width)
+        return result
+
+    def _build(self, region: "Region") -> Optional[FlowField]:
+        width, height = self.map.width, self.map.height
+        cors = _cors_of(region)
+        sources = sorted({y * width + x for x, y in cors if 0 <= x < width and 0 <= y < height})
+        if not sources:
+            return None
+
+        size = width * height
+        dist = array("i", [_UNREACHABLE]) * size
+        next_hop = array("i", [-1]) * size
+        for idx in sources:
+            dist[idx] = 0
+        costs = _COST_BY_CODE
+        type_codes = self.map.tiles.type_codes
+
+        heap = [(0, idx) for idx in sources]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            # 从邻格 u 走进 v 的消耗为 cost(v)
+            step_cost = d + costs[type_codes[v]]
+            for u in self._neighbors(v):
+                if step_cost < dist[u]:
+                    dist[u] = step_cost
+                    next_hop[u] = v
+                    heapq.heappush(heap, (step_cost, u))
+        return FlowField(region, cors, dist, next_hop)
+
+    def _on_tile_type_changed(self, idx: int, old_code: int, new_code: int) -> None:
+        """单格地形改动：只丢弃最短路树受影响的流场。"""
+        old_cost, new_cost = _COST_BY_CODE[old_code], _COST_BY_CODE[new_code]
+        if old_cost == new_cost:
+            return
+        neighbors = self._neighbors(idx)
+        stale = []
+        for region_id, field in self._fields.items():
+            if new_cost > old_cost:
+                # 变贵：只有经过该格的最短路会变长
+                affected = any(field.next_hop[u] == idx for u in neighbors)
+            else:
+                # 变便宜：邻格改走该格更短时才需要重算
+                affected = any(field.dist[idx] + new_cost < field.dist[u] for u in neighbors)
+            if affected:
+                stale.append(region_id)
+        for region_id in stale:
+            del self._fields[region_id]
+
+    def advance(self, x: int, y: int, region: "Region", budget: int) -> Optional[tuple[int, int]]:
+        """
+        沿流场朝 region 前进一个月，返回新坐标；已在区域内时原地返回。
+        区域没有可用坐标时返回 None，由调用方退回直线移动。
+        """
+        field = self.flow_field(region)
+        if field is None:
+            return None
+
+        width = self.map.width
+        idx = y * width + x
+        spent = 0
+        while True:
+            nxt = field.next_hop[idx]
+            if nxt < 0:
+                break
+            cost = self.tile_cost(nxt)
+            if spent and spent + cost > budget:
+                break
+            spent += cost
+            idx = nxt
+            if spent >= budget:
+                break
+        return idx % width, idx // width
+
+    def is_inside(self, x: int, y: int, region: "Region") -> bool:
+        """(x, y) 是否已在 region 的坐标内（即流场终点）。"""
+        field = self.flow_field(region)
+        return field is not None and field.dist[y * self.map.width + x] == 0
@@ -1,23 +1,53 @@
 from dataclasses import dataclass, field
-from typing import Union, TypeVar, Type, Optional, TYPE_CHECKING
+from typing import Any, Union, TypeVar, Type, Optional, TYPE_CHECKING
 from enum import Enum
 from abc import ABC, abstractmethod
 
 from src.utils.df import game_configs, get_str, get_int, get_list_int
 from src.utils.config import CONFIG
-from src.utils.distance import chebyshev_distance
 from src.classes.essence import EssenceType, Essence
 from src.classes.animal import Animal, animals_by_id
 from src.classes.environment.plant import Plant, plants_by_id
 from src.classes.environment.lode import Lode, lodes_by_id
 from src.classes.core.sect import sects_by_name
 from src.classes.items.store import StoreMixin
+from src.classes.language import language_manager
+from src.classes.travel import travel_months_from
 from src.i18n import t
 
 if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
 
 
+# 区域描述片段的全局版本号：区域之外的对象（物品、宗门等）被改名时递增，使所有片段缓存失效
+_info_version = 0
+# 距离后缀缓存：语言 -> {月数: 文本}
+_distance_desc_cache: dict = {}
+
+
+def invalidate_region_info() -> None:
+    """使所有区域的描述片段缓存失效（历史修改了区域引用的物品、宗门等名字后调用）。"""
+    global _info_version
+    _info_version += 1
+    _distance_desc_cache.clear()
+
+
+def distance_desc_table() -> dict[int, str]:
+    """当前语言的距离后缀表（月数 -> ' (Distance: N months)'），按需填充。"""
+    lang = language_manager.current
+    table = _distance_desc_cache.get(lang)
+    if table is None:
+        table = _distance_desc_cache[lang] = {}
+    return table
+
+
+def distance_desc(months: int) -> str:
+    table = distance_desc_table()
+    text = table.get(months)
+    if text is None:
+        text = table[months] = t(" (Distance: {months} months)", months=months)
+    return text
+
 
 @dataclass
 class Region(ABC):
@@ -35,6 +65,9 @@ class Region(ABC):
     center_loc: tuple[int, int] = field(init=False)
     area: int = field(init=False)
 
+    # 描述片段缓存：(状态键, 简要片段, 详细片段)，见 _get_info_fragments
+    _info_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """初始化计算字段"""
         # 基于坐标点计算面积
@@ -75,21 +108,39 @@ class Region(ABC):
         """
         pass
 
+    def _get_info_state(self) -> tuple:
+        """
+        _get_desc 依赖的可变状态，参与片段缓存键。
+        子类的 _get_desc 若依赖名字/描述以外的可变字段，需要在这里体现。
+        """
+        return ()
+
+    def _get_info_fragments(self) -> tuple[str, str]:
+        """
+        返回 (简要片段, 详细片段)，不含距离与洞府主人等按调用方变化的部分。
+        按 (语言, 全局版本, 名字, 描述, 子类状态) 缓存，任一变化时重建。
+        """
+        key = (language_manager.current, _info_version, self.name, self.desc, self._get_info_state())
+        cache = self._info_cache
+        if cache is None or cache[0] != key:
+            cache = (key, self.name, f"{self.name}{self._get_desc()} - {self.desc}")
+            self._info_cache = cache
+        return cache[1], cache[2]
+
     def _get_distance_desc(self, current_loc: tuple[int, int] = None, step_len: int = 1) -> str:
         if current_loc is None:
             return ""
-        dist = chebyshev_distance(current_loc, self.center_loc)
-        # 估算到达时间：距离 / 步长 (向上取整)
-        months = (dist + step_len - 1) // step_len
-        # 避免显示 0 个月
-        months = max(1, months)
-        return t(" (Distance: {months} months)", months=months)
+        return distance_desc(travel_months_from(current_loc, self.center_loc, step_len))
+
+    def _get_owner_desc(self) -> str:
+        """追加在距离之后的归属描述（如洞府主人），随时变化，不缓存。"""
+        return ""
 
     def get_info(self, current_loc: tuple[int, int] = None, step_len: int = 1) -> str:
-        return f"{self.name}{self._get_distance_desc(current_loc, step_len)}"
+        return f"{self._get_info_fragments()[0]}{self._get_distance_desc(current_loc, step_len)}{self._get_owner_desc()}"
 
     def get_detailed_info(self, current_loc: tuple[int, int] = None, step_len: int = 1) -> str:
-        return f"{self.name}{self._get_desc()} - {self.desc}{self._get_distance_desc(current_loc, step_len)}"
+        return f"{self._get_info_fragments()[1]}{self._get_distance_desc(current_loc, step_len)}{self._get_owner_desc()}"
 
     def get_structured_info(self) -> dict:
         return {
@@ -178,8 +229,10 @@ class CultivateRegion(Region):
     sub_type: str = "cave"  # "cave" 或 "ruin"
     essence: Essence = field(init=False)
     
-    # 洞府主人：默认为空（无主）
-    host_avatar: Optional["Avatar"] = field(default=None, init=False)
+    # 洞府主人：默认为空（无主），通过 host_avatar 属性读写
+    _host_avatar: Optional["Avatar"] = field(default=None, init=False, repr=False)
+    # 主人变化时通知的地图（维护洞府主人索引），见 Map.is_region_host
+    _host_listener: Any = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
         super().__post_init__()
@@ -187,6 +240,17 @@ class CultivateRegion(Region):
         essence_density_dict[self.essence_type] = self.essence_density
         self.essence = Essence(essence_density_dict)
 
+    @property
+    def host_avatar(self) -> Optional["Avatar"]:
+        return self._host_avatar
+
+    @host_avatar.setter
+    def host_avatar(self, avatar: Optional["Avatar"]) -> None:
+        old = self._host_avatar
+        self._host_avatar = avatar
+        if self._host_listener is not None and old is not avatar:
+            self._host_listener._on_host_changed(old, avatar)
+
     def get_region_type(self) -> str:
         return "cultivate"
 
@@ -195,12 +259,6 @@ class CultivateRegion(Region):
              return t(" (Owner: {owner}, {realm})", owner=self.host_avatar.name, realm=str(self.host_avatar.cultivation_progress.realm))
         return ""
 
-    def get_info(self, current_loc: tuple[int, int] = None, step_len: int = 1) -> str:
-        return super().get_info(current_loc, step_len) + self._get_owner_desc()
-
-    def get_detailed_info(self, current_loc: tuple[int, int] = None, step_len: int = 1) -> str:
-        return super().get_detailed_info(current_loc, step_len) + self._get_owner_desc()
-
     def _get_desc(self) -> str:
         return t(" ({essence_type} Essence: {essence_density})", essence_type=self.essence_type, essence_density=self.essence_density)
 
@@ -245,6 +303,9 @@ class CityRegion(Region, StoreMixin):
     def get_region_type(self) -> str:
         return "city"
 
+    def _get_info_state(self) -> tuple:
+        return (len(self.store_items),)
+
     def _get_desc(self) -> str:
         store_info = self.get_store_info()
         if store_info:
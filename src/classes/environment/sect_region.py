@@ -29,6 +29,9 @@ class SectRegion(Region):
     def get_region_type(self) -> str:
         return "sect"
 
+    def _get_info_state(self) -> tuple:
+        return (self.sect_name,)
+
     def _get_desc(self) -> str:
         return t("sect_headquarters_desc_format", sect_name=self.sect_name)
 
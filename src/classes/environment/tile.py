@@ -1,5 +1,4 @@
 from enum import Enum
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -85,13 +84,68 @@ def get_large_tile_slices(tile_name: str) -> list[str]:
     return [f"{tile_name}_{i}" for i in range(4)]
 
 
-@dataclass
 class Tile():
-    # 实际的地块
-    type: TileType
-    x: int
-    y: int
-    region: 'Region' = None # 可以是一个region的一部分，也可以不属于任何region
+    """
+    地块。
+    地图中的 Tile 是 TileGrid 图层的轻量视图（按需创建），读写 type/region 直接落到图层；
+    也可以单独构造 Tile(type, x, y, region)，此时字段保存在对象自身，写入地图后改为该格的视图。
+    """
+    __slots__ = ("x", "y", "_grid", "_type", "_region")
+
+    def __init__(self, type: TileType, x: int, y: int, region: 'Region' = None):
+        self.x = x
+        self.y = y
+        self._grid = None
+        self._type = type
+        self._region = region # 可以是一个region的一部分，也可以不属于任何region
+
+    @classmethod
+    def _view(cls, grid, x: int, y: int) -> "Tile":
+        tile = cls.__new__(cls)
+        tile.x = x
+        tile.y = y
+        tile._grid = grid
+        tile._type = None
+        tile._region = None
+        return tile
+
+    @property
+    def type(self) -> TileType:
+        if self._grid is not None:
+            tile_type = self._grid.type_at(self.x, self.y)
+            return self._type if tile_type is None else tile_type
+        return self._type
+
+    @type.setter
+    def type(self, value: TileType) -> None:
+        if self._grid is not None:
+            self._grid.set_type(self.x, self.y, value)
+            self._type = None
+        else:
+            self._type = value
+
+    @property
+    def region(self) -> 'Region':
+        if self._grid is not None:
+            return self._grid.region_at(self.x, self.y)
+        return self._region
+
+    @region.setter
+    def region(self, value: 'Region') -> None:
+        if self._grid is not None:
+            self._grid.set_region(self.x, self.y, value)
+        else:
+            self._region = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Tile):
+            return NotImplemented
+        return (self.type, self.x, self.y, self.region) == (other.type, other.x, other.y, other.region)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Tile(type={self.type!r}, x={self.x!r}, y={self.y!r}, region={self.region!r})"
 
     @property
     def coordinate(self) -> tuple[int, int]:
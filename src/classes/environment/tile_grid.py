@@ -0,0 +1,266 @@
+"""
+稠密地块图层
+
+TileGrid 以行优先（index = y * width + x）的连续数组保存整张地图：
+- type_codes：地块类型编码（0 表示该格没有地块，其余为 TILE_TYPES 下标 + 1）
+- region_slots：区域槽位（0 表示不属于任何区域，其余为 regions 表下标）
+- influence：宗门势力 bitmask（每个宗门占一位，见 sect_bit）
+
+对外保持 dict[(x, y)] -> Tile 的映射接口，Tile 是按需创建的轻量视图，读写 type/region 直接落到图层。
+图层使用标准库 array 存储；安装了 numpy 时可通过 as_numpy 取得零拷贝的 (height, width) 视图，用于向量化查询。
+"""
+from array import array
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from src.classes.environment.tile import Tile, TileType
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+if TYPE_CHECKING:
+    from src.classes.environment.region import Region
+
+TILE_TYPES: tuple[TileType, ...] = tuple(TileType)
+TILE_TYPE_CODES: dict[TileType, int] = {tile_type: i + 1 for i, tile_type in enumerate(TILE_TYPES)}
+
+LAYERS = ("type_codes", "region_slots", "influence")
+# influence 图层为 64 位无符号整数，最多容纳 64 个宗门
+MAX_INFLUENCE_SECTS = 64
+
+
+class TileGrid(MutableMapping):
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.type_codes = array("B", bytes(size))
+        self.region_slots = array("i", bytes(4 * size))
+        self.influence = array("Q", bytes(8 * size))
+
+        # 槽位 0 固定为 None；以对象身份登记，允许同 id 的不同 Region 对象共存（测试中常见）
+        self._regions: list[Optional["Region"]] = [None]
+        self._region_slot_of: dict[int, int] = {}
+        self._sect_bits: dict[int, int] = {}
+        # 已创建的 Tile 视图（或直接赋值进来的独立 Tile）
+        self._views: list[Optional[Tile]] = [None] * size
+        self._count = 0
+        # 区域图层每次写入都会递增，供按区域归属缓存的查询判断失效
+        self.region_version = 0
+        # 类型图层整体替换时递增；单格改动通过 type_listener(idx, 旧编码, 新编码) 通知（见 pathfinding）
+        self.type_version = 0
+        self.type_listener = None
+
+    # ------------------------------------------------------------------
+    # 坐标与映射接口
+    # ------------------------------------------------------------------
+    def _index(self, key) -> int:
+        try:
+            x, y = key
+        except (TypeError, ValueError):
+            raise KeyError(key) from None
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(key)
+        return y * self.width + x
+
+    def __getitem__(self, key) -> Tile:
+        idx = self._index(key)
+        view = self._views[idx]
+        if view is None:
+            if not self.type_codes[idx]:
+                raise KeyError(key)
+            view = self._views[idx] = Tile._view(self, key[0], key[1])
+        return view
+
+    def tile_at(self, x: int, y: int) -> Tile:
+        """get_tile 的快速路径：不经过元组键。"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            idx = y * self.width + x
+            view = self._views[idx]
+            if view is not None:
+                return view
+            if self.type_codes[idx]:
+                view = self._views[idx] = Tile._view(self, x, y)
+                return view
+        raise KeyError((x, y))
+
+    def __setitem__(self, key, tile: Tile) -> None:
+        """
+        写入一个 Tile：把它当前的 type/region 写入图层。
+        独立构造的 Tile 会被改挂到本图（成为该格的视图，之后对它的修改同步到图层）；
+        其他地图或其他格的视图则换成本格的新视图。
+        """
+        idx = self._index(key)
+        self._mark_present(idx)
+        tile_type, region = tile.type, tile.region
+        # 非 TileType 的类型（只在测试里出现）无法写入图层，保留在 Tile 自身
+        self._write_type(idx, TILE_TYPE_CODES[tile_type] if isinstance(tile_type, TileType) else 0)
+        self.region_slots[idx] = self.region_slot(region)
+        self.region_version += 1
+        if tile._grid is None:
+            tile.x, tile.y = key
+            tile._grid = self
+            tile._type = None if isinstance(tile_type, TileType) else tile_type
+            tile._region = None
+            self._views[idx] = tile
+        elif tile._grid is not self or (tile.x, tile.y) != tuple(key):
+            self._views[idx] = None
+
+    def __delitem__(self, key) -> None:
+        idx = self._index(key)
+        if not self._present(idx):
+            raise KeyError(key)
+        self._write_type(idx, 0)
+        self.region_slots[idx] = 0
+        self.region_version += 1
+        self.influence[idx] = 0
+        self._views[idx] = None
+        self._count -= 1
+
+    def __contains__(self, key) -> bool:
+        try:
+            x, y = key
+        except (TypeError, ValueError):
+            return False
+        if 0 <= x < self.width and 0 <= y < self.height:
+            idx = y * self.width + x
+            return bool(self.type_codes[idx]) or self._views[idx] is not None
+        return False
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        width = self.width
+        for idx in range(width * self.height):
+            if self._present(idx):
+                yield (idx % width, idx // width)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _present(self, idx: int) -> bool:
+        return bool(self.type_codes[idx]) or self._views[idx] is not None
+
+    def _mark_present(self, idx: int) -> None:
+        if not self._present(idx):
+            self._count += 1
+
+    # ------------------------------------------------------------------
+    # 图层读写
+    # ------------------------------------------------------------------
+    def type_at(self, x: int, y: int) -> Optional[TileType]:
+        code = self.type_codes[self._index((x, y))]
+        return TILE_TYPES[code - 1] if code else None
+
+    def set_type(self, x: int, y: int, tile_type: TileType) -> None:
+        idx = self._index((x, y))
+        self._mark_present(idx)
+        self._write_type(idx, TILE_TYPE_CODES[tile_type])
+
+    def _write_type(self, idx: int, code: int) -> None:
+        old = self.type_codes[idx]
+        if old == code:
+            return
+        self.type_codes[idx] = code
+        if self.type_listener is not None:
+            self.type_listener(idx, old, code)
+
+    def create(self, x: int, y: int, tile_type: TileType) -> None:
+        """创建/重置一个地块：写入类型，清空区域归属，丢弃旧视图。"""
+        self.set_type(x, y, tile_type)
+        idx = y * self.width + x
+        self.region_slots[idx] = 0
+        self.region_version += 1
+        self._views[idx] = None
+
+    def load_type_codes(self, codes: array) -> None:
+        """整体替换类型图层（长度须为 width * height），用于从 tile_map.csv 批量加载。"""
+        if len(codes) != len(self.type_codes):
+            raise ValueError(f"expected {len(self.type_codes)} type codes, got {len(codes)}")
+        self.type_codes[:] = codes
+        self.type_version += 1
+        self._views[:] = [None] * len(codes)
+        self._count = len(codes) - self.type_codes.count(0)
+
+    def region_at(self, x: int, y: int) -> Optional["Region"]:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError((x, y))
+        return self._regions[self.region_slots[y * self.width + x]]
+
+    def set_region(self, x: int, y: int, region: Optional["Region"]) -> None:
+        self.region_slots[self._index((x, y))] = self.region_slot(region)
+        self.region_version += 1
+
+    def assign_region(self, region: "Region", cors) -> None:
+        """把 cors 中所有界内坐标归属到 region（界外坐标忽略）。"""
+        slot = self.region_slot(region)
+        width, height = self.width, self.height
+        for x, y in cors:
+            if 0 <= x < width and 0 <= y < height:
+                self.region_slots[y * width + x] = slot
+        self.region_version += 1
+
+    def regions_in_diamond(self, cx: int, cy: int, radius: int) -> set["Region"]:
+        """曼哈顿半径 radius 内（含边界）所有格子所属的区域。遍历顺序为 x 外层、y 内层。"""
+        width = self.width
+        slots = self.region_slots
+        regions = self._regions
+        found: set["Region"] = set()
+        for x in range(max(0, cx - radius), min(width - 1, cx + radius) + 1):
+            span = radius - abs(x - cx)
+            for y in range(max(0, cy - span), min(self.height - 1, cy + span) + 1):
+                slot = slots[y * width + x]
+                if slot:
+                    found.add(regions[slot])
+        return found
+
+    def region_slot(self, region: Optional["Region"]) -> int:
+        """返回 region 在区域表中的槽位，首次出现时登记。"""
+        if region is None:
+            return 0
+        slot = self._region_slot_of.get(id(region))
+        if slot is None:
+            slot = self._region_slot_of[id(region)] = len(self._regions)
+            self._regions.append(region)
+        return slot
+
+    def region_ids(self) -> array:
+        """按格展开的区域 id 图层（-1 表示无区域）。"""
+        ids = [-1] + [region.id for region in self._regions[1:]]
+        return array("i", [ids[slot] for slot in self.region_slots])
+
+    # ------------------------------------------------------------------
+    # 宗门势力
+    # ------------------------------------------------------------------
+    def sect_bit(self, sect_id: int) -> int:
+        """宗门在 influence 图层中的位（1 << n），首次出现时分配。"""
+        bit = self._sect_bits.get(sect_id)
+        if bit is None:
+            if len(self._sect_bits) >= MAX_INFLUENCE_SECTS:
+                raise ValueError(f"influence layer supports at most {MAX_INFLUENCE_SECTS} sects")
+            bit = self._sect_bits[sect_id] = 1 << len(self._sect_bits)
+        return bit
+
+    def clear_influence(self) -> None:
+        # 原地清零，保持已取得的 numpy 视图有效
+        self.influence[:] = array("Q", bytes(8 * len(self.influence)))
+
+    def add_influence(self, x: int, y: int, sect_id: int) -> None:
+        self.influence[self._index((x, y))] |= self.sect_bit(sect_id)
+
+    def influence_owners(self, x: int, y: int) -> list[int]:
+        """占据该格的宗门 id，按位从低到高（即宗门首次登记的顺序）。"""
+        mask = self.influence[self._index((x, y))]
+        return [sect_id for sect_id, bit in self._sect_bits.items() if mask & bit]
+
+    # ------------------------------------------------------------------
+    # numpy 视图
+    # ------------------------------------------------------------------
+    def as_numpy(self, layer: str):
+        """返回图层的零拷贝 numpy 视图，形状为 (height, width)。需要安装 numpy。"""
+        if np is None:
+            raise ImportError("numpy is required for TileGrid.as_numpy")
+        if layer not in LAYERS:
+            raise ValueError(f"unknown layer: {layer}")
+        data = getattr(self, layer)
+        return np.frombuffer(data, dtype=data.typecode).reshape(self.height, self.width)
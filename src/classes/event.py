@@ -3,11 +3,12 @@ event class
 """
 from dataclasses import dataclass, field
 from typing import List, Optional
-import uuid
 import time
 from datetime import datetime
 
 from src.systems.time import Month, Year, MonthStamp, get_date_str
+from src.utils.id_generator import new_uuid
+from src.utils.rng import event_time
 
 @dataclass
 class Event:
@@ -21,10 +22,14 @@ class Event:
     is_major: bool = False
     # 是否为故事事件（不进入记忆索引），默认False
     is_story: bool = False
-    # 唯一ID，用于去重
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    # 创建时间戳 (Unix timestamp float)
-    created_at: float = field(default_factory=time.time)
+    # 唯一ID，用于去重（确定性随机模式下随种子复现）
+    id: str = field(default_factory=new_uuid)
+    # 创建时间戳 (Unix timestamp float)；不传时由 event_time 生成（确定性随机模式下随月份与序号复现）
+    created_at: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.created_at is None:
+            self.created_at = event_time(self.month_stamp)
 
     def __str__(self) -> str:
         return f"{get_date_str(int(self.month_stamp))}: {self.content}"
@@ -52,7 +57,7 @@ class Event:
             related_sects=data.get("related_sects"),
             is_major=data.get("is_major", False),
             is_story=data.get("is_story", False),
-            id=data.get("id", str(uuid.uuid4())),
+            id=data["id"] if "id" in data else new_uuid(),
             created_at=data.get("created_at", time.time())
         )
 
@@ -5,13 +5,18 @@ SQLite 事件存储层。
 """
 from __future__ import annotations
 
+import functools
+import os
 import sqlite3
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 from contextlib import contextmanager
 from datetime import datetime, timezone
 
 from src.run.log import get_logger
+from src.run.metrics import sqlite_query_duration
+from src.run.profiler import profile_span
 
 if TYPE_CHECKING:
     from src.classes.event import Event
@@ -36,6 +41,56 @@ def _parse_time(ts_str: str) -> float:
     # 假设数据库存的是 UTC (naive time string from sqlite usually treated as such)
     return dt.replace(tzinfo=timezone.utc).timestamp()
 
+# 在线备份每步复制的页数；步与步之间释放锁，模拟线程可以继续写入
+BACKUP_PAGES_PER_STEP = 256
+
+
+def snapshot_database(source_path: Path, dest_path: Path, pages: int = BACKUP_PAGES_PER_STEP) -> None:
+    """
+    用 SQLite 在线备份 API 把数据库快照到 dest_path。
+
+    备份通过独立的只读连接进行，只读取已提交的数据，不会拷到写了一半的事务；
+    每步复制 pages 页后释放锁，期间主连接仍可写入（被改动时备份会自动重新开始）。
+    先写临时文件再原子替换，失败不会留下半个数据库。
+    """
+    dest_path = Path(dest_path)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_name(dest_path.name + ".tmp")
+    src_conn = sqlite3.connect(f"{Path(source_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        dst_conn = sqlite3.connect(str(tmp_path))
+        try:
+            src_conn.backup(dst_conn, pages=pages)
+        finally:
+            dst_conn.close()
+        os.replace(tmp_path, dest_path)
+    except Exception:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    finally:
+        src_conn.close()
+
+
+def _timed_query(func):
+    """记录 SQLite 操作耗时到 cws_sqlite_query_duration_seconds{op=方法名}，剖析器开启时同时记录 span。"""
+    op = func.__name__
+    span_name = f"sqlite:{op}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with profile_span(span_name, "sqlite", cpu=True):
+                return func(*args, **kwargs)
+        finally:
+            sqlite_query_duration().observe(time.perf_counter() - start, op=op)
+
+    return wrapper
+
+
 class EventStorage:
     """
     SQLite 事件存储层。
@@ -126,6 +181,7 @@ class EventStorage:
             self._conn.rollback()
             raise
 
+    @_timed_query
     def add_event(self, event: "Event") -> bool:
         """
         写入单个事件。
@@ -144,48 +200,77 @@ class EventStorage:
 
         try:
             with self._transaction():
-                # 插入事件主表。
-                self._conn.execute(
-                    """
-                    INSERT OR IGNORE INTO events (id, month_stamp, content, is_major, is_story, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        event.id,
-                        int(event.month_stamp),
-                        event.content,
-                        event.is_major,
-                        event.is_story,
-                        _format_time(event.created_at),
-                    )
-                )
-
-                # 插入关联表。
-                if event.related_avatars:
-                    for avatar_id in event.related_avatars:
-                        self._conn.execute(
-                            """
-                            INSERT OR IGNORE INTO event_avatars (event_id, avatar_id)
-                            VALUES (?, ?)
-                            """,
-                            (event.id, str(avatar_id))
-                        )
-                
-                # 插入宗门关联表。
-                if getattr(event, "related_sects", None):
-                    for sect_id in event.related_sects:
-                        self._conn.execute(
-                            """
-                            INSERT OR IGNORE INTO event_sects (event_id, sect_id)
-                            VALUES (?, ?)
-                            """,
-                            (event.id, int(sect_id))
-                        )
+                self._insert_event(event)
             return True
         except Exception as e:
             self._logger.error(f"Failed to write event {event.id}: {e}")
             return False
 
+    @_timed_query
+    def add_events(self, events: Iterable["Event"]) -> int:
+        """
+        在同一个事务中批量写入事件（读档迁移等场景，避免逐条提交）。
+
+        失败时整批回滚，记录日志并返回 0，不抛异常。
+
+        Returns:
+            写入的事件条数。
+        """
+        if self._conn is None:
+            self._logger.error("EventStorage not initialized")
+            return 0
+
+        count = 0
+        try:
+            with self._transaction():
+                for event in events:
+                    self._insert_event(event)
+                    count += 1
+            return count
+        except Exception as e:
+            self._logger.error(f"Failed to write event batch: {e}")
+            return 0
+
+    def _insert_event(self, event: "Event") -> None:
+        """写入事件及其关联表（调用方负责事务）。"""
+        # 插入事件主表。
+        self._conn.execute(
+            """
+            INSERT OR IGNORE INTO events (id, month_stamp, content, is_major, is_story, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                event.id,
+                int(event.month_stamp),
+                event.content,
+                event.is_major,
+                event.is_story,
+                _format_time(event.created_at),
+            )
+        )
+
+        # 插入关联表。
+        if event.related_avatars:
+            for avatar_id in event.related_avatars:
+                self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO event_avatars (event_id, avatar_id)
+                    VALUES (?, ?)
+                    """,
+                    (event.id, str(avatar_id))
+                )
+        
+        # 插入宗门关联表。
+        if getattr(event, "related_sects", None):
+            for sect_id in event.related_sects:
+                self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO event_sects (event_id, sect_id)
+                    VALUES (?, ?)
+                    """,
+                    (event.id, int(sect_id))
+                )
+
     def _parse_cursor(self, cursor: str) -> tuple[int, int]:
         """
         解析复合 cursor。
@@ -204,6 +289,7 @@ class EventStorage:
         """生成复合 cursor。"""
         return f"{month_stamp}_{rowid}"
 
+    @_timed_query
     def get_events(
         self,
         avatar_id: Optional[str] = None,
@@ -356,6 +442,7 @@ class EventStorage:
         events, _ = self.get_events(avatar_id_pair=(id1, id2), limit=limit)
         return list(reversed(events))  # 转为时间正序。
 
+    @_timed_query
     def get_major_events_by_avatar(self, avatar_id: str, limit: int = 10) -> list["Event"]:
         """获取角色的大事（长期记忆）。"""
         from src.classes.event import Event
@@ -408,6 +495,7 @@ class EventStorage:
             self._logger.error(f"Failed to query major events: {e}")
             return []
 
+    @_timed_query
     def get_minor_events_by_avatar(self, avatar_id: str, limit: int = 10) -> list["Event"]:
         """获取角色的小事（短期记忆，包括故事）。"""
         from src.classes.event import Event
@@ -460,6 +548,7 @@ class EventStorage:
             self._logger.error(f"Failed to query minor events: {e}")
             return []
 
+    @_timed_query
     def get_major_events_between(self, id1: str, id2: str, limit: int = 10) -> list["Event"]:
         """获取两个角色之间的大事（长期记忆）。"""
         from src.classes.event import Event
@@ -513,6 +602,7 @@ class EventStorage:
             self._logger.error(f"Failed to query major events between: {e}")
             return []
 
+    @_timed_query
     def get_minor_events_between(self, id1: str, id2: str, limit: int = 10) -> list["Event"]:
         """获取两个角色之间的小事（短期记忆）。"""
         from src.classes.event import Event
@@ -571,6 +661,60 @@ class EventStorage:
         events, _ = self.get_events(limit=limit)
         return list(reversed(events))  # 时间正序。
 
+    @_timed_query
+    def backup_to(self, dest_path: Path, pages: int = BACKUP_PAGES_PER_STEP) -> None:
+        """把当前数据库快照到 dest_path（在线备份，见 snapshot_database）。"""
+        snapshot_database(self._db_path, dest_path, pages=pages)
+
+    def last_rowid(self) -> int:
+        """当前最大的 rowid（增量存档据此记录检查点位置）。"""
+        if self._conn is None:
+            return 0
+        try:
+            row = self._conn.execute("SELECT MAX(rowid) FROM events").fetchone()
+            return int(row[0] or 0) if row else 0
+        except Exception:
+            return 0
+
+    @_timed_query
+    def get_events_since(self, rowid: int) -> list["Event"]:
+        """按写入顺序获取 rowid 之后新增的事件（供增量存档使用）。"""
+        from src.classes.event import Event
+        from src.systems.time import MonthStamp
+
+        if self._conn is None:
+            return []
+
+        try:
+            rows = self._conn.execute(
+                "SELECT rowid, id, month_stamp, content, is_major, is_story, created_at "
+                "FROM events WHERE rowid > ? ORDER BY rowid",
+                (int(rowid),),
+            ).fetchall()
+            events = []
+            for row in rows:
+                avatar_ids = [r["avatar_id"] for r in self._conn.execute(
+                    "SELECT avatar_id FROM event_avatars WHERE event_id = ?", (row["id"],)
+                ).fetchall()]
+                sect_ids = [r["sect_id"] for r in self._conn.execute(
+                    "SELECT sect_id FROM event_sects WHERE event_id = ?", (row["id"],)
+                ).fetchall()]
+                events.append(Event(
+                    month_stamp=MonthStamp(row["month_stamp"]),
+                    content=row["content"],
+                    related_avatars=avatar_ids or None,
+                    related_sects=sect_ids or None,
+                    is_major=bool(row["is_major"]),
+                    is_story=bool(row["is_story"]),
+                    id=row["id"],
+                    created_at=_parse_time(row["created_at"]),
+                ))
+            return events
+        except Exception as e:
+            self._logger.error(f"Failed to query events since rowid {rowid}: {e}")
+            return []
+
+    @_timed_query
     def cleanup(self, keep_major: bool = True, before_month_stamp: Optional[int] = None) -> int:
         """
         清理事件。
@@ -616,6 +760,7 @@ class EventStorage:
             self._logger.error(f"Failed to cleanup events: {e}")
             return 0
 
+    @_timed_query
     def count(self) -> int:
         """获取事件总数。"""
         if self._conn is None:
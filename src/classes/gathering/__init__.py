@@ -1,5 +1,26 @@
-from .gathering import Gathering, GatheringManager
-from .auction import Auction
-from .hidden_domain import HiddenDomain
-from .sect_teaching import SectTeachingConference
-from .tournament import Tournament
+"""
+聚会（Gathering）包。
+
+导入本包不会加载具体聚会模块；GatheringManager 首次实例化时才导入并注册内置聚会
+（见 gathering.load_builtin_gatherings）。
+"""
+import importlib
+
+_EXPORTS = {
+    "Gathering": "gathering",
+    "GatheringManager": "gathering",
+    "Auction": "auction",
+    "HiddenDomain": "hidden_domain",
+    "SectTeachingConference": "sect_teaching",
+    "Tournament": "tournament",
+}
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
+
+
+__all__ = list(_EXPORTS)
@@ -1,3 +1,4 @@
+import importlib
 from abc import ABC, abstractmethod
 from typing import List, Type, TYPE_CHECKING
 
@@ -72,10 +73,26 @@ def register_gathering(cls: Type[Gathering]):
     GATHERING_REGISTRY.append(cls)
     return cls
 
+# 内置聚会模块，顺序即每月检查与执行的顺序
+BUILTIN_GATHERING_MODULES = ("auction", "hidden_domain", "sect_teaching", "tournament")
+
+
+def load_builtin_gatherings() -> List[Type[Gathering]]:
+    """
+    导入内置聚会模块（完成注册），返回按规范顺序排列的注册表：
+    内置聚会按 BUILTIN_GATHERING_MODULES 排在前，其余按注册先后。
+    """
+    modules = [f"{__package__}.{name}" for name in BUILTIN_GATHERING_MODULES]
+    for module_name in modules:
+        importlib.import_module(module_name)
+    order = {module_name: i for i, module_name in enumerate(modules)}
+    return sorted(GATHERING_REGISTRY, key=lambda cls: order.get(cls.__module__, len(order)))
+
+
 class GatheringManager:
     def __init__(self):
         # 实例化所有注册的 Gathering
-        self.gatherings: List[Gathering] = [cls() for cls in GATHERING_REGISTRY]
+        self.gatherings: List[Gathering] = [cls() for cls in load_builtin_gatherings()]
 
     async def check_and_run_all(self, world: "World") -> List[Event]:
         """
@@ -108,6 +108,7 @@ class SectTeachingConference(Gathering):
             student_exp = self._calc_student_exp(student, teacher)
             if student.cultivation_progress.can_cultivate():
                 student.cultivation_progress.add_exp(student_exp)
+                student.mark_save_dirty()
                 exp_gains.append((student, student_exp))
             
             # 判定顿悟（习得功法）
@@ -259,6 +259,11 @@ class HistoryManager:
             obj.desc = val
             recorded_changes["desc"] = val
 
+        if recorded_changes:
+            # 区域描述片段引用了物品、宗门等名字，改名后需要重建
+            from src.classes.environment.region import invalidate_region_info
+            invalidate_region_info()
+
         # 记录差分到 World
         if category and id_str and recorded_changes and self.world:
             self.world.record_modification(category, id_str, recorded_changes)
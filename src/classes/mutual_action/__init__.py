@@ -33,16 +33,20 @@ __all__ = [
 ]
 
 # 注册 mutual actions（均为实际动作）
-register_action(actual=True)(DriveAway)
-register_action(actual=True)(MutualAttack)
-register_action(actual=True)(Conversation)
-register_action(actual=True)(DualCultivation)
-register_action(actual=True)(Talk)
-register_action(actual=True)(Impart)
-register_action(actual=True)(Gift)
-register_action(actual=True)(Spar)
-register_action(actual=True)(Occupy)
-register_action(actual=True)(TeaParty)
-register_action(actual=True)(Chess)
-register_action(actual=True)(Confess)
-register_action(actual=True)(SwearBrotherhood)
+def register_mutual_actions() -> None:
+    register_action(actual=True)(DriveAway)
+    register_action(actual=True)(MutualAttack)
+    register_action(actual=True)(Conversation)
+    register_action(actual=True)(DualCultivation)
+    register_action(actual=True)(Talk)
+    register_action(actual=True)(Impart)
+    register_action(actual=True)(Gift)
+    register_action(actual=True)(Spar)
+    register_action(actual=True)(Occupy)
+    register_action(actual=True)(TeaParty)
+    register_action(actual=True)(Chess)
+    register_action(actual=True)(Confess)
+    register_action(actual=True)(SwearBrotherhood)
+
+
+register_mutual_actions()
@@ -90,6 +90,7 @@ class DualCultivation(MutualAction):
         extra = int(extra_raw or 0)
         exp_gain += extra
         initiator.cultivation_progress.add_exp(exp_gain)
+        initiator.mark_save_dirty()
         self._dual_exp_gain = exp_gain
 
     async def finish(self, target_avatar: "Avatar|str") -> list[Event]:
@@ -111,6 +111,7 @@ class Impart(MutualAction):
         # 总经验 = 100 * 5 * 4 = 2000
         exp_gain = 100 * 5 * 4
         target.cultivation_progress.add_exp(exp_gain)
+        target.mark_save_dirty()
         self._impart_exp_gain = exp_gain
 
     async def finish(self, target_avatar: "Avatar|str") -> list[Event]:
@@ -29,7 +29,8 @@ def get_avatar_observation_radius(avatar: "Avatar") -> int:
     获取角色的感知半径。
     """
     base = get_observation_radius_by_realm(avatar.cultivation_progress.realm)
-    extra_raw = avatar.effects.get("extra_observation_radius", 0)
+    # 只评估声明了该效果的来源，不触发完整的 effects 合并
+    extra_raw = avatar.get_effect("extra_observation_radius", 0)
     extra = int(extra_raw or 0)
     return max(1, base + extra)
 
@@ -47,11 +48,12 @@ def get_observable_avatars(initiator: "Avatar", avatars: Iterable["Avatar"]) ->
     从给定集合中过滤出处于 initiator 交互范围内的角色（不包含 initiator 本人）。
     算法：线性扫描 O(N)，与现有管理器遍历复杂度一致。
     """
+    radius = get_avatar_observation_radius(initiator)
     result: list["Avatar"] = []
     for v in avatars:
         if v is initiator:
             continue
-        if is_within_observation(initiator, v):
+        if get_avatar_distance(initiator, v) <= radius:
             result.append(v)
     return result
 
@@ -1,12 +1,44 @@
+import heapq
 from dataclasses import dataclass, field
+from operator import itemgetter
 from typing import List, Dict, Any, TYPE_CHECKING, Optional
 from src.systems.cultivation import Realm
 from src.systems.battle import get_base_strength
+from src.utils.config import CONFIG
 
 if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
     from src.classes.core.world import World
 
+# 境界 -> 榜单字段名
+_REALM_BOARDS = {
+    Realm.Nascent_Soul: "heaven_ranking",
+    Realm.Core_Formation: "earth_ranking",
+    Realm.Foundation_Establishment: "human_ranking",
+}
+_BOARD_FIELDS = {
+    "heaven": "heaven_ranking",
+    "earth": "earth_ranking",
+    "human": "human_ranking",
+    "sect": "sect_ranking",
+}
+
+
+def _ranking_conf(key: str, default: int) -> int:
+    conf = getattr(CONFIG, "ranking", None)
+    return max(1, int(getattr(conf, key, default))) if conf else default
+
+
+def get_ranking_top_k() -> int:
+    """每个榜单保留的条目数。"""
+    return _ranking_conf("top_k", 20)
+
+
+def get_ranking_display_size() -> int:
+    """默认返回与“上榜”判定使用的条目数（不超过 top_k）。"""
+    return min(_ranking_conf("display_size", 5), get_ranking_top_k())
+
+
 @dataclass
 class RankingManager:
     heaven_ranking: List[Dict[str, Any]] = field(default_factory=list)
@@ -21,20 +53,17 @@ class RankingManager:
     })
 
     def update_rankings(self, living_avatars: List["Avatar"]) -> None:
-        heaven = []
-        earth = []
-        human = []
-        
+        """
+        按境界分榜，每榜只保留战力最高的 top_k 人。
+        每人的战力只评估一次，用 heapq.nlargest 选取（O(N log K)），与稳定排序后截断的结果一致。
+        """
+        buckets: Dict[str, list] = {name: [] for name in _REALM_BOARDS.values()}
         for avatar in living_avatars:
-            realm = avatar.cultivation_progress.realm
-            if realm == Realm.Nascent_Soul:
-                heaven.append(avatar)
-            elif realm == Realm.Core_Formation:
-                earth.append(avatar)
-            elif realm == Realm.Foundation_Establishment:
-                human.append(avatar)
-                
-        def get_avatar_info(avatar: "Avatar") -> dict:
+            board = _REALM_BOARDS.get(avatar.cultivation_progress.realm)
+            if board is not None:
+                buckets[board].append((get_base_strength(avatar), avatar))
+
+        def get_avatar_info(avatar: "Avatar", strength: float) -> dict:
             from src.i18n import t
             # Translate sect name if necessary, or just use string
             sect_name = avatar.sect.name if avatar.sect else t("Rogue Cultivator")
@@ -45,16 +74,13 @@ class RankingManager:
                 "sect": sect_name,
                 "realm": str(avatar.cultivation_progress.realm),
                 "stage": str(avatar.cultivation_progress.stage),
-                "power": int(get_base_strength(avatar))
+                "power": int(strength)
             }
-            
-        heaven.sort(key=lambda a: get_base_strength(a), reverse=True)
-        earth.sort(key=lambda a: get_base_strength(a), reverse=True)
-        human.sort(key=lambda a: get_base_strength(a), reverse=True)
-        
-        self.heaven_ranking = [get_avatar_info(a) for a in heaven[:5]]
-        self.earth_ranking = [get_avatar_info(a) for a in earth[:5]]
-        self.human_ranking = [get_avatar_info(a) for a in human[:5]]
+
+        top_k = get_ranking_top_k()
+        for board, entries in buckets.items():
+            top = heapq.nlargest(top_k, entries, key=itemgetter(0))
+            setattr(self, board, [get_avatar_info(avatar, strength) for strength, avatar in top])
         
         from src.classes.core.sect import sects_by_id
         sect_list = []
@@ -63,7 +89,6 @@ class RankingManager:
             living_members = [m for m in sect.members.values() if not m.is_dead]
             total_power = sum(get_base_strength(m) for m in living_members)
             
-            from src.i18n import t
             sect_list.append({
                 "id": sect.id,
                 "name": sect.name,
@@ -73,8 +98,7 @@ class RankingManager:
                 "total_power": int(total_power)
             })
             
-        sect_list.sort(key=lambda s: s["total_power"], reverse=True)
-        self.sect_ranking = sect_list[:5]
+        self.sect_ranking = heapq.nlargest(top_k, sect_list, key=itemgetter("total_power"))
 
     def update_rankings_with_world(self, world: "World", living_avatars: List["Avatar"]) -> None:
         """
@@ -98,9 +122,10 @@ class RankingManager:
         from src.i18n import t
 
         sect_list: List[Dict[str, Any]] = []
+        month = int(getattr(world, "month_stamp", 0))
         for sect in active_sects:
-            living_members = [m for m in sect.members.values() if not getattr(m, "is_dead", False)]
-            total_power = sum(get_base_strength(m) for m in living_members)
+            living_members = sect.get_member_stats().living_members
+            total_power = sect.get_strength_summary(get_base_strength, month).total
 
             sect_list.append(
                 {
@@ -113,28 +138,29 @@ class RankingManager:
                 }
             )
 
-        sect_list.sort(key=lambda s: s["total_power"], reverse=True)
-        self.sect_ranking = sect_list[:5]
+        self.sect_ranking = heapq.nlargest(get_ranking_top_k(), sect_list, key=itemgetter("total_power"))
 
-    def get_rankings_data(self) -> Dict[str, Any]:
-        return {
-            "heaven": self.heaven_ranking,
-            "earth": self.earth_ranking,
-            "human": self.human_ranking,
-            "sect": self.sect_ranking,
-            "tournament": self.tournament_info
+    def get_rankings_data(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        各榜单的一页（默认为前 display_size 名），直接切片已选好的榜单。
+        """
+        if limit is None:
+            limit = get_ranking_display_size()
+        offset = max(0, int(offset))
+        end = offset + max(0, int(limit))
+        data: Dict[str, Any] = {
+            key: getattr(self, board)[offset:end] for key, board in _BOARD_FIELDS.items()
         }
+        data["tournament"] = self.tournament_info
+        return data
 
     def get_avatar_rank(self, avatar_id: str) -> Optional[tuple[str, int]]:
-        for i, info in enumerate(self.heaven_ranking):
-            if info["id"] == str(avatar_id):
-                return "heaven", i + 1
-        for i, info in enumerate(self.earth_ranking):
-            if info["id"] == str(avatar_id):
-                return "earth", i + 1
-        for i, info in enumerate(self.human_ranking):
-            if info["id"] == str(avatar_id):
-                return "human", i + 1
+        """角色在天/地/人榜的名次；只有进入前 display_size 名才算上榜。"""
+        size = get_ranking_display_size()
+        for key in ("heaven", "earth", "human"):
+            for i, info in enumerate(getattr(self, _BOARD_FIELDS[key])[:size]):
+                if info["id"] == str(avatar_id):
+                    return key, i + 1
         return None
 
     def init_tournament_info(self, start_year: int, current_year: int, current_month_value: int) -> None:
@@ -0,0 +1,104 @@
+"""
+关系图索引
+
+avatar.relations（dict[Avatar, Relation]）仍是关系的唯一事实来源，存档、展示都直接读它。
+本模块在它旁边维护两份索引，使按类型查找与删除角色时的清理都是 O(度数)：
+- 类型邻接：Relation -> {对方}，按写入顺序（如 related(avatar, Relation.IS_LOVER_OF) 即道侣）
+- 反向边：relations 里有该角色的那些角色
+
+索引挂在角色自身（Avatar._relation_index / _relation_referrers），与 relations 同生同灭：
+测试里常 deepcopy 角色（连带其 world），已故角色也会按需还原，挂在节点上可以保证索引总和它索引的字典一起复制。
+
+写入 relations 应通过 add_edge / remove_edge（set_relation / clear_relation 与读档均如此）。
+整体替换 relations 字典时，类型邻接会在下次查询时按新字典重建；反向边可能残留旧的引用方，
+因此 referrers 会再确认一次对方的 relations。
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.classes.core.avatar import Avatar
+    from src.classes.relation.relation import Relation
+
+
+def _typed_index(avatar: "Avatar") -> dict["Relation", dict["Avatar", None]]:
+    """avatar 的类型邻接；relations 字典被整体替换过时按新字典重建。"""
+    relations = avatar.relations
+    cached = getattr(avatar, "_relation_index", None)
+    if isinstance(cached, tuple) and cached[0] is relations:
+        return cached[1]
+    index: dict["Relation", dict["Avatar", None]] = {}
+    for other, relation in relations.items():
+        index.setdefault(relation, {})[other] = None
+    avatar._relation_index = (relations, index)
+    return index
+
+
+def _referrers_of(avatar: "Avatar") -> dict[int, "Avatar"]:
+    referrers = getattr(avatar, "_relation_referrers", None)
+    if not isinstance(referrers, dict):
+        referrers = avatar._relation_referrers = {}
+    return referrers
+
+
+def add_edge(avatar: "Avatar", other: "Avatar", relation: "Relation") -> None:
+    """写入 avatar.relations[other] = relation（单向），同步维护索引。"""
+    index = _typed_index(avatar)
+    old = avatar.relations.get(other)
+    avatar.relations[other] = relation
+    _mark_save_dirty(avatar)
+    if old is not None and old is not relation:
+        _discard(index, old, other)
+    index.setdefault(relation, {})[other] = None
+    _referrers_of(other)[id(avatar)] = avatar
+
+
+def remove_edge(avatar: "Avatar", other: "Avatar") -> Optional["Relation"]:
+    """删除 avatar.relations[other]（单向），返回被删除的关系。"""
+    index = _typed_index(avatar)
+    old = avatar.relations.pop(other, None)
+    if old is not None:
+        _discard(index, old, other)
+        _mark_save_dirty(avatar)
+    _referrers_of(other).pop(id(avatar), None)
+    return old
+
+
+def _mark_save_dirty(avatar: "Avatar") -> None:
+    mark = getattr(avatar, "mark_save_dirty", None)
+    if mark is not None:
+        mark()
+
+
+def _discard(index: dict, relation: "Relation", other: "Avatar") -> None:
+    bucket = index.get(relation)
+    if bucket is not None:
+        bucket.pop(other, None)
+        if not bucket:
+            del index[relation]
+
+
+def related(avatar: "Avatar", relation: "Relation") -> list["Avatar"]:
+    """avatar.relations 中关系为 relation 的对方，按写入顺序。"""
+    return list(_typed_index(avatar).get(relation, ()))
+
+
+def first_related(avatar: "Avatar", relation: "Relation") -> Optional["Avatar"]:
+    for other in _typed_index(avatar).get(relation, ()):
+        return other
+    return None
+
+
+def has_related(avatar: "Avatar", relation: "Relation") -> bool:
+    return relation in _typed_index(avatar)
+
+
+def referrers(avatar: "Avatar") -> list["Avatar"]:
+    """relations 中含有 avatar 的角色（反向边）。"""
+    result = []
+    for other in _referrers_of(avatar).values():
+        relations = getattr(other, "relations", None)
+        if relations is not None and avatar in relations:
+            result.append(other)
+    return result
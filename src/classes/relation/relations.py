@@ -12,6 +12,7 @@ from src.classes.relation.relation import (
     is_innate, 
     CALCULATED_RELATIONS
 )
+from src.classes.relation.relation_graph import add_edge, remove_edge, related
 from src.classes.event import Event
 from src.classes.action.event_helper import EventHelper
 
@@ -19,71 +20,82 @@ if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
 
 
+# 二阶关系只由血缘与师门这几类一阶边推导
+_DERIVING_RELATIONS = frozenset({
+    Relation.IS_PARENT_OF,
+    Relation.IS_CHILD_OF,
+    Relation.IS_MASTER_OF,
+    Relation.IS_DISCIPLE_OF,
+})
+
+
 def update_second_degree_relations(avatar: "Avatar") -> None:
     """
     计算并更新角色的二阶关系缓存。
     覆盖 SIBLING, GRAND_PARENT, MARTIAL_SIBLING 等。
+    一阶边变动时由 set_relation / clear_relation 通过 refresh_second_degree_around 增量调用。
     """
     computed = {}
     
-    # 1. 预筛选一阶关键人 (中间节点)
-    relations = getattr(avatar, "relations", {})
-    
-    parents = [t for t, r in relations.items() if r == Relation.IS_PARENT_OF]
-    children = [t for t, r in relations.items() if r == Relation.IS_CHILD_OF]
-    masters = [t for t, r in relations.items() if r == Relation.IS_MASTER_OF]
-    apprentices = [t for t, r in relations.items() if r == Relation.IS_DISCIPLE_OF]
+    # 1. 一阶关键人 (中间节点)，直接取关系图的类型邻接
+    parents = related(avatar, Relation.IS_PARENT_OF)
+    children = related(avatar, Relation.IS_CHILD_OF)
+    masters = related(avatar, Relation.IS_MASTER_OF)
+    apprentices = related(avatar, Relation.IS_DISCIPLE_OF)
 
     # 2. 血缘推导
     # Sibling: 父母的子女 (排除自己)
     for p in parents:
-        # 注意：这里需要访问 parent 的 relations
-        # 如果 parent 是死者或者未完全加载，需要确保其 relations 可用
-        p_relations = getattr(p, "relations", {})
-        for sib, r in p_relations.items():
-            if r == Relation.IS_CHILD_OF and sib.id != avatar.id:
+        for sib in related(p, Relation.IS_CHILD_OF):
+            if sib.id != avatar.id:
                 computed[sib] = Relation.IS_SIBLING_OF
                 
     # Grandparent: 父母的父母
     for p in parents:
-        p_relations = getattr(p, "relations", {})
-        for gp, r in p_relations.items():
-            if r == Relation.IS_PARENT_OF:
-                computed[gp] = Relation.IS_GRAND_PARENT_OF
+        for gp in related(p, Relation.IS_PARENT_OF):
+            computed[gp] = Relation.IS_GRAND_PARENT_OF
 
     # Grandchild: 子女的子女
     for c in children:
-        c_relations = getattr(c, "relations", {})
-        for gc, r in c_relations.items():
-            if r == Relation.IS_CHILD_OF:
-                computed[gc] = Relation.IS_GRAND_CHILD_OF
+        for gc in related(c, Relation.IS_CHILD_OF):
+            computed[gc] = Relation.IS_GRAND_CHILD_OF
 
     # 3. 师门推导
     # Martial Sibling: 师傅的徒弟 (排除自己)
     for m in masters:
-        m_relations = getattr(m, "relations", {})
-        for fellow, r in m_relations.items():
-            if r == Relation.IS_DISCIPLE_OF and fellow.id != avatar.id:
+        for fellow in related(m, Relation.IS_DISCIPLE_OF):
+            if fellow.id != avatar.id:
                 computed[fellow] = Relation.IS_MARTIAL_SIBLING_OF
                 
     # Martial Grandmaster: 师傅的师傅
     for m in masters:
-        m_relations = getattr(m, "relations", {})
-        for mgm, r in m_relations.items():
-            if r == Relation.IS_MASTER_OF:
-                computed[mgm] = Relation.IS_MARTIAL_GRANDMASTER_OF
+        for mgm in related(m, Relation.IS_MASTER_OF):
+            computed[mgm] = Relation.IS_MARTIAL_GRANDMASTER_OF
 
     # Martial Grandchild: 徒弟的徒弟
     for app in apprentices:
-        app_relations = getattr(app, "relations", {})
-        for mgc, r in app_relations.items():
-            if r == Relation.IS_DISCIPLE_OF:
-                computed[mgc] = Relation.IS_MARTIAL_GRANDCHILD_OF
+        for mgc in related(app, Relation.IS_DISCIPLE_OF):
+            computed[mgc] = Relation.IS_MARTIAL_GRANDCHILD_OF
 
     # 4. 更新缓存
     avatar.computed_relations = computed
 
 
+def refresh_second_degree_around(*avatars: "Avatar") -> None:
+    """
+    血缘/师门边变动后，重算受影响角色的二阶关系。
+    二阶关系只看两跳内的血缘/师门边，所以受影响的只有边的端点及其血缘/师门邻居。
+    """
+    affected: dict[int, "Avatar"] = {}
+    for avatar in avatars:
+        affected[id(avatar)] = avatar
+        for relation in _DERIVING_RELATIONS:
+            for other in related(avatar, relation):
+                affected[id(other)] = other
+    for avatar in affected.values():
+        update_second_degree_relations(avatar)
+
+
 def get_possible_new_relations(from_avatar: "Avatar", to_avatar: "Avatar") -> List[Relation]:
     """
     评估"to_avatar 相对于 from_avatar"可能新增的后天关系集合（方向性明确）。
@@ -134,6 +146,14 @@ def get_possible_new_relations(from_avatar: "Avatar", to_avatar: "Avatar") -> Li
     return candidates
 
 
+def _mark_save_dirty(*avatars: "Avatar") -> None:
+    """关系写在双方的存档数据里，变动时通知增量存档（对方可能已故）。"""
+    for avatar in avatars:
+        manager = getattr(getattr(avatar, "world", None), "avatar_manager", None)
+        if manager is not None:
+            manager.mark_save_dirty(avatar.id)
+
+
 def set_relation(from_avatar: "Avatar", to_avatar: "Avatar", relation: Relation) -> None:
     """
     设置 from_avatar 对 to_avatar 的关系。
@@ -142,9 +162,13 @@ def set_relation(from_avatar: "Avatar", to_avatar: "Avatar", relation: Relation)
     """
     if to_avatar is from_avatar:
         return
-    from_avatar.relations[to_avatar] = relation
+    old = from_avatar.relations.get(to_avatar)
+    add_edge(from_avatar, to_avatar, relation)
     # 写入对方的对偶关系（对称关系会得到同一枚举值）
-    to_avatar.relations[from_avatar] = get_reciprocal(relation)
+    add_edge(to_avatar, from_avatar, get_reciprocal(relation))
+    _mark_save_dirty(from_avatar, to_avatar)
+    if relation in _DERIVING_RELATIONS or old in _DERIVING_RELATIONS:
+        refresh_second_degree_around(from_avatar, to_avatar)
     
     # [新增] 如果是道侣关系，记录开始时间
     if relation == Relation.IS_LOVER_OF:
@@ -178,8 +202,11 @@ def clear_relation(from_avatar: "Avatar", to_avatar: "Avatar") -> None:
     """
     清除 from_avatar 和 to_avatar 之间的关系（双向清除）。
     """
-    from_avatar.relations.pop(to_avatar, None)
-    to_avatar.relations.pop(from_avatar, None)
+    old = remove_edge(from_avatar, to_avatar)
+    old_reciprocal = remove_edge(to_avatar, from_avatar)
+    _mark_save_dirty(from_avatar, to_avatar)
+    if old in _DERIVING_RELATIONS or old_reciprocal in _DERIVING_RELATIONS:
+        refresh_second_degree_around(from_avatar, to_avatar)
 
     # [新增] 清理时间记录
     from_avatar.relation_start_dates.pop(to_avatar.id, None)
@@ -172,6 +172,7 @@ def check_and_promote_sect_rank(avatar: "Avatar", old_realm: "Realm", new_realm:
     
     # 执行晋升
     avatar.sect_rank = new_rank
+    avatar.sect.on_member_rank_changed(avatar)
 
 
 def sect_has_patriarch(avatar: "Avatar") -> bool:
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.classes.core.avatar import Avatar
+    from src.classes.environment.region import Region
+
+
+def get_avatar_move_step(avatar: "Avatar") -> int:
+    """
+    角色每月的移动步长：境界步长 + extra_move_step 效果。
+    """
+    step = getattr(avatar, "move_step_length", 1)
+    extra = int(avatar.get_effect("extra_move_step", 0) or 0)
+    return step + extra
+
+
+def months_for_distance(distance: int, step: int) -> int:
+    """按步长估算走完 distance 所需月数（向上取整，至少 1 个月）。"""
+    step = max(1, step)
+    return max(1, (distance + step - 1) // step)
+
+
+def travel_months_from(loc: tuple[int, int], center: tuple[int, int], step: int) -> int:
+    """从 loc 走到 center 的预计月数（切比雪夫距离 / 步长）。"""
+    return months_for_distance(max(abs(loc[0] - center[0]), abs(loc[1] - center[1])), step)
+
+
+def travel_months(avatar: "Avatar", region: "Region", step: int | None = None) -> int:
+    """
+    角色从当前位置到区域中心的预计月数（切比雪夫距离）。
+    默认按境界步长估算，与 MoveToRegion 等定向移动一致（extra_move_step 只作用于自由移动 Move）。
+    地图 Prompt 里的距离见 Map.region_travel_months，按同一公式整表计算。
+    """
+    if step is None:
+        step = getattr(avatar, "move_step_length", 1)
+    return travel_months_from((avatar.pos_x, avatar.pos_y), region.center_loc, step)
@@ -31,11 +31,13 @@ class UISettingsPatch(BaseModel):
 class SimulationSettings(BaseModel):
     auto_save_enabled: bool = False
     max_auto_saves: int = 5
+    profiling_enabled: bool = False
 
 
 class SimulationSettingsPatch(BaseModel):
     auto_save_enabled: Optional[bool] = None
     max_auto_saves: Optional[int] = None
+    profiling_enabled: Optional[bool] = None
 
 
 class LLMProfile(BaseModel):
@@ -86,7 +88,8 @@ class NewGameDefaultsPatch(BaseModel):
 
 
 class RunConfig(NewGameDefaults):
-    pass
+    # 随机种子：指定后开启确定性随机模式（见 src/utils/rng.py），None 表示普通随机
+    random_seed: Optional[int] = None
 
 
 class AppSettings(BaseModel):
@@ -109,6 +109,8 @@ class SettingsService:
                 payload["simulation"]["auto_save_enabled"] = sim_patch["auto_save_enabled"]
             if sim_patch.get("max_auto_saves") is not None:
                 payload["simulation"]["max_auto_saves"] = sim_patch["max_auto_saves"]
+            if sim_patch.get("profiling_enabled") is not None:
+                payload["simulation"]["profiling_enabled"] = sim_patch["profiling_enabled"]
 
         if patch_payload.get("new_game_defaults"):
             draft_patch = patch_payload["new_game_defaults"]
@@ -87,6 +87,63 @@ def _get_translation() -> Optional[gettext.GNUTranslations]:
     return _translations.get(lang)
 
 
+_UNSET = object()
+_language_manager = None
+
+
+class _ActiveCatalog:
+    """
+    当前语言的翻译快照：把 messages 与 game_configs 两个 .mo 的 catalog 合并成一个 dict，
+    t() 只需一次字典查找。语言切换时（reload_translations 或 language_manager 当前语言变化）重建。
+    """
+
+    __slots__ = ("language", "lang", "table", "warn_missing")
+
+    def __init__(self):
+        self.language = _UNSET  # LanguageType，用身份比较检测切换
+        self.lang = ""
+        self.table: dict[str, str] = {}
+        self.warn_missing = False
+
+
+_active = _ActiveCatalog()
+# 已告警过的缺失 msgid（按语言去重）
+_warned_missing: set[tuple[str, str]] = set()
+
+
+def _catalog_of(trans) -> dict[str, str]:
+    """展开 GNUTranslations 及其 fallback 链为 {msgid: msgstr}（主 catalog 优先）。"""
+    table: dict[str, str] = {}
+    chain = []
+    while trans is not None:
+        chain.append(trans)
+        trans = getattr(trans, "_fallback", None)
+    for item in reversed(chain):
+        catalog = getattr(item, "_catalog", None) or {}
+        table.update((k, v) for k, v in catalog.items() if isinstance(k, str))
+    return table
+
+
+def _current_language():
+    global _language_manager
+    if _language_manager is None:
+        try:
+            from src.classes.language import language_manager as _language_manager
+        except ImportError:
+            return None
+    return _language_manager.current
+
+
+def _activate(language) -> _ActiveCatalog:
+    lang = language.value if language is not None else "zh-CN"
+    trans = _get_translation()
+    _active.table = _catalog_of(trans) if trans is not None else {}
+    _active.lang = lang
+    _active.warn_missing = lang != "en-US"
+    _active.language = language
+    return _active
+
+
 def t(message: str, **kwargs) -> str:
     """
     Translate a message and format with kwargs.
@@ -106,16 +163,20 @@ def t(message: str, **kwargs) -> str:
         # zh-CN: "Zhang San 战胜了 Li Si"
         # en-US: "Zhang San defeated Li Si"
     """
-    trans = _get_translation()
-    
-    if trans:
-        translated = trans.gettext(message)
-    else:
+    catalog = _active
+    language = _current_language()
+    if catalog.language is not language:
+        catalog = _activate(language)
+
+    translated = catalog.table.get(message)
+    if translated is None:
         translated = message
-    
-    # Check for missing translation if not in English
-    if _get_current_lang() != "en-US" and translated == message and message.strip():
-        logger.warning(f"[i18n] Missing translation for msgid: '{message}'")
+        # Check for missing translation if not in English (warn once per msgid)
+        if catalog.warn_missing and message.strip():
+            key = (catalog.lang, message)
+            if key not in _warned_missing:
+                _warned_missing.add(key)
+                logger.warning(f"[i18n] Missing translation for msgid: '{message}'")
     
     if kwargs:
         try:
@@ -133,6 +194,8 @@ def reload_translations() -> None:
     Call this after language changes to reload translations.
     """
     _translations.clear()
+    _active.language = _UNSET
+    _warned_missing.clear()
 
 
 __all__ = ["t", "reload_translations"]
@@ -60,11 +60,14 @@ def fix_runtime_references(world: "World"):
     logger.info("[DataLoader] 开始修复运行时引用...")
     
     # 收集所有角色（活人 + 死者）
-    # 注意：dead_avatars 可能是 dict 或 list，根据 avatar_manager 实现
-    # 查看 main.py 中 world.avatar_manager.avatars.values()，应该是 dict
+    # 未还原的死者存根只保存 id，还原时自然会拿到新对象，这里跳过
+    from src.sim.load.lazy_avatars import DeadAvatarStub
     all_avatars = list(world.avatar_manager.avatars.values())
     if hasattr(world.avatar_manager, "dead_avatars"):
-        all_avatars.extend(list(world.avatar_manager.dead_avatars.values()))
+        all_avatars.extend(
+            avatar for _, avatar in world.avatar_manager.iter_dead_records()
+            if not isinstance(avatar, DeadAvatarStub)
+        )
     
     count = 0
     fixed_sects = set()
@@ -0,0 +1,329 @@
+"""
+无界面快进模拟入口
+
+用法：
+    python -m src.run.headless --months 120
+    python -m src.run.headless --load assets/saves/xxx.json --months 600 --save-every 120
+    python -m src.run.headless --npcs 200 --months 24 --events out/events.jsonl --profile out/trace.json
+    python -m src.run.headless --llm-backend rule --months 120          # 完全离线
+    python -m src.run.headless --llm-backend record --llm-cassette out/cassette --months 12
+    python -m src.run.headless --llm-backend replay --llm-cassette out/cassette --months 12
+    PYTHONHASHSEED=0 python -m src.run.headless --llm-backend rule --seed 7 --events out/a.jsonl  # 可复现
+
+功能：
+1. 新建世界（与服务端开局流程一致，但不生成 LLM 历史背景）或读取已有存档
+2. 不 sleep、不经过 WebSocket，尽可能快地连续推进 N 个月
+3. 定期写入存档，可选把每月事件以 JSONL 形式追加到文件
+4. 每月打印耗时，结束时打印汇总；可选导出剖析器 trace
+
+主要用于：长时间稳定性测试、在玩家加入前预先推演世界、CI 中的模拟器基准测试。
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.classes.core.sect import Sect
+    from src.classes.core.world import World
+    from src.sim.simulator import Simulator
+
+
+@dataclass
+class HeadlessResult:
+    """一次无界面运行的结果汇总。"""
+    months: int = 0
+    month_durations: list[float] = field(default_factory=list)
+    event_count: int = 0
+    saves: list[Path] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.month_durations)
+
+    def summary(self) -> dict:
+        durations = self.month_durations
+        return {
+            "months": self.months,
+            "events": self.event_count,
+            "total_s": round(self.total_seconds, 3),
+            "mean_ms": round(statistics.fmean(durations) * 1e3, 3) if durations else 0.0,
+            "p50_ms": round(statistics.median(durations) * 1e3, 3) if durations else 0.0,
+            "max_ms": round(max(durations) * 1e3, 3) if durations else 0.0,
+            "saves": [str(p) for p in self.saves],
+        }
+
+
+def build_world(
+    npc_num: int,
+    sect_num: int,
+    awakening_rate: Optional[float] = None,
+    events_db_path: Optional[Path] = None,
+    seed: Optional[int] = None,
+) -> tuple["World", "Simulator", list["Sect"]]:
+    """
+    新建一个世界（对应服务端 init_game_async 的非 LLM 部分）。
+
+    Args:
+        npc_num: 初始角色数量
+        sect_num: 启用的宗门数量
+        awakening_rate: 凡人觉醒率，None 表示使用 config.yml 默认值
+        events_db_path: 事件数据库路径，None 表示放在存档目录下
+        seed: 随机种子，指定后开启世界级确定性随机模式
+    """
+    from src.classes.core.sect import sects_by_id
+    from src.classes.core.world import World
+    from src.run.data_loader import reload_all_static_data
+    from src.run.load_map import load_cultivation_world_map
+    from src.sim.avatar_init import make_avatars
+    from src.sim.load.load_game import get_events_db_path
+    from src.sim.simulator import Simulator
+    from src.systems.time import Month, Year, create_month_stamp
+    from src.utils.config import CONFIG
+
+    reload_all_static_data()
+    game_map = load_cultivation_world_map()
+
+    if events_db_path is None:
+        saves_dir = CONFIG.paths.saves
+        saves_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        events_db_path = get_events_db_path(saves_dir / f"headless_{timestamp}.json")
+
+    start_year = getattr(CONFIG.game, "start_year", 100)
+    world = World.create_with_db(
+        map=game_map,
+        month_stamp=create_month_stamp(Year(start_year), Month.JANUARY),
+        events_db_path=events_db_path,
+        start_year=start_year,
+    )
+    world.set_seed(seed)
+    sim = Simulator(world)
+    if awakening_rate is not None:
+        sim.awakening_rate = awakening_rate
+
+    existed_sects: list["Sect"] = []
+    with world.random_scope():
+        if sect_num > 0 and sects_by_id:
+            pool = list(sects_by_id.values())
+            random.shuffle(pool)
+            existed_sects = pool[:sect_num]
+
+        if npc_num > 0:
+            world.avatar_manager.avatars.update(
+                make_avatars(
+                    world,
+                    count=npc_num,
+                    current_month_stamp=world.month_stamp,
+                    existed_sects=existed_sects,
+                )
+            )
+    world.existed_sects = existed_sects
+    world.sect_context.from_existed_sects(existed_sects)
+    return world, sim, existed_sects
+
+
+def _format_month(world: "World") -> str:
+    return f"Y{world.month_stamp.get_year()}M{world.month_stamp.get_month().value}"
+
+
+async def run_headless(
+    world: "World",
+    sim: "Simulator",
+    existed_sects: list["Sect"],
+    months: int,
+    save_every: int = 0,
+    save_dir: Optional[Path] = None,
+    save_name: str = "headless",
+    events_path: Optional[Path] = None,
+    quiet: bool = False,
+) -> HeadlessResult:
+    """
+    连续推进 months 个月。
+
+    Args:
+        save_every: 每隔多少个月写一次存档（0 表示只在结束时保存）
+        save_dir: 存档目录，None 表示 config 中的存档目录
+        save_name: 存档名前缀
+        events_path: 事件 JSONL 输出路径（追加写入），None 表示不输出
+        quiet: 不打印逐月耗时
+    """
+    from src.sim.save.save_format import get_save_suffix
+    from src.sim.save.save_game import save_game
+    from src.utils.config import CONFIG
+
+    save_dir = Path(save_dir) if save_dir is not None else CONFIG.paths.saves
+    save_dir.mkdir(parents=True, exist_ok=True)
+    result = HeadlessResult()
+
+    def _save() -> None:
+        path = save_dir / f"{save_name}_{_format_month(world)}{get_save_suffix()}"
+        ok, _ = save_game(world, sim, existed_sects, save_path=path)
+        if ok:
+            result.saves.append(path)
+
+    events_file = None
+    if events_path is not None:
+        events_path = Path(events_path)
+        events_path.parent.mkdir(parents=True, exist_ok=True)
+        events_file = open(events_path, "a", encoding="utf-8")
+
+    try:
+        for i in range(1, months + 1):
+            label = _format_month(world)
+            start = time.perf_counter()
+            events = await sim.step()
+            elapsed = time.perf_counter() - start
+
+            # 无前端消费，清空变更缓冲，避免无限增长
+            world.avatar_manager.pop_newly_born()
+            world.avatar_manager.pop_newly_dead()
+
+            result.months = i
+            result.month_durations.append(elapsed)
+            result.event_count += len(events)
+
+            if events_file is not None:
+                for event in events:
+                    events_file.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+                events_file.flush()
+
+            if not quiet:
+                print(
+                    f"[Headless] {label} step={elapsed * 1e3:.1f}ms "
+                    f"events={len(events)} living={len(world.avatar_manager.avatars)} "
+                    f"dead={len(world.avatar_manager.dead_avatars)}"
+                )
+
+            if save_every > 0 and i % save_every == 0 and i != months:
+                _save()
+    finally:
+        if events_file is not None:
+            events_file.close()
+
+    _save()
+    return result
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.run.headless",
+        description="Run the simulation headlessly as fast as possible.",
+    )
+    parser.add_argument("--months", type=int, default=12, help="Number of months to simulate.")
+    parser.add_argument("--load", type=Path, default=None, help="Load this save instead of building a new world.")
+    parser.add_argument("--npcs", type=int, default=None, help="Initial NPC count for a new world.")
+    parser.add_argument("--sects", type=int, default=None, help="Active sect count for a new world.")
+    parser.add_argument("--locale", default=None, help="Content locale, e.g. zh-CN or en-US.")
+    parser.add_argument("--seed", type=int, default=None, help="Enable deterministic mode with this world seed (overrides the seed stored in a loaded save).")
+    parser.add_argument("--save-every", type=int, default=0, help="Write a save every N months (0 = only at the end).")
+    parser.add_argument("--save-dir", type=Path, default=None, help="Directory for saves (defaults to the configured saves dir).")
+    parser.add_argument("--name", default="headless", help="Save file name prefix.")
+    parser.add_argument("--events", type=Path, default=None, help="Append every event as JSONL to this file.")
+    parser.add_argument("--profile", type=Path, default=None, help="Enable the step profiler and write a Chrome trace here.")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary.")
+    parser.add_argument(
+        "--llm-backend",
+        choices=("http", "rule", "record", "replay", "stub"),
+        default=None,
+        help="LLM backend override (defaults to llm.backend in config.yml). "
+             "'stub' starts an in-process OpenAI-compatible stub server.",
+    )
+    parser.add_argument("--llm-cassette", type=Path, default=None, help="Cassette directory for record/replay.")
+    return parser
+
+
+def _configure_llm_backend(name: Optional[str], cassette: Optional[Path]):
+    """按命令行参数切换 LLM 后端；stub 模式返回需要在结束时关闭的服务。"""
+    if name is None:
+        return None
+
+    from src.utils.llm.backends import set_backend
+
+    if name == "stub":
+        from src.utils.llm.stub_server import start_stub_server
+        server = start_stub_server()
+        set_backend("stub", base_url=server.url)
+        return server
+
+    set_backend(name, directory=cassette)
+    return None
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    from src.classes.language import language_manager
+    from src.config import get_settings_service
+    from src.run.profiler import get_profiler
+    from src.utils.config import CONFIG, update_paths_for_language
+    from src.utils.df import reload_game_configs
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    stub_server = _configure_llm_backend(args.llm_backend, args.llm_cassette)
+
+    locale = args.locale or get_settings_service().get_default_run_config().content_locale
+    language_manager.set_language(locale)
+    update_paths_for_language(locale)
+    reload_game_configs()
+
+    profiler = get_profiler()
+    if args.profile is not None:
+        profiler.clear()
+        profiler.set_enabled(True)
+
+    if args.load is not None:
+        from src.sim.load.load_game import load_game
+        world, sim, existed_sects = load_game(args.load)
+        if args.seed is not None:
+            world.set_seed(args.seed)
+    else:
+        defaults = get_settings_service().get_default_run_config()
+        world, sim, existed_sects = build_world(
+            npc_num=args.npcs if args.npcs is not None else int(defaults.init_npc_num),
+            sect_num=args.sects if args.sects is not None else int(defaults.sect_num),
+            awakening_rate=float(defaults.npc_awakening_rate_per_month),
+            seed=args.seed,
+        )
+
+    try:
+        result = asyncio.run(
+            run_headless(
+                world,
+                sim,
+                existed_sects,
+                months=args.months,
+                save_every=args.save_every,
+                save_dir=args.save_dir or CONFIG.paths.saves,
+                save_name=args.name,
+                events_path=args.events,
+                quiet=args.quiet,
+            )
+        )
+    finally:
+        world.event_manager.close()
+        if stub_server is not None:
+            stub_server.stop()
+
+    if args.profile is not None:
+        args.profile.parent.mkdir(parents=True, exist_ok=True)
+        args.profile.write_text(profiler.to_chrome_trace_json(), encoding="utf-8")
+        profiler.set_enabled(False)
+
+    print(f"[Headless] Summary: {json.dumps(result.summary(), ensure_ascii=False)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
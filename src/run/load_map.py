@@ -1,7 +1,9 @@
 import os
 import csv
+from array import array
 from src.classes.environment.map import Map
 from src.classes.environment.tile import TileType
+from src.classes.environment.tile_grid import TILE_TYPE_CODES
 from src.classes.environment.region import Region, NormalRegion, CultivateRegion, CityRegion
 from src.classes.environment.sect_region import SectRegion
 from src.utils.df import game_configs, get_str, get_int
@@ -33,18 +35,16 @@ def load_cultivation_world_map() -> Map:
     
     game_map = Map(width=width, height=height)
     
-    # 2. 填充 Tile Type
+    # 2. 填充 Tile Type：直接写入类型图层
+    # 如果不是标准地形，则是宗门驻地名称，这些名称直接对应 SECT 类型
+    code_by_name = {tile_type.name.lower(): code for tile_type, code in TILE_TYPE_CODES.items()}
+    sect_code = TILE_TYPE_CODES[TileType.SECT]
+    type_codes = array("B", bytes(width * height))
     for y, row in enumerate(tile_rows):
-        for x, tile_name in enumerate(row):
-            if x < width:
-                try:
-                    t_type = TileType[tile_name.upper()]
-                except KeyError:
-                    # 如果不是标准地形，则是宗门驻地名称
-                    # 这些名称直接对应 SECT 类型
-                    t_type = TileType.SECT
-                
-                game_map.create_tile(x, y, t_type)
+        offset = y * width
+        for x, tile_name in enumerate(row[:width]):
+            type_codes[offset + x] = code_by_name.get(tile_name.lower(), sect_code)
+    game_map.tiles.load_type_codes(type_codes)
     
     # 3. 读取 Region Map 并聚合坐标
     # region_coords: { region_id: [(x, y), ...] }
@@ -137,10 +137,8 @@ def _load_and_assign_regions(game_map: Map, region_coords: dict[int, list[tuple[
                 # 写入 Map 缓存 (region_cors)
                 game_map.region_cors[rid] = cors
                 
-                # 绑定到 Tiles
-                for rx, ry in cors:
-                    if game_map.is_in_bounds(rx, ry):
-                        game_map.tiles[(rx, ry)].region = region_obj
+                # 绑定到 Tiles（写入区域图层）
+                game_map.tiles.assign_region(region_obj, cors)
                         
             except Exception as e:
                 print(f"Error creating region {rid}: {e}")
@@ -0,0 +1,393 @@
+"""
+进程内指标模块
+功能：
+1. 提供 Counter / Gauge / Histogram 三种指标，支持标签
+2. 以 Prometheus 文本格式导出（供 /api/metrics 抓取）
+3. 不依赖任何外部服务，所有数据仅保存在当前进程内存中
+
+指标会在多个线程中更新（自动保存线程、asyncio.to_thread 中的 LLM 请求等），
+因此每个指标内部都持有一把锁。
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+# 默认的耗时分桶（秒），覆盖从亚毫秒级的 SQLite 查询到分钟级的 LLM 调用。
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape_label_value(extra[1])}"')
+    if not pairs:
+        return ""
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    """指标基类：负责名称、说明与标签值的规范化。"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._render_samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """单调递增计数器。"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """可增可减的瞬时值。"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """分桶直方图，导出 _bucket / _sum / _count 三组样本。"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # key -> [各分桶计数..., sum, count]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = data
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """上下文管理器：记录代码块的耗时（秒）。"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            return data[-1] if data else 0.0
+
+    def get_sum(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            return data[-2] if data else 0.0
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(data)) for key, data in self._values.items())
+        lines: list[str] = []
+        for key, data in items:
+            for i, bound in enumerate(self.buckets):
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(data[i])}")
+            labels = _format_labels(self.labelnames, key, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {_format_value(data[-1])}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{plain} {_format_value(data[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+
+    同名指标只会创建一次，重复注册返回已有实例，
+    方便各模块在使用处就地声明而不必集中定义。
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """注册一个在导出前执行的回调，用于刷新抓取时才计算的 Gauge。"""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """按 Prometheus 文本格式（0.0.4）导出全部指标。"""
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"[Metrics] Collector failed: {e}")
+
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        body = "\n".join(metric.render() for metric in metrics)
+        return body + "\n" if body else ""
+
+
+# 全局注册表实例
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """获取全局指标注册表实例"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+# ---------------------------------------------------------------------------
+# 业务指标（集中声明名称与标签，避免各处拼写不一致）
+# ---------------------------------------------------------------------------
+
+def step_phase_duration() -> Histogram:
+    return get_metrics().histogram(
+        "cws_step_phase_duration_seconds",
+        "Wall time of each Simulator.step phase.",
+        ("phase",),
+    )
+
+
+def step_duration() -> Histogram:
+    return get_metrics().histogram(
+        "cws_step_duration_seconds",
+        "Wall time of a whole Simulator.step (one month).",
+    )
+
+
+def llm_calls() -> Counter:
+    return get_metrics().counter(
+        "cws_llm_calls_total",
+        "LLM requests by task name, mode and outcome.",
+        ("task", "mode", "status"),
+    )
+
+
+def llm_latency() -> Histogram:
+    return get_metrics().histogram(
+        "cws_llm_request_duration_seconds",
+        "LLM request latency (excluding semaphore wait).",
+        ("task", "mode"),
+    )
+
+
+def llm_parse_retries() -> Counter:
+    return get_metrics().counter(
+        "cws_llm_parse_retries_total",
+        "LLM responses that failed to parse and were retried.",
+        ("task", "mode"),
+    )
+
+
+def llm_semaphore_wait() -> Histogram:
+    return get_metrics().histogram(
+        "cws_llm_semaphore_wait_seconds",
+        "Time spent waiting for the LLM concurrency semaphore.",
+        ("mode",),
+    )
+
+
+def events_ingested() -> Counter:
+    return get_metrics().counter(
+        "cws_events_ingested_total",
+        "Events accepted by the EventManager.",
+    )
+
+
+def sqlite_query_duration() -> Histogram:
+    return get_metrics().histogram(
+        "cws_sqlite_query_duration_seconds",
+        "EventStorage SQLite operation latency.",
+        ("op",),
+    )
+
+
+def ws_connections() -> Gauge:
+    return get_metrics().gauge(
+        "cws_ws_connections",
+        "Currently connected WebSocket clients.",
+    )
+
+
+def ws_pending_broadcasts() -> Gauge:
+    return get_metrics().gauge(
+        "cws_ws_pending_broadcasts",
+        "Broadcast messages queued or being sent to WebSocket clients.",
+    )
+
+
+def ws_broadcast_duration() -> Histogram:
+    return get_metrics().histogram(
+        "cws_ws_broadcast_duration_seconds",
+        "Time to fan out one broadcast to all WebSocket clients.",
+    )
+
+
+def population() -> Gauge:
+    return get_metrics().gauge(
+        "cws_population",
+        "World population by kind (living / dead / mortal).",
+        ("kind",),
+    )
+
+
+def update_population(world) -> None:
+    """根据世界状态刷新人口相关 Gauge。"""
+    gauge = population()
+    if world is None:
+        for kind in ("living", "dead", "mortal"):
+            gauge.set(0, kind=kind)
+        return
+    gauge.set(len(world.avatar_manager.avatars), kind="living")
+    gauge.set(len(world.avatar_manager.dead_avatars), kind="dead")
+    mortal_manager = getattr(world, "mortal_manager", None)
+    gauge.set(len(mortal_manager.mortals) if mortal_manager else 0, kind="mortal")
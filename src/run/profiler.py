@@ -0,0 +1,253 @@
+"""
+步进剖析模块（可选开启）
+功能：
+1. 以嵌套 span 的形式记录 Simulator.step 各 phase、LLM 调用、SQLite 查询、效果重算的耗时
+2. 每个 span 记录墙钟时间；不含 await 的同步 span 另记 CPU 时间与阻塞时间，写入固定容量的环形缓冲区
+3. 导出为 Chrome trace-event JSON（chrome://tracing / Perfetto）或 collapsed stacks（flamegraph.pl / speedscope）
+
+关闭时 span() 直接返回共享的空上下文，开销仅为一次属性判断。
+
+说明：
+- span 的父子关系通过 ContextVar 传递，asyncio.gather 出来的子任务会继承父 span。
+- 以 cpu=True 开启的 span（同步 phase、SQLite 查询、效果重算等不会 await 的代码块）记录本线程的
+  thread_time 差值作为 CPU 时间，墙钟 - CPU 为阻塞时间（磁盘 I/O、等锁等）。
+- 跨越 await 的 span 期间，事件循环上交错执行的其它协程也会消耗本线程的 CPU，线程 CPU 时间无法区分归属，
+  因此这类 span 的 CPU / 挂起时间记为不可用（None），只有墙钟时间；需要 CPU 剖析时请配合 py-spy 等采样工具。
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+DEFAULT_CAPACITY = 50000
+
+_NULL_SPAN = nullcontext()
+
+# 当前所在 span 的调用栈（以元组保存，天然不可变，便于在协程间安全继承）
+_SPAN_STACK: ContextVar[tuple[str, ...]] = ContextVar("profiler_span_stack", default=())
+
+
+@dataclass(slots=True)
+class SpanRecord:
+    """一次已结束的 span。时间单位均为秒，start 为 perf_counter 读数。"""
+    name: str
+    category: str
+    stack: tuple[str, ...]
+    start: float
+    wall: float
+    tid: int
+    cpu: Optional[float] = None
+    args: dict = field(default_factory=dict)
+
+    @property
+    def await_time(self) -> Optional[float]:
+        """墙钟中未在本线程执行的时间；CPU 不可用时为 None。"""
+        if self.cpu is None:
+            return None
+        return max(0.0, self.wall - self.cpu)
+
+
+def _current_track_id() -> int:
+    # 同一协程内的 span 严格嵌套，不同协程之间可能重叠，
+    # 因此按 asyncio task 分轨，非协程环境退化为线程 id。
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return id(task)
+    return threading.get_ident()
+
+
+class _Span:
+    __slots__ = ("_profiler", "_name", "_category", "_args", "_cpu", "_token", "_start", "_cpu_start", "_stack")
+
+    def __init__(self, profiler: "StepProfiler", name: str, category: str, args: Optional[dict], cpu: bool):
+        self._profiler = profiler
+        self._name = name
+        self._category = category
+        self._args = args
+        self._cpu = cpu
+
+    def __enter__(self):
+        self._stack = _SPAN_STACK.get() + (self._name,)
+        self._token = _SPAN_STACK.set(self._stack)
+        self._cpu_start = time.thread_time() if self._cpu else 0.0
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._start
+        cpu = min(time.thread_time() - self._cpu_start, wall) if self._cpu else None
+        try:
+            _SPAN_STACK.reset(self._token)
+        except ValueError:
+            # 跨 context 退出（极少见），退回到手动弹栈
+            _SPAN_STACK.set(self._stack[:-1])
+        self._profiler._record(
+            SpanRecord(
+                name=self._name,
+                category=self._category,
+                stack=self._stack,
+                start=self._start,
+                wall=wall,
+                tid=_current_track_id(),
+                cpu=cpu,
+                args=self._args or {},
+            )
+        )
+        return False
+
+
+class StepProfiler:
+    """span 剖析器，持有一个环形缓冲区。"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.enabled = False
+        self._spans: deque[SpanRecord] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    @property
+    def capacity(self) -> int:
+        return self._spans.maxlen or 0
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = bool(enabled)
+
+    def set_capacity(self, capacity: int) -> None:
+        with self._lock:
+            self._spans = deque(self._spans, maxlen=max(1, int(capacity)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def span(self, name: str, category: str = "sim", args: Optional[dict] = None, cpu: bool = False):
+        """
+        开启一个 span；未启用时返回空上下文。
+
+        Args:
+            cpu: 代码块内不会 await 时传 True，额外记录 CPU 时间；跨越 await 的 span 不要开启
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args, cpu)
+
+    def _record(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._spans.append(record)
+
+    def get_spans(self) -> list[SpanRecord]:
+        with self._lock:
+            return list(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    # ------------------------------------------------------------------
+    # 导出
+    # ------------------------------------------------------------------
+
+    def to_chrome_trace(self) -> dict:
+        """导出 Chrome trace-event 格式（Complete 事件，单位微秒）。"""
+        events = []
+        for s in self.get_spans():
+            events.append({
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": round((s.start - self._origin) * 1e6, 3),
+                "dur": round(s.wall * 1e6, 3),
+                "pid": 1,
+                "tid": s.tid,
+                "args": {
+                    **s.args,
+                    "cpu_ms": None if s.cpu is None else round(s.cpu * 1e3, 3),
+                    "await_ms": None if s.cpu is None else round(s.await_time * 1e3, 3),
+                },
+            })
+        events.sort(key=lambda e: e["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_chrome_trace_json(self) -> str:
+        return json.dumps(self.to_chrome_trace(), ensure_ascii=False)
+
+    def to_collapsed_stacks(self, metric: str = "wall") -> str:
+        """
+        导出 collapsed stacks（每行 "a;b;c 数值"，数值为该栈帧的自身耗时，单位微秒）。
+
+        Args:
+            metric: "wall" 或 "cpu"（cpu 只统计记录了 CPU 时间的同步 span）
+        """
+        if metric not in ("wall", "cpu"):
+            raise ValueError(f"Unsupported metric: {metric}")
+
+        totals: dict[tuple[str, ...], float] = {}
+        children: dict[tuple[str, ...], float] = {}
+        for s in self.get_spans():
+            value = s.wall if metric == "wall" else s.cpu
+            if value is None:
+                continue
+            totals[s.stack] = totals.get(s.stack, 0.0) + value
+            if len(s.stack) > 1:
+                parent = s.stack[:-1]
+                children[parent] = children.get(parent, 0.0) + value
+
+        lines = []
+        for stack, total in sorted(totals.items()):
+            # 并发子 span 的总和可能超过父 span，自身耗时截断到 0
+            self_us = int(round(max(0.0, total - children.get(stack, 0.0)) * 1e6))
+            if self_us > 0:
+                lines.append(f"{';'.join(stack)} {self_us}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def summary(self) -> list[dict]:
+        """
+        按 span 名称聚合的统计（次数、墙钟/CPU/await 总计），按墙钟降序。
+        CPU/await 只累计记录了 CPU 时间的 span，一个都没有时为 None。
+        """
+        agg: dict[tuple[str, str], dict] = {}
+        for s in self.get_spans():
+            item = agg.setdefault((s.category, s.name), {
+                "name": s.name,
+                "category": s.category,
+                "count": 0,
+                "wall_ms": 0.0,
+                "cpu_ms": None,
+                "await_ms": None,
+            })
+            item["count"] += 1
+            item["wall_ms"] += s.wall * 1e3
+            if s.cpu is not None:
+                item["cpu_ms"] = (item["cpu_ms"] or 0.0) + s.cpu * 1e3
+                item["await_ms"] = (item["await_ms"] or 0.0) + s.await_time * 1e3
+        result = sorted(agg.values(), key=lambda x: x["wall_ms"], reverse=True)
+        for item in result:
+            for key in ("wall_ms", "cpu_ms", "await_ms"):
+                if item[key] is not None:
+                    item[key] = round(item[key], 3)
+        return result
+
+
+# 全局剖析器实例
+_profiler: Optional[StepProfiler] = None
+
+
+def get_profiler() -> StepProfiler:
+    """获取全局剖析器实例"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StepProfiler()
+    return _profiler
+
+
+def profile_span(name: str, category: str = "sim", args: Optional[dict] = None, cpu: bool = False):
+    """便捷函数：在全局剖析器上开启 span"""
+    return get_profiler().span(name, category, args, cpu)
@@ -0,0 +1,134 @@
+"""
+冷启动剖析
+功能：
+1. 在独立子进程中以 `python -X importtime` 导入目标模块（默认 src.server.main），解析 stderr
+2. 汇总总导入耗时与累计耗时最高的模块，并列出不应出现在冷启动路径上的重模块
+3. 命令行入口：python -m src.run.startup_profile [--module M] [--top N] [--budget-ms MS]
+   超出预算时以非零状态退出，便于在 CI 中跟踪
+
+说明：
+- 子进程保证每次都是冷导入（不受当前进程已加载模块影响）。
+- 累计耗时（cumulative）包含子模块；同一行的 self 耗时仅为模块自身执行时间。
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_MODULE = "src.server.main"
+# 冷启动预算（毫秒）：CI 机器上导入 src.server.main 的上限，留有余量
+DEFAULT_BUDGET_MS = 4000
+# 这些模块应在首次使用时才导入，出现在冷启动路径上视为回归
+DEFERRED_MODULES = (
+    "webview",
+    "src.classes.mutual_action",
+    "src.classes.action.respire",
+    "src.classes.action.breakthrough",
+    "src.classes.gathering.auction",
+    "src.classes.gathering.tournament",
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+@dataclass(slots=True)
+class ImportRecord:
+    """importtime 的一行。时间单位为微秒。"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    module: str
+    records: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        """目标模块的累计导入耗时。"""
+        for record in self.records:
+            if record.module == self.module and record.depth == 0:
+                return record.cumulative_us / 1000
+        return sum(r.self_us for r in self.records) / 1000
+
+    @property
+    def imported(self) -> set[str]:
+        return {r.module for r in self.records}
+
+    def top(self, n: int = 20) -> list[ImportRecord]:
+        return sorted(self.records, key=lambda r: r.cumulative_us, reverse=True)[:n]
+
+    def deferred_violations(self, modules=DEFERRED_MODULES) -> list[str]:
+        imported = self.imported
+        return [m for m in modules if m in imported]
+
+    def summary(self, n: int = 20) -> str:
+        lines = [f"import {self.module}: {self.total_ms:.1f} ms ({len(self.records)} modules)"]
+        lines.append(f"{'cumulative(ms)':>14} {'self(ms)':>9}  module")
+        for r in self.top(n):
+            lines.append(f"{r.cumulative_us / 1000:>14.1f} {r.self_us / 1000:>9.1f}  {r.module}")
+        return "\n".join(lines)
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """解析 -X importtime 输出（`import time: self | cumulative | name`）。"""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # 表头
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        records.append(ImportRecord(stripped, self_us, cumulative_us, (len(name) - len(stripped) - 1) // 2))
+    return records
+
+
+def profile_startup(module: str = DEFAULT_MODULE, python: Optional[str] = None) -> StartupProfile:
+    """在子进程中冷导入 module 并返回剖析结果。"""
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return StartupProfile(module, parse_importtime(result.stderr))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import profile")
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    profile = profile_startup(args.module)
+    print(profile.summary(args.top))
+
+    ok = True
+    violations = profile.deferred_violations()
+    if violations:
+        print(f"Deferred modules imported at startup: {', '.join(violations)}")
+        ok = False
+    if profile.total_ms > args.budget_ms:
+        print(f"Startup budget exceeded: {profile.total_ms:.1f} ms > {args.budget_ms:.0f} ms")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
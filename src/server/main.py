@@ -16,10 +16,8 @@ for stream_name in ('stdout', 'stderr'):
 # ==============================================================================
 
 import asyncio
-try:
-    import webview  # type: ignore
-except ImportError:
-    webview = None
+# webview 仅在 start() 的窗口模式下按需导入，避免拖慢服务端冷启动
+webview = None
 import subprocess
 import time
 import threading
@@ -33,6 +31,7 @@ from contextlib import asynccontextmanager
 from typing import List, Optional
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 from pydantic import BaseModel
@@ -59,7 +58,7 @@ from src.classes.alignment import Alignment
 from src.classes.event import Event
 from src.classes.celestial_phenomenon import celestial_phenomena_by_id
 from src.classes.long_term_objective import set_user_long_term_objective, clear_user_long_term_objective
-from src.sim import save_game, list_saves, load_game, get_events_db_path, check_save_compatibility
+from src.sim import save_game, save_incremental, list_saves, load_game, get_events_db_path, check_save_compatibility
 from src.utils.llm.client import test_connectivity
 from src.utils.llm.config import LLMConfig, LLMMode
 from src.run.data_loader import reload_all_static_data
@@ -67,6 +66,8 @@ from src.classes.language import language_manager, LanguageType
 from src.systems.sect_relations import compute_sect_relations
 from src.i18n import t
 from src.config import AppSettingsPatch, LLMSettingsUpdate, RunConfig, get_settings_service
+from src.run import metrics
+from src.run.profiler import get_profiler
 
 # 全局游戏实例
 game_instance = {
@@ -212,6 +213,7 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        metrics.ws_connections().set(len(self.active_connections))
         
         # 取消可能存在的关机定时器
         if self._shutdown_timer:
@@ -226,6 +228,7 @@ class ConnectionManager:
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        metrics.ws_connections().set(len(self.active_connections))
             
         # 当最后一个客户端断开时，自动暂停游戏
         if len(self.active_connections) == 0:
@@ -248,13 +251,18 @@ class ConnectionManager:
 
     async def broadcast(self, message: dict):
         import json
+        pending = metrics.ws_pending_broadcasts()
+        pending.inc()
         try:
-            # 简单序列化，实际生产可能需要更复杂的 Encoder
-            txt = json.dumps(message, default=str)
-            for connection in self.active_connections:
-                await connection.send_text(txt)
+            with metrics.ws_broadcast_duration().time():
+                # 简单序列化，实际生产可能需要更复杂的 Encoder
+                txt = json.dumps(message, default=str)
+                for connection in self.active_connections:
+                    await connection.send_text(txt)
         except Exception as e:
             print(f"Broadcast error: {e}")
+        finally:
+            pending.dec()
 
 manager = ConnectionManager()
 
@@ -482,6 +490,7 @@ async def init_game_async():
         )
         sim = Simulator(world)
         sim.awakening_rate = run_config.npc_awakening_rate_per_month
+        world.set_seed(run_config.random_seed)
         world.run_config_snapshot = _model_to_dict(run_config)
 
         # 阶段 2: 历史背景影响 (如果配置了历史)
@@ -504,7 +513,8 @@ async def init_game_async():
         existed_sects = []
         if needed_sects > 0 and all_sects:
             pool = list(all_sects)
-            random.shuffle(pool)
+            with world.random_scope():
+                random.shuffle(pool)
             existed_sects = pool[:needed_sects]
 
         # 阶段 4: 角色生成
@@ -514,12 +524,13 @@ async def init_game_async():
 
         if target_total_count > 0:
             def _make_random_sync():
-                return _new_make_random(
-                    world,
-                    count=target_total_count,
-                    current_month_stamp=world.month_stamp,
-                    existed_sects=existed_sects
-                )
+                with world.random_scope():
+                    return _new_make_random(
+                        world,
+                        count=target_total_count,
+                        current_month_stamp=world.month_stamp,
+                        existed_sects=existed_sects
+                    )
             random_avatars = await asyncio.to_thread(_make_random_sync)
             final_avatars.update(random_avatars)
             print(f"Generated {len(random_avatars)} random NPCs")
@@ -575,6 +586,26 @@ async def init_game_async():
 
 
 
+def _delta_dependents(saves, checkpoint_name: str) -> list:
+    """依赖某检查点的增量存档路径（增量只能叠加在其检查点上读取）。"""
+    return [path for path, meta in saves if (meta.get("delta") or {}).get("base") == checkpoint_name]
+
+
+def _remove_save_files(path) -> None:
+    """删除存档文件及其事件数据库。"""
+    world = game_instance.get("world")
+    if world is not None:
+        world.avatar_manager.release_save_file(path)
+    if path.exists():
+        os.remove(path)
+    db_path = get_events_db_path(path)
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception as e:
+            print(f"[Warning] Failed to delete db file {db_path}: {e}")
+
+
 def trigger_auto_save(world, sim):
     """提取的自动保存逻辑，供 game_loop 和测试使用"""
     playthrough_id = getattr(world, "playthrough_id", "")
@@ -586,30 +617,29 @@ def trigger_auto_save(world, sim):
     for path, meta in all_saves:
         if meta.get("is_auto_save", False) and meta.get("playthrough_id", "") == playthrough_id:
             auto_saves.append((path, meta))
-            
+
     # 2. 如果数量 >= 上限，删除最老的
-    # list_saves 已经是按时间倒序排列的，所以最老的是在列表末尾
-    while len(auto_saves) >= max_auto_saves:
-        oldest_path, oldest_meta = auto_saves.pop()
-        # 删除旧存档
-        if oldest_path.exists():
-            try:
-                import os
-                os.remove(oldest_path)
-                # 同时删除对应的 db 文件
-                db_path = get_events_db_path(oldest_path)
-                if db_path.exists():
-                    os.remove(db_path)
-                print(f"[Auto-Save] Removed old auto save: {oldest_path.name}")
-            except Exception as e:
-                print(f"[Auto-Save] Failed to remove old auto save: {e}")
-                
-    # 3. 创建新存档
+    # list_saves 已经是按时间倒序排列的，所以最老的是在列表末尾。
+    # 增量存档依赖其检查点（各增量相对检查点累计，彼此独立），检查点与其增量作为一组淘汰：
+    # 先删最老一组里的增量，增量删完后再删检查点，任何时候都不会留下缺检查点的增量。
+    # 当前日志的检查点也照此淘汰，被删后下一次自动存档会改写新的检查点（见 SaveJournal.can_write_delta）。
+    while auto_saves and len(auto_saves) >= max_auto_saves:
+        referenced = {meta["delta"].get("base") for _, meta in auto_saves if meta.get("delta")}
+        # 增量从不被引用，所以总能找到
+        oldest_path = next(path for path, _ in reversed(auto_saves) if path.name not in referenced)
+        auto_saves = [(path, meta) for path, meta in auto_saves if path != oldest_path]
+        try:
+            _remove_save_files(oldest_path)
+            print(f"[Auto-Save] Removed old auto save: {oldest_path.name}")
+        except Exception as e:
+            print(f"[Auto-Save] Failed to remove old auto save: {e}")
+
+    # 3. 创建新存档（检查点 + 增量，见 src/sim/save/journal.py）
     existed_sects = getattr(world, "existed_sects", [])
     if not existed_sects:
         existed_sects = list(sects_by_id.values())
     
-    save_game(world, sim, existed_sects, is_auto_save=True)
+    save_incremental(world, sim, existed_sects, is_auto_save=True)
 
 async def game_loop():
     """后台自动运行游戏循环。"""
@@ -748,6 +778,7 @@ async def lifespan(app: FastAPI):
 
     settings = get_settings_service().get_settings_view()
     apply_runtime_content_locale(settings.new_game_defaults.content_locale)
+    get_profiler().set_enabled(settings.simulation.profiling_enabled)
     print(f"Current Language: {language_manager}")
 
     # 启动时不再自动开始初始化游戏，等待前端指令
@@ -880,6 +911,65 @@ async def websocket_endpoint(websocket: WebSocket):
         print(f"WS Error: {e}")
         manager.disconnect(websocket)
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """以 Prometheus 文本格式导出进程内指标。"""
+    metrics.update_population(game_instance.get("world"))
+    return PlainTextResponse(
+        metrics.get_metrics().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+class ProfilerControlRequest(BaseModel):
+    enabled: Optional[bool] = None
+    clear: bool = False
+    capacity: Optional[int] = None
+
+
+@app.get("/api/profiler")
+def get_profiler_status():
+    """获取剖析器状态与按 span 聚合的耗时摘要。"""
+    profiler = get_profiler()
+    return {
+        "enabled": profiler.enabled,
+        "capacity": profiler.capacity,
+        "span_count": len(profiler),
+        "summary": profiler.summary(),
+    }
+
+
+@app.post("/api/control/profiler")
+def control_profiler(req: ProfilerControlRequest):
+    """临时开关剖析器（不写入设置），可选清空缓冲区或调整容量。"""
+    profiler = get_profiler()
+    if req.capacity is not None:
+        profiler.set_capacity(req.capacity)
+    if req.clear:
+        profiler.clear()
+    if req.enabled is not None:
+        profiler.set_enabled(req.enabled)
+    return {"enabled": profiler.enabled, "capacity": profiler.capacity, "span_count": len(profiler)}
+
+
+@app.get("/api/profiler/trace")
+def export_profiler_trace(format: str = Query("chrome", pattern="^(chrome|collapsed)$"), metric: str = "wall"):
+    """
+    导出剖析数据。
+
+    Query Parameters:
+        format: chrome（trace-event JSON，可直接拖入 Perfetto）或 collapsed（flamegraph 输入）。
+        metric: collapsed 格式下使用 wall 或 cpu 时间（cpu 只含记录了 CPU 时间的同步 span）。
+    """
+    profiler = get_profiler()
+    if format == "collapsed":
+        try:
+            return PlainTextResponse(profiler.to_collapsed_stacks(metric=metric))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return profiler.to_chrome_trace()
+
+
 @app.get("/api/meta/avatars")
 def get_avatar_meta():
     return AVATAR_ASSETS
@@ -1101,8 +1191,8 @@ def get_map():
 
 
 @app.get("/api/rankings")
-def get_rankings():
-    """获取天、地、人及宗门榜单数据"""
+def get_rankings(offset: int = 0, limit: Optional[int] = None):
+    """获取天、地、人及宗门榜单数据；offset/limit 用于分页（默认前 display_size 名）"""
     world = game_instance.get("world")
     if not world or not hasattr(world, "ranking_manager"):
         return {"heaven": [], "earth": [], "human": [], "sect": []}
@@ -1117,7 +1207,7 @@ def get_rankings():
     ):
         rm.update_rankings_with_world(world, world.avatar_manager.get_living_avatars())
 
-    return rm.get_rankings_data()
+    return rm.get_rankings_data(offset=offset, limit=limit)
 
 
 @app.get("/api/sect-relations")
@@ -1185,7 +1275,7 @@ def get_sect_territories():
         }
         for sect in snapshot.active_sects
     ]
-    return {"sects": sects}
+    return {"sects": sects, "grid": snapshot.as_arrays()}
 
 
 @app.post("/api/control/reset")
@@ -1270,6 +1360,7 @@ def get_settings():
 def patch_settings(req: AppSettingsPatch):
     """更新应用设置（不包含敏感信息）。"""
     updated = get_settings_service().patch_settings(req)
+    get_profiler().set_enabled(updated.simulation.profiling_enabled)
     return _model_to_dict(updated)
 
 
@@ -1746,6 +1837,8 @@ class SaveGameRequest(BaseModel):
 
 class DeleteSaveRequest(BaseModel):
     filename: str
+    # 删除检查点时一并删除依赖它的增量存档
+    delete_dependents: bool = False
 
 class LoadGameRequest(BaseModel):
     filename: str
@@ -1813,22 +1906,23 @@ def api_delete_game(req: DeleteSaveRequest):
     try:
         saves_dir = CONFIG.paths.saves
         target_path = saves_dir / req.filename
-        
-        # 1. 删除 JSON 存档文件
-        if target_path.exists():
-            os.remove(target_path)
-            
-        # 2. 删除对应的 SQL 数据库文件
-        events_db_path = get_events_db_path(target_path)
-        if os.path.exists(events_db_path):
-            try:
-                os.remove(events_db_path)
-            except Exception as e:
-                print(f"[Warning] Failed to delete db file {events_db_path}: {e}")
-                
-        # 3. 删除可能存在的其他关联文件（如果有）
-        
+
+        # 1. 增量存档只能叠加在其检查点上读取：仍有增量依赖时拒绝删除，除非要求一并删除
+        dependents = _delta_dependents(list_saves(), req.filename)
+        if dependents and not req.delete_dependents:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Save is the checkpoint of {len(dependents)} delta save(s): "
+                       + ", ".join(p.name for p in dependents),
+            )
+
+        # 2. 删除存档文件及对应的 SQL 数据库文件（连同依赖它的增量）
+        for path in dependents + [target_path]:
+            _remove_save_files(path)
+
         return {"status": "ok", "message": "Save deleted"}
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1975,6 +2069,7 @@ def _patch_sys_streams():
 
 def start():
     """启动服务的入口函数"""
+    global webview
     _patch_sys_streams()
     import argparse
     import webbrowser
@@ -2020,9 +2115,9 @@ def start():
         # log_level="error" 可以减少控制台噪音，根据需要调整
         uvicorn.run(app, host=host, port=port, log_level="info")
 
-    if args.mode == "window":
+    if args.mode == "window" and webview is None:
         try:
-            import webview
+            import webview  # type: ignore
         except ImportError:
             print("webview module not found, falling back to browser mode.")
             args.mode = "browser"
@@ -12,6 +12,7 @@ def __getattr__(name):
 
 # 导出常用的 save/load 函数，方便外部调用
 from .save.save_game import save_game, list_saves, get_save_info
+from .save.journal import save_incremental
 from .load.load_game import load_game, get_events_db_path, check_save_compatibility
 
-__all__ = ["Simulator", "save_game", "list_saves", "get_save_info", "load_game", "get_events_db_path", "check_save_compatibility"]
+__all__ = ["Simulator", "save_game", "list_saves", "get_save_info", "save_incremental", "load_game", "get_events_db_path", "check_save_compatibility"]
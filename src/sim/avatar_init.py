@@ -363,6 +363,7 @@ class SectRankAssigner:
         if rank == SectRank.Patriarch and sect_has_patriarch(avatar):
             rank = SectRank.Elder
         avatar.sect_rank = rank
+        avatar.sect.on_member_rank_changed(avatar)
 
     @staticmethod
     def assign_batch(avatars: List[Avatar], world: World) -> None:
@@ -400,6 +401,11 @@ class SectRankAssigner:
                 for avatar in candidates[1:]:
                     avatar.sect_rank = SectRank.Elder
 
+        # 职位变化影响宗门成员统计（掌门）
+        for avatar in avatars:
+            if avatar is not None and avatar.sect is not None:
+                avatar.sect.on_member_rank_changed(avatar)
+
 
 class AvatarFactory:
     """
@@ -66,6 +66,15 @@ class AvatarLoadMixin:
         # 重建age
         age = Age.from_dict(data["age"], realm)
         
+        # 性格、阵营、功法直接传给构造函数，__post_init__ 就不会先随机生成再被覆盖
+        # （随机挑选相容性格是读档时最耗时的一步）
+        persona_ids = data.get("persona_ids", [])
+        personas = [personas_by_id[pid] for pid in persona_ids if pid in personas_by_id]
+        alignment_name = data.get("alignment")
+        alignment = Alignment[alignment_name] if alignment_name is not None else None
+        technique_id = data.get("technique_id")
+        technique = techniques_by_id.get(technique_id) if technique_id is not None else None
+
         # 创建Avatar（不完整，需要后续填充）
         avatar = cls(
             world=world,
@@ -77,6 +86,9 @@ class AvatarLoadMixin:
             cultivation_progress=cultivation_progress,
             pos_x=data["pos_x"],
             pos_y=data["pos_y"],
+            personas=personas,
+            alignment=alignment,
+            technique=technique,
         )
         avatar.born_region_id = data.get("born_region_id")
         stamp_val = data.get("cultivation_start_month_stamp")
@@ -86,9 +98,8 @@ class AvatarLoadMixin:
         avatar.root = Root[data["root"]]
         
         # 设置功法
-        technique_id = data.get("technique_id")
         if technique_id is not None:
-            avatar.technique = techniques_by_id.get(technique_id)
+            avatar.technique = technique
         
         # 设置HP
         avatar.hp = HP.from_dict(data["hp"])
@@ -145,14 +156,6 @@ class AvatarLoadMixin:
         if sect_rank_value is not None:
             avatar.sect_rank = SectRank(sect_rank_value)
         
-        alignment_name = data.get("alignment")
-        if alignment_name is not None:
-            avatar.alignment = Alignment[alignment_name]
-        
-        # 重建personas
-        persona_ids = data.get("persona_ids", [])
-        avatar.personas = [personas_by_id[pid] for pid in persona_ids if pid in personas_by_id]
-        
         # 设置外貌（通过level获取完整的Appearance对象）
         avatar.appearance = get_appearance_by_level(data.get("appearance", 5))
 
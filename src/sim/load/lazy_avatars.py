@@ -0,0 +1,298 @@
+"""
+已故角色的惰性加载
+
+长期运行的存档里，已故角色往往占了大头，但游戏中很少访问它们（查看人物详情、
+关系图等）。读档时只为以下角色立即构建 Avatar：
+- 存活角色
+- 仍挂在宗门名下或占据洞府的已故角色
+- 以上角色关系网能够（传递）触达的已故角色——Avatar.relations 以 Avatar 对象为键，
+  被引用的一方必须是真实对象
+
+读档分两遍流式读取存档：第一遍每个角色只留下 summarize_avatar_record 的几个字段，
+据此挑出需要立即构建的角色；第二遍只为它们解析并构建 Avatar。峰值内存与存档总量无关。
+
+其余已故角色保存为 DeadAvatarStub（id、姓名、死亡信息、关系 id 与记录在存档中的序号），
+放在 LazyAvatarDict 中，第一次通过 [] / get 或遍历 values / items 取到它时才调用
+Avatar.from_save_dict 还原，并把它与同样是存根的关系对象一起还原。
+values / items 是惰性视图，只还原实际遍历到的角色；dict(...) / copy() 得到的也都是 Avatar，
+只有 iter_records（AvatarManager.iter_dead_records）会给出存根。
+
+不变式：已还原的角色不会以存根为关系对象，因此存档、清理等路径可以直接操作存根
+（见 AvatarManager.iter_dead_records / iter_save_dicts），无需还原；
+存档时存根的记录按来源批量回读（每个来源顺序扫描一遍）。
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import ItemsView, ValuesView
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.sim.load.save_reader import SaveReader
+    from src.classes.core.avatar import Avatar
+    from src.classes.core.world import World
+
+
+def summarize_avatar_record(data: dict) -> dict:
+    """读档第一遍只保留的字段：挑选立即构建的角色与建立存根都只用到这些。"""
+    return {
+        "id": data["id"],
+        "name": data.get("name", ""),
+        "death_info": data.get("death_info"),
+        "is_dead": data.get("is_dead", False),
+        "sect_id": data.get("sect_id"),
+        "relations": list(data.get("relations") or {}),
+    }
+
+
+class AvatarRecordSource:
+    """
+    存根的原始记录所在的存档：按 iter_avatars 中的序号回读。
+
+    读档后存档文件被改写或删除会让回读失效，因此覆盖/删除前应先调用
+    LazyAvatarDict.release_source 把记录读回内存（save_game 与服务端删除存档时如此）。
+    """
+
+    def __init__(self, reader: "SaveReader"):
+        self.path = Path(reader.path)
+        self._stamps = {Path(p): _file_stamp(p) for p in reader.source_paths}
+
+    def covers(self, path: Path) -> bool:
+        path = Path(path).resolve()
+        return any(p.resolve() == path for p in self._stamps)
+
+    def read(self, indices: Iterable[int]) -> Iterator[tuple[int, dict]]:
+        from src.sim.load.save_reader import SaveFormatError, open_save
+
+        for path, stamp in self._stamps.items():
+            if not path.is_file() or _file_stamp(path) != stamp:
+                raise SaveFormatError(f"Save file changed since it was loaded: {path.name}")
+        return open_save(self.path).read_avatars_at(indices)
+
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    stat = Path(path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DeadAvatarStub:
+    """
+    尚未还原的已故角色：只常驻 id、姓名、死亡信息与关系 id，原始记录按需从存档回读。
+
+    来源存档被释放（release_source）后 data 保存回读的记录，to_save_dict 直接返回它。
+    """
+
+    __slots__ = ("id", "name", "death_info", "relation_ids", "source", "index", "data")
+
+    is_dead = True
+
+    def __init__(self, summary: dict, source: "AvatarRecordSource | None" = None, index: int = -1):
+        self.id: str = summary["id"]
+        self.name: str = summary.get("name", "")
+        self.death_info: dict | None = summary.get("death_info")
+        self.relation_ids: list[str] = list(summary.get("relations") or ())
+        self.source = source
+        self.index = index
+        self.data: dict | None = None
+
+    def drop_relation(self, other_id: str) -> bool:
+        """删除与 other_id 的关系记录，返回是否有改动。"""
+        if other_id not in self.relation_ids:
+            return False
+        self.relation_ids.remove(other_id)
+        if self.data is not None:
+            self.restore(self.data)
+        return True
+
+    def restore(self, record: dict) -> dict:
+        """把回读的记录对齐到存根当前的关系（读档后删除的关系不再写回）。"""
+        keep = set(self.relation_ids)
+        for key in ("relations", "relation_start_dates"):
+            values = record.get(key)
+            if values and set(values) - keep:
+                record[key] = {k: v for k, v in values.items() if k in keep}
+        return record
+
+    def to_save_dict(self) -> dict:
+        if self.data is not None:
+            return self.data
+        for _, record in self.source.read([self.index]):
+            return self.restore(record)
+        raise KeyError(self.id)
+
+    def __repr__(self) -> str:
+        return f"DeadAvatarStub(id={self.id!r}, name={self.name!r})"
+
+
+def select_eager_avatar_ids(records: dict[str, dict], host_ids: Iterable[str] = ()) -> set[str]:
+    """
+    计算读档时必须立即构建的角色 id。
+
+    Args:
+        records: {avatar_id: 存档数据或其 summarize_avatar_record 摘要}
+        host_ids: 占据洞府的角色 id
+    """
+    eager = {
+        aid for aid, data in records.items()
+        if not data.get("is_dead", False) or data.get("sect_id") is not None
+    }
+    eager.update(aid for aid in host_ids if aid in records)
+
+    queue = deque(eager)
+    while queue:
+        aid = queue.popleft()
+        for other_id in records[aid].get("relations") or {}:
+            if other_id in records and other_id not in eager:
+                eager.add(other_id)
+                queue.append(other_id)
+    return eager
+
+
+class LazyAvatarDict(dict):
+    """
+    已故角色字典：值可以是 DeadAvatarStub，取值时自动还原为 Avatar。
+
+    遍历键、len、in 不会触发还原；values / items 在遍历到存根时逐个还原；
+    需要遍历原始记录（不还原）时用 iter_records。
+    """
+
+    def __init__(self, world: "World"):
+        super().__init__()
+        self._world = world
+
+    def add_stub(self, stub: DeadAvatarStub) -> None:
+        dict.__setitem__(self, stub.id, stub)
+
+    def stub_count(self) -> int:
+        return sum(1 for v in dict.values(self) if isinstance(v, DeadAvatarStub))
+
+    def iter_records(self) -> Iterator[tuple[str, "Avatar | DeadAvatarStub"]]:
+        """遍历 (id, 角色或存根)，不触发还原。"""
+        return iter(list(dict.items(self)))
+
+    def iter_save_dicts(self, ids: Optional[Iterable[str]] = None) -> Iterator[dict]:
+        """
+        产出已故角色的存档数据（ids 为 None 时全部），不触发还原。
+
+        存根的记录按来源批量回读，顺序与 iter_records 不同。
+        """
+        wanted = None if ids is None else set(ids)
+        stubs = []
+        for aid, value in dict.items(self):
+            if wanted is not None and aid not in wanted:
+                continue
+            if isinstance(value, DeadAvatarStub):
+                stubs.append(value)
+            else:
+                yield value.to_save_dict()
+        for _, data in self._read_stub_records(stubs):
+            yield data
+
+    def _read_stub_records(self, stubs: Iterable[DeadAvatarStub]) -> Iterator[tuple[DeadAvatarStub, dict]]:
+        by_source: dict[int, tuple[AvatarRecordSource, dict[int, DeadAvatarStub]]] = {}
+        for stub in stubs:
+            if stub.data is not None:
+                yield stub, stub.data
+                continue
+            by_source.setdefault(id(stub.source), (stub.source, {}))[1][stub.index] = stub
+        for source, by_index in by_source.values():
+            for index, record in source.read(by_index):
+                stub = by_index[index]
+                yield stub, stub.restore(record)
+
+    def release_source(self, path: Path) -> int:
+        """把来源为 path 的存根记录读回内存（存档文件即将被覆盖或删除），返回涉及的存根数。"""
+        stubs = [
+            v for v in dict.values(self)
+            if isinstance(v, DeadAvatarStub) and v.data is None and v.source.covers(path)
+        ]
+        for stub, record in list(self._read_stub_records(stubs)):
+            stub.data = record
+            stub.source = None
+        return len(stubs)
+
+    def peek(self, avatar_id: str, default=None):
+        return dict.get(self, avatar_id, default)
+
+    def __getitem__(self, avatar_id: str) -> "Avatar":
+        value = dict.__getitem__(self, avatar_id)
+        if isinstance(value, DeadAvatarStub):
+            value = self._inflate(value)
+        return value
+
+    def get(self, avatar_id: str, default=None):
+        if avatar_id in self:
+            return self[avatar_id]
+        return default
+
+    def pop(self, avatar_id: str, *default):
+        if avatar_id in self:
+            value = self[avatar_id]
+            dict.pop(self, avatar_id)
+            return value
+        if default:
+            return default[0]
+        raise KeyError(avatar_id)
+
+    def values(self) -> ValuesView["Avatar"]:
+        return ValuesView(self)
+
+    def items(self) -> ItemsView[str, "Avatar"]:
+        return ItemsView(self)
+
+    def __iter__(self) -> Iterator[str]:
+        # 覆盖 __iter__ 后，dict(...) / update(...) 不再直接拷贝底层值，而是经 keys + [] 取值
+        return dict.__iter__(self)
+
+    def copy(self) -> dict[str, "Avatar"]:
+        return {aid: self[aid] for aid in list(self)}
+
+    def popitem(self) -> tuple[str, "Avatar"]:
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        aid = next(reversed(self.keys()))
+        return aid, self.pop(aid)
+
+    def setdefault(self, avatar_id: str, default=None):
+        if avatar_id in self:
+            return self[avatar_id]
+        dict.__setitem__(self, avatar_id, default)
+        return default
+
+    def _inflate(self, stub: DeadAvatarStub) -> "Avatar":
+        """还原 stub 及其关系网中所有仍是存根的角色。"""
+        from src.classes.core.avatar import Avatar
+        from src.classes.relation.relation import Relation
+        from src.classes.relation.relation_graph import add_edge
+        from src.classes.relation.relations import update_second_degree_relations
+
+        # 先按关系 id 收集整个存根关系网，再一次回读它们的记录
+        component: dict[str, DeadAvatarStub] = {stub.id: stub}
+        queue = deque([stub])
+        while queue:
+            for other_id in queue.popleft().relation_ids:
+                other = dict.get(self, other_id)
+                if isinstance(other, DeadAvatarStub) and other_id not in component:
+                    component[other_id] = other
+                    queue.append(other)
+        records = {s.id: data for s, data in self._read_stub_records(list(component.values()))}
+
+        # 先全部注册再连关系，关系网中有环也不会重复还原
+        pending: list[tuple["Avatar", dict]] = []
+        for aid in component:
+            data = records[aid]
+            avatar = Avatar.from_save_dict(data, self._world)
+            dict.__setitem__(self, avatar.id, avatar)
+            pending.append((avatar, data.get("relations") or {}))
+
+        manager = self._world.avatar_manager
+        for avatar, relations in pending:
+            for other_id, relation_value in relations.items():
+                other = manager.get_avatar(other_id)
+                if other is not None:
+                    add_edge(avatar, other, Relation(relation_value))
+        # 关系网里的其他角色要么一并还原，要么不引用存根，只需计算新还原者的二阶关系
+        for avatar, _ in pending:
+            update_second_degree_relations(avatar)
+        return dict.__getitem__(self, stub.id)
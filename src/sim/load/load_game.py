@@ -7,9 +7,12 @@
 - check_save_compatibility: 检查存档版本兼容性（当前未实现严格检查）
 
 加载流程（两阶段）：
-1. 第一阶段：加载所有Avatar对象（relations留空）
-   - 通过AvatarLoadMixin.from_save_dict反序列化
+1. 第一阶段：加载Avatar对象（relations留空）
+   - 先流式扫描一遍角色记录，只保留摘要，挑出需要立即构建的角色
+   - 再扫描一遍，通过AvatarLoadMixin.from_save_dict反序列化这些角色
    - 配表对象（Technique, Material等）通过id从全局字典获取
+   - 与存活角色、宗门、洞府都无关联的死者只保留存根，首次访问时才从存档回读并还原
+     （见 src/sim/load/lazy_avatars.py）
 2. 第二阶段：重建Avatar之间的relations网络
    - 必须在所有Avatar加载完成后才能建立引用关系
    
@@ -21,12 +24,13 @@
 事件存储：
 - 事件存储在 SQLite 数据库中（{save_name}_events.db）
 - 旧存档的 JSON 事件会自动迁移到 SQLite
+- 增量存档（见 src/sim/save/journal.py）由 open_save 叠加到检查点上，
+  事件库以检查点的事件库为底，再补写增量中的新事件
 
 注意事项：
 - 读档后会重置前端UI状态（头像图像、插值等）
 - 地图从头重建（因为地图是固定的），但会恢复宗门总部位置
 """
-import json
 from pathlib import Path
 from typing import Tuple, List, Optional, TYPE_CHECKING
 
@@ -38,8 +42,19 @@ if TYPE_CHECKING:
 from src.systems.time import MonthStamp
 from src.classes.event import Event
 from src.classes.relation.relation import Relation
+from src.classes.relation.relation_graph import add_edge
+from src.classes.relation.relations import update_second_degree_relations
 from src.config import get_settings_service
 from src.utils.config import CONFIG
+from src.utils.rng import SimRandom
+from src.sim.load.save_reader import DeltaSaveReader, open_save
+from src.sim.load.lazy_avatars import (
+    AvatarRecordSource,
+    DeadAvatarStub,
+    LazyAvatarDict,
+    select_eager_avatar_ids,
+    summarize_avatar_record,
+)
 
 
 def apply_history_modifications(world, modifications):
@@ -135,6 +150,10 @@ def apply_history_modifications(world, modifications):
                     auxiliaries_by_name[item.name] = item
         except Exception:
             pass
+
+    # 区域描述片段引用了物品、宗门等名字，统一失效
+    from src.classes.environment.region import invalidate_region_info
+    invalidate_region_info()
             
     print("Historical diff replay completed.")
 
@@ -180,12 +199,12 @@ def load_game(save_path: Optional[Path] = None) -> Tuple["World", "Simulator", L
         from src.sim.simulator import Simulator
         from src.run.load_map import load_cultivation_world_map
         
-        # 读取存档文件
-        with open(save_path, "r", encoding="utf-8") as f:
-            save_data = json.load(f)
+        # 读取存档文件（按格式自动识别；流式存档此时只解析了 header）
+        reader = open_save(save_path)
+        save_data = reader.header
         
         # 读取元信息
-        meta = save_data.get("meta", {})
+        meta = save_data.get("meta") or {}
         print(f"Loading save (Version: {meta.get('version', 'unknown')}, "
               f"游戏时间: {meta.get('game_time', 'unknown')})")
         
@@ -193,13 +212,20 @@ def load_game(save_path: Optional[Path] = None) -> Tuple["World", "Simulator", L
         game_map = load_cultivation_world_map()
         
         # 读取世界数据
-        world_data = save_data.get("world", {})
+        world_data = save_data.get("world") or {}
         month_stamp = MonthStamp(world_data["month_stamp"])
         start_year = world_data.get("start_year", 100)
         
         # 计算事件数据库路径。
         events_db_path = get_events_db_path(save_path)
 
+        # 增量存档没有自己的事件库：首次读档时以检查点的事件库为底，之后补写增量事件
+        if isinstance(reader, DeltaSaveReader) and not events_db_path.exists():
+            base_db_path = get_events_db_path(reader.base_path)
+            if base_db_path.exists():
+                from src.classes.event_storage import snapshot_database
+                snapshot_database(base_db_path, events_db_path)
+
         # 重建World对象（使用 SQLite 事件存储）。
         world = World.create_with_db(
             map=game_map,
@@ -240,6 +266,10 @@ def load_game(save_path: Optional[Path] = None) -> Tuple["World", "Simulator", L
         world.prune_expired_sect_relation_modifiers(int(world.month_stamp))
         world.sect_wars = list(world_data.get("sect_wars", []) or [])
 
+        rng_data = world_data.get("rng")
+        if rng_data:
+            world.rng = SimRandom.from_dict(rng_data)
+
         for sect in sects_by_id.values():
             sect.sect_effects = {}
             sect.temporary_sect_effects = []
@@ -258,42 +288,60 @@ def load_game(save_path: Optional[Path] = None) -> Tuple["World", "Simulator", L
             sect.temporary_sect_effects = list(state_dict.get("temporary_sect_effects", []) or [])
             sect.cleanup_expired_temporary_sect_effects(int(world.month_stamp))
         
-        # 第一阶段：重建所有Avatar（不含relations）
-        avatars_data = save_data.get("avatars", [])
+        # 恢复洞府主人关系、区域状态用到的数据
+        cultivate_regions_hosts = world_data.get("cultivate_regions_hosts", {})
+        regions_status = world_data.get("regions_status", {})
+
+        # 第一遍：流式扫描角色记录，每个角色只留下摘要（id、姓名、死亡信息、宗门、关系 id），
+        # 挑出需要立即构建的角色（存活角色及其关系网、宗门/洞府仍引用的死者）；
+        # 其余死者只保留存根，首次访问时再从存档回读（见 src/sim/load/lazy_avatars.py）
+        summaries = {}
+        for index, data in enumerate(reader.iter_avatars()):
+            summary = summarize_avatar_record(data)
+            summary["index"] = index
+            summaries[summary["id"]] = summary
+        eager_ids = select_eager_avatar_ids(summaries, cultivate_regions_hosts.values())
+
+        # 第二遍：只为立即构建的角色解析完整记录（按存档顺序）
         all_avatars = {}
         living_avatars = {}
-        dead_avatars = {}
-
-        for avatar_data in avatars_data:
-            avatar = Avatar.from_save_dict(avatar_data, world)
+        dead_avatars = LazyAvatarDict(world)
+        eager_relations = {}
+        for data in reader.iter_avatars():
+            if data["id"] not in eager_ids:
+                continue
+            avatar = Avatar.from_save_dict(data, world)
             all_avatars[avatar.id] = avatar
+            eager_relations[avatar.id] = data.get("relations") or {}
             
             # 分流：生者与死者
             if avatar.is_dead:
                 dead_avatars[avatar.id] = avatar
             else:
                 living_avatars[avatar.id] = avatar
+        source = AvatarRecordSource(reader)
+        for avatar_id, summary in summaries.items():
+            if avatar_id not in eager_ids:
+                dead_avatars.add_stub(DeadAvatarStub(summary, source, summary["index"]))
+        del summaries
         
-        # 第二阶段：重建relations（需要所有avatar都已加载）
-        for avatar_data in avatars_data:
-            avatar_id = avatar_data["id"]
-            avatar = all_avatars[avatar_id]
-            relations_dict = avatar_data.get("relations", {})
-            
-            for other_id, relation_value in relations_dict.items():
+        # 第二阶段：重建relations（需要所有avatar都已加载；eager_ids 对关系封闭）
+        for avatar_id, avatar in all_avatars.items():
+            for other_id, relation_value in eager_relations[avatar_id].items():
                 if other_id in all_avatars:
                     other_avatar = all_avatars[other_id]
                     relation = Relation(relation_value)
-                    avatar.relations[other_avatar] = relation
+                    add_edge(avatar, other_avatar, relation)
+        del eager_relations
+        # 二阶关系不存档，读档后按一阶关系算一次，之后随关系变动增量维护
+        for avatar in all_avatars.values():
+            update_second_degree_relations(avatar)
         
         # 将所有avatar添加到world
         world.avatar_manager.avatars = living_avatars
         world.avatar_manager.dead_avatars = dead_avatars
         
         # 恢复洞府主人关系
-        cultivate_regions_hosts = world_data.get("cultivate_regions_hosts", {})
-        regions_status = world_data.get("regions_status", {})
-        
         from src.classes.environment.region import CultivateRegion, CityRegion
         for rid_str, avatar_id in cultivate_regions_hosts.items():
             rid = int(rid_str)
@@ -336,21 +384,25 @@ def load_game(save_path: Optional[Path] = None) -> Tuple["World", "Simulator", L
 
         # 检查是否需要从 JSON 迁移事件（向后兼容旧存档）。
         db_event_count = world.event_manager.count()
-        events_data = save_data.get("events", [])
-
-        if db_event_count == 0 and len(events_data) > 0:
-            # SQLite 数据库是空的，但 JSON 中有事件，执行迁移。
-            print(f"Migrating {len(events_data)} events from JSON to SQLite...")
-            for event_data in events_data:
-                event = Event.from_dict(event_data)
-                world.event_manager.add_event(event)
-            print("Event migration completed")
+
+        if db_event_count == 0:
+            # SQLite 数据库是空的，若存档中有事件则执行迁移（同一事务批量写入）。
+            migrated = world.event_manager.add_events(
+                Event.from_dict(event_data) for event_data in reader.iter_events()
+            )
+            if migrated:
+                print(f"Migrated {migrated} events from save file to SQLite")
         else:
             print(f"Loaded {db_event_count} events from SQLite")
+            if isinstance(reader, DeltaSaveReader):
+                # 事件 id 去重（INSERT OR IGNORE），重复读档不会重复写入
+                world.event_manager.add_events(
+                    Event.from_dict(event_data) for event_data in reader.iter_delta_events()
+                )
 
         # 重建Simulator
-        simulator_data = save_data.get("simulator", {})
-        run_config_snapshot = save_data.get("run_config", _model_to_dict(get_settings_service().get_default_run_config()))
+        simulator_data = save_data.get("simulator") or {}
+        run_config_snapshot = save_data.get("run_config") or _model_to_dict(get_settings_service().get_default_run_config())
         world.run_config_snapshot = run_config_snapshot
         simulator = Simulator(world)
         # 兼容旧存档 "birth_rate"
@@ -359,7 +411,10 @@ def load_game(save_path: Optional[Path] = None) -> Tuple["World", "Simulator", L
             simulator_data.get("birth_rate", run_config_snapshot.get("npc_awakening_rate_per_month", CONFIG.game.npc_awakening_rate_per_month))
         )
         
-        print(f"Save loaded successfully! Loaded {len(all_avatars)} avatars")
+        print(
+            f"Save loaded successfully! Loaded {len(all_avatars)} avatars "
+            f"({dead_avatars.stub_count()} archived avatars deferred)"
+        )
         return world, simulator, existed_sects
         
     except Exception as e:
@@ -386,10 +441,7 @@ def check_save_compatibility(save_path: Path) -> Tuple[bool, str]:
         (是否兼容, 错误信息)
     """
     try:
-        with open(save_path, "r", encoding="utf-8") as f:
-            save_data = json.load(f)
-        
-        meta = save_data.get("meta", {})
+        meta = open_save(save_path).meta
         save_version = meta.get("version", "unknown")
         current_version = CONFIG.meta.version
         
@@ -0,0 +1,356 @@
+"""
+存档文件格式（读取端）
+
+open_save(path) 按文件内容识别格式，返回统一的读取器：
+- header: {"meta", "run_config", "world", "simulator"}
+- iter_avatars(): 逐个产出角色存档字典
+- iter_events(): 逐个产出事件字典
+- read_avatars_at(indices): 按 iter_avatars 中的序号重新读取部分角色（惰性还原的死者用它回读记录）
+
+流式 JSON Lines 与二进制（.cws）存档逐条解析，峰值内存与单条记录同量级；
+旧版整体 JSON 存档仍然整体 json.load（格式本身不支持增量解析）。
+增量存档（meta.delta）由 DeltaSaveReader 叠加到检查点上，见 src/sim/save/journal.py。
+写入端见 src/sim/save/save_format.py。
+"""
+import json
+import re
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from src.sim.save import binary_codec
+from src.sim.save.save_format import DELTA_KEYED_WORLD_FIELDS, HEADER_KEYS, STREAM_FORMAT_NAME
+
+_AVATAR_PREFIX = '{"section": "avatar"'
+_EVENT_PREFIX = '{"section": "event"'
+_FOOTER_PREFIX = '{"section": "footer"'
+
+
+class SaveFormatError(ValueError):
+    """存档文件损坏或格式无法识别。"""
+
+
+# 二进制存档的结构迁移：旧 schema_version -> 把 (kind, record) 升级到下一个版本的函数。
+# 升级 binary_codec.SCHEMA_VERSION 时在这里登记对应的迁移。
+SCHEMA_MIGRATIONS: dict[int, Callable[[int, dict], dict]] = {}
+
+
+def migrate_record(kind: int, record: dict, from_version: int) -> dict:
+    """把一条记录从 from_version 逐级迁移到当前 schema 版本。"""
+    if from_version > binary_codec.SCHEMA_VERSION:
+        raise SaveFormatError(
+            f"Save schema version {from_version} is newer than supported ({binary_codec.SCHEMA_VERSION})"
+        )
+    for version in range(from_version, binary_codec.SCHEMA_VERSION):
+        migration = SCHEMA_MIGRATIONS.get(version)
+        if migration is not None:
+            record = migration(kind, record)
+    return record
+
+
+class SaveReader:
+    """读取器基类。"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.header: dict = {}
+
+    @property
+    def meta(self) -> dict:
+        return self.header.get("meta") or {}
+
+    @property
+    def source_paths(self) -> list[Path]:
+        """读取时用到的文件（增量存档还包括其检查点）。"""
+        return [self.path]
+
+    def iter_avatars(self) -> Iterator[dict]:
+        raise NotImplementedError
+
+    def read_avatars_at(self, indices: Iterable[int]) -> Iterator[tuple[int, dict]]:
+        """按 iter_avatars 中的序号读取指定角色，一次顺序扫描，按序号升序产出 (序号, 记录)。"""
+        wanted = set(indices)
+        if not wanted:
+            return
+        last = max(wanted)
+        for index, record in enumerate(self.iter_avatars()):
+            if index in wanted:
+                yield index, record
+            if index >= last:
+                break
+
+    def iter_events(self) -> Iterator[dict]:
+        raise NotImplementedError
+
+    def to_dict(self) -> dict:
+        """读出完整存档（与旧版整体 JSON 结构一致），用于工具与兼容场景。"""
+        return {
+            **self.header,
+            "avatars": list(self.iter_avatars()),
+            "events": list(self.iter_events()),
+        }
+
+
+class JsonSaveReader(SaveReader):
+    """旧版整体 JSON 存档。"""
+
+    def __init__(self, path: Path, data: Optional[dict] = None):
+        super().__init__(path)
+        if data is None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        self._data = data
+        self.header = {key: data[key] for key in HEADER_KEYS if key in data}
+
+    def iter_avatars(self) -> Iterator[dict]:
+        yield from self._data.get("avatars", []) or []
+
+    def iter_events(self) -> Iterator[dict]:
+        yield from self._data.get("events", []) or []
+
+
+class JsonLinesSaveReader(SaveReader):
+    """流式 JSON Lines 存档。"""
+
+    def __init__(self, path: Path, header: dict):
+        super().__init__(path)
+        if header.get("format") != STREAM_FORMAT_NAME:
+            raise SaveFormatError(f"Unknown save stream format: {header.get('format')}")
+        self.format_version = int(header.get("format_version", 1))
+        self.header = {key: header.get(key) for key in HEADER_KEYS}
+
+    def _iter_section(self, prefix: str) -> Iterator[dict]:
+        found_footer = False
+        with open(self.path, "r", encoding="utf-8") as f:
+            f.readline()  # header
+            for line in f:
+                # 只解析目标段的行，其余行按前缀跳过
+                if line.startswith(prefix):
+                    yield json.loads(line)["data"]
+                elif line.startswith(_FOOTER_PREFIX):
+                    found_footer = True
+                    break
+        if not found_footer:
+            raise SaveFormatError(f"Save file is truncated (missing footer): {self.path.name}")
+
+    def iter_avatars(self) -> Iterator[dict]:
+        return self._iter_section(_AVATAR_PREFIX)
+
+    def iter_events(self) -> Iterator[dict]:
+        return self._iter_section(_EVENT_PREFIX)
+
+    def read_avatars_at(self, indices: Iterable[int]) -> Iterator[tuple[int, dict]]:
+        # 按前缀数行，只解析目标行
+        wanted = set(indices)
+        if not wanted:
+            return
+        last = max(wanted)
+        index = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            f.readline()  # header
+            for line in f:
+                if not line.startswith(_AVATAR_PREFIX):
+                    continue
+                if index in wanted:
+                    yield index, json.loads(line)["data"]
+                if index >= last:
+                    return
+                index += 1
+        raise SaveFormatError(f"Save file is truncated (missing avatar records): {self.path.name}")
+
+
+class BinarySaveReader(SaveReader):
+    """二进制存档（.cws）。"""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        header = None
+        for kind, record in self._iter_records():
+            if kind == binary_codec.KIND_HEADER:
+                header = record
+            break
+        if header is None:
+            raise SaveFormatError(f"Save file has no header: {self.path.name}")
+        self.header = {key: header.get(key) for key in HEADER_KEYS}
+
+    def _iter_records(self) -> Iterator[tuple[int, dict]]:
+        with open(self.path, "rb") as raw:
+            preamble = binary_codec.read_preamble(raw)
+            if preamble is None:
+                raise SaveFormatError(f"Not a binary save: {self.path.name}")
+            self.schema_version, encoding, compression = preamble
+            decode = binary_codec.get_decoder(encoding)
+            stream = binary_codec.open_compressed_reader(raw, compression)
+            try:
+                for kind, payload in binary_codec.iter_frames(stream):
+                    yield kind, migrate_record(kind, decode(payload), self.schema_version)
+            finally:
+                if stream is not raw:
+                    stream.close()
+
+    def _iter_kind(self, target: int) -> Iterator[dict]:
+        found_footer = False
+        for kind, record in self._iter_records():
+            if kind == target:
+                yield record
+            elif kind == binary_codec.KIND_FOOTER:
+                found_footer = True
+                break
+        if not found_footer:
+            raise SaveFormatError(f"Save file is truncated (missing footer): {self.path.name}")
+
+    def iter_avatars(self) -> Iterator[dict]:
+        return self._iter_kind(binary_codec.KIND_AVATAR)
+
+    def iter_events(self) -> Iterator[dict]:
+        return self._iter_kind(binary_codec.KIND_EVENT)
+
+
+def fold_world(base_world: dict, delta_world: dict, removed_entries: dict) -> dict:
+    """把增量存档中的世界字段叠加到检查点上。"""
+    world = dict(base_world)
+    for key, value in delta_world.items():
+        if key in DELTA_KEYED_WORLD_FIELDS and isinstance(value, dict):
+            merged = dict(world.get(key) or {})
+            merged.update(value)
+            world[key] = merged
+        else:
+            world[key] = value
+    for key, gone in (removed_entries or {}).items():
+        merged = dict(world.get(key) or {})
+        for sub in gone:
+            merged.pop(sub, None)
+        world[key] = merged
+    return world
+
+
+class DeltaSaveReader(SaveReader):
+    """
+    增量存档：以 meta.delta.base 指向的检查点为底，叠加增量中的改动。
+
+    对外表现为一份完整存档（header.meta 不含 delta 字段）。
+    """
+
+    def __init__(self, path: Path, delta: SaveReader):
+        super().__init__(path)
+        info = delta.meta.get("delta") or {}
+        self.base_path = self.path.parent / str(info.get("base", ""))
+        if not info.get("base") or not self.base_path.is_file():
+            raise SaveFormatError(f"Checkpoint save for delta not found: {info.get('base')}")
+        self.base = _open_single(self.base_path)
+        if self.base.meta.get("delta"):
+            raise SaveFormatError(f"Delta base must be a full save: {self.base_path.name}")
+        self.delta = delta
+        self.removed_avatars = set(info.get("removed_avatars") or [])
+
+        meta = {k: v for k, v in delta.meta.items() if k != "delta"}
+        self.header = {
+            "meta": meta,
+            "run_config": delta.header.get("run_config") or self.base.header.get("run_config"),
+            "world": fold_world(
+                self.base.header.get("world") or {},
+                delta.header.get("world") or {},
+                info.get("removed_entries") or {},
+            ),
+            "simulator": delta.header.get("simulator") or self.base.header.get("simulator"),
+        }
+
+    @property
+    def source_paths(self) -> list[Path]:
+        return [self.path, self.base_path]
+
+    def iter_avatars(self) -> Iterator[dict]:
+        changed = {a["id"]: a for a in self.delta.iter_avatars()}
+        for avatar in self.base.iter_avatars():
+            if avatar["id"] in self.removed_avatars:
+                continue
+            yield changed.pop(avatar["id"], avatar)
+        yield from changed.values()
+
+    def iter_events(self) -> Iterator[dict]:
+        yield from self.base.iter_events()
+        yield from self.delta.iter_events()
+
+    def iter_delta_events(self) -> Iterator[dict]:
+        """检查点之后新增的事件。"""
+        return self.delta.iter_events()
+
+
+def _is_binary_save(path: Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(binary_codec.MAGIC)) == binary_codec.MAGIC
+
+
+def read_save_header(path: Path) -> Optional[dict]:
+    """
+    只读取流式 / 二进制存档的 header；旧版整体 JSON 返回 None。
+    """
+    if _is_binary_save(path):
+        return BinarySaveReader(path).header
+    with open(path, "r", encoding="utf-8") as f:
+        first_line = f.readline()
+    if not first_line.startswith('{"format"'):
+        return None
+    try:
+        header = json.loads(first_line)
+    except json.JSONDecodeError:
+        return None
+    return header if isinstance(header, dict) else None
+
+
+_JSON_META_PREFIX = re.compile(r'\{\s*"meta"\s*:\s*')
+_META_PROBE_BYTES = 64 * 1024
+
+
+def _read_json_meta_prefix(path: Path) -> Optional[dict]:
+    """
+    整体 JSON 存档由 JsonSaveWriter 写出时 meta 位于文件开头，只需解析前一小段；
+    其他来源的 JSON（meta 不在开头）返回 None。
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(_META_PROBE_BYTES)
+    match = _JSON_META_PREFIX.match(head)
+    if match is None:
+        return None
+    try:
+        meta, _ = json.JSONDecoder().raw_decode(head, match.end())
+    except json.JSONDecodeError:
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def read_save_meta(path: Path) -> dict:
+    """
+    只读取存档的 meta（不叠加增量，保留 meta.delta）。
+
+    流式 / 二进制存档读 header，整体 JSON 读文件开头，都只需很小的读取量；
+    只有旧版 meta 不在开头的 JSON 存档才会整体解析。
+    """
+    path = Path(path)
+    header = read_save_header(path)
+    if header is not None:
+        return header.get("meta") or {}
+    meta = _read_json_meta_prefix(path)
+    if meta is not None:
+        return meta
+    return _open_single(path).meta
+
+
+def open_save(path: Path, fold: bool = True) -> SaveReader:
+    """
+    打开存档，自动识别格式。
+
+    增量存档默认叠加到其检查点上；fold=False 时只读增量文件本身（meta 保留 delta 字段）。
+    """
+    reader = _open_single(Path(path))
+    if fold and reader.meta.get("delta"):
+        return DeltaSaveReader(reader.path, reader)
+    return reader
+
+
+def _open_single(path: Path) -> SaveReader:
+    if _is_binary_save(path):
+        return BinarySaveReader(path)
+    header = read_save_header(path)
+    if header is not None:
+        return JsonLinesSaveReader(path, header)
+    return JsonSaveReader(path)
@@ -1,23 +1,27 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, TYPE_CHECKING, Iterable
+from typing import Dict, List, Optional, Set, TYPE_CHECKING, Iterable
 import itertools
 
 if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
 
 from src.classes.observe import get_observable_avatars
+from src.sim.load.lazy_avatars import DeadAvatarStub
+from src.classes.relation.relation_graph import referrers
 
 @dataclass
 class AvatarManager:
     # 仅存储存活的角色，用于主循环遍历
     avatars: Dict[str, "Avatar"] = field(default_factory=dict)
-    # 存储已死亡的角色（归档）
+    # 存储已死亡的角色（归档）；读档后可能是 LazyAvatarDict，取值时才还原长期未用的死者
     dead_avatars: Dict[str, "Avatar"] = field(default_factory=dict)
     
     # --- 变更缓冲区 (不参与序列化) ---
     _newly_dead_buffer: List[str] = field(default_factory=list, init=False)
     _newly_born_buffer: List[str] = field(default_factory=list, init=False)
+    # 自上次完整存档以来被改动过的角色（增量存档用，见 src/sim/save/journal.py）
+    _save_dirty_ids: Set[str] = field(default_factory=set, init=False)
 
     def register_avatar(self, avatar: "Avatar", is_newly_born: bool = False) -> None:
         """
@@ -42,6 +46,31 @@ class AvatarManager:
         self._newly_born_buffer.clear()
         return res
 
+    def mark_save_dirty(self, avatar_id: str) -> None:
+        """
+        标记角色自上次完整存档以来有改动（按 id，角色可能是未还原的死者存根）。
+
+        角色对象自身的改动由 Avatar.mark_save_dirty / 赋值时的 _save_dirty 标记记录，
+        这里用于只知道 id 的场合（事件涉及的角色、死亡、存根的关系变动等）。
+        """
+        self._save_dirty_ids.add(str(avatar_id))
+
+    def get_save_dirty_ids(self) -> Set[str]:
+        """自上次检查点以来存档数据可能有变化的角色 id。"""
+        dirty = set(self._save_dirty_ids)
+        dirty.update(aid for aid, avatar in self.avatars.items() if avatar._save_dirty)
+        dirty.update(
+            aid for aid, avatar in self.iter_dead_records()
+            if getattr(avatar, "_save_dirty", False)
+        )
+        return dirty
+
+    def clear_save_dirty(self) -> None:
+        self._save_dirty_ids.clear()
+        for avatar in self.iter_all_records():
+            if getattr(avatar, "_save_dirty", False):
+                avatar._save_dirty = False
+
     def get_avatar(self, avatar_id: str) -> "Avatar | None":
         """
         根据 ID 获取角色对象，优先查找活人，再查找死者
@@ -63,6 +92,7 @@ class AvatarManager:
             
             # 记录变更
             self._newly_dead_buffer.append(aid)
+            self._save_dirty_ids.add(aid)
 
     def get_avatars_in_same_region(self, avatar: "Avatar") -> List["Avatar"]:
         """
@@ -97,6 +127,45 @@ class AvatarManager:
         """辅助方法：遍历所有角色（活人+死者）"""
         return itertools.chain(self.avatars.values(), self.dead_avatars.values())
 
+    def iter_dead_records(self) -> Iterable[tuple[str, "Avatar"]]:
+        """
+        遍历已故角色但不触发惰性还原（见 src/sim/load/lazy_avatars.py）。
+
+        值可能是 DeadAvatarStub：只保证 id、name、death_info、to_save_dict 可用。
+        """
+        iter_records = getattr(self.dead_avatars, "iter_records", None)
+        if iter_records is not None:
+            return iter_records()
+        return list(self.dead_avatars.items())
+
+    def iter_all_records(self) -> Iterable["Avatar"]:
+        """遍历所有角色（活人+死者），死者不触发惰性还原。"""
+        return itertools.chain(self.avatars.values(), (avatar for _, avatar in self.iter_dead_records()))
+
+    def iter_dead_save_dicts(self, ids: Optional[Iterable[str]] = None) -> Iterable[dict]:
+        """已故角色（ids 为 None 时全部）的存档数据；未还原的死者从存档批量回读，不触发还原。"""
+        iter_save_dicts = getattr(self.dead_avatars, "iter_save_dicts", None)
+        if iter_save_dicts is not None:
+            return iter_save_dicts(ids)
+        wanted = None if ids is None else set(ids)
+        return (
+            avatar.to_save_dict() for aid, avatar in self.dead_avatars.items()
+            if wanted is None or aid in wanted
+        )
+
+    def iter_save_dicts(self) -> Iterable[dict]:
+        """所有角色（活人+死者）的存档数据，死者不触发惰性还原。"""
+        return itertools.chain(
+            (avatar.to_save_dict() for avatar in self.avatars.values()),
+            self.iter_dead_save_dicts(),
+        )
+
+    def release_save_file(self, path) -> None:
+        """存档文件即将被覆盖或删除：先把仍从它回读记录的死者存根读回内存。"""
+        release_source = getattr(self.dead_avatars, "release_source", None)
+        if release_source is not None:
+            release_source(path)
+
     def cleanup_long_dead_avatars(self, current_time: "MonthStamp", threshold_years: int = 20) -> int:
         """
         清理长期已故的角色。
@@ -112,7 +181,7 @@ class AvatarManager:
             return 0
             
         to_remove = []
-        for aid, avatar in self.dead_avatars.items():
+        for aid, avatar in self.iter_dead_records():
             if avatar.death_info:
                 death_time = avatar.death_info.get("time") # int 类型的时间戳
                 if death_time is not None:
@@ -135,6 +204,11 @@ class AvatarManager:
         此操作不可逆。
         """
         aid = str(avatar_id)
+        record = dict.get(self.dead_avatars, aid)
+        if isinstance(record, DeadAvatarStub):
+            self._remove_dead_stub(record)
+            return
+
         avatar = self.get_avatar(aid)
         
         if avatar is None:
@@ -153,11 +227,10 @@ class AvatarManager:
                     region.host_avatar = None
             avatar.owned_regions.clear()
             
-        # 3. 扫一遍所有角色（含死者），确保清除反向引用
-        for other in self._iter_all_avatars():
-            if other is avatar:
-                continue
-            if getattr(other, "relations", None) is not None and avatar in other.relations:
+        # 3. 沿反向边清除仍引用它的角色（单向写入的残留关系）；
+        #    已还原的角色不会被存根引用（见 lazy_avatars 的不变式），无需扫描存根
+        for other in referrers(avatar):
+            if other is not avatar:
                 other.clear_relation(avatar)
         
         # 4. 清理宗门关系
@@ -171,6 +244,14 @@ class AvatarManager:
         self.avatars.pop(aid, None)
         self.dead_avatars.pop(aid, None)
 
+    def _remove_dead_stub(self, stub: DeadAvatarStub) -> None:
+        """删除未还原的死者：它的关系对象也都是存根，直接改存档数据即可。"""
+        for other_id in stub.relation_ids:
+            other = dict.get(self.dead_avatars, other_id)
+            if isinstance(other, DeadAvatarStub) and other.drop_relation(stub.id):
+                self.mark_save_dirty(other_id)
+        dict.pop(self.dead_avatars, stub.id, None)
+
     def remove_avatars(self, avatar_ids: List[str]) -> None:
         """
         批量删除 avatars，并清理所有关系。
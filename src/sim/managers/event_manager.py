@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional, TYPE_CHECKING
+from typing import Iterable, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.classes.event import Event
@@ -76,12 +76,32 @@ class EventManager:
         if is_null_event(event):
             return
 
+        from src.run.metrics import events_ingested
+        events_ingested().inc()
+
         if self._storage:
             self._storage.add_event(event)
         else:
             # 内存后备模式。
             self._memory_events.append(event)
 
+    def add_events(self, events: Iterable["Event"]) -> int:
+        """
+        批量添加事件（SQLite 模式下只提交一次），返回实际写入的条数。
+        """
+        from src.classes.event import is_null_event
+        batch = [event for event in events if not is_null_event(event)]
+        if not batch:
+            return 0
+
+        from src.run.metrics import events_ingested
+        events_ingested().inc(len(batch))
+
+        if self._storage:
+            return self._storage.add_events(batch)
+        self._memory_events.extend(batch)
+        return len(batch)
+
     def get_recent_events(self, limit: int = 100) -> List["Event"]:
         """获取最近的事件（时间正序）。"""
         if self._storage:
@@ -237,6 +257,30 @@ class EventManager:
             self._memory_events.clear()
             return count
 
+    def backup_to(self, dest_path: Path) -> bool:
+        """
+        把 SQLite 事件库快照到 dest_path（在线备份，写入中的事务不会被拷进去）。
+
+        Returns:
+            是否写出了快照（内存模式返回 False）。
+        """
+        if not self._storage:
+            return False
+        self._storage.backup_to(dest_path)
+        return True
+
+    def last_rowid(self) -> int:
+        """当前写入位置（SQLite rowid；内存模式为事件条数）。"""
+        if self._storage:
+            return self._storage.last_rowid()
+        return len(self._memory_events)
+
+    def get_events_since(self, rowid: int) -> List["Event"]:
+        """获取 last_rowid() 为 rowid 之后新增的事件（写入顺序）。"""
+        if self._storage:
+            return self._storage.get_events_since(rowid)
+        return list(self._memory_events[rowid:])
+
     def count(self) -> int:
         """获取事件总数。"""
         if self._storage:
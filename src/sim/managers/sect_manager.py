@@ -1,6 +1,11 @@
-import math
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：未安装时按行区间逐格填充
+    np = None
 
 from src.classes.event import Event
 from src.systems.battle import get_base_strength
@@ -19,6 +24,45 @@ class SectTerritorySnapshot:
     active_sects: List["Sect"]
     sect_centers: Dict[int, Tuple[int, int]]
     tile_owners: Dict[Tuple[int, int], List[int]]
+    # 按格展开（行优先）的图层：每格占据宗门数，以及占据宗门的 bitmask（位见 sect_bits）
+    width: int = 0
+    height: int = 0
+    owner_counts: Optional[array] = None
+    influence: Optional[array] = None
+    sect_bits: Dict[int, int] = field(default_factory=dict)
+
+    def as_arrays(self) -> dict:
+        """
+        供地图叠加层使用的数组形式：mask 的第 i 位对应 sect_ids[i]。
+        宗门位按本快照的 sect_ids 重新编号，保证活跃宗门不多时数值足够小（前端按 JS number 读取）。
+        """
+        sect_ids = list(self.sect_bits)
+        if self.influence is None:
+            return {"width": self.width, "height": self.height, "sect_ids": [], "owner_counts": [], "masks": []}
+        remap = [(bit, 1 << i) for i, bit in enumerate(self.sect_bits.values())]
+        masks = []
+        for mask in self.influence:
+            packed = 0
+            if mask:
+                for bit, new_bit in remap:
+                    if mask & bit:
+                        packed |= new_bit
+            masks.append(packed)
+        return {
+            "width": self.width,
+            "height": self.height,
+            "sect_ids": sect_ids,
+            "owner_counts": list(self.owner_counts),
+            "masks": masks,
+        }
+
+    def as_numpy(self):
+        """返回 (owner_counts, influence) 两个 (height, width) 的 numpy 数组。需要安装 numpy。"""
+        if np is None:
+            raise ImportError("numpy is required for SectTerritorySnapshot.as_numpy")
+        counts = np.frombuffer(self.owner_counts, dtype=self.owner_counts.typecode)
+        masks = np.frombuffer(self.influence, dtype=self.influence.typecode)
+        return counts.reshape(self.height, self.width), masks.reshape(self.height, self.width)
 
 
 class SectManager:
@@ -52,21 +96,9 @@ class SectManager:
         计算并更新宗门的总战力与势力半径。
         半径公式：int(total_strength) // 10 + 1
         """
-        # 直接通过宗门的 members 属性获取存活的成员
-        members = [m for m in sect.members.values() if not getattr(m, "is_dead", False)]
-
-        # 计算总战力: log(sum(exp(成员战力)))，使用 max trick 保持数值稳定
-        total_strength = 0.0
-        if members:
-            strengths = [float(get_base_strength(m)) for m in members]
-            if strengths:
-                max_str = max(strengths)
-                # 防止 exp 溢出，限制上限
-                sum_exp = sum(
-                    math.exp(max(-500.0, min(s - max_str, 500.0)))
-                    for s in strengths
-                )
-                total_strength = max_str + math.log(sum_exp)
+        # 总战力: log(sum(exp(成员战力)))，由宗门按月缓存，与宗门榜共享
+        month = int(getattr(self.world, "month_stamp", 0))
+        total_strength = sect.get_strength_summary(get_base_strength, month).combined
 
         sect.total_battle_strength = max(0.0, total_strength)
         sect.influence_radius = int(sect.total_battle_strength) // 10 + 1
@@ -96,33 +128,73 @@ class SectManager:
         # 只保留当前实际存在的宗门
         return {sect.id: centers[sect.id] for sect in sects if sect.id in centers}
 
-    def _iter_influence_tiles(
-        self, center_x: int, center_y: int, radius: int, game_map: "Map"
-    ) -> Iterator[Tuple[int, int]]:
+    def _fill_territory(
+        self, claims: List[Tuple[int, int, int, int]], game_map: "Map"
+    ) -> Tuple[Dict[Tuple[int, int], List[int]], array]:
         """
-        枚举以 (center_x, center_y) 为中心、曼哈顿半径为 radius 的菱形范围内所有有效格子。
-        """
-        if radius <= 0:
-            return
-
-        for dx in range(-radius, radius + 1):
-            max_dy = radius - abs(dx)
-            for dy in range(-max_dy, max_dy + 1):
-                x = center_x + dx
-                y = center_y + dy
-                if game_map.is_in_bounds(x, y) and (x, y) in game_map.tiles:
-                    yield (x, y)
+        按 claims = [(sect_id, center_x, center_y, radius), ...] 填充势力范围：
+        每个宗门占据以总部为中心、曼哈顿半径为 radius 的菱形内所有有效格子。
 
-    def _compute_snapshot(self) -> SectTerritorySnapshot:
+        结果写入地图的 influence 图层，并返回 (tile_owners, owner_counts)。
+        tile_owners 的插入顺序与逐宗门、x 外层 y 内层的枚举顺序一致（收入按此顺序累加）。
+        """
+        grid = game_map.tiles
+        width, height = grid.width, grid.height
+        size = width * height
+        grid.clear_influence()
+        owner_counts = array("H", bytes(2 * size))
+        tile_owners: Dict[Tuple[int, int], List[int]] = {}
+        # 地图通常铺满；否则需要逐格确认存在地块
+        sparse = len(grid) != size
+
+        if np is not None:
+            influence = grid.as_numpy("influence")
+            counts = np.frombuffer(owner_counts, dtype=owner_counts.typecode).reshape(height, width)
+            present = None
+            if sparse:
+                present = np.array([[(x, y) in grid for x in range(width)] for y in range(height)], dtype=bool)
+            xs, ys = np.arange(width), np.arange(height)
+            for sect_id, cx, cy, radius in claims:
+                bit = grid.sect_bit(sect_id)
+                mask = (np.abs(ys - cy)[:, None] + np.abs(xs - cx)[None, :]) <= radius
+                if present is not None:
+                    mask &= present
+                influence[mask] |= np.uint64(bit)
+                counts += mask
+                # 转置后 nonzero 按 x 外层、y 内层排列
+                for x, y in zip(*np.nonzero(mask.T)):
+                    tile_owners.setdefault((int(x), int(y)), []).append(sect_id)
+            return tile_owners, owner_counts
+
+        influence = grid.influence
+        for sect_id, cx, cy, radius in claims:
+            bit = grid.sect_bit(sect_id)
+            for x in range(max(0, cx - radius), min(width - 1, cx + radius) + 1):
+                span = radius - abs(x - cx)
+                for y in range(max(0, cy - span), min(height - 1, cy + span) + 1):
+                    if sparse and (x, y) not in grid:
+                        continue
+                    idx = y * width + x
+                    influence[idx] |= bit
+                    owner_counts[idx] += 1
+                    owners = tile_owners.get((x, y))
+                    if owners is None:
+                        tile_owners[(x, y)] = [sect_id]
+                    else:
+                        owners.append(sect_id)
+        return tile_owners, owner_counts
+
+    def _compute_snapshot(self, active_sects: Optional[List["Sect"]] = None) -> SectTerritorySnapshot:
         """
         计算当前世界下宗门势力范围的快照。
         统一完成：
         - active_sects 收集
         - 战力与半径更新
         - 总部中心坐标
-        - tile_owners 填充
+        - tile_owners 与按格图层填充
         """
-        active_sects = self._collect_active_sects()
+        if active_sects is None:
+            active_sects = self._collect_active_sects()
         tile_owners: Dict[Tuple[int, int], List[int]] = {}
         sect_centers: Dict[int, Tuple[int, int]] = {}
 
@@ -140,28 +212,54 @@ class SectManager:
             # 与旧逻辑保持一致：若无法确定中心，则不再枚举 tile_owners
             return SectTerritorySnapshot(active_sects=active_sects, sect_centers=sect_centers, tile_owners=tile_owners)
 
-        # 3. 枚举每个宗门的势力范围，记录占据格子
+        # 3. 填充每个宗门的势力范围
+        claims = []
         for sect in active_sects:
             center = sect_centers.get(sect.id)
             radius = getattr(sect, "influence_radius", 0)
             if center is None or radius <= 0:
                 continue
-
-            cx, cy = center
-            for x, y in self._iter_influence_tiles(cx, cy, radius, game_map):
-                owners = tile_owners.setdefault((x, y), [])
-                owners.append(sect.id)
-
-        return SectTerritorySnapshot(active_sects=active_sects, sect_centers=sect_centers, tile_owners=tile_owners)
+            claims.append((sect.id, center[0], center[1], radius))
+
+        tile_owners, owner_counts = self._fill_territory(claims, game_map)
+        grid = game_map.tiles
+        return SectTerritorySnapshot(
+            active_sects=active_sects,
+            sect_centers=sect_centers,
+            tile_owners=tile_owners,
+            width=grid.width,
+            height=grid.height,
+            owner_counts=owner_counts,
+            influence=array("Q", grid.influence),
+            sect_bits={sect_id: grid.sect_bit(sect_id) for sect_id, _, _, _ in claims},
+        )
 
     def get_snapshot(self) -> SectTerritorySnapshot:
         """
         返回当前世界下宗门势力范围的快照。
 
-        - 统一封装 _compute_sect_centers / _iter_influence_tiles 等内部细节；
-        - 供其他系统（关系计算、决策上下文等）复用，避免在多处重复实现相同逻辑。
+        - 统一封装 _compute_sect_centers / _fill_territory 等内部细节；
+        - 供其他系统（关系计算、决策上下文等）复用，避免在多处重复实现相同逻辑；
+        - 结果缓存在 world 上，同一个月内所有调用方（包括各自新建的 SectManager）共享同一份快照，
+          本局宗门启用状态（World.territory_version）、宗门总部（Map.sect_regions_version）、
+          活跃宗门集合或其中任一宗门的成员版本（Sect.member_version）变化时重算。快照为只读共享对象。
         """
-        return self._compute_snapshot()
+        active_sects = self._collect_active_sects()
+        game_map = getattr(self.world, "map", None)
+        key = (
+            int(getattr(self.world, "month_stamp", 0)),
+            getattr(self.world, "territory_version", 0),
+            id(game_map),
+            getattr(game_map, "sect_regions_version", 0),
+            tuple((id(sect), sect.member_version) for sect in active_sects),
+        )
+        cached = getattr(self.world, "_territory_snapshot", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        snapshot = self._compute_snapshot(active_sects)
+        self.world._territory_snapshot = (key, snapshot)
+        return snapshot
 
     def get_tile_owners(self) -> Tuple[List["Sect"], Dict[Tuple[int, int], List[int]]]:
         """
@@ -188,7 +286,7 @@ class SectManager:
         """
         events: List[Event] = []
 
-        snapshot = self._compute_snapshot()
+        snapshot = self.get_snapshot()
         active_sects = snapshot.active_sects
         tile_owners = snapshot.tile_owners
 
@@ -208,16 +306,20 @@ class SectManager:
         current_month = int(self.world.month_stamp)
         sect_by_id = {int(s.id): s for s in active_sects}
 
+        # 每格产出只与宗门有关，先按宗门算好；冲突格按占据数平分
+        income_per_tile: Dict[int, float] = {}
+        for sid, sect in sect_by_id.items():
+            extra_income = float(sect.get_extra_income_per_tile(current_month))
+            income_per_tile[sid] = max(0.0, base_income + extra_income)
+
         for owners in tile_owners.values():
             n = len(owners)
             if n == 0:
                 continue
             for sid in owners:
-                sect = sect_by_id.get(int(sid))
-                if sect is None:
+                effective_income_per_tile = income_per_tile.get(int(sid))
+                if effective_income_per_tile is None:
                     continue
-                extra_income = float(sect.get_extra_income_per_tile(current_month))
-                effective_income_per_tile = max(0.0, base_income + extra_income)
                 share = effective_income_per_tile / n
                 income_by_sect_id[sid] = income_by_sect_id.get(sid, 0.0) + share
 
@@ -14,7 +14,10 @@ def __getattr__(name):
     elif name == "list_saves":
         from .save_game import list_saves
         return list_saves
+    elif name == "save_incremental":
+        from .journal import save_incremental
+        return save_incremental
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ["save_game", "get_save_info", "list_saves"]
+__all__ = ["save_game", "get_save_info", "list_saves", "save_incremental"]
 
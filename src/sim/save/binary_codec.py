@@ -0,0 +1,170 @@
+"""
+二进制存档容器（.cws）
+
+文件布局：
+    magic(8) | schema_version(u16) | encoding(u8) | compression(u8) | 压缩后的记录流
+
+记录流由若干帧组成，每帧为 kind(u8) | length(u32) | payload，payload 为单条记录的编码结果。
+帧顺序与流式 JSON Lines 存档一致：header、avatar...、event...、footer。
+
+编码与压缩按可用依赖选择，写入时记录在文件头中，读取端据此解码：
+- 编码：msgpack（需安装 msgpack）或紧凑 JSON（标准库）
+- 压缩：zstd（需安装 zstandard）或 gzip（标准库）
+msgpack 与 zstandard 列在 requirements.txt 中；缺失时退回标准库格式，并在首次写入时记录一条警告。
+"""
+import gzip
+import json
+import struct
+from typing import IO, Any, Callable, Iterator, Optional
+
+try:
+    import msgpack
+except ImportError:  # 可选依赖
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖
+    zstandard = None
+
+MAGIC = b"CWSSAVE\x00"
+SCHEMA_VERSION = 1
+
+_PREAMBLE = struct.Struct(">HBB")
+_FRAME = struct.Struct(">BI")
+
+ENCODING_JSON = 0
+ENCODING_MSGPACK = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_GZIP = 1
+COMPRESSION_ZSTD = 2
+
+KIND_HEADER = 0
+KIND_AVATAR = 1
+KIND_EVENT = 2
+KIND_FOOTER = 3
+
+
+_fallback_logged = False
+
+
+def _log_fallback_once() -> None:
+    global _fallback_logged
+    if _fallback_logged:
+        return
+    _fallback_logged = True
+    missing = [name for name, module in (("msgpack", msgpack), ("zstandard", zstandard)) if module is None]
+    from src.run.log import get_logger
+    get_logger().logger.warning(
+        "Binary saves fall back to JSON/gzip because %s is not installed (pip install -r requirements.txt)",
+        " and ".join(missing),
+    )
+
+
+def default_encoding() -> int:
+    if msgpack is None:
+        _log_fallback_once()
+        return ENCODING_JSON
+    return ENCODING_MSGPACK
+
+
+def default_compression() -> int:
+    if zstandard is None:
+        _log_fallback_once()
+        return COMPRESSION_GZIP
+    return COMPRESSION_ZSTD
+
+
+def _json_compatible(value: Any) -> Any:
+    """与 JSON 往返后的结果保持一致（字典键转为字符串、元组转为列表），保证两种编码读出的数据相同。"""
+    if isinstance(value, dict):
+        return {k if isinstance(k, str) else json.dumps(k): _json_compatible(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_compatible(v) for v in value]
+    return value
+
+
+def get_encoder(encoding: int) -> Callable[[Any], bytes]:
+    if encoding == ENCODING_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to write this save")
+        return lambda value: msgpack.packb(_json_compatible(value), use_bin_type=True)
+    return lambda value: json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def get_decoder(encoding: int) -> Callable[[bytes], Any]:
+    if encoding == ENCODING_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to read this save")
+        return lambda data: msgpack.unpackb(data, raw=False)
+    return lambda data: json.loads(data.decode("utf-8"))
+
+
+def write_preamble(raw: IO[bytes], encoding: int, compression: int) -> None:
+    raw.write(MAGIC)
+    raw.write(_PREAMBLE.pack(SCHEMA_VERSION, encoding, compression))
+
+
+def read_preamble(raw: IO[bytes]) -> Optional[tuple[int, int, int]]:
+    """读取文件头，返回 (schema_version, encoding, compression)；不是二进制存档时返回 None。"""
+    if raw.read(len(MAGIC)) != MAGIC:
+        return None
+    data = raw.read(_PREAMBLE.size)
+    if len(data) != _PREAMBLE.size:
+        return None
+    return _PREAMBLE.unpack(data)
+
+
+def open_compressed_writer(raw: IO[bytes], compression: int) -> IO[bytes]:
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to write this save")
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+    if compression == COMPRESSION_GZIP:
+        # 存档以速度优先，低压缩级别已能消除大部分重复键名
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=3, mtime=0)
+    return raw
+
+
+def open_compressed_reader(raw: IO[bytes], compression: int) -> IO[bytes]:
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this save")
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+    if compression == COMPRESSION_GZIP:
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    return raw
+
+
+def write_frame(stream: IO[bytes], kind: int, payload: bytes) -> None:
+    stream.write(_FRAME.pack(kind, len(payload)))
+    stream.write(payload)
+
+
+def iter_frames(stream: IO[bytes]) -> Iterator[tuple[int, bytes]]:
+    """逐帧读取，文件意外结束时停止（由调用方根据是否见到 footer 判断截断）。"""
+    while True:
+        head = _read_exact(stream, _FRAME.size)
+        if head is None:
+            return
+        kind, length = _FRAME.unpack(head)
+        payload = _read_exact(stream, length)
+        if payload is None:
+            return
+        yield kind, payload
+
+
+def _read_exact(stream: IO[bytes], size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        try:
+            chunk = stream.read(remaining)
+        except EOFError:
+            return None
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
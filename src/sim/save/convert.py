@@ -0,0 +1,88 @@
+"""
+存档格式转换工具
+
+用法：
+    python -m src.sim.save.convert assets/saves/a.json assets/saves/a.cws
+    python -m src.sim.save.convert assets/saves/a.cws assets/saves/a.json
+
+目标格式由目标文件扩展名决定（.json / .jsonl / .cws）。
+文件名主干不同时，会一并快照对应的事件数据库。
+增量存档会先叠加到其检查点上，转换结果是一份完整存档。
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.classes.event_storage import snapshot_database
+from src.sim.load.load_game import get_events_db_path
+from src.sim.load.save_reader import DeltaSaveReader, open_save
+from src.sim.save.save_format import open_save_writer
+
+
+def convert_save(src: Path, dst: Path) -> tuple[int, int]:
+    """
+    转换存档格式，逐条读写，不整体载入。
+
+    Returns:
+        (角色数, 事件数)
+    """
+    src, dst = Path(src), Path(dst)
+    if src.resolve() == dst.resolve():
+        raise ValueError("Source and destination must differ")
+
+    reader = open_save(src)
+    with open_save_writer(dst) as writer:
+        writer.write_header(reader.header)
+        for avatar in reader.iter_avatars():
+            writer.write_avatar(avatar)
+        for event in reader.iter_events():
+            writer.write_event(event)
+        writer.write_footer()
+
+    src_db, dst_db = get_events_db_path(src), get_events_db_path(dst)
+    if isinstance(reader, DeltaSaveReader) and not src_db.exists():
+        # 增量存档转为完整存档：事件库取检查点的，再补写增量事件
+        base_db = get_events_db_path(reader.base_path)
+        if base_db.exists():
+            snapshot_database(base_db, dst_db)
+            _append_events(dst_db, reader.iter_delta_events())
+    elif src_db != dst_db and src_db.exists():
+        snapshot_database(src_db, dst_db)
+    return writer.avatar_count, writer.event_count
+
+
+def _append_events(db_path: Path, events) -> None:
+    from src.classes.event import Event
+    from src.classes.event_storage import EventStorage
+
+    storage = EventStorage(db_path)
+    try:
+        for event_data in events:
+            storage.add_event(Event.from_dict(event_data))
+    finally:
+        storage.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.sim.save.convert",
+        description="Convert a save between the .json, .jsonl and .cws formats.",
+    )
+    parser.add_argument("src", type=Path)
+    parser.add_argument("dst", type=Path)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    avatars, events = convert_save(args.src, args.dst)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Converted {args.src.name} -> {args.dst.name}: {avatars} avatars, {events} events, "
+        f"{args.src.stat().st_size} -> {args.dst.stat().st_size} bytes in {elapsed:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+增量存档（检查点 + 增量）
+
+自动存档不必每次都写出完整快照并复制整份事件数据库：
+- 检查点：一次完整存档（save_game），同时记录每个角色、每个世界字段的指纹
+  以及事件库的写入位置
+- 增量：只包含自检查点以来变化的角色、世界字段（区域 / 宗门按条目）、
+  被移除的角色和新增事件；增量相对检查点累计，读档只需 检查点 + 最新一份增量
+
+增量文件与普通存档同格式（按扩展名），meta 中的 delta 字段指向检查点文件；
+读取端 open_save 会自动叠加（见 save_reader.DeltaSaveReader）。
+
+改动检测：
+- 角色只在被标记为脏时才重新序列化：给存档字段赋值（Avatar.__setattr__）、
+  原地修改背包 / 修为 / HP / 关系 / 行动状态的方法（Avatar.mark_save_dirty）、
+  本月事件涉及的角色与死者（AvatarManager.mark_save_dirty）；检查点时清空标记
+- config.yml 中 save.verify_delta 为 true 时，还会比对未标记角色的指纹（检查点时记录），
+  发现漏标的改动时告警并补写，用于排查漏掉的标记
+- 世界字段体量小，逐字段比对指纹
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional
+
+if TYPE_CHECKING:
+    from src.classes.core.world import World
+    from src.sim.simulator import Simulator
+    from src.classes.core.sect import Sect
+
+from src.utils.config import CONFIG
+from src.sim.save.save_format import DELTA_KEYED_WORLD_FIELDS, get_save_suffix, open_save_writer
+from src.sim.save.save_index import record_save
+
+
+def fingerprint(value: Any) -> str:
+    """存档数据的内容指纹。"""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def is_delta_verification_enabled() -> bool:
+    return bool(getattr(CONFIG.save, "verify_delta", False))
+
+
+def get_checkpoint_interval() -> int:
+    """两次完整存档之间最多写几份增量存档（config.yml 中的 save.checkpoint_interval，0 表示不用增量）。"""
+    return max(0, int(getattr(CONFIG.save, "checkpoint_interval", 0) or 0))
+
+
+def _world_fingerprints(world_data: dict) -> dict:
+    fps: dict = {}
+    for key, value in world_data.items():
+        if key in DELTA_KEYED_WORLD_FIELDS and isinstance(value, dict):
+            fps[key] = {sub: fingerprint(item) for sub, item in value.items()}
+        else:
+            fps[key] = fingerprint(value)
+    return fps
+
+
+class SaveJournal:
+    """
+    记录最近一次检查点的状态，用于生成增量存档。
+
+    挂在 world.save_journal 上，不参与序列化；读档后的世界没有日志，
+    下一次自动存档会先写检查点。
+    """
+
+    def __init__(self, checkpoint_interval: Optional[int] = None):
+        self.checkpoint_interval = get_checkpoint_interval() if checkpoint_interval is None else checkpoint_interval
+        self.base_path: Optional[Path] = None
+        self.playthrough_id = ""
+        self.sequence = 0
+        self.event_rowid = 0
+        # 检查点中的角色 id -> 指纹（只在 verify_delta 时计算，否则为 None）
+        self._avatar_fps: dict[str, Optional[str]] = {}
+        self._world_fps: dict = {}
+        self._pending: Optional[tuple[dict, dict, int]] = None
+        self._verify = False
+
+    # ---------- 检查点（由 save_game 调用） ----------
+
+    def begin_checkpoint(self, world: "World", header: dict) -> None:
+        self._verify = is_delta_verification_enabled()
+        self._pending = ({}, _world_fingerprints(header["world"]), world.event_manager.last_rowid())
+
+    def record_avatar(self, data: dict) -> None:
+        if self._pending is not None:
+            self._pending[0][str(data["id"])] = fingerprint(data) if self._verify else None
+
+    def commit_checkpoint(self, world: "World", save_path: Path) -> None:
+        if self._pending is None:
+            return
+        self._avatar_fps, self._world_fps, self.event_rowid = self._pending
+        self._pending = None
+        self.base_path = Path(save_path)
+        self.playthrough_id = getattr(world, "playthrough_id", "")
+        self.sequence = 0
+        world.avatar_manager.clear_save_dirty()
+
+    # ---------- 增量 ----------
+
+    def can_write_delta(self, world: "World") -> bool:
+        return (
+            self.base_path is not None
+            and self.playthrough_id == getattr(world, "playthrough_id", "")
+            and self.base_path.exists()
+            and self.sequence < self.checkpoint_interval
+        )
+
+    def _diff_world(self, world_data: dict) -> tuple[dict, dict]:
+        """返回 (改动的世界字段, 各按条目字段中被删除的条目)。"""
+        changed: dict = {}
+        removed: dict = {}
+        for key, value in world_data.items():
+            old = self._world_fps.get(key)
+            if key in DELTA_KEYED_WORLD_FIELDS and isinstance(value, dict) and isinstance(old, dict):
+                entries = {sub: item for sub, item in value.items() if old.get(sub) != fingerprint(item)}
+                gone = sorted(set(old) - set(value))
+                if entries:
+                    changed[key] = entries
+                if gone:
+                    removed[key] = gone
+            elif old != fingerprint(value):
+                changed[key] = value
+        return changed, removed
+
+    def write_delta(
+        self,
+        world: "World",
+        simulator: "Simulator",
+        existed_sects: List["Sect"],
+        save_path: Optional[Path] = None,
+        is_auto_save: bool = True,
+    ) -> Path:
+        """写出自检查点以来的增量存档，返回存档路径。"""
+        from src.sim.save.save_game import build_save_header
+
+        if self.base_path is None:
+            raise RuntimeError("No checkpoint to write a delta against")
+
+        if save_path is None:
+            # 增量以检查点命名，避免与同一秒内写出的检查点重名
+            save_path = self.base_path.with_name(f"{self.base_path.stem}_d{self.sequence + 1}{get_save_suffix()}")
+        save_path = Path(save_path)
+        if save_path.resolve() == self.base_path.resolve():
+            raise ValueError("Delta save cannot overwrite its checkpoint")
+        header = build_save_header(world, simulator, existed_sects, save_path, is_auto_save=is_auto_save)
+        header["world"], removed_entries = self._diff_world(header["world"])
+
+        manager = world.avatar_manager
+        current_ids = set(manager.avatars) | set(manager.dead_avatars)
+        header["meta"]["delta"] = {
+            "base": self.base_path.name,
+            "sequence": self.sequence + 1,
+            "removed_avatars": sorted(set(self._avatar_fps) - current_ids),
+            "removed_entries": removed_entries,
+        }
+
+        # 未被标记的角色自检查点以来没有变化，不必重新序列化
+        dirty_ids = manager.get_save_dirty_ids()
+
+        def changed(aid: str) -> bool:
+            return aid in dirty_ids or aid not in self._avatar_fps
+
+        with open_save_writer(save_path) as writer:
+            writer.write_header(header)
+            for aid, avatar in manager.avatars.items():
+                if changed(aid):
+                    writer.write_avatar(avatar.to_save_dict())
+                elif self._verify:
+                    self._verify_clean(avatar.to_save_dict(), writer)
+            changed_dead = [aid for aid, _ in manager.iter_dead_records() if changed(aid)]
+            for data in manager.iter_dead_save_dicts(changed_dead):
+                writer.write_avatar(data)
+            if self._verify:
+                clean_dead = [aid for aid, _ in manager.iter_dead_records() if not changed(aid)]
+                for data in manager.iter_dead_save_dicts(clean_dead):
+                    self._verify_clean(data, writer)
+            for event in world.event_manager.get_events_since(self.event_rowid):
+                writer.write_event(event.to_dict())
+            writer.write_footer()
+
+        self.sequence += 1
+        record_save(save_path, header["meta"])
+        print(
+            f"Delta saved to: {save_path} (base {self.base_path.name}, "
+            f"{writer.avatar_count} avatars, {writer.event_count} events)"
+        )
+        return save_path
+
+    def _verify_clean(self, data: dict, writer) -> None:
+        """verify_delta：未标记的角色指纹却变了，说明有改动漏标了 mark_save_dirty。"""
+        from src.run.log import get_logger
+
+        aid = str(data["id"])
+        if self._avatar_fps.get(aid) not in (None, fingerprint(data)):
+            get_logger().logger.warning("Delta save: avatar %s changed without being marked dirty", aid)
+            writer.write_avatar(data)
+
+
+def save_incremental(
+    world: "World",
+    simulator: "Simulator",
+    existed_sects: List["Sect"],
+    is_auto_save: bool = True,
+) -> tuple[bool, Optional[str]]:
+    """
+    按检查点间隔写出增量存档或新的检查点（完整存档）。
+
+    Returns:
+        (保存是否成功, 保存的文件名)
+    """
+    from src.sim.save.save_game import save_game
+
+    journal: Optional[SaveJournal] = getattr(world, "save_journal", None)
+    if journal is not None and journal.can_write_delta(world):
+        try:
+            path = journal.write_delta(world, simulator, existed_sects, is_auto_save=is_auto_save)
+            return True, path.name
+        except Exception as e:
+            # 增量失败时退回完整存档
+            print(f"Failed to write delta save, falling back to a full save: {e}")
+
+    journal = SaveJournal()
+    if journal.checkpoint_interval <= 0:
+        return save_game(world, simulator, existed_sects, is_auto_save=is_auto_save)
+    ok, filename = save_game(world, simulator, existed_sects, is_auto_save=is_auto_save, journal=journal)
+    if ok:
+        world.save_journal = journal
+    return ok, filename
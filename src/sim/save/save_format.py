@@ -0,0 +1,267 @@
+"""
+存档文件格式（写入端）
+
+存档在逻辑上由以下部分组成：
+- header: meta / run_config / world / simulator 等小体量数据
+- avatars: 每个角色一条记录（to_save_dict 的结果）
+- events: 最近 N 条事件（仅用于旧存档迁移）
+
+写入端按顺序逐条写出，不需要先在内存中拼出整份存档。具体格式由扩展名决定：
+- .json:  单个 JSON 对象（旧格式，json.load 可直接读取），逐条写出
+- .jsonl: 流式 JSON Lines，首行 header，之后每行一条记录，最后一行 footer；
+          读取端可以逐行解析，footer 缺失即视为文件被截断
+- .cws:   紧凑二进制（msgpack 或紧凑 JSON + zstd 或 gzip），帧结构同 .jsonl，见 binary_codec.py
+
+新存档使用的格式由 config.yml 中的 save.format 决定（默认 json）。
+读取端见 src/sim/load/save_reader.py。
+"""
+import json
+import os
+from pathlib import Path
+from typing import IO, Optional
+
+from src.sim.save import binary_codec
+from src.utils.config import CONFIG
+
+STREAM_FORMAT_NAME = "cws-save-stream"
+STREAM_FORMAT_VERSION = 1
+
+# 顶层 header 中的字段顺序
+HEADER_KEYS = ("meta", "run_config", "world", "simulator")
+
+# 增量存档中按条目（区域 id / 宗门 id）记录改动的世界字段，其余字段整体覆盖
+DELTA_KEYED_WORLD_FIELDS = ("cultivate_regions_hosts", "regions_status", "sect_runtime_effects")
+
+
+class SaveWriter:
+    """
+    存档写入器基类。
+
+    先写入临时文件，close() 成功后再原子替换目标文件，
+    写入中途失败不会损坏已有存档。
+    """
+
+    suffix = ""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._file: Optional[IO] = None
+        self.avatar_count = 0
+        self.event_count = 0
+
+    def __enter__(self) -> "SaveWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._open(self._tmp_path)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _open(self, path: Path) -> IO:
+        return open(path, "w", encoding="utf-8")
+
+    def write_header(self, header: dict) -> None:
+        raise NotImplementedError
+
+    def write_avatar(self, data: dict) -> None:
+        raise NotImplementedError
+
+    def write_event(self, data: dict) -> None:
+        raise NotImplementedError
+
+    def write_footer(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+
+class JsonSaveWriter(SaveWriter):
+    """
+    旧版整体 JSON 格式，但按记录逐条写出。
+
+    输出仍是一个合法的 JSON 对象：{"meta", "run_config", "world", "simulator", "avatars", "events"}。
+    """
+
+    suffix = ".json"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._section: Optional[str] = None
+        self._first = True
+
+    def _dump(self, value) -> str:
+        return json.dumps(value, ensure_ascii=False, indent=2)
+
+    def _open_list(self, name: str) -> None:
+        if self._section is not None:
+            self._file.write("\n  ]")
+        self._file.write(f',\n  "{name}": [')
+        self._section = name
+        self._first = True
+
+    def _write_item(self, name: str, data: dict) -> None:
+        if self._section != name:
+            # avatars 段必须在 events 段之前出现
+            if name == "events" and self._section is None:
+                self._open_list("avatars")
+            self._open_list(name)
+        self._file.write(("\n    " if self._first else ",\n    ") + self._dump(data))
+        self._first = False
+
+    def write_header(self, header: dict) -> None:
+        parts = [f'  "{key}": {self._dump(header.get(key))}' for key in HEADER_KEYS]
+        self._file.write("{\n" + ",\n".join(parts))
+
+    def write_avatar(self, data: dict) -> None:
+        self._write_item("avatars", data)
+        self.avatar_count += 1
+
+    def write_event(self, data: dict) -> None:
+        self._write_item("events", data)
+        self.event_count += 1
+
+    def write_footer(self) -> None:
+        if self._section is None:
+            self._open_list("avatars")
+        if self._section == "avatars":
+            self._open_list("events")
+        self._file.write("\n  ]\n}\n")
+
+
+class JsonLinesSaveWriter(SaveWriter):
+    """流式 JSON Lines 格式。"""
+
+    suffix = ".jsonl"
+
+    def _write_line(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+
+    def write_header(self, header: dict) -> None:
+        self._write_line({
+            "format": STREAM_FORMAT_NAME,
+            "format_version": STREAM_FORMAT_VERSION,
+            **{key: header.get(key) for key in HEADER_KEYS},
+        })
+
+    def write_avatar(self, data: dict) -> None:
+        self._write_line({"section": "avatar", "data": data})
+        self.avatar_count += 1
+
+    def write_event(self, data: dict) -> None:
+        self._write_line({"section": "event", "data": data})
+        self.event_count += 1
+
+    def write_footer(self) -> None:
+        self._write_line({
+            "section": "footer",
+            "avatar_count": self.avatar_count,
+            "event_count": self.event_count,
+        })
+
+
+class BinarySaveWriter(SaveWriter):
+    """紧凑二进制格式（.cws）。"""
+
+    suffix = ".cws"
+
+    def __init__(self, path: Path, encoding: Optional[int] = None, compression: Optional[int] = None):
+        super().__init__(path)
+        self.encoding = binary_codec.default_encoding() if encoding is None else encoding
+        self.compression = binary_codec.default_compression() if compression is None else compression
+        self._encode = binary_codec.get_encoder(self.encoding)
+        self._raw: Optional[IO[bytes]] = None
+
+    def _open(self, path: Path) -> IO:
+        self._raw = open(path, "wb")
+        binary_codec.write_preamble(self._raw, self.encoding, self.compression)
+        return binary_codec.open_compressed_writer(self._raw, self.compression)
+
+    def _frame(self, kind: int, value) -> None:
+        binary_codec.write_frame(self._file, kind, self._encode(value))
+
+    def write_header(self, header: dict) -> None:
+        self._frame(binary_codec.KIND_HEADER, {key: header.get(key) for key in HEADER_KEYS})
+
+    def write_avatar(self, data: dict) -> None:
+        self._frame(binary_codec.KIND_AVATAR, data)
+        self.avatar_count += 1
+
+    def write_event(self, data: dict) -> None:
+        self._frame(binary_codec.KIND_EVENT, data)
+        self.event_count += 1
+
+    def write_footer(self) -> None:
+        self._frame(binary_codec.KIND_FOOTER, {"avatar_count": self.avatar_count, "event_count": self.event_count})
+
+    def close(self) -> None:
+        if self._file is not None and self._file is not self._raw:
+            # 先结束压缩流，再关闭底层文件
+            self._file.close()
+            self._file = self._raw
+        super().close()
+
+    def abort(self) -> None:
+        if self._file is not None and self._file is not self._raw:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = self._raw
+        super().abort()
+
+
+SAVE_WRITERS: dict[str, type[SaveWriter]] = {
+    "json": JsonSaveWriter,
+    "jsonl": JsonLinesSaveWriter,
+    "cws": BinarySaveWriter,
+}
+
+
+def get_save_format() -> str:
+    """新存档使用的格式名（config.yml 中的 save.format）。"""
+    fmt = str(getattr(CONFIG.save, "format", "json") or "json").lower()
+    return fmt if fmt in SAVE_WRITERS else "json"
+
+
+def get_save_suffix(fmt: Optional[str] = None) -> str:
+    """新存档的扩展名。"""
+    return SAVE_WRITERS[fmt or get_save_format()].suffix
+
+
+def save_suffixes() -> tuple[str, ...]:
+    """所有可识别的存档扩展名。"""
+    return tuple(writer.suffix for writer in SAVE_WRITERS.values())
+
+
+def is_save_file(path: Path) -> bool:
+    return Path(path).suffix in save_suffixes()
+
+
+def open_save_writer(path: Path) -> SaveWriter:
+    """按扩展名选择写入器，未知扩展名按 JSON 处理。"""
+    path = Path(path)
+    for writer in SAVE_WRITERS.values():
+        if path.suffix == writer.suffix:
+            return writer(path)
+    return JsonSaveWriter(path)
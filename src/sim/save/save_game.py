@@ -2,9 +2,10 @@
 存档功能模块
 
 主要功能：
-- save_game: 保存游戏完整状态到JSON文件
+- save_game: 保存游戏完整状态到存档文件
+- build_save_header: 构建存档 header（完整存档与增量存档共用）
 - get_save_info: 读取存档的元信息（不加载完整数据）
-- list_saves: 列出所有存档文件
+- list_saves: 列出所有存档文件（使用目录索引缓存 meta，见 save_index.py）
 
 存档内容：
 - meta: 版本号、保存时间、游戏时间、事件数据库信息
@@ -14,7 +15,7 @@
 - simulator: 模拟器配置（如出生率）
 
 存档格式：
-- JSON（明文，易于调试）+ SQLite事件数据库
+- JSON（明文，易于调试）或流式 JSON Lines（按 save.format 配置，见 save_format.py）+ SQLite事件数据库
 - 存档位置：assets/saves/ (配置在config.yml中)
 - 事件数据库：{save_name}_events.db（与JSON文件同目录）
 
@@ -24,7 +25,6 @@
 - relations在Avatar中已转换为id映射，避免循环引用
 - 事件实时写入SQLite，JSON中的events字段仅用于旧存档迁移
 """
-import json
 import re
 from pathlib import Path
 from datetime import datetime
@@ -34,11 +34,15 @@ if TYPE_CHECKING:
     from src.classes.core.world import World
     from src.sim.simulator import Simulator
     from src.classes.core.sect import Sect
+    from src.sim.save.journal import SaveJournal
 
 from src.utils.config import CONFIG
 from src.config import get_settings_service
 from src.classes.language import language_manager
 from src.sim.load.load_game import get_events_db_path
+from src.sim.load.save_reader import read_save_meta
+from src.sim.save.save_format import get_save_suffix, is_save_file, open_save_writer
+from src.sim.save.save_index import SaveIndex, record_save
 
 
 
@@ -57,13 +61,148 @@ def _model_to_dict(model):
     return model.dict()
 
 
+def resolve_save_path(world: "World", save_path: Optional[Path] = None, custom_name: Optional[str] = None) -> Path:
+    """确定存档路径，默认为 saves/时间戳_游戏时间.<扩展名>。"""
+    if save_path is not None:
+        save_path = Path(save_path)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        return save_path
+
+    saves_dir = CONFIG.paths.saves
+    saves_dir.mkdir(parents=True, exist_ok=True)
+
+    # 生成友好的文件名。
+    now = datetime.now()
+    time_str = now.strftime("%Y%m%d_%H%M%S")
+    year = world.month_stamp.get_year()
+    month = world.month_stamp.get_month().value
+    game_time_str = f"Y{year}M{month}"
+
+    # 处理自定义名称。
+    if custom_name:
+        safe_name = sanitize_save_name(custom_name)
+        filename = f"{safe_name}_{time_str}{get_save_suffix()}"
+    else:
+        filename = f"{time_str}_{game_time_str}{get_save_suffix()}"
+
+    return saves_dir / filename
+
+
+def build_save_header(
+    world: "World",
+    simulator: "Simulator",
+    existed_sects: List["Sect"],
+    save_path: Path,
+    custom_name: Optional[str] = None,
+    is_auto_save: bool = False,
+) -> dict:
+    """
+    构建存档 header：{"meta", "run_config", "world", "simulator"}。
+
+    完整存档与增量存档共用。
+    """
+    events_db_path = get_events_db_path(save_path)
+
+    # 计算角色统计。
+    alive_count = len(world.avatar_manager.avatars)
+    dead_count = len(world.avatar_manager.dead_avatars)
+    total_count = alive_count + dead_count
+
+    run_config_snapshot = getattr(world, "run_config_snapshot", None)
+    if not run_config_snapshot:
+        run_config_snapshot = _model_to_dict(get_settings_service().get_default_run_config())
+        # In non-server flows there may be no explicit runtime snapshot on the world yet.
+        # Keep the saved metadata and run_config aligned with the active language context.
+        run_config_snapshot["content_locale"] = str(language_manager)
+
+    # 构建元信息
+    meta = {
+        "version": CONFIG.meta.version,
+        "save_time": datetime.now().isoformat(),
+        "game_time": f"{world.month_stamp.get_year()}年{world.month_stamp.get_month().value}月",
+        "language": run_config_snapshot.get("content_locale", str(language_manager)),
+        # SQLite 事件数据库信息。
+        "events_db": str(events_db_path.name),
+        "event_count": world.event_manager.count(),
+        # 新增元数据。
+        "avatar_count": total_count,
+        "alive_count": alive_count,
+        "dead_count": dead_count,
+        "custom_name": custom_name,
+        "playthrough_id": getattr(world, "playthrough_id", ""),
+        "is_auto_save": is_auto_save,
+    }
+
+    # 构建世界数据
+    # 收集有主洞府信息
+    from src.classes.environment.region import CultivateRegion, CityRegion
+    cultivate_regions_hosts = {}
+    regions_status = {}
+
+    if hasattr(world.map, 'regions'):
+         for rid, region in world.map.regions.items():
+             # 保存洞府主人
+             if isinstance(region, CultivateRegion) and region.host_avatar:
+                 cultivate_regions_hosts[str(rid)] = region.host_avatar.id
+
+             # 保存城市繁荣度
+             if isinstance(region, CityRegion):
+                 regions_status[str(rid)] = {
+                     "prosperity": region.prosperity
+                 }
+
+    sect_runtime_effects = {
+        str(sect.id): {
+            "sect_effects": dict(getattr(sect, "sect_effects", {}) or {}),
+            "temporary_sect_effects": list(getattr(sect, "temporary_sect_effects", []) or []),
+        }
+        for sect in existed_sects
+    }
+
+    world_data = {
+        "month_stamp": int(world.month_stamp),
+        "start_year": world.start_year,
+        "existed_sect_ids": [sect.id for sect in existed_sects],
+        # 天地灵机
+        "current_phenomenon_id": world.current_phenomenon.id if world.current_phenomenon else None,
+        "phenomenon_start_year": world.phenomenon_start_year if hasattr(world, 'phenomenon_start_year') else 0,
+        "cultivate_regions_hosts": cultivate_regions_hosts,
+        "regions_status": regions_status,
+        # 出世物品流转
+        "circulation": world.circulation.to_save_dict(),
+        # 世界历史
+        "history": {
+            "text": world.history.text,
+            "modifications": world.history.modifications
+        },
+        "sect_runtime_effects": sect_runtime_effects,
+        "sect_relation_modifiers": list(getattr(world, "sect_relation_modifiers", []) or []),
+        "sect_wars": list(getattr(world, "sect_wars", []) or []),
+        # 确定性随机模式的种子与当前状态（未开启时为 None）
+        "rng": world.rng.to_dict() if getattr(world, "rng", None) is not None else None,
+    }
+
+    # 保存模拟器数据
+    simulator_data = {
+        "awakening_rate": simulator.awakening_rate
+    }
+
+    return {
+        "meta": meta,
+        "run_config": run_config_snapshot,
+        "world": world_data,
+        "simulator": simulator_data,
+    }
+
+
 def save_game(
     world: "World",
     simulator: "Simulator",
     existed_sects: List["Sect"],
     save_path: Optional[Path] = None,
     custom_name: Optional[str] = None,
-    is_auto_save: bool = False
+    is_auto_save: bool = False,
+    journal: Optional["SaveJournal"] = None,
 ) -> tuple[bool, Optional[str]]:
     """
     保存游戏状态到文件
@@ -74,162 +213,49 @@ def save_game(
         existed_sects: 本局启用的宗门列表
         save_path: 保存路径，默认为saves/时间戳_游戏时间.json
         custom_name: 用户自定义的存档名称
+        journal: 增量存档日志；传入时本次存档作为其检查点（见 journal.py）
 
     Returns:
         (保存是否成功, 保存的文件名)
     """
     try:
-        # 确定保存路径
-        if save_path is None:
-            saves_dir = CONFIG.paths.saves
-            saves_dir.mkdir(parents=True, exist_ok=True)
-
-            # 生成友好的文件名。
-            now = datetime.now()
-            time_str = now.strftime("%Y%m%d_%H%M%S")
-            year = world.month_stamp.get_year()
-            month = world.month_stamp.get_month().value
-            game_time_str = f"Y{year}M{month}"
-
-            # 处理自定义名称。
-            if custom_name:
-                safe_name = sanitize_save_name(custom_name)
-                filename = f"{safe_name}_{time_str}.json"
-            else:
-                filename = f"{time_str}_{game_time_str}.json"
-
-            save_path = saves_dir / filename
-        else:
-            save_path = Path(save_path)
-            save_path.parent.mkdir(parents=True, exist_ok=True)
+        save_path = resolve_save_path(world, save_path, custom_name)
         
         # 计算事件数据库路径。
         events_db_path = get_events_db_path(save_path)
 
-        # 确保当前的 SQLite 数据库被复制到新存档的位置。
-        # 如果当前使用的是其他数据库文件，需要将其复制过来。
+        # 把当前的 SQLite 事件库快照到新存档的位置（在线备份，不受未提交写入影响）。
+        # 如果当前使用的就是这个数据库文件，则无需快照。
         if hasattr(world.event_manager, "_storage") and world.event_manager._storage:
              current_db_path = world.event_manager._storage._db_path
              if current_db_path != events_db_path:
-                 import shutil
-                 # 确保源文件存在
-                 if current_db_path.exists():
-                    # 确保目标目录存在
-                    events_db_path.parent.mkdir(parents=True, exist_ok=True)
-                    # 复制数据库文件
-                    shutil.copy2(current_db_path, events_db_path)
-                    print(f"Copied events database: {current_db_path} -> {events_db_path}")
-                 else:
-                     print(f"Warning: Current events database not found: {current_db_path}")
-
-        # 计算角色统计。
-        alive_count = len(world.avatar_manager.avatars)
-        dead_count = len(world.avatar_manager.dead_avatars)
-        total_count = alive_count + dead_count
-
-        run_config_snapshot = getattr(world, "run_config_snapshot", None)
-        if not run_config_snapshot:
-            run_config_snapshot = _model_to_dict(get_settings_service().get_default_run_config())
-            # In non-server flows there may be no explicit runtime snapshot on the world yet.
-            # Keep the saved metadata and run_config aligned with the active language context.
-            run_config_snapshot["content_locale"] = str(language_manager)
-
-        # 构建元信息
-        meta = {
-            "version": CONFIG.meta.version,
-            "save_time": datetime.now().isoformat(),
-            "game_time": f"{world.month_stamp.get_year()}年{world.month_stamp.get_month().value}月",
-            "language": run_config_snapshot.get("content_locale", str(language_manager)),
-            # SQLite 事件数据库信息。
-            "events_db": str(events_db_path.name),
-            "event_count": world.event_manager.count(),
-            # 新增元数据。
-            "avatar_count": total_count,
-            "alive_count": alive_count,
-            "dead_count": dead_count,
-            "custom_name": custom_name,
-            "playthrough_id": getattr(world, "playthrough_id", ""),
-            "is_auto_save": is_auto_save,
-        }
-        
-        # 构建世界数据
-        # 收集有主洞府信息
-        from src.classes.environment.region import CultivateRegion, CityRegion
-        cultivate_regions_hosts = {}
-        regions_status = {}
-        
-        if hasattr(world.map, 'regions'):
-             for rid, region in world.map.regions.items():
-                 # 保存洞府主人
-                 if isinstance(region, CultivateRegion) and region.host_avatar:
-                     cultivate_regions_hosts[str(rid)] = region.host_avatar.id
-                 
-                 # 保存城市繁荣度
-                 if isinstance(region, CityRegion):
-                     regions_status[str(rid)] = {
-                         "prosperity": region.prosperity
-                     }
-
-        sect_runtime_effects = {
-            str(sect.id): {
-                "sect_effects": dict(getattr(sect, "sect_effects", {}) or {}),
-                "temporary_sect_effects": list(getattr(sect, "temporary_sect_effects", []) or []),
-            }
-            for sect in existed_sects
-        }
+                 world.event_manager.backup_to(events_db_path)
+                 print(f"Snapshotted events database: {current_db_path} -> {events_db_path}")
 
-        world_data = {
-            "month_stamp": int(world.month_stamp),
-            "start_year": world.start_year,
-            "existed_sect_ids": [sect.id for sect in existed_sects],
-            # 天地灵机
-            "current_phenomenon_id": world.current_phenomenon.id if world.current_phenomenon else None,
-            "phenomenon_start_year": world.phenomenon_start_year if hasattr(world, 'phenomenon_start_year') else 0,
-            "cultivate_regions_hosts": cultivate_regions_hosts,
-            "regions_status": regions_status,
-            # 出世物品流转
-            "circulation": world.circulation.to_save_dict(),
-            # 世界历史
-            "history": {
-                "text": world.history.text,
-                "modifications": world.history.modifications
-            },
-            "sect_runtime_effects": sect_runtime_effects,
-            "sect_relation_modifiers": list(getattr(world, "sect_relation_modifiers", []) or []),
-            "sect_wars": list(getattr(world, "sect_wars", []) or []),
-        }
-        
-        # 保存所有Avatar（第一阶段：不含relations）
-        # 需要保存活人和死者
-        avatars_data = []
-        for avatar in world.avatar_manager._iter_all_avatars():
-            avatars_data.append(avatar.to_save_dict())
-        
-        # 保存事件历史（限制数量）
+        # 覆盖的若是死者存根回读记录的存档，先把记录读回内存
+        world.avatar_manager.release_save_file(save_path)
+
+        header = build_save_header(world, simulator, existed_sects, save_path, custom_name, is_auto_save)
+        if journal is not None:
+            journal.begin_checkpoint(world, header)
+
+        # 按记录逐条写出：角色（含死者，relations 已是 id 映射）与最近事件，
+        # 不在内存中拼装整份存档
         max_events = CONFIG.save.max_events_to_save
-        events_data = []
-        recent_events = world.event_manager.get_recent_events(limit=max_events)
-        for event in recent_events:
-            events_data.append(event.to_dict())
-        
-        # 保存模拟器数据
-        simulator_data = {
-            "awakening_rate": simulator.awakening_rate
-        }
-        
-        # 组装完整的存档数据
-        save_data = {
-            "meta": meta,
-            "run_config": run_config_snapshot,
-            "world": world_data,
-            "avatars": avatars_data,
-            "events": events_data,
-            "simulator": simulator_data
-        }
-        
-        # 写入文件
-        with open(save_path, "w", encoding="utf-8") as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        with open_save_writer(save_path) as writer:
+            writer.write_header(header)
+            # 未还原的死者（DeadAvatarStub）从来源存档批量回读原始数据，不还原
+            for data in world.avatar_manager.iter_save_dicts():
+                writer.write_avatar(data)
+                if journal is not None:
+                    journal.record_avatar(data)
+            for event in world.event_manager.get_recent_events(limit=max_events):
+                writer.write_event(event.to_dict())
+            writer.write_footer()
+
+        if journal is not None:
+            journal.commit_checkpoint(world, save_path)
+        record_save(save_path, header["meta"])
         
         print(f"Game saved to: {save_path}")
         return True, save_path.name
@@ -252,9 +278,7 @@ def get_save_info(save_path: Path) -> Optional[dict]:
         存档元信息字典，如果读取失败返回None
     """
     try:
-        with open(save_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("meta", {})
+        return read_save_meta(save_path)
     except Exception:
         return None
 
@@ -275,11 +299,27 @@ def list_saves(saves_dir: Optional[Path] = None) -> List[tuple[Path, dict]]:
     if not saves_dir.exists():
         return []
     
+    # 文件未变化的存档直接使用索引中的 meta，只有新增或改动的存档才读取文件头
+    index = SaveIndex(saves_dir)
+    names = set()
     saves = []
-    for save_file in saves_dir.glob("*.json"):
-        info = get_save_info(save_file)
-        if info is not None:
-            saves.append((save_file, info))
+    for save_file in saves_dir.iterdir():
+        if not is_save_file(save_file):
+            continue
+        try:
+            stat = save_file.stat()
+        except OSError:
+            continue
+        names.add(save_file.name)
+        info = index.get(save_file, stat)
+        if info is None:
+            info = get_save_info(save_file)
+            if info is None:
+                continue
+            index.put(save_file, info, stat)
+        saves.append((save_file, info))
+    index.retain(names)
+    index.flush()
     
     # 按保存时间倒序排列
     saves.sort(key=lambda x: x[1].get("save_time", ""), reverse=True)
@@ -0,0 +1,79 @@
+"""
+存档目录索引
+
+list_saves 需要每个存档的 meta。索引文件（存档目录下的 .save_index）缓存
+{文件名: (mtime_ns, size, meta)}，文件未变化时直接使用缓存，列目录只需 stat 每个文件；
+文件变化或首次出现时重新读取 meta（只读文件头，见 save_reader.read_save_meta）并回填。
+
+save_game 写出存档后会顺带写入索引；被删除的存档在下一次列目录时从索引中清除。
+索引只是缓存，损坏或版本不符时直接丢弃重建。
+"""
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+SAVE_INDEX_NAME = ".save_index"
+SAVE_INDEX_VERSION = 1
+
+
+class SaveIndex:
+    """单个存档目录的 meta 索引。"""
+
+    def __init__(self, saves_dir: Path):
+        self.path = Path(saves_dir) / SAVE_INDEX_NAME
+        self._entries: dict[str, dict] = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != SAVE_INDEX_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, save_path: Path, stat: os.stat_result) -> Optional[dict]:
+        """文件自缓存以来未变化时返回缓存的 meta。"""
+        entry = self._entries.get(Path(save_path).name)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return entry.get("meta")
+        return None
+
+    def put(self, save_path: Path, meta: dict, stat: Optional[os.stat_result] = None) -> None:
+        save_path = Path(save_path)
+        stat = stat or save_path.stat()
+        self._entries[save_path.name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "meta": meta}
+        self._dirty = True
+
+    def retain(self, names: set[str]) -> None:
+        """清除已不存在的存档。"""
+        stale = [name for name in self._entries if name not in names]
+        for name in stale:
+            del self._entries[name]
+        if stale:
+            self._dirty = True
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": SAVE_INDEX_VERSION, "entries": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            # 索引写不进去不影响存档本身
+            print(f"Warning: failed to write save index {self.path}: {e}")
+
+
+def record_save(save_path: Path, meta: dict) -> None:
+    """存档写出后更新其所在目录的索引。"""
+    save_path = Path(save_path)
+    index = SaveIndex(save_path.parent)
+    index.put(save_path, meta)
+    index.flush()
@@ -27,6 +27,12 @@ def finalize_step(ctx: SimulationStepContext) -> list[Event]:
         for event in final_events:
             ctx.world.event_manager.add_event(event)
 
+    # 事件涉及的角色（如战斗中的对方）状态可能被改动，标记存档脏
+    manager = ctx.world.avatar_manager
+    for event in final_events:
+        for avatar_id in event.related_avatars or ():
+            manager.mark_save_dirty(avatar_id)
+
     log_events(final_events)
     ctx.world.month_stamp = ctx.world.month_stamp + 1
     ctx.events = final_events
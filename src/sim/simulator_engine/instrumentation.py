@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+
+from src.run.metrics import step_phase_duration
+from src.run.profiler import profile_span
+
+
+@contextmanager
+def timed_phase(name: str, cpu: bool = False):
+    # 统一包裹 step() 中的每个 phase：
+    # - 记录墙钟耗时到 cws_step_phase_duration_seconds{phase=name}
+    # - 剖析器开启时，同时记录一个 phase span（LLM/SQLite 等子 span 会挂在它下面）
+    # 对 async phase 而言，耗时包含 await 期间（例如等待 LLM）的时间。
+    # 不含 await 的同步 phase 传 cpu=True，span 额外记录 CPU 时间。
+    start = time.perf_counter()
+    try:
+        with profile_span(name, "phase", cpu=cpu):
+            yield
+    finally:
+        step_phase_duration().observe(time.perf_counter() - start, phase=name)
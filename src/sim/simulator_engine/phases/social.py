@@ -3,8 +3,6 @@ from __future__ import annotations
 from src.classes.core.avatar import Avatar
 from src.classes.event import Event
 from src.classes.relation.relation_resolver import RelationResolver
-from src.classes.relation.relations import update_second_degree_relations
-from src.systems.time import Month
 from src.utils.config import CONFIG
 
 
@@ -81,12 +79,3 @@ async def phase_evolve_relations(avatar_manager, living_avatars: list[Avatar]) -
 
     relation_events = await RelationResolver.run_batch(pairs_to_resolve)
     return relation_events or []
-
-
-def phase_update_calculated_relations(world, living_avatars: list[Avatar]) -> None:
-    # 二阶关系这类“计算型关系”成本较高，只在每年一月集中刷新一次。
-    if world.month_stamp.get_month() != Month.JANUARY:
-        return
-
-    for avatar in living_avatars:
-        update_second_degree_relations(avatar)
@@ -4,7 +4,7 @@ import asyncio
 
 from src.classes.celestial_phenomenon import get_random_celestial_phenomenon
 from src.classes.core.avatar import Avatar
-from src.classes.environment.region import CityRegion, CultivateRegion
+from src.classes.environment.region import CityRegion
 from src.classes.event import Event
 from src.classes.observe import get_avatar_observation_radius
 from src.i18n import t
@@ -19,49 +19,23 @@ def phase_update_perception_and_knowledge(world, living_avatars: list[Avatar]) -
     # 1. 根据观察半径刷新 known_regions
     # 2. 让尚无洞府的角色在观察到无主修炼地时尝试占据
     events: list[Event] = []
-    avatars_with_home = set()
-
-    cultivate_regions = [
-        region
-        for region in world.map.regions.values()
-        if isinstance(region, CultivateRegion)
-    ]
-    for region in cultivate_regions:
-        if region.host_avatar:
-            avatars_with_home.add(region.host_avatar.id)
+    game_map = world.map
 
     for avatar in living_avatars:
         radius = get_avatar_observation_radius(avatar)
-
-        # 先按包围盒缩小搜索范围，再用曼哈顿距离判断真正可见区域。
-        start_x = max(0, avatar.pos_x - radius)
-        end_x = min(world.map.width - 1, avatar.pos_x + radius)
-        start_y = max(0, avatar.pos_y - radius)
-        end_y = min(world.map.height - 1, avatar.pos_y + radius)
-
-        observed_regions = set()
-        for x in range(start_x, end_x + 1):
-            for y in range(start_y, end_y + 1):
-                if abs(x - avatar.pos_x) + abs(y - avatar.pos_y) > radius:
-                    continue
-
-                tile = world.map.get_tile(x, y)
-                if tile.region:
-                    observed_regions.add(tile.region)
-
-        for region in observed_regions:
-            avatar.known_regions.add(region.id)
-
-            # 占地逻辑只允许“无主修炼区 + 角色尚无洞府”的组合进入。
-            if not isinstance(region, CultivateRegion):
-                continue
+        region_ids, cultivate_regions = game_map.get_observed_regions(avatar.pos_x, avatar.pos_y, radius)
+        # 只在有新区域时写入（写入会标记存档脏）
+        if not region_ids <= avatar.known_regions:
+            avatar.known_regions |= region_ids
+
+        # 占地逻辑只允许“无主修炼区 + 角色尚无洞府”的组合进入。
+        if game_map.is_region_host(avatar.id):
+            continue
+        for region in cultivate_regions:
             if region.host_avatar is not None:
                 continue
-            if avatar.id in avatars_with_home:
-                continue
 
             avatar.occupy_region(region)
-            avatars_with_home.add(avatar.id)
             events.append(
                 Event(
                     world.month_stamp,
@@ -73,6 +47,7 @@ def phase_update_perception_and_knowledge(world, living_avatars: list[Avatar]) -
                     related_avatars=[avatar.id],
                 )
             )
+            break
 
     return events
 
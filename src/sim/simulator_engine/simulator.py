@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import time
+
 from src.classes.core.world import World
+from src.run.metrics import step_duration
+from src.run.profiler import profile_span
 from src.utils.config import CONFIG
 
 from .context import SimulationStepContext
 from .finalizer import finalize_step
+from .instrumentation import timed_phase
 from .phases import actions, annual, lifecycle, sect_war, social, world as world_phases
 
 
@@ -46,72 +51,97 @@ class Simulator:
         """
         # step() 只保留“按顺序编排 phase”这一件事。
         # 具体业务细节分散到 phases/ 与 finalizer 中，方便后续继续拆分。
+        # 确定性模式下，整个 step 的随机数都来自世界随机源
+        with profile_span("step", "step", {"month_stamp": int(self.world.month_stamp)}), self.world.random_scope():
+            return await self._run_phases()
+
+    async def _run_phases(self) -> list[Event]:
+        step_start = time.perf_counter()
         ctx = SimulationStepContext.create(self.world)
 
         # 1. 更新感知与知识
-        ctx.add_events(world_phases.phase_update_perception_and_knowledge(self.world, ctx.living_avatars))
+        with timed_phase("perception", cpu=True):
+            ctx.add_events(world_phases.phase_update_perception_and_knowledge(self.world, ctx.living_avatars))
 
         # 2. 长期目标思考
-        ctx.add_events(await lifecycle.phase_long_term_objective_thinking(ctx.living_avatars))
+        with timed_phase("long_term_objective"):
+            ctx.add_events(await lifecycle.phase_long_term_objective_thinking(ctx.living_avatars))
 
         # 3. Gathering 系统
-        ctx.add_events(await world_phases.phase_process_gatherings(self.world))
+        with timed_phase("gatherings"):
+            ctx.add_events(await world_phases.phase_process_gatherings(self.world))
 
         # 4. AI 决策相位
-        await actions.phase_decide_actions(self.world, ctx.living_avatars)
+        with timed_phase("decide_actions"):
+            await actions.phase_decide_actions(self.world, ctx.living_avatars)
 
         # 5. 提交并启动下一步计划
-        ctx.add_events(actions.phase_commit_next_plans(ctx.living_avatars))
+        with timed_phase("commit_plans", cpu=True):
+            ctx.add_events(actions.phase_commit_next_plans(ctx.living_avatars))
 
         # 6. 执行当前行动
-        ctx.add_events(await actions.phase_execute_actions(ctx.living_avatars))
+        with timed_phase("execute_actions"):
+            ctx.add_events(await actions.phase_execute_actions(ctx.living_avatars))
 
         # 7. 处理基于事件的交互（第一轮）
         # 第一轮会把动作阶段产出的互动事件计入角色状态，
         # 让紧接着的关系演化可以在同月看到这些变化。
-        social.phase_handle_interactions(self.world.avatar_manager, ctx.events, ctx.processed_event_ids)
+        with timed_phase("interactions_1", cpu=True):
+            social.phase_handle_interactions(self.world.avatar_manager, ctx.events, ctx.processed_event_ids)
 
         # 8. 关系演化
-        ctx.add_events(await social.phase_evolve_relations(self.world.avatar_manager, ctx.living_avatars))
+        with timed_phase("evolve_relations"):
+            ctx.add_events(await social.phase_evolve_relations(self.world.avatar_manager, ctx.living_avatars))
 
         # 9. 死亡结算（会更新 living_avatars）
-        ctx.add_events(lifecycle.phase_resolve_death(self.world, ctx.living_avatars))
+        with timed_phase("resolve_death", cpu=True):
+            ctx.add_events(lifecycle.phase_resolve_death(self.world, ctx.living_avatars))
 
         # 10. 年龄更新 + 出生/觉醒
-        ctx.add_events(lifecycle.phase_update_age_and_birth(self.world, ctx.living_avatars))
+        with timed_phase("age_and_birth", cpu=True):
+            ctx.add_events(lifecycle.phase_update_age_and_birth(self.world, ctx.living_avatars))
 
         # 11. 身世背景生成
-        await lifecycle.phase_backstory_generation(ctx.living_avatars)
+        with timed_phase("backstory"):
+            await lifecycle.phase_backstory_generation(ctx.living_avatars)
 
         # 12. 被动效果 + 世界性事件
-        ctx.add_events(await world_phases.phase_passive_effects(self.world, ctx.living_avatars))
+        with timed_phase("passive_effects"):
+            ctx.add_events(await world_phases.phase_passive_effects(self.world, ctx.living_avatars))
 
         # 13. 小型随机事件 + 宗门随机事件
-        ctx.add_events(await world_phases.phase_random_minor_events(self.world, ctx.living_avatars))
-        ctx.add_events(await world_phases.phase_sect_random_event(self.world))
+        with timed_phase("random_events"):
+            ctx.add_events(await world_phases.phase_random_minor_events(self.world, ctx.living_avatars))
+            ctx.add_events(await world_phases.phase_sect_random_event(self.world))
 
         # 13.5 宗门战争遭遇战
-        ctx.add_events(await sect_war.phase_handle_sect_wars(self, ctx.living_avatars))
+        with timed_phase("sect_wars"):
+            ctx.add_events(await sect_war.phase_handle_sect_wars(self, ctx.living_avatars))
 
         # 14. 外号生成
-        ctx.add_events(await lifecycle.phase_nickname_generation(ctx.living_avatars))
+        with timed_phase("nickname"):
+            ctx.add_events(await lifecycle.phase_nickname_generation(ctx.living_avatars))
 
         # 15. 更新天象
-        ctx.add_events(world_phases.phase_update_celestial_phenomenon(self.world))
+        with timed_phase("celestial_phenomenon", cpu=True):
+            ctx.add_events(world_phases.phase_update_celestial_phenomenon(self.world))
 
         # 16. 更新区域繁荣度
-        world_phases.phase_update_region_prosperity(self.world)
+        with timed_phase("region_prosperity", cpu=True):
+            world_phases.phase_update_region_prosperity(self.world)
 
         # 17. 再次按事件处理交互（包含后续新事件）
         # 第二轮只处理本月后半程新增的互动事件。
         # 由于关系演化已在前面执行，这些新增互动会影响下个月的关系判定。
-        social.phase_handle_interactions(self.world.avatar_manager, ctx.events, ctx.processed_event_ids)
-
-        # 18. 计算型关系更新（二阶关系等）
-        social.phase_update_calculated_relations(self.world, ctx.living_avatars)
-
-        # 19. 每年一月：世界年度维护
-        await annual.run_annual_maintenance(self, ctx)
-
-        # 20. 最终收尾并返回本回合事件列表
-        return finalize_step(ctx)
+        with timed_phase("interactions_2", cpu=True):
+            social.phase_handle_interactions(self.world.avatar_manager, ctx.events, ctx.processed_event_ids)
+
+        # 18. 每年一月：世界年度维护
+        with timed_phase("annual_maintenance"):
+            await annual.run_annual_maintenance(self, ctx)
+
+        # 19. 最终收尾并返回本回合事件列表
+        with timed_phase("finalize", cpu=True):
+            events = finalize_step(ctx)
+        step_duration().observe(time.perf_counter() - step_start)
+        return events
@@ -20,6 +20,7 @@ from src.classes.technique import (
 from src.classes.items.weapon import Weapon, get_random_weapon_by_realm
 from src.classes.items.auxiliary import Auxiliary, get_random_auxiliary_by_realm
 from src.classes.relation.relation import Relation
+from src.classes.relation.relation_graph import has_related
 from src.classes.alignment import Alignment
 from src.systems.cultivation import Realm
 from src.systems.single_choice import (
@@ -44,10 +45,7 @@ class FortuneKind(Enum):
 
 def _has_master(avatar: Avatar) -> bool:
     """检查是否已有师傅"""
-    for other, rel in avatar.relations.items():
-        if rel == Relation.IS_MASTER_OF:
-            return True
-    return False
+    return has_related(avatar, Relation.IS_MASTER_OF)
 
 
 def _is_alignment_compatible(avatar: Avatar, other: Avatar) -> bool:
@@ -460,6 +458,7 @@ async def try_trigger_fortune(avatar: Avatar) -> list[Event]:
     elif kind == FortuneKind.SPIRIT_STONE:
         amount = _get_spirit_stone_amount(avatar)
         avatar.magic_stone.value += amount
+        avatar.mark_save_dirty()
         from src.i18n import t
         res_text = t("{avatar_name} obtained {amount} spirit stones",
                     avatar_name=avatar.name, amount=amount)
@@ -467,6 +466,7 @@ async def try_trigger_fortune(avatar: Avatar) -> list[Event]:
     elif kind == FortuneKind.CULTIVATION:
         exp_gain = get_cultivation_exp_reward(avatar)
         avatar.cultivation_progress.add_exp(exp_gain)
+        avatar.mark_save_dirty()
         from src.i18n import t
         res_text = t("{avatar_name} gained {exp_gain} cultivation experience",
                     avatar_name=avatar.name, exp_gain=exp_gain)
@@ -597,6 +597,7 @@ async def try_trigger_misfortune(avatar: Avatar) -> list[Event]:
         loss = random.randint(50, 300)
         loss = min(loss, max_loss)
         avatar.magic_stone.value -= loss
+        avatar.mark_save_dirty()
         res_text = t("misfortune_result_loss_spirit_stone", name=avatar.name, amount=loss)
         
     elif kind == MisfortuneKind.INJURY:
@@ -620,6 +621,7 @@ async def try_trigger_misfortune(avatar: Avatar) -> list[Event]:
         current_exp = avatar.cultivation_progress.exp
         actual_loss = min(current_exp, loss)
         avatar.cultivation_progress.exp -= actual_loss
+        avatar.mark_save_dirty()
         
         res_text = t("misfortune_result_backlash", name=avatar.name, amount=actual_loss)
         
@@ -115,11 +115,8 @@ def build_sect_decision_context(
         "controlled_tile_income": controlled_tile_income,
     }
 
-    living_members = [
-        avatar
-        for avatar in getattr(sect, "members", {}).values()
-        if not getattr(avatar, "is_dead", False)
-    ]
+    member_stats = sect.get_member_stats()
+    living_members = member_stats.living_members
     recruit_cost = int(getattr(CONFIG.sect, "recruit_cost", 500))
     support_amount = int(getattr(CONFIG.sect, "support_amount", 300))
     resource_pressure = "high"
@@ -128,23 +125,11 @@ def build_sect_decision_context(
         resource_pressure = "low"
     elif current_stones >= support_amount:
         resource_pressure = "normal"
-    peak_member = max(
-        living_members,
-        key=lambda avatar: int(getattr(getattr(avatar, "cultivation_progress", None), "level", 0) or 0),
-        default=None,
-    )
-    patriarch = next(
-        (
-            avatar
-            for avatar in living_members
-            if getattr(getattr(avatar, "sect_rank", None), "value", "") == "patriarch"
-        ),
-        None,
-    )
+    patriarch = member_stats.patriarch
     self_assessment = {
         "member_count": len(getattr(sect, "members", {})),
         "alive_member_count": len(living_members),
-        "peak_member_realm": str(getattr(getattr(peak_member, "cultivation_progress", None), "realm", "") or ""),
+        "peak_member_realm": str(member_stats.peak_realm or ""),
         "patriarch_realm": str(getattr(getattr(patriarch, "cultivation_progress", None), "realm", "") or ""),
         "war_readiness": "stretched" if conflict_tile_count > max(1, tile_count // 3) else "stable",
         "resource_pressure": resource_pressure,
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
 
 from src.classes.relation.relation import Relation
+from src.classes.relation.relation_graph import related
 
 
 @dataclass
@@ -131,10 +132,7 @@ class TribulationSelector:
             return None
         
         target_rel = tribulation.relation_type
-        candidates = [
-            other for other, rel in avatar.relations.items() 
-            if rel is target_rel
-        ]
+        candidates = related(avatar, target_rel)
         
         if not candidates:
             return None
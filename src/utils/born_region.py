@@ -44,21 +44,10 @@ def get_born_region_id(
                 break
     
     if parent_loc:
-        # 寻找最近的城市
+        # 寻找最近的城市（每格最近城市表由地图预计算）
         from src.classes.environment.region import CityRegion
-        from src.utils.distance import chebyshev_distance
-        
-        min_dist = float('inf')
-        nearest_city_id = -1
-        
-        # world.map.regions 包含了所有区域
-        for rid, region in world.map.regions.items():
-            if isinstance(region, CityRegion):
-                dist = chebyshev_distance(parent_loc, region.center_loc)
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest_city_id = rid
-        
+
+        nearest_city_id = world.map.nearest_region_id(parent_loc[0], parent_loc[1], CityRegion)
         if nearest_city_id != -1:
             return nearest_city_id
 
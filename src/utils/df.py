@@ -1,4 +1,7 @@
 import csv
+import hashlib
+import os
+import pickle
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -90,30 +93,89 @@ def load_csv(path: Path) -> List[Dict[str, Any]]:
 
     return data
 
-def load_game_configs() -> dict[str, List[Dict[str, Any]]]:
-    game_configs = {}
-    
-    # 1. 加载共享配置 (static/game_configs/*.csv)
-    if hasattr(CONFIG.paths, "shared_game_configs") and CONFIG.paths.shared_game_configs.exists():
-        for path in CONFIG.paths.shared_game_configs.glob("*.csv"):
-            data = load_csv(path)
-            game_configs[path.stem] = data
+# 编译缓存格式版本：load_csv 的解析/翻译逻辑有变化时递增
+GAME_CONFIG_CACHE_VERSION = 1
+
 
-    # 2. 加载本地化配置 (static/locales/{lang}/game_configs/*.csv)
-    # 如果文件名相同，覆盖共享配置
+def _game_config_sources() -> List[Path]:
+    """按加载顺序列出 CSV（共享在前、本地化覆盖在后）。"""
+    sources = []
+    if hasattr(CONFIG.paths, "shared_game_configs") and CONFIG.paths.shared_game_configs.exists():
+        sources.extend(sorted(CONFIG.paths.shared_game_configs.glob("*.csv")))
     if hasattr(CONFIG.paths, "localized_game_configs") and CONFIG.paths.localized_game_configs.exists():
-        for path in CONFIG.paths.localized_game_configs.glob("*.csv"):
-            data = load_csv(path)
-            game_configs[path.stem] = data
-            
+        sources.extend(sorted(CONFIG.paths.localized_game_configs.glob("*.csv")))
+    return sources
+
+
+def _parse_game_configs(sources: List[Path]) -> dict[str, List[Dict[str, Any]]]:
+    game_configs = {}
+    # 同名文件后者覆盖前者（本地化配置覆盖共享配置）
+    for path in sources:
+        game_configs[path.stem] = load_csv(path)
+    return game_configs
+
+
+def _translation_files() -> tuple[str, List[Path]]:
+    """t() 当前使用的语言及其 .mo 文件。"""
+    from src.classes.language import language_manager
+    lang = str(language_manager)
+    mo_dir = Path(__file__).resolve().parent.parent.parent / "static" / "locales" / lang / "LC_MESSAGES"
+    return lang, sorted(mo_dir.glob("*.mo")) if mo_dir.exists() else []
+
+
+def _game_config_cache_key(lang: str, sources: List[Path], mo_files: List[Path]) -> str:
+    """CSV 与翻译 .mo 文件内容的哈希，任一文件改动都会让缓存失效。"""
+    digest = hashlib.blake2b(f"{GAME_CONFIG_CACHE_VERSION}:{lang}".encode(), digest_size=16)
+    for path in [*sources, *mo_files]:
+        digest.update(str(path).encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_game_configs() -> dict[str, List[Dict[str, Any]]]:
+    """逐个解析全部 CSV 配置（已注入当前语言的翻译）。"""
+    return _parse_game_configs(_game_config_sources())
+
+
+def load_game_configs_cached() -> dict[str, List[Dict[str, Any]]]:
+    """
+    同 load_game_configs，但解析结果按语言缓存在数据目录的 cache/ 下。
+
+    缓存以 CSV 与 .mo 文件内容哈希为键，命中时直接反序列化，不再逐行解析与翻译；
+    启动和切换语言都走这里。
+    """
+    sources = _game_config_sources()
+    lang, mo_files = _translation_files()
+    key = _game_config_cache_key(lang, sources, mo_files)
+    from src.config.data_paths import get_data_paths
+    cache_path = get_data_paths().cache_dir / f"game_configs_{lang}.pickle"
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        if isinstance(cached, dict) and cached.get("key") == key:
+            return cached["configs"]
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+        pass
+
+    game_configs = _parse_game_configs(sources)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"key": key, "configs": game_configs}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # 缓存写不进去不影响读配置
+        print(f"[DF] Warning: failed to write game config cache {cache_path}: {e}")
     return game_configs
 
-game_configs = load_game_configs()
+game_configs = load_game_configs_cached()
 
 def reload_game_configs():
     """重新加载所有 CSV 配置"""
     print("[DF] Reloading game configs from csv...")
-    new_data = load_game_configs()
+    new_data = load_game_configs_cached()
     game_configs.clear()
     game_configs.update(new_data)
     print(f"[DF] Loaded {len(game_configs)} config files.")
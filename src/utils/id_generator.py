@@ -4,6 +4,9 @@
 
 import random
 import string
+import uuid
+
+from src.utils.rng import is_deterministic
 
 
 def base62_id(length: int = 8) -> str:
@@ -18,3 +21,14 @@ def base62_id(length: int = 8) -> str:
 def get_avatar_id() -> str:
     """获取Avatar ID的默认函数"""
     return base62_id(8)
+
+
+def new_uuid() -> str:
+    """
+    生成 UUID 字符串。
+    确定性随机作用域内由全局 random 生成（随种子复现），否则使用 uuid4，
+    避免普通模式下额外消耗全局随机流。
+    """
+    if is_deterministic():
+        return str(uuid.UUID(int=random.getrandbits(128), version=4))
+    return str(uuid.uuid4())
@@ -5,6 +5,8 @@ LLM 调用模块
 - call_llm: 基础调用，返回原始文本
 - call_llm_json: 调用并解析为 JSON
 - call_llm_with_template: 使用模板调用（最常用）
+
+实际请求由可替换的 LLM 后端完成（http / rule / record / replay / stub），见 backends.py。
 """
 
 from .client import (
@@ -14,6 +16,15 @@ from .client import (
     call_llm_with_task_name,
     test_connectivity
 )
+from .backends import (
+    LLMBackend,
+    LLMRequest,
+    available_backends,
+    create_backend,
+    get_backend,
+    register_backend,
+    set_backend,
+)
 from .config import LLMMode, get_task_mode
 from .exceptions import LLMError, ParseError, ConfigError
 
@@ -23,6 +34,13 @@ __all__ = [
     "call_llm_with_template",
     "call_llm_with_task_name",
     "test_connectivity",
+    "LLMBackend",
+    "LLMRequest",
+    "available_backends",
+    "create_backend",
+    "get_backend",
+    "register_backend",
+    "set_backend",
     "LLMMode",
     "get_task_mode",
     "LLMError",
@@ -0,0 +1,379 @@
+"""
+LLM 后端注册表
+
+call_llm 不直接发 HTTP 请求，而是交给当前激活的后端：
+- http:   默认后端，调用 OpenAI 兼容接口（原有行为）
+- rule:   确定性的规则后端，按任务名返回合法但简单的结果，无需网络
+- record: 包装另一个后端，把 prompt 哈希 -> 响应 写入磁盘
+- replay: 从磁盘读取 record 录下的响应，未命中时可回退到另一个后端
+- stub:   走真实 HTTP 链路，请求本地 stub 服务（见 stub_server.py）
+
+后端选择顺序：set_backend() 显式指定 > config.yml 中的 llm.backend > http。
+"""
+
+import hashlib
+import json
+import random
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.utils.config import CONFIG
+from .config import LLMConfig, LLMMode
+from .exceptions import ConfigError, LLMError
+
+
+@dataclass(frozen=True)
+class LLMRequest:
+    """一次 LLM 请求的全部上下文。infos 为模板参数，直接调用 call_llm 时为 None。"""
+    prompt: str
+    mode: LLMMode
+    task_name: str = "unknown"
+    infos: Optional[dict] = None
+
+    @property
+    def prompt_hash(self) -> str:
+        return hashlib.sha256(self.prompt.encode("utf-8")).hexdigest()
+
+
+class LLMBackend:
+    """后端基类。blocking=True 的后端会被放到线程池中执行。"""
+
+    name = "base"
+    blocking = False
+
+    def complete(self, request: LLMRequest, config: LLMConfig) -> str:
+        raise NotImplementedError
+
+
+class HttpBackend(LLMBackend):
+    """调用 OpenAI 兼容接口。"""
+
+    name = "http"
+    blocking = True
+
+    def complete(self, request: LLMRequest, config: LLMConfig) -> str:
+        # 运行时取 client 模块属性，便于测试 patch _call_with_requests
+        from . import client
+        return client._call_with_requests(config, request.prompt)
+
+
+# ---------------------------------------------------------------------------
+# 规则后端
+# ---------------------------------------------------------------------------
+
+RuleHandler = Callable[[LLMRequest, random.Random], Any]
+_RULE_HANDLERS: dict[str, RuleHandler] = {}
+
+
+def rule_handler(*task_names: str):
+    """注册规则后端的任务处理函数。"""
+    def decorator(func: RuleHandler) -> RuleHandler:
+        for name in task_names:
+            _RULE_HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def _load_json_field(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, ValueError):
+            return None
+    return value
+
+
+@rule_handler("action_decision")
+def _rule_action_decision(request: LLMRequest, rng: random.Random) -> dict:
+    infos = request.infos or {}
+    avatar_name = infos.get("avatar_name")
+    action_infos = _load_json_field(infos.get("general_action_infos"))
+    if not avatar_name or not isinstance(action_infos, dict):
+        return {}
+
+    # 只挑不需要参数的动作，保证规划一定合法可执行
+    candidates = sorted(name for name, info in action_infos.items() if not (info or {}).get("params"))
+    if not candidates:
+        return {}
+    count = min(len(candidates), rng.randint(1, 3))
+    pairs = [[name, {}] for name in rng.sample(candidates, count)]
+    return {
+        avatar_name: {
+            "avatar_thinking": "",
+            "current_emotion": "emotion_calm",
+            "short_term_objective": "",
+            "action_name_params_pairs": pairs,
+        }
+    }
+
+
+@rule_handler("relation_resolver")
+def _rule_relation_resolver(request: LLMRequest, rng: random.Random) -> dict:
+    return {"changed": False}
+
+
+@rule_handler("interaction_feedback")
+def _rule_interaction_feedback(request: LLMRequest, rng: random.Random) -> dict:
+    infos = request.infos or {}
+    target_name = infos.get("avatar_name_2")
+    feedback_actions = list(infos.get("feedback_actions") or [])
+    if not target_name or not feedback_actions:
+        return {}
+    return {target_name: {"feedback": rng.choice(feedback_actions)}}
+
+
+@rule_handler("single_choice")
+def _rule_single_choice(request: LLMRequest, rng: random.Random) -> dict:
+    options = _load_json_field((request.infos or {}).get("options_json"))
+    keys = [str(o.get("key")) for o in options or [] if isinstance(o, dict) and o.get("key") is not None]
+    if not keys:
+        return {}
+    return {"choice": rng.choice(keys), "thinking": ""}
+
+
+@rule_handler("long_term_objective")
+def _rule_long_term_objective(request: LLMRequest, rng: random.Random) -> dict:
+    return {"long_term_objective": "Cultivate steadily and break through to the next realm."}
+
+
+@rule_handler("nickname")
+def _rule_nickname(request: LLMRequest, rng: random.Random) -> dict:
+    return {"nickname": f"Wanderer-{rng.randint(1, 999)}", "thinking": "", "reason": "offline"}
+
+
+@rule_handler("backstory")
+def _rule_backstory(request: LLMRequest, rng: random.Random) -> dict:
+    return {"backstory": "Born into an ordinary family, later set foot on the path of cultivation."}
+
+
+@rule_handler("random_minor_event")
+def _rule_random_minor_event(request: LLMRequest, rng: random.Random) -> dict:
+    return {"event_text": "A quiet month passed without anything remarkable."}
+
+
+@rule_handler("sect_random_event")
+def _rule_sect_random_event(request: LLMRequest, rng: random.Random) -> dict:
+    return {"reason_fragment": "a dispute over a spirit vein"}
+
+
+class RuleBasedBackend(LLMBackend):
+    """
+    确定性的规则后端。
+
+    同一 prompt 总是得到同一响应（随机源以 prompt 哈希为种子）。
+    未注册的任务返回空 JSON 对象，调用方会走各自的兜底逻辑。
+    """
+
+    name = "rule"
+    blocking = False
+
+    def __init__(self, handlers: Optional[dict[str, RuleHandler]] = None):
+        self.handlers = dict(_RULE_HANDLERS)
+        if handlers:
+            self.handlers.update(handlers)
+
+    def respond(self, request: LLMRequest) -> Any:
+        rng = random.Random(int(request.prompt_hash[:16], 16))
+        handler = self.handlers.get(request.task_name)
+        if handler is None and "options_json" in (request.infos or {}):
+            handler = self.handlers.get("single_choice")
+        if handler is None:
+            return {}
+        return handler(request, rng)
+
+    def complete(self, request: LLMRequest, config: LLMConfig) -> str:
+        return json.dumps(self.respond(request), ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# 录制 / 回放
+# ---------------------------------------------------------------------------
+
+class CassetteStore:
+    """按 prompt 哈希存取响应，每条记录一个 JSON 文件（<dir>/<hash[:2]>/<hash>.json）。"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def _path(self, prompt_hash: str) -> Path:
+        return self.directory / prompt_hash[:2] / f"{prompt_hash}.json"
+
+    def get(self, request: LLMRequest) -> Optional[str]:
+        path = self._path(request.prompt_hash)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["response"]
+
+    def put(self, request: LLMRequest, response: str) -> None:
+        path = self._path(request.prompt_hash)
+        record = {
+            "prompt_hash": request.prompt_hash,
+            "task_name": request.task_name,
+            "mode": getattr(request.mode, "value", str(request.mode)),
+            "prompt_length": len(request.prompt),
+            "response": response,
+        }
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            tmp_path.replace(path)
+
+
+class RecordingBackend(LLMBackend):
+    """包装另一个后端，把每次响应写入录制目录。"""
+
+    name = "record"
+
+    def __init__(self, directory: Path, inner: Optional[LLMBackend] = None):
+        self.store = CassetteStore(directory)
+        self.inner = inner or HttpBackend()
+        self.blocking = self.inner.blocking
+
+    def complete(self, request: LLMRequest, config: LLMConfig) -> str:
+        response = self.inner.complete(request, config)
+        self.store.put(request, response)
+        return response
+
+
+class ReplayBackend(LLMBackend):
+    """从录制目录回放响应；未命中时交给 fallback，没有 fallback 则抛 LLMError。"""
+
+    name = "replay"
+
+    def __init__(self, directory: Path, fallback: Optional[LLMBackend] = None):
+        self.store = CassetteStore(directory)
+        self.fallback = fallback
+        # 未命中时会同步调用 fallback，阻塞型 fallback 需要整个后端放进线程池
+        self.blocking = bool(fallback and fallback.blocking)
+        self.hits = 0
+        self.misses = 0
+
+    def complete(self, request: LLMRequest, config: LLMConfig) -> str:
+        response = self.store.get(request)
+        if response is not None:
+            self.hits += 1
+            return response
+        self.misses += 1
+        if self.fallback is None:
+            raise LLMError(
+                "Replay cassette miss",
+                task_name=request.task_name,
+                prompt_hash=request.prompt_hash,
+            )
+        return self.fallback.complete(request, config)
+
+
+# ---------------------------------------------------------------------------
+# 本地 stub 服务
+# ---------------------------------------------------------------------------
+
+class StubServerBackend(LLMBackend):
+    """
+    通过 HTTP 请求本地 stub 服务。
+
+    与 http 后端走同样的 urllib + 线程池链路，请求体额外携带任务名与模板参数，
+    因此只应指向 stub_server.py 启动的服务，不要指向真实服务商。
+    """
+
+    name = "stub"
+    blocking = True
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def complete(self, request: LLMRequest, config: LLMConfig) -> str:
+        import urllib.request
+
+        payload = {
+            "model": config.model_name or "stub",
+            "messages": [{"role": "user", "content": request.prompt}],
+            "cws_request": {
+                "task_name": request.task_name,
+                "mode": getattr(request.mode, "value", str(request.mode)),
+                "infos": request.infos,
+            },
+        }
+        req = urllib.request.Request(
+            f"{self.base_url}/chat/completions",
+            data=json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(req, timeout=120) as response:
+            result = json.loads(response.read().decode("utf-8"))
+        return result["choices"][0]["message"]["content"]
+
+
+# ---------------------------------------------------------------------------
+# 注册表
+# ---------------------------------------------------------------------------
+
+_BACKEND_FACTORIES: dict[str, Callable[..., LLMBackend]] = {}
+_active_backend: Optional[LLMBackend] = None
+
+
+def register_backend(name: str, factory: Callable[..., LLMBackend]) -> None:
+    """注册后端工厂，factory 接受关键字参数（如 directory、base_url）。"""
+    _BACKEND_FACTORIES[name] = factory
+
+
+def _default_cassette_dir() -> Path:
+    return Path(getattr(CONFIG.llm, "cassette_dir", "") or "tmp/llm_cassette")
+
+
+register_backend("http", lambda **_: HttpBackend())
+register_backend("rule", lambda **_: RuleBasedBackend())
+register_backend(
+    "record",
+    lambda directory=None, **_: RecordingBackend(Path(directory) if directory else _default_cassette_dir()),
+)
+register_backend(
+    "replay",
+    lambda directory=None, fallback=None, **_: ReplayBackend(
+        Path(directory) if directory else _default_cassette_dir(),
+        fallback=create_backend(fallback) if fallback else None,
+    ),
+)
+register_backend(
+    "stub",
+    lambda base_url=None, **_: StubServerBackend(base_url or getattr(CONFIG.llm, "stub_url", "") or "http://127.0.0.1:8765"),
+)
+
+
+def available_backends() -> list[str]:
+    return sorted(_BACKEND_FACTORIES)
+
+
+def create_backend(name: str, **kwargs) -> LLMBackend:
+    factory = _BACKEND_FACTORIES.get(name)
+    if factory is None:
+        raise ConfigError(f"Unknown LLM backend: {name} (available: {', '.join(available_backends())})")
+    return factory(**kwargs)
+
+
+def set_backend(backend: "LLMBackend | str | None", **kwargs) -> Optional[LLMBackend]:
+    """
+    显式指定当前后端。
+
+    Args:
+        backend: 后端实例、已注册的后端名，或 None（恢复为按配置选择）
+    """
+    global _active_backend
+    if isinstance(backend, str):
+        backend = create_backend(backend, **kwargs)
+    _active_backend = backend
+    return backend
+
+
+def get_backend() -> LLMBackend:
+    """获取当前后端。"""
+    global _active_backend
+    if _active_backend is None:
+        _active_backend = create_backend(str(getattr(CONFIG.llm, "backend", "http") or "http"))
+    return _active_backend
@@ -4,12 +4,17 @@ import json
 import urllib.request
 import urllib.error
 import asyncio
+import time
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Optional
 
 from src.config import get_settings_service
 from src.run.log import log_llm_call
+from src.run.metrics import llm_calls, llm_latency, llm_parse_retries, llm_semaphore_wait
+from src.run.profiler import profile_span
 from src.utils.config import CONFIG
+from .backends import LLMRequest, get_backend
 from .config import LLMMode, LLMConfig, get_task_mode
 from .parser import parse_json
 from .prompt import build_prompt, load_template
@@ -19,6 +24,12 @@ from .exceptions import LLMError, ParseError
 _SEMAPHORE: Optional[asyncio.Semaphore] = None
 _SEMAPHORE_LIMIT: Optional[int] = None
 
+# 当前调用所属的任务名（由 call_llm_with_task_name 设置），仅用于指标标签。
+# 使用 ContextVar 而不是逐层传参，保持下层 API 的签名不变。
+_CURRENT_TASK: ContextVar[str] = ContextVar("llm_current_task", default="unknown")
+# 当前模板调用的参数，供离线后端（规则/stub）据此构造结构化响应
+_CURRENT_INFOS: ContextVar[Optional[dict]] = ContextVar("llm_current_infos", default=None)
+
 
 def _get_semaphore() -> asyncio.Semaphore:
     global _SEMAPHORE, _SEMAPHORE_LIMIT
@@ -82,14 +93,32 @@ def _call_with_requests(config: LLMConfig, prompt: str) -> str:
 async def call_llm(prompt: str, mode: LLMMode = LLMMode.NORMAL) -> str:
     """
     基础 LLM 调用，自动控制并发
-    使用 urllib 直接调用 OpenAI 兼容接口
+    实际请求交给当前 LLM 后端（默认 http，即 urllib 调用 OpenAI 兼容接口），见 backends.py
     """
     config = LLMConfig.from_mode(mode)
     semaphore = _get_semaphore()
-    
-    async with semaphore:
-        result = await asyncio.to_thread(_call_with_requests, config, prompt)
-    
+    task = _CURRENT_TASK.get()
+    mode_label = getattr(mode, "value", str(mode))
+    backend = get_backend()
+    request = LLMRequest(prompt=prompt, mode=mode, task_name=task, infos=_CURRENT_INFOS.get())
+
+    with profile_span(f"llm:{task}", "llm", {"mode": mode_label}):
+        wait_start = time.perf_counter()
+        async with semaphore:
+            llm_semaphore_wait().observe(time.perf_counter() - wait_start, mode=mode_label)
+            call_start = time.perf_counter()
+            try:
+                if backend.blocking:
+                    result = await asyncio.to_thread(backend.complete, request, config)
+                else:
+                    result = backend.complete(request, config)
+            except Exception:
+                llm_calls().inc(task=task, mode=mode_label, status="error")
+                raise
+            finally:
+                llm_latency().observe(time.perf_counter() - call_start, task=task, mode=mode_label)
+    llm_calls().inc(task=task, mode=mode_label, status="ok")
+
     log_llm_call(config.model_name, prompt, result)
     return result
 
@@ -111,6 +140,7 @@ async def call_llm_json(
         except ParseError as e:
             last_error = e
             if attempt < max_retries:
+                llm_parse_retries().inc(task=_CURRENT_TASK.get(), mode=getattr(mode, "value", str(mode)))
                 continue
             raise LLMError(f"解析失败（重试 {max_retries} 次后）", cause=last_error) from last_error
     
@@ -127,7 +157,15 @@ async def call_llm_with_template(
     """使用模板调用 LLM"""
     template = load_template(template_path)
     prompt = build_prompt(template, infos)
-    return await call_llm_json(prompt, mode, max_retries)
+    infos_token = _CURRENT_INFOS.set(infos)
+    # 未经 call_llm_with_task_name 的直接模板调用，以模板名作为任务名
+    task_token = _CURRENT_TASK.set(Path(template_path).stem) if _CURRENT_TASK.get() == "unknown" else None
+    try:
+        return await call_llm_json(prompt, mode, max_retries)
+    finally:
+        _CURRENT_INFOS.reset(infos_token)
+        if task_token is not None:
+            _CURRENT_TASK.reset(task_token)
 
 
 async def call_llm_with_task_name(
@@ -155,8 +193,12 @@ async def call_llm_with_task_name(
     global_mode = getattr(CONFIG.llm, "mode", "default")
     if global_mode in ["normal", "fast"]:
         mode = LLMMode(global_mode)
-            
-    return await call_llm_with_template(template_path, infos, mode, max_retries)
+
+    token = _CURRENT_TASK.set(task_name)
+    try:
+        return await call_llm_with_template(template_path, infos, mode, max_retries)
+    finally:
+        _CURRENT_TASK.reset(token)
 
 
 def test_connectivity(mode: LLMMode = LLMMode.NORMAL, config: Optional[LLMConfig] = None) -> tuple[bool, str]:
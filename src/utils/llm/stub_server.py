@@ -0,0 +1,132 @@
+"""
+本地 LLM stub 服务
+
+一个最小的 OpenAI 兼容服务（仅实现 POST .../chat/completions），响应由指定后端
+（默认规则后端）生成。用于在没有真实服务商的情况下走通完整的 HTTP 调用链路，
+例如压测并发信号量、线程池与网络层。
+
+用法：
+    python -m src.utils.llm.stub_server --port 8765
+然后把 LLM 的 base_url 指向 http://127.0.0.1:8765/v1，或使用 stub 后端。
+
+请求体若带有 stub 后端附加的 cws_request 字段（任务名与模板参数），规则后端可以
+返回结构化的合法响应；普通 OpenAI 客户端的请求则只能拿到空 JSON 对象。
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .backends import LLMBackend, LLMRequest, RuleBasedBackend
+from .config import LLMConfig, LLMMode
+
+
+class StubServer:
+    """在后台线程中运行的 stub 服务。"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, backend: Optional[LLMBackend] = None):
+        self.backend = backend or RuleBasedBackend()
+        self.request_count = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("chat/completions"):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+                    content = server.handle(body)
+                except Exception as e:
+                    self._send_json(500, {"error": {"message": str(e)}})
+                    return
+                self._send_json(200, {
+                    "object": "chat.completion",
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                })
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(self, body: dict) -> str:
+        messages = body.get("messages") or []
+        prompt = str(messages[-1].get("content", "")) if messages else ""
+        meta = body.get("cws_request") or {}
+        try:
+            mode = LLMMode(meta.get("mode", "normal"))
+        except ValueError:
+            mode = LLMMode.NORMAL
+        request = LLMRequest(
+            prompt=prompt,
+            mode=mode,
+            task_name=meta.get("task_name") or "unknown",
+            infos=meta.get("infos"),
+        )
+        config = LLMConfig(model_name=str(body.get("model", "stub")), api_key="", base_url=self.url)
+        self.request_count += 1
+        return self.backend.complete(request, config)
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="llm-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, backend: Optional[LLMBackend] = None) -> StubServer:
+    """启动 stub 服务并返回；port=0 表示随机端口。"""
+    return StubServer(host, port, backend).start()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.utils.llm.stub_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    server = StubServer(args.host, args.port)
+    print(f"[LLM Stub] Serving OpenAI-compatible API at {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
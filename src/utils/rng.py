@@ -0,0 +1,124 @@
+"""
+世界级随机数服务（可选的确定性模式）
+
+各系统（战斗、出生、奇遇、秘境、起名……）统一使用全局 random 模块，测试也大量
+patch random.random 等模块函数。为了不改动这些调用点，世界随机源按上下文绑定：
+
+- World 持有一个 SimRandom（仅在指定种子时创建），内部是独立的 random.Random；
+- Simulator.step 期间通过 world.random_scope() 把它绑定到当前上下文（ContextVar）：
+  random.random / random.choice 等模块函数在绑定的上下文里转发给世界随机源，
+  其余任务与线程（如服务端的其他请求）照旧使用全局随机流，互不串扰；
+- 在作用域内创建的子任务（asyncio 会复制上下文）也使用世界随机源；
+- 状态随存档保存与读取，因此同一存档 + 同一种子的后续推演是可复现的；
+- 事件的 created_at 在绑定的上下文里改由 (month_stamp, 当月序号) 推出（见 event_time），
+  不再取墙钟时间，事件流（含 headless 输出的 JSONL）逐字节一致。
+
+未指定种子时一切照旧：random_scope() 为空上下文，模块函数直接使用全局随机流。
+转发版本在导入本模块时安装，之后 patch random.random 等仍按原样生效。
+
+复现的前提：
+- LLM 响应本身是确定的（rule / replay 后端）；真实服务商的响应与完成顺序都不确定；
+- 固定 PYTHONHASHSEED（字符串集合的遍历顺序依赖它）。
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+# 当前上下文绑定的世界随机源（None 表示使用全局随机流）
+_current: ContextVar[Optional["SimRandom"]] = ContextVar("sim_random", default=None)
+
+# 确定性模式下每个月占用的 created_at 区间（秒），当月事件按序号递增
+_MONTH_SECONDS = 30 * 24 * 3600
+
+# 需要按上下文转发的 random 模块函数（seed / getstate / setstate 仍只作用于全局随机流）
+_DISPATCHED = (
+    "random", "uniform", "triangular", "randint", "randrange", "choice", "choices", "sample",
+    "shuffle", "gauss", "normalvariate", "lognormvariate", "expovariate", "vonmisesvariate",
+    "gammavariate", "betavariate", "paretovariate", "weibullvariate", "getrandbits", "randbytes",
+)
+
+
+def _dispatcher(name: str, fallback: Callable) -> Callable:
+    def dispatched(*args, **kwargs):
+        bound = _current.get()
+        if bound is None:
+            return fallback(*args, **kwargs)
+        return getattr(bound._rng, name)(*args, **kwargs)
+
+    dispatched.__name__ = name
+    dispatched.__doc__ = fallback.__doc__
+    dispatched.__wrapped__ = fallback
+    return dispatched
+
+
+def _install() -> None:
+    """把 random 模块函数换成按上下文转发的版本。"""
+    for name in _DISPATCHED:
+        fallback = getattr(random, name, None)
+        if fallback is not None and not hasattr(fallback, "__wrapped__"):
+            setattr(random, name, _dispatcher(name, fallback))
+
+
+_install()
+
+
+class SimRandom:
+    """世界级随机源。"""
+
+    def __init__(self, seed: int):
+        self.seed = int(seed)
+        self._rng = random.Random(self.seed)
+        # 事件时间：当前月份与当月已发出的序号（每步推进一整月，换月即从头计数）
+        self._clock_month: Optional[int] = None
+        self._clock_seq = 0
+
+    def derive(self, name: str) -> random.Random:
+        """派生一个与主流无关、但由种子唯一确定的子随机源（不消耗主流）。"""
+        return random.Random(f"{self.seed}:{name}")
+
+    @contextmanager
+    def bind_global(self) -> Iterator["SimRandom"]:
+        """在作用域内（仅当前上下文）让 random 模块函数使用本随机源。"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def event_time(self, month_stamp: int) -> float:
+        """month_stamp 月内下一个事件的 created_at：同月内严格递增，不同月份互不重叠。"""
+        month = int(month_stamp)
+        if month != self._clock_month:
+            self._clock_month = month
+            self._clock_seq = 0
+        self._clock_seq += 1
+        return float(month * _MONTH_SECONDS + self._clock_seq)
+
+    def to_dict(self) -> dict:
+        version, internal, gauss_next = self._rng.getstate()
+        return {"seed": self.seed, "state": [version, list(internal), gauss_next]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SimRandom":
+        rng = cls(int(data.get("seed", 0)))
+        state = data.get("state")
+        if state:
+            version, internal, gauss_next = state
+            rng._rng.setstate((version, tuple(internal), gauss_next))
+        return rng
+
+
+def is_deterministic() -> bool:
+    """当前是否处于确定性随机作用域内。"""
+    return _current.get() is not None
+
+
+def event_time(month_stamp: int) -> float:
+    """事件的 created_at：确定性作用域内由世界随机源按月份推出，否则取墙钟时间。"""
+    bound = _current.get()
+    if bound is None:
+        return time.time()
+    return bound.event_time(month_stamp)
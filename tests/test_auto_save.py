@@ -77,8 +77,11 @@ def test_trigger_auto_save_limit(base_world, temp_save_dir):
     for path, meta in saves:
         assert meta["is_auto_save"] is True
         assert meta["playthrough_id"] == test_uuid
-        # sqlite db must exist
+        # sqlite db must exist (delta saves use their checkpoint's db)
         from src.sim.load.load_game import get_events_db_path
+        if meta.get("delta"):
+            path = path.parent / meta["delta"]["base"]
+            assert path.exists()
         assert get_events_db_path(path).exists()
 
 def test_trigger_auto_save_does_not_delete_manual_saves_or_other_playthroughs(base_world, temp_save_dir):
@@ -132,4 +135,65 @@ def test_trigger_auto_save_does_not_delete_manual_saves_or_other_playthroughs(ba
     
     # Verify main auto saves are exactly 5
     main_auto_saves = [s for s in saves if s[1].get("playthrough_id") == main_uuid and s[1].get("is_auto_save") is True]
-    assert len(main_auto_saves) == 5
\ No newline at end of file
+    assert len(main_auto_saves) == 5
+
+def _make_auto_saves(world, sim, times, max_auto_saves=5):
+    from datetime import datetime, timedelta
+    from types import SimpleNamespace
+    from src.sim.managers.event_manager import EventManager
+    world.event_manager = EventManager.create_with_db(CONFIG.paths.saves / "base_events3.db")
+    world.playthrough_id = "test-uuid-units"
+    settings = SimpleNamespace(simulation=SimpleNamespace(max_auto_saves=max_auto_saves))
+    service = SimpleNamespace(get_settings=lambda: settings)
+    current = [datetime.now()]
+
+    def mock_now():
+        current[0] += timedelta(seconds=1)
+        return current[0]
+
+    counts = []
+    with patch("src.sim.save.save_game.datetime") as mock_datetime, \
+            patch("src.server.main.get_settings_service", return_value=service):
+        mock_datetime.now.side_effect = mock_now
+        for _ in range(times):
+            trigger_auto_save(world, sim)
+            counts.append(len(list_saves()))
+    return counts
+
+
+def test_trigger_auto_save_prunes_checkpoint_with_its_deltas(base_world, temp_save_dir):
+    """检查点与其增量一起淘汰：当前日志的检查点也不例外，存档数不超过上限。"""
+    from src.sim.load.load_game import get_events_db_path
+    sim = Simulator(base_world)
+    counts = _make_auto_saves(base_world, sim, 12, max_auto_saves=1)
+    assert counts == [1] * 12
+
+    names = {path.name for path, _ in list_saves()}
+    for path, meta in list_saves():
+        if meta.get("delta"):
+            assert meta["delta"]["base"] in names
+            path = path.parent / meta["delta"]["base"]
+        assert get_events_db_path(path).exists()
+
+
+def test_delete_checkpoint_with_deltas(base_world, temp_save_dir):
+    """删除仍被增量依赖的检查点会被拒绝，除非要求一并删除增量。"""
+    from fastapi.testclient import TestClient
+    from src.server import main
+    from src.sim.load.load_game import get_events_db_path
+    sim = Simulator(base_world)
+    _make_auto_saves(base_world, sim, 3)
+    saves = list_saves()
+    checkpoint = next(path for path, meta in saves if not meta.get("delta"))
+    deltas = [path for path, meta in saves if meta.get("delta")]
+    assert deltas
+
+    client = TestClient(main.app)
+    response = client.post("/api/game/delete", json={"filename": checkpoint.name})
+    assert response.status_code == 409
+    assert checkpoint.exists() and all(path.exists() for path in deltas)
+
+    response = client.post("/api/game/delete", json={"filename": checkpoint.name, "delete_dependents": True})
+    assert response.status_code == 200
+    assert list_saves() == []
+    assert not get_events_db_path(checkpoint).exists()
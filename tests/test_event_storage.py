@@ -13,7 +13,7 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 from src.classes.event import Event, NULL_EVENT
-from src.classes.event_storage import EventStorage
+from src.classes.event_storage import EventStorage, snapshot_database
 from src.sim.managers.event_manager import EventManager
 from src.systems.time import MonthStamp, Year, Month, create_month_stamp
 
@@ -121,6 +121,15 @@ class TestEventStorageBasic:
         assert result is True
         assert event_storage.count() == 1
 
+    def test_add_events_batch(self, event_storage):
+        """Test adding a batch of events in one transaction."""
+        events = [make_event(100, i, f"Event {i}", ["avatar_1"]) for i in range(1, 6)]
+        events.append(make_event(100, 9, "Duplicate", event_id=events[0].id))
+
+        assert event_storage.add_events(events) == 6
+        assert event_storage.count() == 5
+        assert len(event_storage.get_events_by_avatar("avatar_1")) == 5
+
     def test_count(self, event_storage):
         """Test event counting."""
         assert event_storage.count() == 0
@@ -430,6 +439,51 @@ class TestEventStorageCursorParsing:
 
 # --- EventManager Tests ---
 
+class TestEventStorageSnapshot:
+    """Tests for online backup snapshots and rowid watermarks."""
+
+    def test_backup_excludes_uncommitted_writes(self, event_storage, temp_db_path):
+        """A snapshot taken mid-transaction only contains committed events."""
+        for i in range(50):
+            event_storage.add_event(make_event(100, 1, f"Committed {i}" + "x" * 200))
+        event_storage._conn.execute(
+            "INSERT INTO events (id, month_stamp, content) VALUES ('pending', 1, 'uncommitted')"
+        )
+
+        dest = temp_db_path.with_name("snapshot.db")
+        event_storage.backup_to(dest, pages=1)
+        event_storage._conn.rollback()
+
+        snapshot = EventStorage(dest)
+        try:
+            assert snapshot.count() == 50
+        finally:
+            snapshot.close()
+        assert not dest.with_name(dest.name + ".tmp").exists()
+
+    def test_snapshot_database_from_path(self, event_storage, temp_db_path):
+        event_storage.add_event(make_event(100, 1, "Event"))
+
+        dest = temp_db_path.with_name("copy.db")
+        snapshot_database(temp_db_path, dest)
+
+        snapshot = EventStorage(dest)
+        try:
+            assert [e.content for e in snapshot.get_recent_events()] == ["Event"]
+        finally:
+            snapshot.close()
+
+    def test_get_events_since_watermark(self, event_manager):
+        event_manager.add_event(make_event(100, 1, "Old"))
+        watermark = event_manager.last_rowid()
+        event_manager.add_event(make_event(100, 2, "New", ["a1"]))
+
+        events = event_manager.get_events_since(watermark)
+
+        assert [e.content for e in events] == ["New"]
+        assert events[0].related_avatars == ["a1"]
+
+
 class TestEventManagerWithStorage:
     """EventManager tests with SQLite storage."""
 
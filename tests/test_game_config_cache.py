@@ -0,0 +1,53 @@
+"""
+测试 CSV 配置的编译缓存：命中时不再解析 CSV，任一源文件改动后自动失效。
+"""
+import shutil
+
+import pytest
+
+from src.config import get_data_paths
+from src.utils import df
+from src.utils.config import CONFIG
+
+
+@pytest.fixture
+def shared_configs(tmp_path, monkeypatch):
+    """把共享配置复制到临时目录，便于修改。"""
+    target = tmp_path / "game_configs"
+    shutil.copytree(CONFIG.paths.shared_game_configs, target)
+    monkeypatch.setattr(CONFIG.paths, "shared_game_configs", target)
+    return target
+
+
+def test_second_load_is_served_from_cache(shared_configs, monkeypatch):
+    first = df.load_game_configs_cached()
+    assert list(get_data_paths().cache_dir.glob("game_configs_*.pickle"))
+
+    def no_parse(path):
+        raise AssertionError(f"parsed {path}")
+
+    monkeypatch.setattr(df, "load_csv", no_parse)
+    assert df.load_game_configs_cached() == first
+
+
+def test_changed_csv_invalidates_cache(shared_configs, monkeypatch):
+    df.load_game_configs_cached()
+
+    path = shared_configs / "root.csv"
+    path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    parsed = []
+    real_load_csv = df.load_csv
+    monkeypatch.setattr(df, "load_csv", lambda p: parsed.append(p.name) or real_load_csv(p))
+
+    configs = df.load_game_configs_cached()
+
+    assert "root.csv" in parsed
+    assert configs["root"] == real_load_csv(path)
+
+
+def test_corrupt_cache_is_rebuilt(shared_configs):
+    expected = df.load_game_configs_cached()
+    for cache_file in get_data_paths().cache_dir.glob("game_configs_*.pickle"):
+        cache_file.write_bytes(b"not a pickle")
+
+    assert df.load_game_configs_cached() == expected
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from src.run.headless import build_world, run_headless, main
+from src.sim.load.load_game import load_game
+
+
+@pytest.mark.asyncio
+async def test_run_headless_advances_months_and_writes_outputs(tmp_path, mock_llm_managers):
+    world, sim, sects = build_world(npc_num=4, sect_num=1, events_db_path=tmp_path / "run_events.db")
+    start_stamp = int(world.month_stamp)
+    events_path = tmp_path / "out" / "events.jsonl"
+
+    result = await run_headless(
+        world,
+        sim,
+        sects,
+        months=3,
+        save_every=2,
+        save_dir=tmp_path / "saves",
+        save_name="soak",
+        events_path=events_path,
+        quiet=True,
+    )
+    world.event_manager.close()
+
+    assert int(world.month_stamp) == start_stamp + 3
+    assert result.months == 3
+    assert len(result.month_durations) == 3
+    # 第 2 个月的周期存档 + 结束时的最终存档
+    assert [p.name for p in result.saves] == ["soak_Y100M3.json", "soak_Y100M4.json"]
+    assert all(p.exists() for p in result.saves)
+
+    lines = events_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == result.event_count
+    for line in lines:
+        assert "content" in json.loads(line)
+
+    summary = result.summary()
+    assert summary["months"] == 3 and summary["max_ms"] >= summary["p50_ms"]
+
+
+def test_headless_cli_loads_save_and_continues(tmp_path, mock_llm_managers):
+    world, sim, sects = build_world(npc_num=2, sect_num=0, events_db_path=tmp_path / "base_events.db")
+    world.event_manager.close()
+
+    from src.sim.save.save_game import save_game
+    save_path = tmp_path / "base.json"
+    assert save_game(world, sim, sects, save_path=save_path)[0]
+
+    trace_path = tmp_path / "trace.json"
+    rc = main([
+        "--load", str(save_path),
+        "--months", "1",
+        "--save-dir", str(tmp_path / "out"),
+        "--name", "cont",
+        "--profile", str(trace_path),
+        "--quiet",
+    ])
+    assert rc == 0
+
+    saved = tmp_path / "out" / "cont_Y100M2.json"
+    loaded_world, _, _ = load_game(saved)
+    assert loaded_world.month_stamp == world.month_stamp + 1
+    loaded_world.event_manager.close()
+
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    assert any(e["name"] == "step" for e in trace["traceEvents"])
+
+
+@pytest.mark.asyncio
+async def test_seeded_runs_write_identical_event_jsonl(tmp_path, mock_llm_managers):
+    async def run(name: str) -> bytes:
+        world, sim, sects = build_world(npc_num=4, sect_num=1, events_db_path=tmp_path / f"{name}.db", seed=7)
+        events_path = tmp_path / f"{name}.jsonl"
+        await run_headless(
+            world, sim, sects, months=3,
+            save_dir=tmp_path / name, events_path=events_path, quiet=True,
+        )
+        world.event_manager.close()
+        return events_path.read_bytes()
+
+    first = await run("a")
+    second = await run("b")
+    assert first
+    assert first == second
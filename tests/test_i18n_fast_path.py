@@ -0,0 +1,56 @@
+"""
+t() 快速路径：翻译快照与 gettext 结果一致、语言切换即时生效、缺失告警去重。
+"""
+import logging
+
+import pytest
+
+import src.i18n as i18n
+from src.classes.language import LanguageType, language_manager
+from src.i18n import reload_translations, t
+
+
+@pytest.fixture
+def restore_language():
+    original = language_manager._current
+    yield
+    language_manager._current = original
+    reload_translations()
+
+
+def test_snapshot_matches_gettext():
+    reload_translations()
+    trans = i18n._get_translation()
+    t("action_thinking")
+
+    table = i18n._active.table
+    assert table
+    for message in list(table)[:500]:
+        if message:
+            assert t(message) == trans.gettext(message)
+
+
+def test_direct_language_change_is_picked_up(restore_language):
+    language_manager._current = LanguageType.ZH_CN
+    zh = t("action_thinking")
+
+    language_manager._current = LanguageType.EN_US
+    en = t("action_thinking")
+
+    assert zh != en
+    assert i18n._active.lang == "en-US"
+
+
+def test_missing_translation_warned_once(caplog, restore_language):
+    language_manager._current = LanguageType.ZH_CN
+    reload_translations()
+
+    with caplog.at_level(logging.WARNING, logger=i18n.logger.name):
+        for _ in range(3):
+            assert t("__missing_fast_path_msgid__") == "__missing_fast_path_msgid__"
+    assert len([r for r in caplog.records if "__missing_fast_path_msgid__" in r.getMessage()]) == 1
+
+    reload_translations()
+    with caplog.at_level(logging.WARNING, logger=i18n.logger.name):
+        t("__missing_fast_path_msgid__")
+    assert len([r for r in caplog.records if "__missing_fast_path_msgid__" in r.getMessage()]) == 2
@@ -0,0 +1,161 @@
+import pytest
+
+from src.classes.age import Age
+from src.classes.core.avatar import Avatar, Gender
+from src.classes.relation.relation import Relation
+from src.sim.load.lazy_avatars import DeadAvatarStub, LazyAvatarDict
+from src.sim.load.load_game import load_game
+from src.sim.load.save_reader import open_save
+from src.sim.save.save_game import save_game
+from src.sim.simulator import Simulator
+from src.systems.cultivation import Realm
+from src.systems.time import Month, Year, create_month_stamp
+from src.utils.id_generator import get_avatar_id
+
+
+def _make_avatar(world, name):
+    avatar = Avatar(
+        world=world,
+        name=name,
+        id=get_avatar_id(),
+        birth_month_stamp=create_month_stamp(Year(2000), Month.JANUARY),
+        age=Age(30, Realm.Qi_Refinement),
+        gender=Gender.FEMALE,
+        pos_x=1,
+        pos_y=1,
+    )
+    world.avatar_manager.register_avatar(avatar)
+    return avatar
+
+
+def _kill(world, avatar):
+    avatar.set_dead("test", world.month_stamp)
+    world.avatar_manager.handle_death(avatar.id)
+
+
+@pytest.fixture
+def loaded(base_world, tmp_path):
+    """存活的 L 与已故的 D1 有关系；已故的 D2、D3 只彼此相关。"""
+    living, d1, d2, d3 = (_make_avatar(base_world, n) for n in ("L", "D1", "D2", "D3"))
+    living.set_relation(d1, Relation.IS_FRIEND_OF)
+    d2.set_relation(d3, Relation.IS_ENEMY_OF)
+    for avatar in (d1, d2, d3):
+        _kill(base_world, avatar)
+
+    path = tmp_path / "lazy.json"
+    save_game(base_world, Simulator(base_world), [], save_path=path)
+    world, _, _ = load_game(path)
+    yield world, path, {a.name: a.id for a in (living, d1, d2, d3)}
+    world.event_manager.close()
+
+
+def test_unreferenced_dead_avatars_load_as_stubs(loaded):
+    world, _, ids = loaded
+    manager = world.avatar_manager
+    records = dict(manager.iter_dead_records())
+
+    assert isinstance(manager.dead_avatars, LazyAvatarDict)
+    assert isinstance(records[ids["D1"]], Avatar)
+    assert isinstance(records[ids["D2"]], DeadAvatarStub)
+    assert isinstance(records[ids["D3"]], DeadAvatarStub)
+    assert len(manager.dead_avatars) == 3
+
+    living = manager.avatars[ids["L"]]
+    assert living.relations[manager.dead_avatars[ids["D1"]]] == Relation.IS_FRIEND_OF
+
+
+def test_stub_inflates_with_its_relations_on_access(loaded):
+    world, _, ids = loaded
+    manager = world.avatar_manager
+
+    d2 = manager.get_avatar(ids["D2"])
+
+    assert isinstance(d2, Avatar) and d2.is_dead
+    records = dict(manager.iter_dead_records())
+    d3 = records[ids["D3"]]
+    assert isinstance(d3, Avatar)
+    assert d2.relations[d3] == Relation.IS_ENEMY_OF
+    assert d3.relations[d2] == Relation.IS_ENEMY_OF
+    assert manager.dead_avatars.stub_count() == 0
+
+
+def test_resave_keeps_stub_data_without_inflating(loaded, tmp_path):
+    world, path, ids = loaded
+
+    resaved = tmp_path / "resaved.json"
+    save_game(world, Simulator(world), [], save_path=resaved)
+
+    assert world.avatar_manager.dead_avatars.stub_count() == 2
+    before = {a["id"]: a for a in open_save(path).iter_avatars()}
+    after = {a["id"]: a for a in open_save(resaved).iter_avatars()}
+    assert after[ids["D2"]] == before[ids["D2"]]
+    assert set(after) == set(before)
+
+
+def test_removing_stub_updates_related_stub(loaded):
+    world, _, ids = loaded
+    manager = world.avatar_manager
+
+    manager.remove_avatar(ids["D2"])
+
+    assert ids["D2"] not in manager.dead_avatars
+    d3 = dict(manager.iter_dead_records())[ids["D3"]]
+    assert isinstance(d3, DeadAvatarStub)
+    assert d3.relation_ids == []
+    assert ids["D3"] in manager.get_save_dirty_ids()
+
+
+def test_iterating_values_inflates_only_visited_stubs(loaded):
+    world, _, ids = loaded
+    dead = world.avatar_manager.dead_avatars
+
+    values = dead.values()
+    assert len(values) == 3
+    assert ids["D2"] in dead
+    # D1 是读档时就构建的，排在存根前面；遍历到它为止不还原任何存根
+    for avatar in values:
+        if avatar.id == ids["D1"]:
+            break
+    assert dead.stub_count() == 2
+    for _ in world.avatar_manager.iter_all_records():
+        pass
+    assert dead.stub_count() == 2
+
+    assert all(isinstance(avatar, Avatar) for _, avatar in dead.items())
+    assert dead.stub_count() == 0
+
+
+def test_copies_never_expose_stubs(loaded):
+    world, _, ids = loaded
+    dead = world.avatar_manager.dead_avatars
+
+    for copied in (dict(dead), dead.copy(), {**dead}):
+        assert type(copied) is dict
+        assert set(copied) == set(ids.values()) - {ids["L"]}
+        assert all(isinstance(avatar, Avatar) for avatar in copied.values())
+
+
+def test_stubs_keep_only_summary_and_reread_from_save(loaded):
+    world, path, ids = loaded
+    d2 = dict(world.avatar_manager.iter_dead_records())[ids["D2"]]
+
+    assert d2.data is None
+    assert d2.source.path == path
+    assert d2.relation_ids == [ids["D3"]]
+    assert d2.to_save_dict()["name"] == "D2"
+
+
+def test_overwriting_source_save_releases_stub_records(loaded, tmp_path):
+    world, path, ids = loaded
+    manager = world.avatar_manager
+    manager.remove_avatar(ids["D2"])
+
+    # 覆盖读档时的存档：存根先把记录读回内存，之后仍可存档与还原
+    save_game(world, Simulator(world), [], save_path=path)
+    d3 = dict(manager.iter_dead_records())[ids["D3"]]
+    assert isinstance(d3, DeadAvatarStub) and d3.source is None
+    saved = {a["id"]: a for a in open_save(path).iter_avatars()}
+    assert ids["D2"] not in saved
+    assert saved[ids["D3"]].get("relations") in (None, {})
+
+    assert manager.get_avatar(ids["D3"]).relations == {}
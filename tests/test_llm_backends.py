@@ -0,0 +1,144 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.sim.simulator import Simulator
+from src.utils.llm import LLMError, LLMMode, call_llm_with_task_name, set_backend
+from src.utils.llm.backends import (
+    LLMRequest,
+    RecordingBackend,
+    ReplayBackend,
+    RuleBasedBackend,
+    StubServerBackend,
+    create_backend,
+)
+from src.utils.llm.config import LLMConfig
+from src.utils.llm.exceptions import ConfigError
+from src.utils.llm.stub_server import start_stub_server
+
+CONFIG = LLMConfig(model_name="m", api_key="", base_url="")
+
+
+@pytest.fixture
+def offline_llm():
+    """切换到规则后端，并使 LLM 配置不依赖本地设置。"""
+    with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=CONFIG), \
+         patch("src.utils.llm.client.log_llm_call"):
+        yield set_backend("rule")
+    set_backend(None)
+
+
+def _action_request(prompt: str = "p") -> LLMRequest:
+    action_infos = {
+        "Cultivate": {"params": {}},
+        "Rest": {},
+        "MoveToRegion": {"params": {"region": "region name"}},
+    }
+    return LLMRequest(
+        prompt=prompt,
+        mode=LLMMode.NORMAL,
+        task_name="action_decision",
+        infos={"avatar_name": "张三", "general_action_infos": json.dumps(action_infos)},
+    )
+
+
+def test_rule_backend_is_deterministic_and_skips_parameterised_actions():
+    backend = RuleBasedBackend()
+    first = json.loads(backend.complete(_action_request(), CONFIG))
+    second = json.loads(backend.complete(_action_request(), CONFIG))
+    assert first == second
+
+    pairs = first["张三"]["action_name_params_pairs"]
+    assert pairs and all(name in ("Cultivate", "Rest") for name, _ in pairs)
+
+    unknown = LLMRequest(prompt="p", mode=LLMMode.FAST, task_name="story_teller")
+    assert backend.complete(unknown, CONFIG) == "{}"
+
+    choice = LLMRequest(
+        prompt="p",
+        mode=LLMMode.NORMAL,
+        task_name="anything",
+        infos={"options_json": json.dumps([{"key": "A"}, {"key": "B"}])},
+    )
+    assert json.loads(backend.complete(choice, CONFIG))["choice"] in ("A", "B")
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    inner = MagicMock()
+    inner.blocking = True
+    inner.complete.return_value = '{"answer": 42}'
+    request = LLMRequest(prompt="hello", mode=LLMMode.FAST, task_name="demo")
+
+    recorder = RecordingBackend(tmp_path, inner=inner)
+    assert recorder.blocking is True
+    assert recorder.complete(request, CONFIG) == '{"answer": 42}'
+
+    replay = ReplayBackend(tmp_path)
+    assert replay.complete(request, CONFIG) == '{"answer": 42}'
+    assert replay.hits == 1
+
+    with pytest.raises(LLMError):
+        replay.complete(LLMRequest(prompt="other", mode=LLMMode.FAST), CONFIG)
+
+    with_fallback = ReplayBackend(tmp_path, fallback=RuleBasedBackend())
+    assert with_fallback.complete(LLMRequest(prompt="other", mode=LLMMode.FAST), CONFIG) == "{}"
+    assert with_fallback.misses == 1
+    assert with_fallback.blocking is False
+    assert replay.blocking is False
+    # 阻塞型 fallback（如 HTTP）未命中时会同步发请求，整个回放后端需进线程池
+    assert ReplayBackend(tmp_path, fallback=StubServerBackend("http://127.0.0.1:1")).blocking is True
+
+
+def test_unknown_backend_name_raises():
+    with pytest.raises(ConfigError):
+        create_backend("nope")
+
+
+def test_stub_server_round_trip():
+    server = start_stub_server()
+    try:
+        backend = StubServerBackend(server.url)
+        result = json.loads(backend.complete(_action_request(), CONFIG))
+    finally:
+        server.stop()
+    assert "张三" in result
+    assert server.request_count == 1
+
+
+@pytest.mark.asyncio
+async def test_call_llm_uses_active_backend_with_task_and_infos(offline_llm, tmp_path):
+    template = tmp_path / "t.txt"
+    template.write_text("{avatar_name_2}", encoding="utf-8")
+
+    with patch("src.utils.llm.client._call_with_requests") as http:
+        result = await call_llm_with_task_name(
+            "interaction_feedback",
+            template,
+            {"avatar_name_2": "李四", "feedback_actions": ["Accept", "Reject"]},
+        )
+    http.assert_not_called()
+    assert result["李四"]["feedback"] in ("Accept", "Reject")
+
+
+@pytest.mark.asyncio
+async def test_simulator_steps_offline_with_rule_backend(base_world, dummy_avatar, offline_llm):
+    from src.classes.ai import llm_ai
+
+    base_world.avatar_manager.register_avatar(dummy_avatar)
+    sim = Simulator(base_world)
+    tasks = []
+    original = offline_llm.respond
+
+    def spy(request):
+        tasks.append(request.task_name)
+        return original(request)
+
+    # conftest 默认把决策 AI 换成了 mock，这里换回真实实现，让决策走规则后端
+    with patch("src.sim.simulator_engine.phases.actions.llm_ai", llm_ai), \
+         patch.object(offline_llm, "respond", side_effect=spy), \
+         patch("src.utils.llm.client._call_with_requests", side_effect=AssertionError("network")):
+        for _ in range(2):
+            await sim.step()
+    assert "action_decision" in tasks
+    assert dummy_avatar.current_action is not None or dummy_avatar.has_plans()
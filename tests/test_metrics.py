@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from src.run.metrics import MetricsRegistry, get_metrics, step_phase_duration, llm_calls, llm_parse_retries
+from src.sim.simulator import Simulator
+
+
+def test_counter_and_gauge_render_prometheus_text():
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo counter.", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    counter.inc(kind='b"x')
+
+    gauge = registry.gauge("demo_gauge", "Demo gauge.")
+    gauge.set(5)
+    gauge.dec()
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{kind="a"} 3' in text
+    assert 'demo_total{kind="b\\"x"} 1' in text
+    assert "# TYPE demo_gauge gauge" in text
+    assert "demo_gauge 4" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    hist = registry.histogram("demo_seconds", "Demo histogram.", buckets=(0.1, 1.0))
+    hist.observe(0.05)
+    hist.observe(0.5)
+    hist.observe(5)
+
+    text = registry.render()
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1"} 2' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+    assert "demo_seconds_count 3" in text
+    assert hist.get_sum() == pytest.approx(5.55)
+
+
+def test_registry_reuses_metric_and_rejects_type_conflict():
+    registry = MetricsRegistry()
+    assert registry.counter("x_total", "x") is registry.counter("x_total", "x")
+    with pytest.raises(ValueError):
+        registry.gauge("x_total", "x")
+    with pytest.raises(ValueError):
+        registry.counter("x_total", "x").inc(kind="unexpected")
+
+
+@pytest.mark.asyncio
+async def test_simulator_step_records_phase_durations(base_world, mock_llm_managers):
+    before = step_phase_duration().get_count(phase="perception")
+    before_finalize = step_phase_duration().get_count(phase="finalize")
+
+    await Simulator(base_world).step()
+
+    assert step_phase_duration().get_count(phase="perception") == before + 1
+    assert step_phase_duration().get_count(phase="finalize") == before_finalize + 1
+
+
+@pytest.mark.asyncio
+async def test_llm_metrics_by_task_and_retry():
+    from src.utils.llm.client import call_llm_with_task_name
+    from src.utils.llm.config import LLMMode
+
+    mock_config = MagicMock()
+    mock_config.model_name = "test-model"
+    ok_before = llm_calls().get(task="metrics_task", mode="fast", status="ok")
+    retry_before = llm_parse_retries().get(task="metrics_task", mode="fast")
+
+    with patch("src.utils.llm.client.get_task_mode", return_value=LLMMode.FAST), \
+         patch("src.utils.llm.client.load_template", return_value="prompt"), \
+         patch("src.utils.llm.client.CONFIG") as mock_cfg, \
+         patch("src.utils.llm.client.LLMConfig.from_mode", return_value=mock_config), \
+         patch("src.utils.llm.client.log_llm_call"), \
+         patch("src.utils.llm.client._call_with_requests", side_effect=["not json", '{"ok": true}']):
+        mock_cfg.llm.mode = "default"
+        result = await call_llm_with_task_name("metrics_task", "t.txt", {}, max_retries=1)
+
+    assert result == {"ok": True}
+    assert llm_calls().get(task="metrics_task", mode="fast", status="ok") == ok_before + 2
+    assert llm_parse_retries().get(task="metrics_task", mode="fast") == retry_before + 1
+
+
+def test_api_metrics_endpoint_exposes_population(base_world, dummy_avatar):
+    from src.server import main
+
+    base_world.avatar_manager.register_avatar(dummy_avatar)
+    original_world = main.game_instance.get("world")
+    main.game_instance["world"] = base_world
+    try:
+        client = TestClient(main.app)
+        resp = client.get("/api/metrics")
+    finally:
+        main.game_instance["world"] = original_world
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'cws_population{kind="living"} 1' in resp.text
+    assert 'cws_population{kind="dead"} 0' in resp.text
+    assert get_metrics().render().startswith("# HELP")
@@ -0,0 +1,114 @@
+"""
+地形感知寻路：地块消耗、按目的地共享的流场缓存与增量失效。
+"""
+from src.classes.action import MoveToRegion
+from src.classes.environment.pathfinding import TILE_MOVE_COSTS
+from src.classes.environment.region import CityRegion
+from src.classes.environment.tile import TileType
+
+
+def _city(game_map, cors):
+    city = CityRegion(id=1, name="青云城", desc="", cors=cors)
+    game_map.regions[city.id] = city
+    game_map.tiles.assign_region(city, cors)
+    return city
+
+
+def test_uniform_terrain_distance_is_manhattan(base_map):
+    city = _city(base_map, [(9, 9)])
+    field = base_map.pathfinder.flow_field(city)
+
+    for y in range(base_map.height):
+        for x in range(base_map.width):
+            assert field.dist[y * base_map.width + x] == (9 - x) + (9 - y)
+    assert base_map.pathfinder.advance(0, 9, city, budget=3) == (3, 9)
+
+
+def test_path_avoids_expensive_terrain(base_map):
+    # 第 0 行中间是一片雪山，绕行一行更省
+    for x in range(2, 8):
+        base_map.create_tile(x, 0, TileType.SNOW_MOUNTAIN)
+    city = _city(base_map, [(9, 0)])
+    pathfinder = base_map.pathfinder
+
+    x, y, visited = 0, 0, []
+    while not pathfinder.is_inside(x, y, city):
+        x, y = pathfinder.advance(x, y, city, budget=1)
+        visited.append((x, y))
+    assert all(base_map.get_tile(*loc).type is not TileType.SNOW_MOUNTAIN for loc in visited)
+    assert len(visited) == 11
+
+
+def test_budget_spent_on_tile_costs(base_map):
+    # 整列雪山，必须翻越
+    for y in range(base_map.height):
+        base_map.create_tile(5, y, TileType.SNOW_MOUNTAIN)
+    city = _city(base_map, [(9, 0)])
+    pathfinder = base_map.pathfinder
+    assert TILE_MOVE_COSTS[TileType.SNOW_MOUNTAIN] == 3
+
+    # 剩余预算不足以进入雪山时停下
+    assert pathfinder.advance(3, 0, city, budget=2) == (4, 0)
+    # 但每月至少前进一格
+    assert pathfinder.advance(4, 0, city, budget=2) == (5, 0)
+    assert pathfinder.advance(4, 0, city, budget=5) == (7, 0)
+
+
+def test_flow_field_shared_and_invalidated_incrementally(base_map):
+    city = _city(base_map, [(9, 0)])
+    other = CityRegion(id=2, name="落霞城", desc="", cors=[(0, 9)])
+    base_map.regions[other.id] = other
+    pathfinder = base_map.pathfinder
+
+    field = pathfinder.flow_field(city)
+    other_field = pathfinder.flow_field(other)
+    assert pathfinder.flow_field(city) is field
+
+    # (5, 0) 位于通往 city 的最短路上：变贵后 city 的流场失效；other 的流场只在确实受影响时重建
+    base_map.create_tile(5, 0, TileType.VOLCANO)
+    rebuilt = pathfinder.flow_field(city)
+    assert rebuilt is not field
+    assert rebuilt.dist == pathfinder._build(city).dist
+    assert pathfinder.flow_field(other).dist == pathfinder._build(other).dist
+
+    # 离 other 很远的角落变便宜不影响通往 other 的流场
+    other_field = pathfinder.flow_field(other)
+    base_map.create_tile(9, 0, TileType.FOREST)
+    base_map.create_tile(9, 0, TileType.PLAIN)
+    assert pathfinder.flow_field(other) is other_field
+
+    # 地块类型不变（或消耗不变）时不失效
+    field = pathfinder.flow_field(city)
+    base_map.create_tile(3, 3, TileType.GRASSLAND)
+    assert pathfinder.flow_field(city) is field
+
+    base_map.tiles.load_type_codes(base_map.tiles.type_codes)
+    assert pathfinder.flow_field(city) is not field
+
+
+def test_flow_field_rebuilt_when_region_cors_change(base_map):
+    city = _city(base_map, [(9, 0)])
+    pathfinder = base_map.pathfinder
+    field = pathfinder.flow_field(city)
+    assert field.dist[0] == 9
+
+    # 原地迁移区域坐标（如宗门总部变动）
+    city.cors[:] = [(0, 9)]
+    rebuilt = pathfinder.flow_field(city)
+    assert rebuilt is not field
+    assert rebuilt.dist[0] == 9 and rebuilt.dist[9] == 18
+    assert pathfinder.flow_field(city) is rebuilt
+
+
+def test_move_to_region_reaches_target(base_world, dummy_avatar):
+    game_map = base_world.map
+    for y in range(0, 8):
+        game_map.create_tile(4, y, TileType.SEA)
+    city = _city(game_map, [(8, 0), (9, 0), (8, 1), (9, 1)])
+
+    action = MoveToRegion(dummy_avatar, base_world)
+    action.start(city.name)
+    for _ in range(30):
+        if action.step(city.name).status.value == "completed":
+            break
+    assert (dummy_avatar.pos_x, dummy_avatar.pos_y) == action.target_loc
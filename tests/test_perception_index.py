@@ -0,0 +1,88 @@
+"""
+感知阶段的预计算：按 (x, y, 半径) 缓存可见区域、洞府主人索引、单项效果读取。
+"""
+import random
+
+import pytest
+
+from src.classes.environment.region import CultivateRegion
+from src.classes.essence import EssenceType
+from src.classes.observe import get_avatar_observation_radius
+from src.run.load_map import load_cultivation_world_map
+from src.sim.simulator_engine.phases.world import phase_update_perception_and_knowledge
+
+
+@pytest.fixture
+def cave_world(base_world):
+    game_map = base_world.map
+    caves = [
+        CultivateRegion(id=1, name="东洞", desc="", cors=[(1, 0)], essence_type=EssenceType.FIRE, essence_density=3),
+        CultivateRegion(id=2, name="西洞", desc="", cors=[(0, 1)], essence_type=EssenceType.WATER, essence_density=3),
+    ]
+    for cave in caves:
+        game_map.regions[cave.id] = cave
+        game_map.tiles.assign_region(cave, cave.cors)
+    return base_world, caves
+
+
+def test_observed_regions_match_diamond_scan():
+    game_map = load_cultivation_world_map()
+    rng = random.Random(7)
+
+    for _ in range(200):
+        x, y, radius = rng.randrange(game_map.width), rng.randrange(game_map.height), rng.randint(1, 6)
+        expected = {
+            game_map.get_region(tx, ty).id
+            for tx in range(game_map.width)
+            for ty in range(game_map.height)
+            if abs(tx - x) + abs(ty - y) <= radius and game_map.get_region(tx, ty)
+        }
+        region_ids, caves = game_map.get_observed_regions(x, y, radius)
+        assert region_ids == expected
+        assert {c.id for c in caves} == {rid for rid in expected if isinstance(game_map.regions[rid], CultivateRegion)}
+
+
+def test_region_change_invalidates_observed_cache(cave_world):
+    world, (east, _) = cave_world
+    assert world.map.get_observed_regions(5, 5, 2)[0] == frozenset()
+
+    world.map.get_tile(5, 6).region = east
+    assert world.map.get_observed_regions(5, 5, 2)[0] == {east.id}
+
+
+def test_host_index_follows_host_changes(cave_world, dummy_avatar):
+    world, (east, west) = cave_world
+    game_map = world.map
+    assert not game_map.is_region_host(dummy_avatar.id)
+
+    dummy_avatar.occupy_region(east)
+    assert game_map.is_region_host(dummy_avatar.id)
+    dummy_avatar.occupy_region(west)
+    dummy_avatar.release_region(east)
+    assert game_map.is_region_host(dummy_avatar.id)
+
+    west.host_avatar = None
+    assert not game_map.is_region_host(dummy_avatar.id)
+
+
+def test_phase_occupies_one_ownerless_cave(cave_world, dummy_avatar):
+    world, caves = cave_world
+
+    events = phase_update_perception_and_knowledge(world, [dummy_avatar])
+
+    assert {1, 2} <= dummy_avatar.known_regions
+    assert len(events) == 1
+    assert [c.host_avatar for c in caves].count(dummy_avatar) == 1
+
+    assert phase_update_perception_and_knowledge(world, [dummy_avatar]) == []
+
+
+def test_get_effect_matches_full_merge(base_world):
+    from src.sim.avatar_init import make_avatars
+
+    avatars = make_avatars(base_world, count=20).values()
+    for avatar in avatars:
+        effects = avatar.effects
+        for key in ("extra_observation_radius", "extra_battle_strength_points", "legal_actions"):
+            assert avatar.get_effect(key) == effects.get(key)
+        assert get_avatar_observation_radius(avatar) >= 1
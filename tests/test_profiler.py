@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.run.profiler import StepProfiler, get_profiler
+from src.sim.simulator import Simulator
+
+
+@pytest.fixture
+def profiler():
+    p = get_profiler()
+    p.clear()
+    p.set_enabled(True)
+    yield p
+    p.set_enabled(False)
+    p.clear()
+
+
+def test_disabled_profiler_records_nothing():
+    p = StepProfiler()
+    with p.span("outer"):
+        with p.span("inner"):
+            pass
+    assert len(p) == 0
+
+
+def test_nested_spans_and_collapsed_stacks():
+    p = StepProfiler()
+    p.set_enabled(True)
+    with p.span("step"):
+        with p.span("phase_a", "phase", cpu=True):
+            sum(range(10000))
+        with p.span("phase_b", "phase", cpu=True):
+            pass
+
+    spans = p.get_spans()
+    assert [s.name for s in spans] == ["phase_a", "phase_b", "step"]
+    assert spans[0].stack == ("step", "phase_a")
+    assert all(s.wall >= s.cpu >= 0 for s in spans[:2])
+    # 未声明 cpu 的 span 只有墙钟时间
+    assert spans[2].cpu is None and spans[2].await_time is None
+
+    collapsed = p.to_collapsed_stacks()
+    stacks = {line.rsplit(" ", 1)[0] for line in collapsed.splitlines()}
+    assert "step;phase_a" in stacks
+    cpu_stacks = {line.rsplit(" ", 1)[0] for line in p.to_collapsed_stacks(metric="cpu").splitlines()}
+    assert "step" not in cpu_stacks
+    with pytest.raises(ValueError):
+        p.to_collapsed_stacks(metric="bogus")
+
+
+def test_ring_buffer_capacity():
+    p = StepProfiler(capacity=3)
+    p.set_enabled(True)
+    for i in range(5):
+        with p.span(f"s{i}"):
+            pass
+    assert [s.name for s in p.get_spans()] == ["s2", "s3", "s4"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_inherit_parent_span():
+    p = StepProfiler()
+    p.set_enabled(True)
+
+    async def child(i):
+        with p.span(f"child{i}", "llm"):
+            await asyncio.sleep(0.01)
+
+    with p.span("phase"):
+        await asyncio.gather(child(0), child(1))
+
+    children = [s for s in p.get_spans() if s.category == "llm"]
+    assert {s.stack for s in children} == {("phase", "child0"), ("phase", "child1")}
+    # 两个子任务分属不同轨道，避免 Chrome trace 中重叠
+    assert children[0].tid != children[1].tid
+    assert all(s.wall > 0 and s.cpu is None for s in children)
+
+
+@pytest.mark.asyncio
+async def test_simulator_step_emits_phase_spans(base_world, mock_llm_managers, profiler):
+    await Simulator(base_world).step()
+
+    trace = profiler.to_chrome_trace()
+    names = {e["name"] for e in trace["traceEvents"]}
+    assert {"step", "perception", "decide_actions", "finalize"} <= names
+    phase = next(e for e in trace["traceEvents"] if e["name"] == "perception")
+    assert phase["ph"] == "X"
+    assert phase["args"]["cpu_ms"] >= 0 and phase["args"]["await_ms"] >= 0
+    # 跨越 await 的 phase 不报告 CPU / 挂起时间
+    decide = next(e for e in trace["traceEvents"] if e["name"] == "decide_actions")
+    assert decide["args"]["cpu_ms"] is None and decide["args"]["await_ms"] is None
+    json.dumps(trace)
+
+    summary = {item["name"]: item for item in profiler.summary()}
+    assert summary["perception"]["cpu_ms"] is not None
+    assert summary["step"]["cpu_ms"] is None
+
+
+def test_profiler_api_toggle_and_export(profiler):
+    from src.server import main
+
+    client = TestClient(main.app)
+    resp = client.post("/api/control/profiler", json={"enabled": False, "clear": True})
+    assert resp.json()["enabled"] is False
+
+    client.post("/api/control/profiler", json={"enabled": True})
+    with profiler.span("api_demo", cpu=True):
+        sum(range(10000))
+
+    status = client.get("/api/profiler").json()
+    assert status["enabled"] is True
+    assert status["summary"][0]["name"] == "api_demo"
+
+    chrome = client.get("/api/profiler/trace").json()
+    assert chrome["traceEvents"][0]["name"] == "api_demo"
+
+    collapsed = client.get("/api/profiler/trace", params={"format": "collapsed"})
+    assert collapsed.text.startswith("api_demo ")
+    cpu = client.get("/api/profiler/trace", params={"format": "collapsed", "metric": "cpu"})
+    assert cpu.status_code == 200
+    assert client.get("/api/profiler/trace", params={"format": "collapsed", "metric": "bogus"}).status_code == 400
@@ -178,3 +178,36 @@ def test_init_tournament_info():
     manager.init_tournament_info(100, 111, 12)
     assert manager.tournament_info["next_year"] == 121
 
+
+
+def test_top_k_matches_full_sort_and_paginates(dummy_avatar, monkeypatch):
+    """榜单保留 top_k 人，顺序与按战力稳定排序一致；读取按 offset/limit 切片。"""
+    import copy
+    import uuid
+    from src.systems.battle import get_base_strength
+    from src.utils.config import CONFIG
+
+    monkeypatch.setattr(CONFIG.ranking, "top_k", 4)
+    monkeypatch.setattr(CONFIG.ranking, "display_size", 2)
+
+    avatars = []
+    for level in (61, 75, 61, 89, 70, 82, 61):
+        av = copy.deepcopy(dummy_avatar)
+        av.id = str(uuid.uuid4())
+        av.name = f"L{level}"
+        av.update_cultivation(level)
+        avatars.append(av)
+
+    manager = RankingManager()
+    manager.update_rankings(avatars)
+
+    expected = sorted(avatars, key=get_base_strength, reverse=True)[:4]
+    assert [info["id"] for info in manager.earth_ranking] == [str(a.id) for a in expected]
+    assert [info["power"] for info in manager.earth_ranking] == [int(get_base_strength(a)) for a in expected]
+
+    assert [info["id"] for info in manager.get_rankings_data()["earth"]] == [str(a.id) for a in expected[:2]]
+    assert [info["id"] for info in manager.get_rankings_data(offset=2, limit=5)["earth"]] == [str(a.id) for a in expected[2:]]
+
+    # 只有前 display_size 名算上榜
+    assert manager.get_avatar_rank(str(expected[1].id)) == ("earth", 2)
+    assert manager.get_avatar_rank(str(expected[2].id)) is None
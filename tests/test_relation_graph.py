@@ -0,0 +1,86 @@
+"""
+关系图索引：类型邻接、反向边与删除角色时的清理。
+"""
+from src.classes.age import Age
+from src.classes.core.avatar import Avatar, Gender
+from src.classes.relation.relation import Relation
+from src.classes.relation.relation_graph import add_edge, first_related, referrers, related
+from src.classes.relation.relations import cancel_relation
+from src.systems.cultivation import Realm
+from src.systems.time import MonthStamp
+from src.utils.id_generator import get_avatar_id
+
+
+def create_avatar(world, name, gender=Gender.MALE):
+    avatar = Avatar(
+        world=world,
+        name=name,
+        id=get_avatar_id(),
+        birth_month_stamp=MonthStamp(0),
+        age=Age(20, Realm.Qi_Refinement),
+        gender=gender,
+        pos_x=0, pos_y=0
+    )
+    world.avatar_manager.register_avatar(avatar)
+    return avatar
+
+
+def test_typed_adjacency_follows_set_and_clear(base_world):
+    me = create_avatar(base_world, "Me")
+    wife = create_avatar(base_world, "Wife", Gender.FEMALE)
+    father = create_avatar(base_world, "Father")
+    friend = create_avatar(base_world, "Friend")
+
+    me.become_lovers_with(wife)
+    me.acknowledge_parent(father)
+    me.make_friend_with(friend)
+
+    assert first_related(me, Relation.IS_LOVER_OF) is wife
+    assert first_related(wife, Relation.IS_LOVER_OF) is me
+    assert related(me, Relation.IS_PARENT_OF) == [father]
+    assert related(father, Relation.IS_CHILD_OF) == [me]
+    assert set(referrers(me)) == {wife, father, friend}
+
+    # 关系变更：从旧类型移到新类型
+    me.make_enemy_of(friend)
+    assert related(me, Relation.IS_FRIEND_OF) == []
+    assert related(friend, Relation.IS_ENEMY_OF) == [me]
+
+    assert cancel_relation(me, wife, Relation.IS_LOVER_OF)
+    assert first_related(me, Relation.IS_LOVER_OF) is None
+    assert wife not in referrers(me) and me not in referrers(wife)
+
+
+def test_index_rebuilt_when_relations_dict_replaced(base_world):
+    me = create_avatar(base_world, "Me")
+    master = create_avatar(base_world, "Master")
+    me.acknowledge_master(master)
+    assert related(me, Relation.IS_MASTER_OF) == [master]
+
+    me.relations = {}
+    assert related(me, Relation.IS_MASTER_OF) == []
+    # master 的反向边里残留的 me 不再被当作引用方
+    assert referrers(master) == []
+
+    add_edge(me, master, Relation.IS_MASTER_OF)
+    assert related(me, Relation.IS_MASTER_OF) == [master]
+    assert referrers(master) == [me]
+
+
+def test_remove_avatar_clears_reverse_edges(base_world):
+    manager = base_world.avatar_manager
+    target = create_avatar(base_world, "Target")
+    friend = create_avatar(base_world, "Friend")
+    bystander = create_avatar(base_world, "Bystander")
+    target.make_friend_with(friend)
+    friend.make_friend_with(bystander)
+    # 单向残留引用也要清掉
+    add_edge(bystander, target, Relation.IS_ENEMY_OF)
+
+    manager.remove_avatar(target.id)
+
+    assert target not in friend.relations
+    assert target not in bystander.relations
+    assert related(bystander, Relation.IS_ENEMY_OF) == []
+    assert friend.relations == {bystander: Relation.IS_FRIEND_OF}
+    assert manager.get_avatar(target.id) is None
@@ -90,6 +90,37 @@ def test_sect_relations(base_world):
     assert grand_master.computed_relations.get(disciple_a) == Relation.IS_MARTIAL_GRANDCHILD_OF
     assert grand_master.computed_relations.get(disciple_b) == Relation.IS_MARTIAL_GRANDCHILD_OF
 
+def test_second_degree_relations_follow_edge_changes(base_world):
+    grandpa = create_avatar(base_world, "Grandpa")
+    father = create_avatar(base_world, "Father")
+    son = create_avatar(base_world, "Son")
+    father.acknowledge_parent(grandpa)
+    son.acknowledge_parent(father)
+
+    # 不需要等到年度刷新：新出生的女儿立刻与兄长互为兄妹，并认得祖父
+    daughter = create_avatar(base_world, "Daughter", Gender.FEMALE)
+    daughter.acknowledge_parent(father)
+    assert son.computed_relations.get(daughter) == Relation.IS_SIBLING_OF
+    assert daughter.computed_relations.get(son) == Relation.IS_SIBLING_OF
+    assert daughter.computed_relations.get(grandpa) == Relation.IS_GRAND_PARENT_OF
+    assert grandpa.computed_relations.get(daughter) == Relation.IS_GRAND_CHILD_OF
+
+    # 删除一阶边后，依赖它的二阶关系随即消失
+    father.clear_relation(grandpa)
+    assert grandpa not in son.computed_relations
+    assert grandpa.computed_relations == {}
+
+    # 血缘边改写为非推导关系同样会刷新
+    daughter.make_friend_with(father)
+    assert son.computed_relations == {}
+    assert daughter.computed_relations == {}
+
+    # 与从头计算的结果一致
+    for p in [grandpa, father, son, daughter]:
+        expected = dict(p.computed_relations)
+        update_second_degree_relations(p)
+        assert p.computed_relations == expected
+
 def test_master_disciple_sect_binding(base_world):
     from src.classes.core.sect import Sect, SectHeadQuarter
     from src.classes.alignment import Alignment
@@ -0,0 +1,171 @@
+import pytest
+
+from src.classes.age import Age
+from src.classes.core.avatar import Avatar, Gender
+from src.classes.event import Event
+from src.classes.relation.relation import Relation
+from src.sim.load.load_game import load_game
+from src.sim.load.save_reader import DeltaSaveReader, SaveFormatError, fold_world, open_save
+from src.sim.managers.event_manager import EventManager
+from src.sim.save.journal import SaveJournal, save_incremental
+from src.sim.save.save_game import save_game
+from src.sim.simulator import Simulator
+from src.systems.cultivation import Realm
+from src.systems.time import Month, Year, create_month_stamp
+from src.utils.id_generator import get_avatar_id
+
+
+def _make_avatar(world, name):
+    avatar = Avatar(
+        world=world,
+        name=name,
+        id=get_avatar_id(),
+        birth_month_stamp=create_month_stamp(Year(2000), Month.JANUARY),
+        age=Age(30, Realm.Qi_Refinement),
+        gender=Gender.FEMALE,
+        pos_x=1,
+        pos_y=1,
+    )
+    world.avatar_manager.register_avatar(avatar)
+    return avatar
+
+
+@pytest.fixture
+def trio(base_world, tmp_path):
+    base_world.event_manager = EventManager.create_with_db(tmp_path / "live_events.db")
+    avatars = [_make_avatar(base_world, name) for name in ("A", "B", "C")]
+    avatars[0].set_relation(avatars[1], Relation.IS_FRIEND_OF)
+    yield avatars
+    base_world.event_manager.close()
+
+
+def _avatars_by_id(reader):
+    return {a["id"]: a for a in reader.iter_avatars()}
+
+
+def test_delta_contains_only_changes_and_folds_to_full_state(base_world, trio, tmp_path):
+    a, b, c = trio
+    sim = Simulator(base_world)
+    journal = SaveJournal(checkpoint_interval=3)
+    assert save_game(base_world, sim, [], save_path=tmp_path / "base.json", journal=journal)[0]
+
+    b.name = "B2"
+    c.set_dead("test", base_world.month_stamp)
+    base_world.avatar_manager.handle_death(c.id)
+    base_world.avatar_manager.remove_avatar(a.id)
+    base_world.month_stamp = create_month_stamp(Year(2), Month.JANUARY)
+
+    delta_path = journal.write_delta(base_world, sim, [], save_path=tmp_path / "delta.json")
+    raw = open_save(delta_path, fold=False)
+    assert raw.meta["delta"]["base"] == "base.json"
+    assert raw.meta["delta"]["removed_avatars"] == [a.id]
+    assert set(_avatars_by_id(raw)) == {b.id, c.id}
+    assert set(raw.header["world"]) == {"month_stamp"}
+
+    save_game(base_world, sim, [], save_path=tmp_path / "full.json")
+    folded = open_save(delta_path)
+    full = open_save(tmp_path / "full.json")
+    assert isinstance(folded, DeltaSaveReader)
+    assert "delta" not in folded.meta
+    assert _avatars_by_id(folded) == _avatars_by_id(full)
+    assert folded.header["world"] == full.header["world"]
+
+
+def test_dead_avatars_are_skipped_unless_marked(base_world, trio, tmp_path):
+    a, b, c = trio
+    c.set_dead("test", base_world.month_stamp)
+    base_world.avatar_manager.handle_death(c.id)
+    sim = Simulator(base_world)
+    journal = SaveJournal(checkpoint_interval=3)
+    save_game(base_world, sim, [], save_path=tmp_path / "base.json", journal=journal)
+
+    # 未标记的死者不应被重新序列化（绕过 __setattr__，替换方法本身不算改动）
+    object.__setattr__(c, "to_save_dict", None)
+    delta_path = journal.write_delta(base_world, sim, [], save_path=tmp_path / "d1.json")
+    assert _avatars_by_id(open_save(delta_path, fold=False)) == {}
+
+    del c.to_save_dict
+    c.set_relation(a, Relation.IS_ENEMY_OF)
+    delta_path = journal.write_delta(base_world, sim, [], save_path=tmp_path / "d2.json")
+    assert set(_avatars_by_id(open_save(delta_path, fold=False))) == {a.id, c.id}
+
+
+def test_only_marked_living_avatars_are_serialized(base_world, trio, tmp_path):
+    a, b, c = trio
+    sim = Simulator(base_world)
+    journal = SaveJournal(checkpoint_interval=3)
+    save_game(base_world, sim, [], save_path=tmp_path / "base.json", journal=journal)
+    assert base_world.avatar_manager.get_save_dirty_ids() == set()
+
+    object.__setattr__(a, "to_save_dict", None)
+    b.pos_x = 2  # 赋值
+    c.update_cultivation(c.cultivation_progress.level + 1)  # 原地修改
+    delta_path = journal.write_delta(base_world, sim, [], save_path=tmp_path / "d1.json")
+    raw = _avatars_by_id(open_save(delta_path, fold=False))
+    assert set(raw) == {b.id, c.id}
+    assert raw[b.id]["pos_x"] == 2
+
+
+def test_verify_delta_catches_unmarked_changes(base_world, trio, tmp_path, monkeypatch):
+    from src.sim.save import journal as journal_module
+
+    monkeypatch.setattr(journal_module, "is_delta_verification_enabled", lambda: True)
+    a, b, c = trio
+    sim = Simulator(base_world)
+    journal = SaveJournal(checkpoint_interval=3)
+    save_game(base_world, sim, [], save_path=tmp_path / "base.json", journal=journal)
+
+    a.hp.cur = max(0, a.hp.cur - 1)  # 原地修改且未标记
+    delta_path = journal.write_delta(base_world, sim, [], save_path=tmp_path / "d1.json")
+    assert set(_avatars_by_id(open_save(delta_path, fold=False))) == {a.id}
+
+
+def test_load_delta_restores_new_events(base_world, trio, tmp_path):
+    sim = Simulator(base_world)
+    base_world.event_manager.add_event(Event(base_world.month_stamp, "before", id="e1"))
+    journal = SaveJournal(checkpoint_interval=3)
+    save_game(base_world, sim, [], save_path=tmp_path / "base.json", journal=journal)
+
+    base_world.event_manager.add_event(Event(base_world.month_stamp, "after", id="e2"))
+    delta_path = journal.write_delta(base_world, sim, [], save_path=tmp_path / "delta.json")
+    assert [e["id"] for e in open_save(delta_path, fold=False).iter_events()] == ["e2"]
+
+    for _ in range(2):  # 重复读档不会重复写入事件
+        loaded_world, _, _ = load_game(delta_path)
+        try:
+            assert {e.content for e in loaded_world.event_manager.get_recent_events()} == {"before", "after"}
+            assert set(loaded_world.avatar_manager.avatars) == {a.id for a in trio}
+        finally:
+            loaded_world.event_manager.close()
+
+
+def test_save_incremental_rolls_over_to_new_checkpoint(base_world, trio, monkeypatch):
+    from src.sim.save import journal as journal_module
+
+    monkeypatch.setattr(journal_module, "get_checkpoint_interval", lambda: 2)
+    sim = Simulator(base_world)
+    names = [save_incremental(base_world, sim, [])[1] for _ in range(4)]
+
+    saves_dir = base_world.save_journal.base_path.parent
+    assert names[1:3] == [f"{names[0][:-5]}_d1.json", f"{names[0][:-5]}_d2.json"]
+    assert "delta" not in open_save(saves_dir / names[3], fold=False).meta
+
+
+def test_missing_checkpoint_is_reported(base_world, trio, tmp_path):
+    sim = Simulator(base_world)
+    journal = SaveJournal(checkpoint_interval=3)
+    save_game(base_world, sim, [], save_path=tmp_path / "base.json", journal=journal)
+    delta_path = journal.write_delta(base_world, sim, [], save_path=tmp_path / "delta.json")
+    (tmp_path / "base.json").unlink()
+
+    with pytest.raises(SaveFormatError):
+        open_save(delta_path)
+
+
+def test_fold_world_merges_keyed_fields():
+    base = {"month_stamp": 1, "regions_status": {"1": {"prosperity": 50}, "2": {"prosperity": 60}}}
+    delta = {"month_stamp": 13, "regions_status": {"2": {"prosperity": 70}, "3": {"prosperity": 10}}}
+
+    folded = fold_world(base, delta, {"regions_status": ["1"]})
+
+    assert folded == {"month_stamp": 13, "regions_status": {"2": {"prosperity": 70}, "3": {"prosperity": 10}}}
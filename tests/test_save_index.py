@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from src.sim.load import save_reader
+from src.sim.save import save_game as save_game_module
+from src.sim.save.save_game import get_save_info, list_saves, save_game
+from src.sim.save.save_index import SAVE_INDEX_NAME
+from src.sim.simulator import Simulator
+
+
+@pytest.fixture
+def saves_dir(tmp_path):
+    d = tmp_path / "saves"
+    d.mkdir()
+    return d
+
+
+def _index_entries(saves_dir):
+    return json.loads((saves_dir / SAVE_INDEX_NAME).read_text(encoding="utf-8"))["entries"]
+
+
+def test_json_meta_is_read_from_file_head(base_world, saves_dir, monkeypatch):
+    path = saves_dir / "a.json"
+    save_game(base_world, Simulator(base_world), [], save_path=path, custom_name="head")
+
+    def no_full_parse(*args, **kwargs):
+        raise AssertionError("full parse")
+
+    monkeypatch.setattr(save_reader, "JsonSaveReader", no_full_parse)
+    assert get_save_info(path)["custom_name"] == "head"
+
+
+def test_legacy_json_meta_falls_back_to_full_parse(saves_dir):
+    path = saves_dir / "legacy.json"
+    path.write_text(json.dumps({"world": {}, "avatars": [], "meta": {"save_time": "t", "version": "old"}}), encoding="utf-8")
+
+    assert get_save_info(path)["version"] == "old"
+
+
+def test_list_saves_uses_index_until_file_changes(base_world, saves_dir, monkeypatch):
+    sim = Simulator(base_world)
+    save_game(base_world, sim, [], save_path=saves_dir / "a.json")
+    save_game(base_world, sim, [], save_path=saves_dir / "b.jsonl")
+    assert set(_index_entries(saves_dir)) == {"a.json", "b.jsonl"}
+
+    reads = []
+    real_get_save_info = save_game_module.get_save_info
+    monkeypatch.setattr(save_game_module, "get_save_info", lambda p: reads.append(p.name) or real_get_save_info(p))
+
+    assert len(list_saves(saves_dir)) == 2
+    assert reads == []
+
+    save_game(base_world, sim, [], save_path=saves_dir / "c.json")
+    (saves_dir / "c.json").write_text(json.dumps({"meta": {"save_time": "x", "custom_name": "edited"}}), encoding="utf-8")
+    (saves_dir / "b.jsonl").unlink()
+
+    saves = {p.name: meta for p, meta in list_saves(saves_dir)}
+    assert reads == ["c.json"]
+    assert saves["c.json"]["custom_name"] == "edited"
+    assert set(_index_entries(saves_dir)) == {"a.json", "c.json"}
+
+
+def test_corrupt_index_is_rebuilt(base_world, saves_dir):
+    save_game(base_world, Simulator(base_world), [], save_path=saves_dir / "a.json")
+    (saves_dir / SAVE_INDEX_NAME).write_text("{not json", encoding="utf-8")
+
+    assert [p.name for p, _ in list_saves(saves_dir)] == ["a.json"]
+    assert set(_index_entries(saves_dir)) == {"a.json"}
@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from src.classes.core.avatar import Avatar, Gender
+from src.classes.age import Age
+from src.classes.relation.relation import Relation
+from src.sim.load.load_game import load_game
+from src.sim.load.save_reader import (
+    BinarySaveReader,
+    JsonLinesSaveReader,
+    JsonSaveReader,
+    SaveFormatError,
+    open_save,
+)
+from src.sim.save import binary_codec
+from src.sim.save.convert import convert_save
+from src.sim.save.save_game import get_save_info, list_saves, save_game
+from src.sim.simulator import Simulator
+from src.systems.cultivation import Realm
+from src.systems.time import Month, Year, create_month_stamp
+from src.utils.id_generator import get_avatar_id
+
+
+@pytest.fixture
+def two_friends(base_world, dummy_avatar):
+    other = Avatar(
+        world=base_world,
+        name="Friend",
+        id=get_avatar_id(),
+        birth_month_stamp=create_month_stamp(Year(2000), Month.JANUARY),
+        age=Age(30, Realm.Qi_Refinement),
+        gender=Gender.FEMALE,
+        pos_x=1,
+        pos_y=1,
+    )
+    dummy_avatar.weapon = None
+    base_world.avatar_manager.register_avatar(dummy_avatar)
+    base_world.avatar_manager.register_avatar(other)
+    dummy_avatar.set_relation(other, Relation.IS_SWORN_SIBLING_OF)
+    return dummy_avatar, other
+
+
+@pytest.mark.parametrize(
+    "suffix, reader_cls",
+    [(".json", JsonSaveReader), (".jsonl", JsonLinesSaveReader), (".cws", BinarySaveReader)],
+)
+def test_round_trip_by_suffix(base_world, two_friends, tmp_path, suffix, reader_cls):
+    me, friend = two_friends
+    path = tmp_path / f"world{suffix}"
+
+    ok, _ = save_game(base_world, Simulator(base_world), [], save_path=path)
+    assert ok
+    assert not path.with_name(path.name + ".tmp").exists()
+
+    reader = open_save(path)
+    assert isinstance(reader, reader_cls)
+    assert {a["id"] for a in reader.iter_avatars()} == {me.id, friend.id}
+    assert get_save_info(path)["alive_count"] == 2
+
+    loaded_world, loaded_sim, _ = load_game(path)
+    try:
+        loaded_me = loaded_world.avatar_manager.avatars[me.id]
+        loaded_friend = loaded_world.avatar_manager.avatars[friend.id]
+        assert loaded_me.relations[loaded_friend] == Relation.IS_SWORN_SIBLING_OF
+    finally:
+        loaded_world.event_manager.close()
+
+
+def test_json_writer_output_is_plain_json(base_world, two_friends, tmp_path):
+    path = tmp_path / "plain.json"
+    save_game(base_world, Simulator(base_world), [], save_path=path)
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert set(data) == {"meta", "run_config", "world", "simulator", "avatars", "events"}
+    assert len(data["avatars"]) == 2
+
+
+def test_stream_save_is_line_oriented_and_detects_truncation(base_world, two_friends, tmp_path):
+    path = tmp_path / "stream.jsonl"
+    save_game(base_world, Simulator(base_world), [], save_path=path)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["format"] == "cws-save-stream"
+    assert json.loads(lines[-1]) == {"section": "footer", "avatar_count": 2, "event_count": 0}
+
+    path.write_text("\n".join(lines[:-1]) + "\n", encoding="utf-8")
+    with pytest.raises(SaveFormatError):
+        list(open_save(path).iter_avatars())
+
+
+def test_list_saves_includes_all_formats(base_world, tmp_path):
+    sim = Simulator(base_world)
+    save_game(base_world, sim, [], save_path=tmp_path / "a.json")
+    save_game(base_world, sim, [], save_path=tmp_path / "b.jsonl")
+    save_game(base_world, sim, [], save_path=tmp_path / "c.cws")
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+
+    assert sorted(p.name for p, _ in list_saves(tmp_path)) == ["a.json", "b.jsonl", "c.cws"]
+
+
+def test_convert_between_json_and_binary(base_world, two_friends, tmp_path):
+    src = tmp_path / "src.json"
+    save_game(base_world, Simulator(base_world), [], save_path=src)
+
+    binary = tmp_path / "packed.cws"
+    back = tmp_path / "back.json"
+    assert convert_save(src, binary) == (2, 0)
+    convert_save(binary, back)
+
+    assert open_save(back).to_dict() == open_save(src).to_dict()
+    assert binary.stat().st_size < src.stat().st_size
+
+
+def test_binary_codec_logs_fallback_once(monkeypatch):
+    from unittest.mock import MagicMock, patch
+
+    monkeypatch.setattr(binary_codec, "msgpack", None)
+    monkeypatch.setattr(binary_codec, "zstandard", None)
+    monkeypatch.setattr(binary_codec, "_fallback_logged", False)
+    logger = MagicMock()
+    with patch("src.run.log.get_logger", return_value=logger):
+        assert binary_codec.default_encoding() == binary_codec.ENCODING_JSON
+        assert binary_codec.default_compression() == binary_codec.COMPRESSION_GZIP
+        binary_codec.default_encoding()
+
+    logger.logger.warning.assert_called_once()
+    assert "msgpack and zstandard" in logger.logger.warning.call_args.args[1]
+
+
+def test_binary_save_rejects_newer_schema(base_world, two_friends, tmp_path, monkeypatch):
+    path = tmp_path / "future.cws"
+    monkeypatch.setattr(binary_codec, "SCHEMA_VERSION", binary_codec.SCHEMA_VERSION + 1)
+    save_game(base_world, Simulator(base_world), [], save_path=path)
+    monkeypatch.undo()
+
+    with pytest.raises(SaveFormatError):
+        open_save(path)
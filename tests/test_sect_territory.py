@@ -0,0 +1,258 @@
+"""
+宗门势力范围填充：与逐格枚举菱形的旧实现结果（含 tile_owners 顺序）完全一致，并可导出为按格数组；
+势力快照按世界、总部与各宗门成员版本缓存，成员统计增量维护。
+"""
+import random
+
+import pytest
+
+from src.classes.environment.map import Map
+from src.classes.environment.tile import TileType
+from src.run.load_map import load_cultivation_world_map
+from src.sim.managers import sect_manager as sect_manager_module
+from src.sim.managers.sect_manager import SectManager, SectTerritorySnapshot
+
+
+def _reference_tile_owners(claims, game_map):
+    tile_owners = {}
+    for sect_id, cx, cy, radius in claims:
+        for dx in range(-radius, radius + 1):
+            max_dy = radius - abs(dx)
+            for dy in range(-max_dy, max_dy + 1):
+                x, y = cx + dx, cy + dy
+                if game_map.is_in_bounds(x, y) and (x, y) in game_map.tiles:
+                    tile_owners.setdefault((x, y), []).append(sect_id)
+    return tile_owners
+
+
+def _random_claims(game_map, rng, count=8):
+    return [
+        (sid, rng.randrange(game_map.width), rng.randrange(game_map.height), rng.randint(1, 60))
+        for sid in range(1, count + 1)
+    ]
+
+
+@pytest.fixture(params=["stdlib", "numpy"])
+def fill_backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(sect_manager_module, "np", None)
+    return request.param
+
+
+def test_fill_matches_diamond_enumeration(base_world, fill_backend):
+    game_map = load_cultivation_world_map()
+    base_world.map = game_map
+    manager = SectManager(base_world)
+    rng = random.Random(3)
+
+    for _ in range(5):
+        claims = _random_claims(game_map, rng)
+        tile_owners, owner_counts = manager._fill_territory(claims, game_map)
+
+        expected = _reference_tile_owners(claims, game_map)
+        assert list(tile_owners.items()) == list(expected.items())
+        for (x, y), owners in expected.items():
+            assert owner_counts[y * game_map.width + x] == len(owners)
+            assert set(game_map.tiles.influence_owners(x, y)) == set(owners)
+        assert sum(owner_counts) == sum(len(o) for o in expected.values())
+
+
+def test_fill_skips_missing_tiles(base_world, fill_backend):
+    game_map = Map(6, 4)
+    for x in range(6):
+        for y in range(4):
+            if (x + y) % 3:
+                game_map.create_tile(x, y, TileType.PLAIN)
+    claims = [(1, 0, 0, 3), (2, 5, 3, 4)]
+
+    tile_owners, _ = SectManager(base_world)._fill_territory(claims, game_map)
+
+    assert list(tile_owners.items()) == list(_reference_tile_owners(claims, game_map).items())
+
+
+def test_snapshot_as_arrays():
+    snapshot = SectTerritorySnapshot(
+        active_sects=[],
+        sect_centers={},
+        tile_owners={},
+        width=2,
+        height=1,
+        owner_counts=[2, 1],
+        influence=[0b101, 0b100],
+        sect_bits={7: 0b100, 3: 0b001},
+    )
+
+    grid = snapshot.as_arrays()
+
+    assert grid["sect_ids"] == [7, 3]
+    assert grid["owner_counts"] == [2, 1]
+    assert grid["masks"] == [0b11, 0b01]
+
+
+@pytest.fixture
+def sect_world(base_world):
+    from pathlib import Path
+
+    from src.classes.alignment import Alignment
+    from src.classes.core.sect import Sect, SectHeadQuarter
+    from src.classes.environment.sect_region import SectRegion
+
+    game_map = base_world.map
+    region = SectRegion(id=1001, name="R1", desc="", sect_id=1, sect_name="宗门A", cors=[(2, 2)])
+    game_map.regions[region.id] = region
+    game_map.region_cors[region.id] = region.cors
+    game_map.update_sect_regions()
+
+    hq = SectHeadQuarter(name="驻地", desc="", image=Path(""))
+    sects = [
+        Sect(id=sid, name=f"宗门{sid}", desc="", member_act_style="", alignment=Alignment.NEUTRAL,
+             headquarter=hq, technique_names=[])
+        for sid in (1, 2)
+    ]
+    base_world.existed_sects = sects
+    base_world.sect_context.from_existed_sects(sects)
+    return base_world
+
+
+def test_snapshot_shared_within_month(sect_world, monkeypatch):
+    calls = []
+    original = SectManager._compute_snapshot
+    monkeypatch.setattr(SectManager, "_compute_snapshot", lambda self, *a: calls.append(1) or original(self, *a))
+
+    first = SectManager(sect_world).get_snapshot()
+    assert SectManager(sect_world).get_snapshot() is first
+    assert len(calls) == 1
+    assert first.sect_centers == {1: (2, 2)}
+
+    sect_world.month_stamp = sect_world.month_stamp + 1
+    assert SectManager(sect_world).get_snapshot() is not first
+    assert len(calls) == 2
+
+
+def test_snapshot_invalidated_by_territory_changes(sect_world, dummy_avatar):
+    manager = SectManager(sect_world)
+    sect = sect_world.existed_sects[0]
+
+    snapshot = manager.get_snapshot()
+    dummy_avatar.join_sect(sect, None)
+    assert manager.get_snapshot() is not snapshot
+    assert manager.get_snapshot() is manager.get_snapshot()
+
+    snapshot = manager.get_snapshot()
+    # 境界变化经角色更新，递增所在宗门的成员版本
+    dummy_avatar.update_cultivation(31)
+    assert manager.get_snapshot() is not snapshot
+
+    sect_world.sect_context.mark_sect_inactive(2)
+    assert [s.id for s in manager.get_snapshot().active_sects] == [1]
+
+    snapshot = manager.get_snapshot()
+    sect_world.map.update_sect_regions()
+    assert manager.get_snapshot() is not snapshot
+
+
+def test_member_changes_only_invalidate_their_own_sect(sect_world, dummy_avatar):
+    sect_a, sect_b = sect_world.existed_sects[:2]
+    stats_b = sect_b.get_member_stats()
+    version_b = sect_b.member_version
+    world_version = sect_world.territory_version
+
+    dummy_avatar.join_sect(sect_a, None)
+    dummy_avatar.update_cultivation(31)
+    assert sect_a.member_version > 0
+    assert sect_b.member_version == version_b
+    assert sect_b.get_member_stats() is stats_b
+    # 世界级的势力版本只随本局宗门启用状态变化
+    assert sect_world.territory_version == world_version
+    sect_world.sect_context.mark_sect_inactive(sect_b.id)
+    assert sect_world.territory_version == world_version + 1
+
+
+def test_member_stats_follow_membership_and_realm(sect_world, dummy_avatar):
+    from src.classes.sect_ranks import SectRank
+    from src.systems.cultivation import Realm
+
+    sect = sect_world.existed_sects[0]
+    assert sect.get_member_stats().living_members == ()
+
+    dummy_avatar.join_sect(sect, SectRank.Patriarch)
+    stats = sect.get_member_stats()
+    assert stats.living_members == (dummy_avatar,) and stats.patriarch is dummy_avatar
+    assert sect.get_member_stats() is stats
+
+    # 境界变化经角色更新，递增所在宗门的成员版本
+    dummy_avatar.update_cultivation(31)
+    stats = sect.get_member_stats()
+    assert stats.realm_counts == {Realm.Foundation_Establishment: 1}
+    assert stats.peak_realm is Realm.Foundation_Establishment
+
+    dummy_avatar.set_dead("test", sect_world.month_stamp)
+    assert sect.get_member_stats().living_members == ()
+
+
+def test_strength_summary_shared_within_month(sect_world, dummy_avatar):
+    sect = sect_world.existed_sects[0]
+    dummy_avatar.join_sect(sect, None)
+    calls = []
+
+    def strength(avatar):
+        calls.append(avatar)
+        return 20.0
+
+    summary = sect.get_strength_summary(strength, 5)
+    assert (summary.total, summary.combined) == (20.0, 20.0)
+    assert sect.get_strength_summary(strength, 5) is summary
+    assert len(calls) == 1
+    sect.get_strength_summary(strength, 6)
+    assert len(calls) == 2
+
+
+def test_incremental_member_stats_match_full_scan(sect_world):
+    from types import SimpleNamespace
+
+    from src.classes.sect_ranks import SectRank
+    from src.systems.cultivation import Realm
+
+    sect = sect_world.existed_sects[0]
+    rng = random.Random(7)
+    realms = list(Realm)
+    ranks = [SectRank.Patriarch, SectRank.Elder, None]
+    pool = [
+        SimpleNamespace(id=f"m{i}", is_dead=False, sect_rank=None,
+                        cultivation_progress=SimpleNamespace(realm=realms[0]))
+        for i in range(12)
+    ]
+
+    def full_scan():
+        living = tuple(m for m in sect.members.values() if not m.is_dead)
+        counts = {}
+        for m in living:
+            counts[m.cultivation_progress.realm] = counts.get(m.cultivation_progress.realm, 0) + 1
+        patriarch = next((m for m in living if m.sect_rank is SectRank.Patriarch), None)
+        return living, counts, patriarch
+
+    for _ in range(400):
+        member = rng.choice(pool)
+        op = rng.randrange(4)
+        if op == 0:
+            sect.add_member(member)
+        elif op == 1:
+            sect.remove_member(member)
+        elif op == 2:
+            member.cultivation_progress.realm = rng.choice(realms)
+            sect.on_member_realm_changed(member)
+        else:
+            member.sect_rank = rng.choice(ranks)
+            sect.on_member_rank_changed(member)
+
+        living, counts, patriarch = full_scan()
+        stats = sect.get_member_stats()
+        assert stats.living_members == living
+        assert stats.realm_counts == counts
+        assert stats.peak_realm == (max(counts) if counts else None)
+        if patriarch is None:
+            assert stats.patriarch is None
+        else:
+            assert stats.patriarch is not None and stats.patriarch.sect_rank is SectRank.Patriarch
@@ -0,0 +1,54 @@
+"""
+冷启动：导入 src.server.main 不应加载按需模块；动作注册表按需加载。
+"""
+import pytest
+
+from src.run.startup_profile import parse_importtime, profile_startup
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        420 |   encodings
+import time:      1000 |       1500 | src.server.main
+"""
+
+
+def test_parse_importtime():
+    records = parse_importtime(SAMPLE)
+
+    assert [(r.module, r.depth) for r in records] == [("_io", 2), ("encodings", 1), ("src.server.main", 0)]
+    assert records[-1].cumulative_us == 1500
+
+
+def test_server_import_defers_on_demand_modules():
+    # 耗时预算由 CI 中的 startup profile 步骤检查，这里只验证导入图，避免墙钟断言在负载高时抖动
+    profile = profile_startup()
+
+    assert profile.deferred_violations() == []
+
+
+def test_failed_action_load_is_retried():
+    from unittest.mock import patch
+    from src.classes.action.registry import ActionRegistry
+
+    before = dict(ActionRegistry._name_to_cls)
+    ActionRegistry._loaded = False
+    with patch("src.classes.action.load_all_actions", side_effect=ImportError("boom")):
+        with pytest.raises(ImportError):
+            ActionRegistry.get("Talk")
+    # 失败后注册表恢复原状且未标记为已加载，下次查询会重试
+    assert ActionRegistry._loaded is False
+    assert ActionRegistry._name_to_cls == before
+
+    assert ActionRegistry.get("Talk").__name__ == "Talk"
+    assert ActionRegistry._loaded is True
+
+
+def test_action_infos_materialize_on_first_use():
+    import src.classes.actions as actions
+    from src.classes.action.registry import ActionRegistry
+
+    names = actions.ALL_ACTUAL_ACTION_NAMES
+    assert "Respire" in names and "Talk" in names
+    assert list(actions.ACTION_INFOS) == names
+    assert ActionRegistry.get("Talk").__name__ == "Talk"
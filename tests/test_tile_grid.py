@@ -0,0 +1,98 @@
+"""
+TileGrid：稠密图层与 Tile 视图保持与原 dict[(x, y)] -> Tile 一致的行为。
+"""
+import pytest
+
+from src.classes.environment.map import Map
+from src.classes.environment.region import CityRegion
+from src.classes.environment.tile import Tile, TileType
+from src.classes.environment.tile_grid import TILE_TYPE_CODES, TileGrid
+from src.run.load_map import load_cultivation_world_map
+
+
+def test_views_read_and_write_layers():
+    game_map = Map(4, 3)
+    game_map.create_tile(1, 2, TileType.FOREST)
+    city = CityRegion(id=7, name="青云城", desc="繁华")
+
+    tile = game_map.get_tile(1, 2)
+    assert tile is game_map.tiles[(1, 2)]
+    assert (tile.type, tile.coordinate, tile.region) == (TileType.FOREST, (1, 2), None)
+
+    tile.region = city
+    assert game_map.get_region(1, 2) is city
+    assert game_map.tiles.region_ids()[2 * 4 + 1] == 7
+    tile.type = TileType.CITY
+    assert game_map.tiles.type_codes[2 * 4 + 1] == TILE_TYPE_CODES[TileType.CITY]
+    assert tile == Tile(TileType.CITY, 1, 2, city)
+
+    assert (0, 0) not in game_map.tiles and (9, 9) not in game_map.tiles
+    assert list(game_map.tiles) == [(1, 2)] and len(game_map.tiles) == 1
+    with pytest.raises(KeyError):
+        game_map.get_tile(0, 0)
+
+
+def test_standalone_tile_assignment():
+    grid = TileGrid(3, 3)
+    city = CityRegion(id=1, name="城", desc="")
+    tile = Tile(TileType.CITY, 0, 0)
+    tile.region = city
+
+    grid[(0, 0)] = tile
+
+    assert grid[(0, 0)] is tile
+    assert grid.region_at(0, 0) is city
+    assert grid.type_at(0, 0) is TileType.CITY
+
+    # 写入后的修改同步到图层
+    other = CityRegion(id=2, name="镇", desc="")
+    grid[(0, 0)].region = other
+    tile.type = TileType.FOREST
+    assert grid.region_at(0, 0) is other
+    assert grid.regions_in_diamond(0, 0, 1) == {other}
+    assert grid.type_at(0, 0) is TileType.FOREST
+    del grid[(0, 0)]
+    assert (0, 0) not in grid and len(grid) == 0
+
+
+def test_assigned_tile_updates_pathfinding(base_map):
+    base_map.tiles[(1, 1)] = Tile(TileType.PLAIN, 1, 1)
+    city = CityRegion(id=3, name="城", desc="", cors=[(1, 1)])
+    base_map.get_tile(1, 1).region = city
+    assert base_map.get_region(1, 1) is city
+
+    base_map.get_tile(1, 1).type = TileType.VOLCANO
+    assert base_map.pathfinder.tile_cost(1 * base_map.width + 1) == 3
+
+
+def test_influence_bitmask():
+    grid = TileGrid(2, 2)
+    grid.add_influence(1, 1, sect_id=5)
+    grid.add_influence(1, 1, sect_id=2)
+    grid.add_influence(0, 1, sect_id=2)
+
+    assert grid.influence_owners(1, 1) == [5, 2]
+    assert grid.influence_owners(0, 1) == [2]
+    grid.clear_influence()
+    assert grid.influence_owners(1, 1) == []
+
+
+def test_loaded_map_matches_csv():
+    game_map = load_cultivation_world_map()
+
+    assert len(game_map.tiles) == game_map.width * game_map.height
+    for rid, cors in game_map.region_cors.items():
+        for x, y in cors:
+            assert game_map.get_tile(x, y).region is game_map.regions[rid]
+    assert any(tile.type is TileType.SECT for tile in game_map.tiles.values())
+
+
+def test_as_numpy_views_layers():
+    np = pytest.importorskip("numpy")
+    grid = TileGrid(3, 2)
+    grid.create(2, 1, TileType.WATER)
+
+    codes = grid.as_numpy("type_codes")
+    assert codes.shape == (2, 3)
+    assert codes[1, 2] == TILE_TYPE_CODES[TileType.WATER]
+    assert np.count_nonzero(codes) == 1
@@ -0,0 +1,86 @@
+"""
+区域到达月数表、每格最近区域表与 travel_months。
+"""
+from src.classes.action import MoveToRegion
+from src.classes.environment.map import Map
+from src.classes.environment.region import CityRegion
+from src.classes.travel import get_avatar_move_step, travel_months
+from src.run.load_map import load_cultivation_world_map
+from src.utils.distance import chebyshev_distance
+
+
+def test_region_travel_months_match_travel_months(dummy_avatar):
+    game_map = load_cultivation_world_map()
+
+    for x, y, step in [(0, 0, 1), (17, 9, 2), (game_map.width - 1, game_map.height - 1, 5)]:
+        dummy_avatar.pos_x, dummy_avatar.pos_y = x, y
+        months = game_map.region_travel_months(x, y, step)
+        assert set(months) == set(game_map.regions)
+        for rid, region in game_map.regions.items():
+            assert months[rid] == travel_months(dummy_avatar, region, step)
+
+
+def test_nearest_region_table_matches_linear_scan():
+    game_map = load_cultivation_world_map()
+    cities = [(rid, r) for rid, r in game_map.regions.items() if isinstance(r, CityRegion)]
+
+    for y in range(game_map.height):
+        for x in range(game_map.width):
+            best_id, best = -1, None
+            for rid, city in cities:
+                dist = chebyshev_distance((x, y), city.center_loc)
+                if best is None or dist < best:
+                    best_id, best = rid, dist
+            assert game_map.nearest_region_id(x, y, CityRegion) == best_id
+
+
+def test_targeted_moves_use_base_step(base_world, dummy_avatar):
+    city = CityRegion(id=1, name="远城", desc="", cors=[(9, 0)])
+    base_world.map.regions[city.id] = city
+    base_step = dummy_avatar.move_step_length
+
+    assert travel_months(dummy_avatar, city) == max(1, -(-9 // base_step))
+
+    # extra_move_step 只加快自由移动，不改变定向移动与到达时间估算
+    dummy_avatar.temporary_effects = [
+        {"source": "test", "start_month": int(base_world.month_stamp), "duration": 12, "effects": {"extra_move_step": 2}}
+    ]
+    assert get_avatar_move_step(dummy_avatar) == base_step + 2
+    assert travel_months(dummy_avatar, city) == max(1, -(-9 // base_step))
+
+    action = MoveToRegion(dummy_avatar, base_world)
+    action.target_loc = (9, 0)
+    action._execute(city)
+    assert dummy_avatar.pos_x == min(9, base_step)
+
+
+def test_region_index_follows_region_version():
+    game_map = Map(10, 10)
+    game_map.regions[1] = CityRegion(id=1, name="甲", desc="", cors=[(0, 0)])
+    game_map.regions[2] = CityRegion(id=2, name="乙", desc="", cors=[(9, 9)])
+    assert game_map.region_travel_months(0, 0, 1) == {1: 1, 2: 9}
+    assert game_map.nearest_region_id(8, 8, CityRegion) == 2
+
+    # 替换区域（数量不变）
+    game_map.regions[2] = CityRegion(id=2, name="乙", desc="", cors=[(3, 0)])
+    assert game_map.region_travel_months(0, 0, 1) == {1: 1, 2: 3}
+
+    # 原地移动区域坐标后写入区域图层
+    moved = game_map.regions[1]
+    moved.cors = [(9, 9)]
+    moved.__post_init__()
+    game_map.tiles.assign_region(moved, moved.cors)
+    assert game_map.region_travel_months(0, 0, 1) == {1: 9, 2: 3}
+    assert game_map.nearest_region_id(8, 8, CityRegion) == 1
+
+
+def test_nearest_region_ties_prefer_earlier_regions():
+    game_map = Map(7, 5)
+    game_map.regions[5] = CityRegion(id=5, name="东", desc="", cors=[(6, 2)])
+    game_map.regions[3] = CityRegion(id=3, name="西", desc="", cors=[(0, 2)])
+    game_map.regions[4] = CityRegion(id=4, name="西二", desc="", cors=[(0, 2)])
+
+    # (3, y) 到两座城距离相同，取 regions 中靠前的 5；同一中心的 3、4 取 3
+    assert [game_map.nearest_region_id(3, y, CityRegion) for y in range(5)] == [5] * 5
+    assert game_map.nearest_region_id(1, 0, CityRegion) == 3
+    assert Map(3, 3).nearest_region_id(1, 1, CityRegion) == -1
@@ -0,0 +1,95 @@
+"""
+世界信息 Prompt 片段缓存：与逐项拼接结果一致，名字/洞府主人/语言/历史变化后立即反映。
+"""
+import pytest
+
+from src.classes.environment.region import CityRegion, CultivateRegion, NormalRegion, invalidate_region_info
+from src.classes.environment.sect_region import SectRegion
+from src.classes.essence import EssenceType
+from src.classes.language import LanguageType, language_manager
+from src.classes.travel import travel_months
+from src.i18n import reload_translations, t
+
+
+@pytest.fixture
+def regions_world(base_world):
+    regions = [
+        CultivateRegion(id=1, name="火洞", desc="炎热", cors=[(5, 5)], essence_type=EssenceType.FIRE, essence_density=5),
+        NormalRegion(id=2, name="平原", desc="开阔", cors=[(2, 0)]),
+        CityRegion(id=3, name="青云城", desc="繁华", cors=[(9, 9)]),
+        SectRegion(id=4, name="山门", desc="宗门驻地", cors=[(0, 3)], sect_name="测试宗", sect_id=1),
+    ]
+    for region in regions:
+        base_world.map.regions[region.id] = region
+    base_world.map.update_sect_regions()
+    return base_world
+
+
+@pytest.fixture
+def restore_language():
+    original = language_manager._current
+    yield
+    language_manager._current = original
+    reload_translations()
+
+
+def _distance(region, avatar):
+    return t(" (Distance: {months} months)", months=travel_months(avatar, region))
+
+
+def _expected(region, avatar):
+    return f"{region.name}{region._get_desc()} - {region.desc}{_distance(region, avatar)}{region._get_owner_desc()}"
+
+
+def _region_lines(info):
+    return [line for value in info.values() if isinstance(value, list) for line in value]
+
+
+def test_map_info_matches_uncached_format(regions_world, dummy_avatar):
+    dummy_avatar.known_regions = {1, 2, 3, 4}
+    lines = _region_lines(regions_world.get_info(detailed=True, avatar=dummy_avatar))
+
+    loc = (dummy_avatar.pos_x, dummy_avatar.pos_y)
+    for region in regions_world.map.regions.values():
+        assert _expected(region, dummy_avatar) in lines
+        assert region.get_detailed_info(loc, dummy_avatar.move_step_length) == _expected(region, dummy_avatar)
+
+    dummy_avatar.known_regions = {2}
+    plain = regions_world.map.regions[2]
+    assert _region_lines(regions_world.get_info(detailed=False, avatar=dummy_avatar)) == [f"平原{_distance(plain, dummy_avatar)}"]
+
+
+def test_fragments_follow_state_changes(regions_world, dummy_avatar, restore_language):
+    cave = regions_world.map.regions[1]
+    loc = (dummy_avatar.pos_x, dummy_avatar.pos_y)
+    step = dummy_avatar.move_step_length
+    cave.get_detailed_info(loc, step)
+
+    cave.name = "烈焰洞"
+    assert cave.get_detailed_info(loc, step).startswith("烈焰洞")
+
+    cave.host_avatar = dummy_avatar
+    assert dummy_avatar.name in cave.get_detailed_info(loc, step)
+
+    sect_region = regions_world.map.regions[4]
+    sect_region.get_detailed_info(loc, step)
+    sect_region.sect_name = "新宗"
+    assert sect_region.get_detailed_info(loc, step) == _expected(sect_region, dummy_avatar)
+
+    invalidate_region_info()
+    assert cave._get_info_fragments()[1] == f"烈焰洞{cave._get_desc()} - {cave.desc}"
+
+    language_manager._current = LanguageType.EN_US
+    assert cave.get_detailed_info(loc, step) == _expected(cave, dummy_avatar)
+
+
+def test_static_info_cached_until_history_changes(base_world):
+    first = base_world.static_info
+    assert base_world.static_info == first
+    assert base_world.static_info is not base_world.static_info
+
+    base_world.history.text = "大劫之后"
+    assert base_world.static_info[t("History")] == "大劫之后"
+
+    base_world.history.text = "新纪元"
+    assert base_world.static_info[t("History")] == "新纪元"
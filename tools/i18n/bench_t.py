@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""t() 吞吐量微基准
+
+使用方法:
+    python tools/i18n/bench_t.py [--lang zh-CN] [--number 200000]
+
+分别测量命中、带参数格式化、缺失 msgid 三种调用的每秒次数，
+以及每次切换语言后重建翻译快照的耗时。
+"""
+
+import argparse
+import sys
+import time
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark for src.i18n.t")
+    parser.add_argument("--lang", default="zh-CN")
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    import src.utils.config  # noqa: F401  首次导入会按存档设置重置语言，需先于 set_language
+    from src.classes.language import language_manager
+    from src.i18n import reload_translations, t
+
+    language_manager.set_language(args.lang)
+
+    cases = [
+        ("hit", "action_thinking", {}),
+        ("format", "{winner} defeated {loser}", {"winner": "A", "loser": "B"}),
+        ("miss", "__bench_missing_msgid__", {}),
+    ]
+    for label, message, kwargs in cases:
+        t(message, **kwargs)
+        seconds = timeit.timeit(lambda: t(message, **kwargs), number=args.number)
+        print(f"{label:<8} {args.number / seconds / 1e6:6.2f} M calls/s  ({seconds / args.number * 1e9:6.0f} ns/call)")
+
+    start = time.perf_counter()
+    reload_translations()
+    t("action_thinking")
+    print(f"rebuild  {(time.perf_counter() - start) * 1000:6.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -318,8 +318,17 @@ export interface SectTerritorySummaryDTO {
   is_active: boolean;
 }
 
+export interface SectTerritoryGridDTO {
+  width: number;
+  height: number;
+  sect_ids: number[];
+  owner_counts: number[];   // 行优先展开的每格占据宗门数
+  masks: number[];          // 第 i 位对应 sect_ids[i]
+}
+
 export interface SectTerritoriesResponseDTO {
   sects: SectTerritorySummaryDTO[];
+  grid?: SectTerritoryGridDTO;
 }
 
 export type ToastLevel = 'error' | 'warning' | 'success' | 'info' | string;